@@ -5,6 +5,14 @@ from flask_cors import CORS
 from .config import Config
 from .extensions import db, migrate, api as smorest_api, jwt, limiter
 from .error_handling import register_error_handlers
+from .db_routing import register_db_routing
+from .events import register_events
+from .services.movement_service import register_movements
+from .services.alert_service import register_alerts
+from .services.search_service import register_search
+from .query_stats import register_query_stats
+from .metrics import register_metrics
+from .profiling import register_profiling
 from .api import register_blueprints
 from .cli import register_cli
 
@@ -70,6 +78,30 @@ def create_app(config_class=Config):
     # Register error handlers
     register_error_handlers(app)
     
+    # Expose replica/primary routing decision on responses
+    register_db_routing(app)
+    
+    # Change feed broker and after-commit event delivery
+    register_events(app)
+    
+    # Daily per-article movement totals, upserted with every transaction insert
+    register_movements(app)
+    
+    # Per-article stock totals and low-stock alerts, re-evaluated on balance flushes
+    register_alerts(app)
+    
+    # Article search words (articles.search_text), rewritten on article/alias flushes
+    register_search(app)
+    
+    # Per-request SQL query counting (Server-Timing, N+1 detection, budgets)
+    register_query_stats(app)
+    
+    # Prometheus request/pool/business metrics (no-op without prometheus_client)
+    register_metrics(app, db)
+    
+    # Opt-in sampling profiler for single requests (ADMIN + X-Profile: 1)
+    register_profiling(app)
+    
     # Register API blueprints
     register_blueprints(smorest_api)
     
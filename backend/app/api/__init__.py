@@ -9,6 +9,11 @@ from .approvals import blp as approvals_blp
 from .reports import blp as reports_blp
 from .inventory import blp as inventory_blp
 from .transactions import blp as transactions_blp
+from .events import blp as events_blp
+from .metrics import blp as metrics_blp
+from .profiles import blp as profiles_blp
+from .alerts import blp as alerts_blp
+from .scan import blp as scan_blp
 
 
 def register_blueprints(api):
@@ -23,3 +28,8 @@ def register_blueprints(api):
     api.register_blueprint(reports_blp)
     api.register_blueprint(inventory_blp)
     api.register_blueprint(transactions_blp)
+    api.register_blueprint(events_blp)
+    api.register_blueprint(metrics_blp)
+    api.register_blueprint(profiles_blp)
+    api.register_blueprint(alerts_blp)
+    api.register_blueprint(scan_blp)
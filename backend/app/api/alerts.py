@@ -0,0 +1,52 @@
+"""Alerts API endpoints."""
+from flask.views import MethodView
+from flask_smorest import Blueprint
+from flask_jwt_extended import jwt_required
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from ..extensions import db
+from ..models import Alert
+from ..db_routing import replica_read
+from ..schemas.alerts import AlertListSchema, AlertQuerySchema
+from ..schemas.common import ErrorResponseSchema
+
+blp = Blueprint(
+    'alerts',
+    __name__,
+    url_prefix='/api/alerts',
+    description='Low-stock alerts'
+)
+
+
+@blp.route('')
+class AlertList(MethodView):
+    """Alert collection resource."""
+    
+    @blp.doc(security=[{'bearerAuth': []}])
+    @blp.arguments(AlertQuerySchema, location='query')
+    @blp.response(200, AlertListSchema)
+    @blp.alt_response(401, schema=ErrorResponseSchema, description='Invalid token')
+    @jwt_required()
+    @replica_read
+    def get(self, query_args):
+        """List low-stock alerts.
+        
+        Alerts are opened and resolved as balances change, when stock + surplus
+        of an article at a location crosses its reorder_threshold. Open alerts by
+        default; newest first. Accessible by ADMIN and OPERATOR.
+        """
+        stmt = select(Alert).options(joinedload(Alert.article))
+        if query_args['status'] != 'ALL':
+            stmt = stmt.where(Alert.status == query_args['status'])
+        if query_args.get('location_id'):
+            stmt = stmt.where(Alert.location_id == query_args['location_id'])
+        if query_args.get('article_id'):
+            stmt = stmt.where(Alert.article_id == query_args['article_id'])
+        stmt = stmt.order_by(Alert.triggered_at.desc(), Alert.id.desc()).limit(query_args['limit'])
+        
+        alerts = db.session.execute(stmt).scalars().all()
+        return {
+            'items': alerts,
+            'total': len(alerts)
+        }
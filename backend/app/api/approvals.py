@@ -3,7 +3,7 @@ from flask.views import MethodView
 from flask_smorest import Blueprint
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
-from ..extensions import db
+from ..db_retry import run_in_transaction
 from ..auth import require_roles
 from ..services.approval_service import approve_draft, reject_draft
 from ..error_handling import AppError, InsufficientStockError
@@ -47,12 +47,11 @@ class ApproveDraft(MethodView):
         # Get actor from JWT instead of request body (JWT identity is string, convert to int)
         actor_user_id = int(get_jwt_identity())
         
-        result = approve_draft(
+        result = run_in_transaction('approve_draft', lambda: approve_draft(
             draft_id=draft_id,
             actor_user_id=actor_user_id,
             note=approval_data.get('note')
-        )
-        db.session.commit()
+        ))
         
         return {
             'message': 'Draft approved successfully',
@@ -87,12 +86,11 @@ class RejectDraft(MethodView):
         # Get actor from JWT instead of request body (JWT identity is string, convert to int)
         actor_user_id = int(get_jwt_identity())
         
-        result = reject_draft(
+        result = run_in_transaction('reject_draft', lambda: reject_draft(
             draft_id=draft_id,
             actor_user_id=actor_user_id,
             note=approval_data.get('note')
-        )
-        db.session.commit()
+        ))
         
         return {
             'message': 'Draft rejected successfully',
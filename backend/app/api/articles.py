@@ -4,15 +4,21 @@ from flask import request
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from flask_jwt_extended import jwt_required
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
 from ..extensions import db
 from ..auth import require_roles
-from ..models import Article, Batch, Stock, Surplus, Transaction, WeighInDraft, User
+from ..models import Alert, Article, ArticleStockTotal, Batch, InventoryBalance, Transaction, WeighInDraft, User
 from ..error_handling import AppError
-from ..schemas.articles import ArticleSchema, ArticleCreateSchema, ArticleListSchema
+from ..schemas.articles import (
+    ArticleSchema, ArticleCreateSchema, ArticleListSchema, ArticleSearchQuerySchema, ArticleSearchSchema
+)
 from ..schemas.aliases import ArticleAliasSchema, AliasCreateSchema, AliasListSchema
 from ..schemas.common import ErrorResponseSchema, SuccessMessageSchema
-from ..services import article_alias_service
+from ..services import article_alias_service, search_service
+from ..db_routing import replica_read
+from ..serialization import use_fast_path, fast_response
 
 blp = Blueprint(
     'articles',
@@ -21,6 +27,14 @@ blp = Blueprint(
     description='Articles management'
 )
 
+# Article table columns exposed by ArticleSchema in list responses
+ARTICLE_LIST_COLUMNS = (
+    'id', 'article_no', 'description', 'article_group', 'base_uom',
+    'pack_size', 'pack_uom', 'barcode', 'uom', 'manufacturer',
+    'manufacturer_art_number', 'reorder_threshold', 'is_paint', 'is_active',
+    'created_at', 'updated_at'
+)
+
 
 @blp.route('')
 class ArticleList(MethodView):
@@ -30,6 +44,7 @@ class ArticleList(MethodView):
     @blp.response(200, ArticleListSchema)
     @blp.alt_response(401, schema=ErrorResponseSchema, description='Invalid token')
     @jwt_required()
+    @replica_read
     def get(self):
         """List articles.
         
@@ -38,7 +53,8 @@ class ArticleList(MethodView):
         - active=false: only archived articles
         - active=all: all articles
         
-        Returns last_consumed_at for each article (based on STOCK_CONSUMED/SURPLUS_CONSUMED).
+        Returns last_consumed_at for each article (based on STOCK_CONSUMED/SURPLUS_CONSUMED)
+        and earliest_expiry_date (first expiry of an active batch with stock).
         """
         active = request.args.get('active', 'true')
         
@@ -51,36 +67,42 @@ class ArticleList(MethodView):
             Transaction.tx_type.in_(consumption_types)
         ).group_by(Transaction.article_id).subquery()
         
-        # Build query with outer join
-        query = db.session.query(
-            Article,
-            last_consumed_subq.c.last_consumed_at
+        # Precomputed per location; earliest over all locations
+        earliest_expiry_subq = select(
+            ArticleStockTotal.article_id,
+            db.func.min(ArticleStockTotal.earliest_expiry_date).label('earliest_expiry_date')
+        ).group_by(ArticleStockTotal.article_id).subquery()
+        
+        # Build Core query with outer join (rows, not ORM objects)
+        query = select(
+            *[Article.__table__.c[name] for name in ARTICLE_LIST_COLUMNS],
+            last_consumed_subq.c.last_consumed_at,
+            earliest_expiry_subq.c.earliest_expiry_date
         ).outerjoin(
             last_consumed_subq,
             Article.id == last_consumed_subq.c.article_id
+        ).outerjoin(
+            earliest_expiry_subq,
+            Article.id == earliest_expiry_subq.c.article_id
         )
         
         # Apply active filter
         if active == 'all':
             pass  # No filter
         elif active == 'false':
-            query = query.filter(Article.is_active == False)
+            query = query.where(Article.is_active == False)
         else:
-            query = query.filter(Article.is_active == True)
-        
-        results = query.all()
+            query = query.where(Article.is_active == True)
         
-        # Build response with last_consumed_at attached
-        items = []
-        for article, last_consumed_at in results:
-            # Attach computed field to article object for schema serialization
-            article.last_consumed_at = last_consumed_at
-            items.append(article)
+        items = [dict(row) for row in db.session.execute(query).mappings()]
         
-        return {
+        payload = {
             'items': items,
             'total': len(items)
         }
+        if use_fast_path():
+            return fast_response(payload)
+        return payload
     
     @blp.doc(security=[{'bearerAuth': []}])
     @blp.arguments(ArticleCreateSchema)
@@ -88,7 +110,7 @@ class ArticleList(MethodView):
     @blp.alt_response(400, schema=ErrorResponseSchema, description='Validation error')
     @blp.alt_response(401, schema=ErrorResponseSchema, description='Invalid token')
     @blp.alt_response(403, schema=ErrorResponseSchema, description='Admin role required')
-    @blp.alt_response(409, schema=ErrorResponseSchema, description='Article already exists')
+    @blp.alt_response(409, schema=ErrorResponseSchema, description='Article or barcode already exists')
     @jwt_required()
     @require_roles('ADMIN')
     def post(self, article_data):
@@ -106,14 +128,61 @@ class ArticleList(MethodView):
                     'details': {'article_no': article_data['article_no']}
                 }
             }, 409
-        
+
+        # Barcodes are unique (ix_articles_barcode); blank means none
+        if article_data.get('barcode') is not None:
+            article_data['barcode'] = article_data['barcode'].strip() or None
+        if article_data.get('barcode') and Article.query.filter_by(barcode=article_data['barcode']).first():
+            raise AppError(
+                'DUPLICATE_BARCODE',
+                f"Barcode {article_data['barcode']} is already used by another article",
+                {'barcode': article_data['barcode']}
+            )
+
         article = Article(**article_data)
         db.session.add(article)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError as e:
+            # A concurrent request took the barcode after the check above
+            db.session.rollback()
+            if article_data.get('barcode') and 'barcode' in str(e.orig).lower():
+                raise AppError(
+                    'DUPLICATE_BARCODE',
+                    f"Barcode {article_data['barcode']} is already used by another article",
+                    {'barcode': article_data['barcode']}
+                )
+            raise
         
         return article, 201
 
 
+@blp.route('/search')
+class ArticleSearch(MethodView):
+    """Ranked article search."""
+    
+    @blp.doc(security=[{'bearerAuth': []}])
+    @blp.arguments(ArticleSearchQuerySchema, location='query')
+    @blp.response(200, ArticleSearchSchema)
+    @blp.alt_response(401, schema=ErrorResponseSchema, description='Invalid token')
+    @jwt_required()
+    @replica_read
+    def get(self, args):
+        """Search articles by words of their number, description, manufacturer data or aliases.
+        
+        Every word of q must match a word of the article, as a prefix or
+        (for typos) by trigram similarity. Exact article_no matches rank first.
+        """
+        items, total = search_service.search(
+            args['q'], ARTICLE_LIST_COLUMNS, active=args['active'],
+            page=args['page'], per_page=args['per_page']
+        )
+        payload = {'items': items, 'total': total, 'page': args['page'], 'per_page': args['per_page']}
+        if use_fast_path():
+            return fast_response(payload)
+        return payload
+
+
 @blp.route('/<string:article_no>')
 class ArticleDetail(MethodView):
     """Single article resource."""
@@ -248,13 +317,9 @@ class ArticleDelete(MethodView):
         if batch_count > 0:
             references['batches'] = batch_count
         
-        stock_count = Stock.query.filter_by(article_id=article_id).count()
-        if stock_count > 0:
-            references['stock_rows'] = stock_count
-        
-        surplus_count = Surplus.query.filter_by(article_id=article_id).count()
-        if surplus_count > 0:
-            references['surplus_rows'] = surplus_count
+        balance_count = InventoryBalance.query.filter_by(article_id=article_id).count()
+        if balance_count > 0:
+            references['inventory_balances'] = balance_count
         
         transaction_count = Transaction.query.filter_by(article_id=article_id).count()
         if transaction_count > 0:
@@ -274,6 +339,9 @@ class ArticleDelete(MethodView):
             }, 409
         
         article_no = article.article_no
+        # Derived rows: zero stock totals and their alert history
+        ArticleStockTotal.query.filter_by(article_id=article_id).delete()
+        Alert.query.filter_by(article_id=article_id).delete()
         db.session.delete(article)
         db.session.commit()
         
@@ -1,19 +1,21 @@
 """Draft Groups API endpoints."""
 from flask.views import MethodView
 from flask_smorest import Blueprint
+from sqlalchemy.orm import selectinload
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from ..extensions import db
 from ..auth import require_roles
-from ..models import DraftGroup, Location
+from ..models import DraftGroup, DraftGroupArchive, Location
 from ..services import draft_group_service
+from ..db_retry import run_in_transaction
 from ..error_handling import AppError, InsufficientStockError
 from ..schemas.draft_groups import (
     DraftGroupSchema, DraftGroupCreateSchema, 
     DraftGroupListSchema, DraftGroupSummarySchema,
     DraftGroupUpdateSchema
 )
-from ..schemas.common import ErrorResponseSchema
+from ..schemas.common import ArchiveQuerySchema, ErrorResponseSchema
 
 blp = Blueprint(
     'draft_groups',
@@ -28,15 +30,28 @@ class DraftGroupList(MethodView):
     """Draft group collection resource."""
     
     @blp.doc(security=[{'bearerAuth': []}])
+    @blp.arguments(ArchiveQuerySchema, location='query')
     @blp.response(200, DraftGroupListSchema)
     @blp.alt_response(401, schema=ErrorResponseSchema, description='Invalid token')
     @jwt_required()
-    def get(self):
+    def get(self, query_args):
         """List draft groups.
         
         Returns groups with summary info (total qty, line count).
+        Finalized groups moved to the archive are only listed with include_archived.
         """
-        groups = DraftGroup.query.order_by(DraftGroup.created_at.desc()).all()
+        models = [DraftGroup]
+        if query_args['include_archived']:
+            models.append(DraftGroupArchive)
+        
+        groups = []
+        for model in models:
+            # line_count/total_quantity_kg read drafts: load them in one query
+            groups.extend(model.query.options(
+                selectinload(model.drafts)
+            ).order_by(model.created_at.desc()).all())
+        if len(models) > 1:
+            groups.sort(key=lambda g: g.created_at, reverse=True)
         return {
             'items': groups,
             'total': len(groups)
@@ -70,13 +85,16 @@ class DraftGroupDetail(MethodView):
     """Single draft group resource."""
     
     @blp.doc(security=[{'bearerAuth': []}])
+    @blp.arguments(ArchiveQuerySchema, location='query')
     @blp.response(200, DraftGroupSchema)
     @blp.alt_response(401, schema=ErrorResponseSchema, description='Invalid token')
     @blp.alt_response(404, schema=ErrorResponseSchema, description='Group not found')
     @jwt_required()
-    def get(self, group_id):
-        """Get draft group by ID with lines."""
+    def get(self, query_args, group_id):
+        """Get draft group by ID with lines (archived groups with include_archived)."""
         group = db.session.get(DraftGroup, group_id)
+        if not group and query_args['include_archived']:
+            group = db.session.get(DraftGroupArchive, group_id)
         if not group:
             return {
                 'error': {
@@ -133,7 +151,10 @@ class ApproveGroup(MethodView):
         current_user_id = int(get_jwt_identity())
         
         try:
-            result = draft_group_service.approve_group(group_id, current_user_id)
+            run_in_transaction(
+                'approve_group',
+                lambda: draft_group_service.approve_group(group_id, current_user_id)
+            )
             group = db.session.get(DraftGroup, group_id)
             return group
         except InsufficientStockError as e:
@@ -171,7 +192,10 @@ class RejectGroup(MethodView):
         current_user_id = int(get_jwt_identity())
         
         try:
-            draft_group_service.reject_group(group_id, current_user_id)
+            run_in_transaction(
+                'reject_group',
+                lambda: draft_group_service.reject_group(group_id, current_user_id)
+            )
             group = db.session.get(DraftGroup, group_id)
             return group
         except AppError as e:
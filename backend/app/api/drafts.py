@@ -6,12 +6,19 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from ..extensions import db
 from ..auth import require_roles
-from ..models import WeighInDraft, Location, Article, Batch
+from ..models import (
+    WeighInDraft, WeighInDraftArchive, ApprovalAction, ApprovalActionArchive,
+    Location, Article, Batch, Transaction
+)
 from ..schemas.drafts import (
     DraftSchema, DraftCreateSchema, DraftUpdateSchema,
     DraftQuerySchema, DraftListSchema
 )
-from ..schemas.common import ErrorResponseSchema
+from ..schemas.approvals import ApprovalActionListSchema
+from ..schemas.transactions import TransactionListSchema
+from ..schemas.common import ArchiveQuerySchema, ErrorResponseSchema
+from ..services.archive_service import client_event_id_exists
+from .transactions import transaction_list_query
 
 blp = Blueprint(
     'drafts',
@@ -35,17 +42,24 @@ class DraftList(MethodView):
         
         Filter by status, location_id, or article_id.
         Accessible by ADMIN and OPERATOR.
+        Finalized drafts moved to the archive are only listed with include_archived.
         """
-        query = WeighInDraft.query
-        
-        if query_args.get('status'):
-            query = query.filter_by(status=query_args['status'])
-        if query_args.get('location_id'):
-            query = query.filter_by(location_id=query_args['location_id'])
-        if query_args.get('article_id'):
-            query = query.filter_by(article_id=query_args['article_id'])
-        
-        drafts = query.order_by(WeighInDraft.created_at.desc()).all()
+        models = [WeighInDraft]
+        if query_args['include_archived']:
+            models.append(WeighInDraftArchive)
+        
+        drafts = []
+        for model in models:
+            query = model.query
+            if query_args.get('status'):
+                query = query.filter_by(status=query_args['status'])
+            if query_args.get('location_id'):
+                query = query.filter_by(location_id=query_args['location_id'])
+            if query_args.get('article_id'):
+                query = query.filter_by(article_id=query_args['article_id'])
+            drafts.extend(query.order_by(model.created_at.desc()).all())
+        if len(models) > 1:
+            drafts.sort(key=lambda d: d.created_at, reverse=True)
         
         return {
             'items': drafts,
@@ -89,11 +103,8 @@ class DraftList(MethodView):
         if not batch:
             return {'error': {'code': 'BATCH_NOT_FOUND', 'message': f"Batch ID {draft_data['batch_id']} not found", 'details': {}}}, 404
 
-        # Check for duplicate client_event_id (idempotency)
-        existing = WeighInDraft.query.filter_by(
-            client_event_id=draft_data['client_event_id']
-        ).first()
-        if existing:
+        # Check for duplicate client_event_id (idempotency), archived drafts included
+        if client_event_id_exists(draft_data['client_event_id']):
             return {
                 'error': {
                     'code': 'DUPLICATE_EVENT_ID',
@@ -128,13 +139,16 @@ class DraftDetail(MethodView):
     """Single draft resource."""
     
     @blp.doc(security=[{'bearerAuth': []}])
+    @blp.arguments(ArchiveQuerySchema, location='query')
     @blp.response(200, DraftSchema)
     @blp.alt_response(401, schema=ErrorResponseSchema, description='Invalid token')
     @blp.alt_response(404, schema=ErrorResponseSchema, description='Draft not found')
     @jwt_required()
-    def get(self, draft_id):
-        """Get draft by ID."""
+    def get(self, query_args, draft_id):
+        """Get draft by ID (archived drafts with include_archived)."""
         draft = db.session.get(WeighInDraft, draft_id)
+        if not draft and query_args['include_archived']:
+            draft = db.session.get(WeighInDraftArchive, draft_id)
         if not draft:
             return {
                 'error': {
@@ -191,3 +205,50 @@ class DraftDetail(MethodView):
         db.session.commit()
         
         return draft
+
+
+@blp.route('/<int:draft_id>/transactions')
+class DraftTransactions(MethodView):
+    """Transactions written when a draft was approved."""
+    
+    @blp.doc(security=[{'bearerAuth': []}])
+    @blp.response(200, TransactionListSchema)
+    @blp.alt_response(401, schema=ErrorResponseSchema, description='Invalid token')
+    @blp.alt_response(403, schema=ErrorResponseSchema, description='Admin role required')
+    @jwt_required()
+    @require_roles('ADMIN')
+    def get(self, draft_id):
+        """List the transactions of a draft (index seek on transactions.draft_id).
+        
+        Empty for drafts that are not approved or do not exist.
+        """
+        stmt = transaction_list_query([Transaction.draft_id == draft_id], limit=1000, offset=0)
+        items = [dict(row) for row in db.session.execute(stmt).mappings()]
+        return {'items': items, 'total': len(items)}
+
+
+@blp.route('/<int:draft_id>/actions')
+class DraftActions(MethodView):
+    """Approval audit trail of a draft."""
+    
+    @blp.doc(security=[{'bearerAuth': []}])
+    @blp.arguments(ArchiveQuerySchema, location='query')
+    @blp.response(200, ApprovalActionListSchema)
+    @blp.alt_response(401, schema=ErrorResponseSchema, description='Invalid token')
+    @blp.alt_response(403, schema=ErrorResponseSchema, description='Admin role required')
+    @jwt_required()
+    @require_roles('ADMIN')
+    def get(self, query_args, draft_id):
+        """List approve/reject/edit actions of a draft, oldest first.
+        
+        Actions of archived drafts are only returned with include_archived.
+        """
+        models = [ApprovalAction]
+        if query_args['include_archived']:
+            models.append(ApprovalActionArchive)
+        
+        items = []
+        for model in models:
+            actions = model.query.filter_by(draft_id=draft_id).order_by(model.id).all()
+            items.extend(action.to_dict() for action in actions)
+        return {'items': items, 'total': len(items)}
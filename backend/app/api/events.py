@@ -0,0 +1,105 @@
+"""Events API - Server-Sent Events change feed."""
+import json
+import time
+
+from flask import current_app, request, Response
+from flask.views import MethodView
+from flask_smorest import Blueprint
+from flask_jwt_extended import jwt_required
+
+from .. import events
+from ..schemas.common import ErrorResponseSchema
+
+blp = Blueprint(
+    'events',
+    __name__,
+    url_prefix='/api/events',
+    description='Change feed (Server-Sent Events)'
+)
+
+
+def format_sse(ev: dict) -> str:
+    """Format one event as an SSE message."""
+    lines = []
+    if ev.get('id'):
+        lines.append(f"id: {ev['id']}")
+    lines.append(f"event: {ev['type']}")
+    lines.append(f"data: {json.dumps(ev, separators=(',', ':'))}")
+    return '\n'.join(lines) + '\n\n'
+
+
+def _resync_event(broker) -> dict:
+    """Tell the client it missed events and must re-fetch current state."""
+    ev = events.make_event(events.EVENT_RESYNC, {})
+    # Continue from the newest buffered event after re-fetching
+    ev['id'] = broker.last_event_id
+    return ev
+
+
+def sse_stream(broker, last_event_id, heartbeat: float, max_seconds: float, retry_ms: int):
+    """Yield SSE messages: replay after last_event_id, then live events.
+
+    The stream ends after max_seconds; clients reconnect with Last-Event-ID.
+    """
+    yield f'retry: {retry_ms}\n\n'
+
+    if last_event_id:
+        seq = broker.resolve(last_event_id)
+        if seq is None:
+            seq = broker.last_seq
+            yield format_sse(_resync_event(broker))
+    else:
+        seq = broker.last_seq
+
+    deadline = time.monotonic() + max_seconds
+    while True:
+        timeout = min(heartbeat, max(deadline - time.monotonic(), 0))
+        new_events, seq_after, lost = broker.wait_after(seq, timeout)
+        if lost:
+            yield format_sse(_resync_event(broker))
+            new_events = []
+        for ev in new_events:
+            yield format_sse(ev)
+        if not new_events and not lost:
+            yield ': keepalive\n\n'
+        seq = seq_after
+
+        if time.monotonic() >= deadline:
+            return
+
+
+@blp.route('/stream')
+class EventStream(MethodView):
+    """Change feed stream resource."""
+
+    @blp.doc(security=[{'bearerAuth': []}])
+    @blp.response(200, description='text/event-stream of change events')
+    @blp.alt_response(401, schema=ErrorResponseSchema, description='Invalid token')
+    @jwt_required()
+    def get(self):
+        """Stream inventory and draft/group change events (SSE).
+
+        Event types: inventory.changed, draft.approved, draft.rejected,
+        group.created, group.approved, group.rejected, resync.
+
+        Resume with the Last-Event-ID header (or ?last_event_id=). If the id
+        is no longer buffered, a 'resync' event tells the client to re-fetch.
+        """
+        app = current_app._get_current_object()
+        broker = events.get_broker(app)
+        if events.get_backend() == events.BACKEND_POSTGRES:
+            broker.ensure_listener(app)
+
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+
+        stream = sse_stream(
+            broker,
+            last_event_id,
+            heartbeat=app.config.get('EVENTS_HEARTBEAT_SECONDS', 15),
+            max_seconds=app.config.get('EVENTS_STREAM_MAX_SECONDS', 300),
+            retry_ms=app.config.get('EVENTS_RETRY_MS', 3000)
+        )
+        return Response(stream, mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+        })
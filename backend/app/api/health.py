@@ -1,41 +1,163 @@
-"""Health check endpoint - public, no auth required."""
+"""Health check endpoints - public, no auth required.
+
+/health/live only proves the process answers (no DB access) and is meant for
+liveness probes. /health/ready returns 503 when the database is unreachable
+or the connection pool is saturated, so load balancers stop routing traffic
+to this worker. The database probe result is cached for
+HEALTH_CHECK_INTERVAL_SECONDS, so frequent probes do not add DB load.
+"""
 import os
+import threading
+import time
+
 from flask import current_app
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from sqlalchemy import text
 
-from ..extensions import db
+from ..extensions import db, limiter
 
 blp = Blueprint(
     'health',
     __name__,
     url_prefix='/health',
-    description='Health check endpoint'
+    description='Health check endpoints'
 )
 
+# Load balancer probes must not be rate limited
+limiter.exempt(blp)
+
+# Per-engine probe results: engine -> {'checked_at', 'healthy', 'latency_ms', 'error'}
+_db_state = {}
+_state_lock = threading.Lock()
+
+
+def pool_stats(engine) -> dict:
+    """Connection pool usage; size accounting only exists for QueuePool-style pools."""
+    pool = engine.pool
+    stats = {'class': type(pool).__name__}
+    if not hasattr(pool, 'checkedout'):
+        return stats
+
+    size = pool.size()
+    max_overflow = getattr(pool, '_max_overflow', 0)
+    checked_out = pool.checkedout()
+    # max_overflow < 0 means unlimited overflow - the pool can never saturate
+    capacity = size + max_overflow if max_overflow >= 0 else None
+    stats.update({
+        'size': size,
+        'max_overflow': max_overflow,
+        'checked_out': checked_out,
+        'checked_in': pool.checkedin(),
+        'overflow': max(pool.overflow(), 0),
+        'capacity': capacity,
+        'usage': round(checked_out / capacity, 3) if capacity else None,
+    })
+    return stats
+
+
+def _probe_database(engine) -> dict:
+    """Run SELECT 1 on a pooled connection, outside the request's ORM session."""
+    started = time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+    except Exception as e:
+        current_app.logger.warning(f'Database health probe failed: {e}')
+        return {'healthy': False, 'latency_ms': None, 'error': str(e)}
+    return {'healthy': True, 'latency_ms': round((time.perf_counter() - started) * 1000, 2), 'error': None}
+
+
+def get_database_state(engine, probe: bool = True) -> dict | None:
+    """Return the cached probe result, re-probing when stale.
+
+    With probe=False a stale or missing result is returned as-is (None if the
+    database was never probed) instead of checking out a connection.
+    """
+    interval = current_app.config.get('HEALTH_CHECK_INTERVAL_SECONDS', 2)
+    now = time.monotonic()
+
+    with _state_lock:
+        state = _db_state.get(engine)
+    if not probe or (state is not None and now - state['checked_at'] < interval):
+        return state
+
+    state = _probe_database(engine)
+    state['checked_at'] = now
+    with _state_lock:
+        _db_state[engine] = state
+    return state
+
+
+def _database_check(state: dict | None) -> dict:
+    if state is None:
+        return {'status': 'unknown'}
+    return {
+        'status': 'ok' if state['healthy'] else 'error',
+        'latency_ms': state['latency_ms'],
+        'error': state['error'],
+        'age_seconds': round(time.monotonic() - state['checked_at'], 3),
+    }
+
 
 @blp.route('')
 class HealthCheck(MethodView):
     """Health check resource."""
-    
+
     @blp.response(200)
     def get(self):
         """Check API and database health.
-        
+
+        Kept for existing clients; always 200. Use /health/ready for
+        load balancer routing decisions.
+
         Returns:
             Health status including database connectivity, version, and environment
         """
-        # Check database connectivity
-        db_status = 'connected'
-        try:
-            db.session.execute(text('SELECT 1'))
-        except Exception as e:
-            db_status = f'error: {str(e)}'
-        
+        state = get_database_state(db.engine)
+
         return {
-            'status': 'ok',
-            'database': db_status,
+            'status': 'ok' if state['healthy'] else 'degraded',
+            'database': 'connected' if state['healthy'] else f"error: {state['error']}",
             'version': current_app.config.get('API_VERSION', '0.1.0'),
             'environment': current_app.config.get('ENV', os.getenv('ENV', 'development'))
         }
+
+
+@blp.route('/live')
+class Liveness(MethodView):
+    """Liveness probe resource."""
+
+    @blp.response(200)
+    def get(self):
+        """Report that the process is up. Never touches the database."""
+        return {'status': 'ok'}
+
+
+@blp.route('/ready')
+class Readiness(MethodView):
+    """Readiness probe resource."""
+
+    @blp.response(200)
+    @blp.alt_response(503, description='Database unreachable or connection pool saturated')
+    def get(self):
+        """Check whether this worker can serve traffic.
+
+        Returns:
+            503 when the (cached) database probe failed or pool usage is at or
+            above HEALTH_POOL_SATURATION_RATIO, with database and pool details
+        """
+        engine = db.engine
+        pool = pool_stats(engine)
+        threshold = current_app.config.get('HEALTH_POOL_SATURATION_RATIO', 1.0)
+        pool['saturated'] = pool.get('usage') is not None and pool['usage'] >= threshold
+
+        # A saturated pool would block the probe for pool_timeout; report the last result
+        state = get_database_state(engine, probe=not pool['saturated'])
+        ready = not pool['saturated'] and state is not None and state['healthy']
+
+        body = {
+            'status': 'ready' if ready else 'unavailable',
+            'checks': {'database': _database_check(state), 'pool': pool},
+        }
+        return body, 200 if ready else 503
@@ -1,16 +1,21 @@
 """Inventory API endpoints."""
+from datetime import datetime, timedelta, timezone
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from marshmallow import Schema, fields, validate
+from sqlalchemy import select
 
 from ..extensions import db
 from ..auth import require_roles
-from ..models import Stock, Surplus, Article, Batch, Location, Transaction, User
+from ..models import InventoryBalance, Article, Batch, Location, Transaction, User
 from ..services.inventory_service import adjust_inventory
 from ..services import inventory_count_service
 from ..services.receiving_service import receive_stock
 from ..error_handling import AppError
+from ..db_routing import replica_read
+from ..db_retry import run_in_transaction
+from ..serialization import use_fast_path, fast_response
 from ..schemas.common import ErrorResponseSchema
 from ..schemas.inventory import (
     InventorySummaryResponseSchema,
@@ -19,7 +24,9 @@ from ..schemas.inventory import (
     InventoryCountResponseSchema,
     StockReceiveRequestSchema,
     StockReceiveResponseSchema,
-    ReceiptHistoryResponseSchema
+    ReceiptHistoryResponseSchema,
+    ExpiringQuerySchema,
+    ExpiringResponseSchema
 )
 
 blp = Blueprint(
@@ -149,116 +156,135 @@ class InventorySummary(MethodView):
         article_id = args.get('article_id')
         batch_id = args.get('batch_id')
         
-        # Build query: Batch is the anchor
-        query = db.session.query(
-            Batch, Article, Stock, Surplus
-        ).join(
-            Article, Batch.article_id == Article.id
-        )
-        
-        # Outer join stock/surplus
-        # If location_id is provided, filter the join
-        stock_filter = (Stock.batch_id == Batch.id)
-        surplus_filter = (Surplus.batch_id == Batch.id)
-        
-        if location_id:
-            stock_filter &= (Stock.location_id == location_id)
-            surplus_filter &= (Surplus.location_id == location_id)
-        
-        query = query.outerjoin(
-            Stock, stock_filter
-        ).outerjoin(
-            Surplus, surplus_filter
-        )
-        
-        # Apply filters
-        if article_id:
-            query = query.filter(Batch.article_id == article_id)
-        if batch_id:
-            query = query.filter(Batch.id == batch_id)
-        
-        # Only show active batches or batches with stock?
-        # For now show all batches that match filters.
-        # But usually we want to see only what we have.
-        # Let's filter to where stock or surplus exists OR batch is active
-        # query = query.filter(
-        #     db.or_(
-        #         Batch.is_active == True,
-        #         Stock.quantity_kg > 0,
-        #         Surplus.quantity_kg > 0
-        #     )
-        # )
-        # Keeping it simple: return query results. 
-        # But wait, if we don't filter by location in WHERE, and use outer join,
-        # we might get multiple rows if multiple locations exist for a batch?
-        # Currently Stock/Surplus has location_id.
-        # If location_id NOT specified, we might get cartesian product if multiple stocks exist?
-        # Specification says "location_id (always 1 for v1)".
-        # And "aggregated by (location_id, article_id, batch_id)".
-        # If we query Batch, we ignore location if we don't join specifically.
-        # If we want detailed list per location, we should query Stock/Surplus primarily.
-        
-        # Better approach for summary:
-        # Union Stock and Surplus keys (loc, art, batch)
-        # But standard use case is single location (1).
-        # Let's default location_id=13 if not provided, to simplify.
-        
+        # Single location in v1 (spec: location 13); one balance row per batch
         target_location_id = location_id if location_id else 13
         
-        # Re-build query with specific location
-        query = db.session.query(
-            Batch, Article, Stock, Surplus
-        ).join(
+        # Batch is the anchor (Core rows, only needed columns)
+        query = select(
+            Batch.id.label('batch_id'),
+            Batch.batch_code,
+            Batch.expiry_date,
+            Article.id.label('article_id'),
+            Article.article_no,
+            Article.description,
+            Article.is_paint,
+            InventoryBalance.stock_kg.label('stock_qty'),
+            InventoryBalance.stock_updated_at,
+            InventoryBalance.surplus_kg.label('surplus_qty'),
+            InventoryBalance.surplus_updated_at
+        ).select_from(Batch).join(
             Article, Batch.article_id == Article.id
         ).outerjoin(
-            Stock, (Stock.batch_id == Batch.id) & (Stock.location_id == target_location_id)
-        ).outerjoin(
-            Surplus, (Surplus.batch_id == Batch.id) & (Surplus.location_id == target_location_id)
+            InventoryBalance,
+            (InventoryBalance.batch_id == Batch.id) & (InventoryBalance.location_id == target_location_id)
         )
         
         if article_id:
-            query = query.filter(Batch.article_id == article_id)
+            query = query.where(Batch.article_id == article_id)
         if batch_id:
-            query = query.filter(Batch.id == batch_id)
+            query = query.where(Batch.id == batch_id)
             
-        results = query.all()
+        results = db.session.execute(query).mappings()
         
         items = []
-        for batch, article, stock, surplus in results:
-            stock_qty = float(stock.quantity_kg) if stock else 0.0
-            surplus_qty = float(surplus.quantity_kg) if surplus else 0.0
-            
-            # Skip if 0 quantity and batch inactive?
-            # User wants to see inventory.
-            
-            # Get location code - simplified, assume target_location_id
-            # In real app we might query Location table.
-            # But we know ID.
+        for row in results:
+            stock_qty = float(row['stock_qty']) if row['stock_qty'] is not None else 0.0
+            surplus_qty = float(row['surplus_qty']) if row['surplus_qty'] is not None else 0.0
             
-            updated_at = None
-            if stock and stock.last_updated:
-                updated_at = stock.last_updated
-            if surplus and surplus.updated_at:
-                if not updated_at or surplus.updated_at > updated_at:
-                    updated_at = surplus.updated_at
+            # Location code is hardcoded for v1 as per spec (single location)
+            updated_at = row['stock_updated_at']
+            if row['surplus_updated_at']:
+                if not updated_at or row['surplus_updated_at'] > updated_at:
+                    updated_at = row['surplus_updated_at']
             
             items.append({
                 'location_id': target_location_id,
                 'location_code': '13', # Hardcoded for v1 as per spec
-                'article_id': article.id,
-                'article_no': article.article_no,
-                'description': article.description,
-                'batch_id': batch.id,
-                'batch_code': batch.batch_code,
-                'expiry_date': batch.expiry_date.isoformat() if batch.expiry_date else None,
-                'stock_qty': float(stock_qty),
-                'surplus_qty': float(surplus_qty),
-                'total_qty': float(stock_qty) + float(surplus_qty),
-                'is_paint': article.is_paint,
+                'article_id': row['article_id'],
+                'article_no': row['article_no'],
+                'description': row['description'],
+                'batch_id': row['batch_id'],
+                'batch_code': row['batch_code'],
+                'expiry_date': row['expiry_date'].isoformat() if row['expiry_date'] else None,
+                'stock_qty': stock_qty,
+                'surplus_qty': surplus_qty,
+                'total_qty': stock_qty + surplus_qty,
+                'is_paint': row['is_paint'],
                 'updated_at': updated_at.isoformat() if updated_at else None
             })
-            
-        return {'items': items, 'total': len(items)}
+        
+        payload = {'items': items, 'total': len(items)}
+        if use_fast_path():
+            return fast_response(payload)
+        return payload
+
+
+@blp.route('/expiring')
+class InventoryExpiring(MethodView):
+    """Expiring stock resource."""
+    
+    @blp.doc(security=[{'bearerAuth': []}])
+    @blp.arguments(ExpiringQuerySchema, location='query')
+    @blp.response(200, ExpiringResponseSchema)
+    @blp.alt_response(401, schema=ErrorResponseSchema, description='Invalid token')
+    @blp.alt_response(403, schema=ErrorResponseSchema, description='Role required (ADMIN or OPERATOR)')
+    @jwt_required()
+    @require_roles('ADMIN', 'OPERATOR')
+    @replica_read
+    def get(self, args):
+        """Get batches that still hold stock and expire within `days`.
+        
+        Earliest expiry first (first-expired, first-out), already expired batches
+        included. One query driven by the partial expiry index on active batches.
+        """
+        today = datetime.now(timezone.utc).date()
+        until = today + timedelta(days=args['days'])
+        location_id = args['location_id']
+        
+        total_qty = InventoryBalance.stock_kg + InventoryBalance.surplus_kg
+        query = select(
+            Batch.id.label('batch_id'),
+            Batch.batch_code,
+            Batch.expiry_date,
+            Article.id.label('article_id'),
+            Article.article_no,
+            Article.description,
+            InventoryBalance.stock_kg.label('stock_qty'),
+            InventoryBalance.surplus_kg.label('surplus_qty')
+        ).select_from(Batch).join(
+            # Full uq_inventory_balances_key lookup per batch
+            InventoryBalance,
+            (InventoryBalance.location_id == location_id)
+            & (InventoryBalance.article_id == Batch.article_id)
+            & (InventoryBalance.batch_id == Batch.id)
+        ).join(
+            Article, Batch.article_id == Article.id
+        ).where(
+            # Matches the ix_batches_expiry_active predicate
+            Batch.is_active,
+            Batch.expiry_date.isnot(None),
+            Batch.expiry_date <= until,
+            total_qty > 0
+        ).order_by(Batch.expiry_date, Batch.id)
+        if args.get('article_id'):
+            query = query.where(Batch.article_id == args['article_id'])
+        
+        items = []
+        for row in db.session.execute(query).mappings():
+            stock_qty = float(row['stock_qty'])
+            surplus_qty = float(row['surplus_qty'])
+            items.append({
+                **row,
+                'days_left': (row['expiry_date'] - today).days,
+                'stock_qty': stock_qty,
+                'surplus_qty': surplus_qty,
+                'total_qty': stock_qty + surplus_qty
+            })
+        
+        payload = {'items': items, 'total': len(items), 'as_of': today, 'until': until}
+        if use_fast_path():
+            return fast_response(payload)
+        return payload
 
 
 @blp.route('/count')
@@ -281,7 +307,7 @@ class InventoryCount(MethodView):
         """
         actor_user_id = int(get_jwt_identity())
         
-        result = inventory_count_service.perform_inventory_count(
+        result = run_in_transaction('inventory_count', lambda: inventory_count_service.perform_inventory_count(
             location_id=data['location_id'],
             article_id=data['article_id'],
             batch_id=data['batch_id'],
@@ -289,8 +315,7 @@ class InventoryCount(MethodView):
             actor_user_id=actor_user_id,
             note=data.get('note'),
             client_event_id=data.get('client_event_id')
-        )
-        db.session.commit()
+        ))
         return result
 
 
@@ -320,7 +345,7 @@ class InventoryReceive(MethodView):
         actor_user_id = int(get_jwt_identity())
         
         try:
-            result = receive_stock(
+            result = run_in_transaction('receive_stock', lambda: receive_stock(
                 article_id=data['article_id'],
                 batch_code=data['batch_code'],
                 quantity_kg=data['quantity_kg'],
@@ -331,8 +356,7 @@ class InventoryReceive(MethodView):
                 received_date=data.get('received_date'),
                 note=data.get('note'),
                 client_event_id=data.get('client_event_id')
-            )
-            db.session.commit()
+            ))
             return result, 201
         except AppError as e:
             db.session.rollback()
@@ -360,6 +384,7 @@ class ReceiptHistory(MethodView):
     @blp.alt_response(403, schema=ErrorResponseSchema, description='Admin role required')
     @jwt_required()
     @require_roles('ADMIN')
+    @replica_read
     def get(self):
         """Get receipt history (grouped).
         
@@ -0,0 +1,30 @@
+"""Metrics endpoint - Prometheus exposition format, no auth required."""
+from flask import current_app
+from flask.views import MethodView
+from flask_smorest import Blueprint
+
+from .. import metrics
+from ..error_handling import AppError
+
+blp = Blueprint(
+    'metrics',
+    __name__,
+    url_prefix='/metrics',
+    description='Prometheus metrics endpoint'
+)
+
+
+@blp.route('')
+class Metrics(MethodView):
+    """Prometheus scrape target."""
+
+    @blp.response(200, description='Prometheus text format')
+    def get(self):
+        """Request latency histograms, status counts, DB pool gauges,
+        row-lock wait times and business counters.
+        """
+        if not metrics.metrics_available():
+            raise AppError('METRICS_UNAVAILABLE', 'prometheus_client is not installed')
+
+        body, content_type = metrics.render_latest()
+        return current_app.response_class(body, status=200, content_type=content_type)
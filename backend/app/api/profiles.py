@@ -0,0 +1,68 @@
+"""Request profiles API - collapsed-stack output of admin-profiled requests."""
+from flask import current_app
+from flask.views import MethodView
+from flask_smorest import Blueprint
+from flask_jwt_extended import jwt_required
+
+from .. import profiling
+from ..auth import require_roles
+from ..error_handling import AppError
+from ..schemas.common import ErrorResponseSchema
+from ..schemas.profiles import ProfileListSchema
+
+blp = Blueprint(
+    'profiles',
+    __name__,
+    url_prefix='/api/admin/profiles',
+    description='Request profiles (send X-Profile: 1 as ADMIN to record one)'
+)
+
+
+@blp.route('')
+class ProfileList(MethodView):
+    """Stored profiles."""
+
+    @blp.doc(security=[{'bearerAuth': []}])
+    @blp.response(200, ProfileListSchema)
+    @blp.alt_response(401, schema=ErrorResponseSchema, description='Invalid token')
+    @blp.alt_response(403, schema=ErrorResponseSchema, description='Admin role required')
+    @jwt_required()
+    @require_roles('ADMIN')
+    def get(self):
+        """List stored request profiles, newest first."""
+        items = profiling.list_profiles()
+        return {'items': items, 'total': len(items)}
+
+
+@blp.route('/<string:profile_id>')
+class ProfileDetail(MethodView):
+    """One stored profile."""
+
+    @blp.doc(security=[{'bearerAuth': []}])
+    @blp.response(200, description='Collapsed stacks (text/plain), one "frame;frame;... count" per line')
+    @blp.alt_response(401, schema=ErrorResponseSchema, description='Invalid token')
+    @blp.alt_response(403, schema=ErrorResponseSchema, description='Admin role required')
+    @blp.alt_response(404, schema=ErrorResponseSchema, description='Profile not found')
+    @jwt_required()
+    @require_roles('ADMIN')
+    def get(self, profile_id):
+        """Download a profile in collapsed-stack format.
+
+        Render with e.g. `flamegraph.pl profile.collapsed > profile.svg`
+        or load it into speedscope.
+        """
+        paths = profiling.profile_paths(profile_id)
+        if paths is None:
+            raise AppError('PROFILE_NOT_FOUND', f'Profile {profile_id} not found')
+        try:
+            with open(paths[0]) as f:
+                body = f.read()
+        except FileNotFoundError:
+            raise AppError('PROFILE_NOT_FOUND', f'Profile {profile_id} not found')
+
+        return current_app.response_class(
+            body,
+            status=200,
+            mimetype='text/plain',
+            headers={'Content-Disposition': f'inline; filename="{profile_id}.collapsed"'}
+        )
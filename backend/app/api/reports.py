@@ -1,16 +1,25 @@
 """Reports API endpoints."""
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from flask_jwt_extended import jwt_required
+from sqlalchemy import select
 
 from ..extensions import db
 from ..auth import require_roles
-from ..models import Stock, Surplus, Transaction, Location, Article, Batch
+from ..models import InventoryBalance, Transaction, Location, Article, Batch
+from ..db_routing import replica_read
+from ..serialization import use_fast_path, fast_response
 from ..schemas.reports import (
-    InventoryReportSchema, TransactionReportSchema, ReportQuerySchema
+    InventoryReportSchema, TransactionReportSchema, ReportQuerySchema, InventoryReportQuerySchema,
+    MovementReportSchema, MovementReportQuerySchema,
+    ConsumptionForecastSchema, ConsumptionForecastQuerySchema
 )
+from ..services import forecast_service
+from ..services.movement_service import period_totals
+from ..services.snapshot_service import balances_as_of
 from ..schemas.common import ErrorResponseSchema
+from ..error_handling import AppError
 
 blp = Blueprint(
     'reports',
@@ -20,76 +29,137 @@ blp = Blueprint(
 )
 
 
+def _inventory_as_of(as_of, location_id, article_id) -> dict:
+    """Point-in-time inventory report payload."""
+    balances, basis = balances_as_of(as_of, location_id, article_id)
+    balances = {key: value for key, value in balances.items() if value[0] or value[1]}
+    
+    # Codes for the keys involved, one query per table
+    location_codes = dict(db.session.execute(
+        select(Location.id, Location.code).where(Location.id.in_({k[0] for k in balances}))
+    ).all())
+    article_nos = dict(db.session.execute(
+        select(Article.id, Article.article_no).where(Article.id.in_({k[1] for k in balances}))
+    ).all())
+    batch_codes = dict(db.session.execute(
+        select(Batch.id, Batch.batch_code).where(Batch.id.in_({k[2] for k in balances}))
+    ).all())
+    
+    items = [
+        {
+            'location_id': loc,
+            'location_code': location_codes.get(loc),
+            'article_id': art,
+            'article_no': article_nos.get(art),
+            'batch_id': batch,
+            'batch_code': batch_codes.get(batch),
+            'stock_kg': stock_kg,
+            'surplus_kg': surplus_kg
+        }
+        for (loc, art, batch), (stock_kg, surplus_kg) in sorted(balances.items())
+    ]
+    return {
+        'items': items,
+        'total': len(items),
+        'generated_at': datetime.now(timezone.utc),
+        'as_of': as_of,
+        **basis
+    }
+
+
 @blp.route('/inventory')
 class InventoryReport(MethodView):
     """Inventory report resource."""
     
     @blp.doc(security=[{'bearerAuth': []}])
-    @blp.arguments(ReportQuerySchema, location='query')
+    @blp.arguments(InventoryReportQuerySchema, location='query')
     @blp.response(200, InventoryReportSchema)
     @blp.alt_response(401, schema=ErrorResponseSchema, description='Invalid token')
     @blp.alt_response(403, schema=ErrorResponseSchema, description='Admin role required')
     @jwt_required()
     @require_roles('ADMIN')
+    @replica_read
     def get(self, query_args):
         """Get inventory report.
         
         Returns current stock and surplus levels grouped by location/article/batch.
+        With as_of, returns the levels at the end of that day, computed from the
+        nearest daily snapshot plus the transactions in between.
         """
-        # Build stock query
-        stock_query = db.session.query(Stock)
-        surplus_query = db.session.query(Surplus)
+        location_id = query_args.get('location_id')
+        article_id = query_args.get('article_id')
         
-        if query_args.get('location_id'):
-            stock_query = stock_query.filter_by(location_id=query_args['location_id'])
-            surplus_query = surplus_query.filter_by(location_id=query_args['location_id'])
+        if query_args.get('as_of'):
+            payload = _inventory_as_of(query_args['as_of'], location_id, article_id)
+            if use_fast_path():
+                return fast_response(payload)
+            return payload
         
-        if query_args.get('article_id'):
-            stock_query = stock_query.filter_by(article_id=query_args['article_id'])
-            surplus_query = surplus_query.filter_by(article_id=query_args['article_id'])
+        # One balance row per location/article/batch, with codes joined in
+        stmt = select(
+            InventoryBalance.location_id,
+            Location.code.label('location_code'),
+            InventoryBalance.article_id,
+            Article.article_no,
+            InventoryBalance.batch_id,
+            Batch.batch_code,
+            InventoryBalance.stock_kg,
+            InventoryBalance.surplus_kg
+        ).select_from(InventoryBalance).outerjoin(
+            Location, InventoryBalance.location_id == Location.id
+        ).outerjoin(
+            Article, InventoryBalance.article_id == Article.id
+        ).outerjoin(
+            Batch, InventoryBalance.batch_id == Batch.id
+        )
+        if location_id:
+            stmt = stmt.where(InventoryBalance.location_id == location_id)
+        if article_id:
+            stmt = stmt.where(InventoryBalance.article_id == article_id)
         
-        stocks = stock_query.all()
-        surpluses = surplus_query.all()
+        items = [dict(row) for row in db.session.execute(stmt).mappings()]
         
-        # Build combined inventory map
-        inventory_map = {}
-        
-        for stock in stocks:
-            key = (stock.location_id, stock.article_id, stock.batch_id)
-            inventory_map[key] = {
-                'location_id': stock.location_id,
-                'location_code': stock.location.code if stock.location else None,
-                'article_id': stock.article_id,
-                'article_no': stock.article.article_no if stock.article else None,
-                'batch_id': stock.batch_id,
-                'batch_code': stock.batch.batch_code if stock.batch else None,
-                'stock_kg': float(stock.quantity_kg),
-                'surplus_kg': 0.0
-            }
-        
-        for surplus in surpluses:
-            key = (surplus.location_id, surplus.article_id, surplus.batch_id)
-            if key in inventory_map:
-                inventory_map[key]['surplus_kg'] = float(surplus.quantity_kg)
-            else:
-                inventory_map[key] = {
-                    'location_id': surplus.location_id,
-                    'location_code': surplus.location.code if surplus.location else None,
-                    'article_id': surplus.article_id,
-                    'article_no': surplus.article.article_no if surplus.article else None,
-                    'batch_id': surplus.batch_id,
-                    'batch_code': surplus.batch.batch_code if surplus.batch else None,
-                    'stock_kg': 0.0,
-                    'surplus_kg': float(surplus.quantity_kg)
-                }
-        
-        items = list(inventory_map.values())
-        
-        return {
+        payload = {
             'items': items,
             'total': len(items),
-            'generated_at': datetime.now(timezone.utc).isoformat()
+            'generated_at': datetime.now(timezone.utc)
         }
+        if use_fast_path():
+            return fast_response(payload)
+        return payload
+
+
+def transaction_report_query(query_args: dict):
+    """Newest 1000 transactions matching the report filters.
+
+    The occurred_at range lets PostgreSQL prune monthly partitions.
+    """
+    stmt = select(
+        Transaction.id,
+        Transaction.tx_type,
+        Transaction.occurred_at,
+        Transaction.location_id,
+        Transaction.article_id,
+        Transaction.batch_id,
+        Transaction.quantity_kg,
+        Transaction.user_id,
+        Transaction.source,
+        Transaction.client_event_id
+    )
+    
+    if query_args.get('location_id'):
+        stmt = stmt.where(Transaction.location_id == query_args['location_id'])
+    
+    if query_args.get('article_id'):
+        stmt = stmt.where(Transaction.article_id == query_args['article_id'])
+    
+    if query_args.get('from_date'):
+        stmt = stmt.where(Transaction.occurred_at >= query_args['from_date'])
+    
+    if query_args.get('to_date'):
+        stmt = stmt.where(Transaction.occurred_at <= query_args['to_date'])
+    
+    return stmt.order_by(Transaction.occurred_at.desc()).limit(1000)
 
 
 @blp.route('/transactions')
@@ -103,29 +173,114 @@ class TransactionReport(MethodView):
     @blp.alt_response(403, schema=ErrorResponseSchema, description='Admin role required')
     @jwt_required()
     @require_roles('ADMIN')
+    @replica_read
     def get(self, query_args):
         """Get transaction report.
         
         Returns transaction history for audit purposes.
         """
-        query = Transaction.query
+        stmt = transaction_report_query(query_args)
+        items = [dict(row) for row in db.session.execute(stmt).mappings()]
         
-        if query_args.get('location_id'):
-            query = query.filter_by(location_id=query_args['location_id'])
+        payload = {
+            'items': items,
+            'total': len(items),
+            'generated_at': datetime.now(timezone.utc)
+        }
+        if use_fast_path():
+            return fast_response(payload)
+        return payload
+
+
+@blp.route('/movements')
+class MovementReport(MethodView):
+    """Daily movement totals resource."""
+    
+    @blp.doc(security=[{'bearerAuth': []}])
+    @blp.arguments(MovementReportQuerySchema, location='query')
+    @blp.response(200, MovementReportSchema)
+    @blp.alt_response(401, schema=ErrorResponseSchema, description='Invalid token')
+    @blp.alt_response(403, schema=ErrorResponseSchema, description='Admin role required')
+    @jwt_required()
+    @require_roles('ADMIN')
+    @replica_read
+    def get(self, query_args):
+        """Get movement totals.
+        
+        Returns summed quantity and transaction count per location/article/tx_type
+        for the days from_date..to_date (UTC, inclusive; default the last 30 days),
+        read from the daily_article_movements aggregate. With by_day, one row per day.
+        """
+        to_date = query_args.get('to_date') or datetime.now(timezone.utc).date()
+        from_date = query_args.get('from_date') or to_date - timedelta(days=29)
         
-        if query_args.get('article_id'):
-            query = query.filter_by(article_id=query_args['article_id'])
+        items = [dict(row) for row in period_totals(
+            from_date, to_date,
+            location_id=query_args.get('location_id'),
+            article_id=query_args.get('article_id'),
+            by_day=query_args['by_day']
+        )]
+        article_nos = dict(db.session.execute(
+            select(Article.id, Article.article_no).where(Article.id.in_({i['article_id'] for i in items}))
+        ).all())
+        for item in items:
+            item['article_no'] = article_nos.get(item['article_id'])
         
-        if query_args.get('from_date'):
-            query = query.filter(Transaction.occurred_at >= query_args['from_date'])
+        payload = {
+            'items': items,
+            'total': len(items),
+            'generated_at': datetime.now(timezone.utc),
+            'from_date': from_date,
+            'to_date': to_date
+        }
+        if use_fast_path():
+            return fast_response(payload)
+        return payload
+
+
+@blp.route('/consumption-forecast')
+class ConsumptionForecast(MethodView):
+    """Consumption forecast resource."""
+    
+    @blp.doc(security=[{'bearerAuth': []}])
+    @blp.arguments(ConsumptionForecastQuerySchema, location='query')
+    @blp.response(200, ConsumptionForecastSchema)
+    @blp.alt_response(401, schema=ErrorResponseSchema, description='Invalid token')
+    @blp.alt_response(403, schema=ErrorResponseSchema, description='Admin role required')
+    @blp.alt_response(501, schema=ErrorResponseSchema, description='numpy not installed')
+    @jwt_required()
+    @require_roles('ADMIN')
+    @replica_read
+    def get(self, query_args):
+        """Get consumption rates and suggested reorder points.
         
-        if query_args.get('to_date'):
-            query = query.filter(Transaction.occurred_at <= query_args['to_date'])
+        For every active article: average, rolling and exponentially smoothed
+        daily consumption over window_days ending at to_date, days of cover for
+        the current stock + surplus, and a suggested reorder point for the given
+        lead time. Computed with NumPy from the daily movement totals.
+        """
+        if not forecast_service.is_available():
+            raise AppError('FORECAST_UNAVAILABLE', 'numpy is not installed')
         
-        transactions = query.order_by(Transaction.occurred_at.desc()).limit(1000).all()
+        to_date = query_args.get('to_date') or datetime.now(timezone.utc).date()
+        result = forecast_service.forecast(
+            to_date,
+            window_days=query_args['window_days'],
+            rolling_days=query_args['rolling_days'],
+            alpha=query_args['alpha'],
+            lead_time_days=query_args['lead_time_days'],
+            safety_factor=query_args['safety_factor'],
+            location_id=query_args.get('location_id')
+        )
         
-        return {
-            'items': [tx.to_dict() for tx in transactions],
-            'total': len(transactions),
-            'generated_at': datetime.now(timezone.utc).isoformat()
+        payload = {
+            'items': result['items'],
+            'total': len(result['items']),
+            'generated_at': datetime.now(timezone.utc),
+            'from_date': to_date - timedelta(days=query_args['window_days'] - 1),
+            'to_date': to_date,
+            'compute_ms': result['compute_ms']
         }
+        if use_fast_path():
+            return fast_response(payload)
+        return payload
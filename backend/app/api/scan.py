@@ -0,0 +1,43 @@
+"""Scan API endpoints."""
+from flask.views import MethodView
+from flask_smorest import Blueprint
+from flask_jwt_extended import jwt_required
+
+from ..schemas.scan import ScanResolveSchema, ScanResolveResponseSchema
+from ..schemas.common import ErrorResponseSchema
+from ..services import scan_service
+from ..db_routing import replica_read
+
+blp = Blueprint(
+    'scan',
+    __name__,
+    url_prefix='/api/scan',
+    description='Barcode scanning'
+)
+
+
+@blp.route('/resolve')
+class ScanResolve(MethodView):
+    """Batched scan resolution."""
+
+    @blp.doc(security=[{'bearerAuth': []}])
+    @blp.arguments(ScanResolveSchema)
+    @blp.response(200, ScanResolveResponseSchema)
+    @blp.alt_response(400, schema=ErrorResponseSchema, description='Validation error')
+    @blp.alt_response(401, schema=ErrorResponseSchema, description='Invalid token')
+    @jwt_required()
+    @replica_read
+    def post(self, scan_data):
+        """Resolve scanned codes to articles and batches.
+
+        Accepts every code of a scan session (article barcodes, article
+        numbers, aliases, batch codes) and resolves them together in at most
+        three queries. Results follow the scan order; a batch code right after
+        a scan of its article resolves to that article's batch.
+        """
+        items = scan_service.resolve_codes(scan_data['codes'])
+        return {
+            'items': items,
+            'total': len(items),
+            'resolved': sum(item['match'] is not None for item in items)
+        }
@@ -1,4 +1,25 @@
 """CLI package."""
-from .seed import register_cli
+from .seed import seed_command
+from .seed_scale import seed_scale_command
+from .partitions import partitions_cli
+from .snapshots import snapshot_stock_command
+from .archive import archive_drafts_command
+from .movements import rebuild_movements_command
+from .alerts import refresh_stock_totals_command
+from .search import rebuild_search_text_command
+from .scales import scale_gateway_command
 
 __all__ = ['register_cli']
+
+
+def register_cli(app):
+    """Register CLI commands with the Flask app."""
+    app.cli.add_command(seed_command)
+    app.cli.add_command(seed_scale_command)
+    app.cli.add_command(partitions_cli)
+    app.cli.add_command(snapshot_stock_command)
+    app.cli.add_command(archive_drafts_command)
+    app.cli.add_command(rebuild_movements_command)
+    app.cli.add_command(refresh_stock_totals_command)
+    app.cli.add_command(rebuild_search_text_command)
+    app.cli.add_command(scale_gateway_command)
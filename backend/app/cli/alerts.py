@@ -0,0 +1,20 @@
+"""CLI refresh-stock-totals command: rebuild per-article totals and alerts."""
+import click
+from flask.cli import with_appcontext
+
+from ..extensions import db
+from ..services.alert_service import refresh_all
+
+
+@click.command('refresh-stock-totals')
+@with_appcontext
+def refresh_stock_totals_command():
+    """Re-sum article_stock_totals from inventory_balances and re-check all thresholds.
+
+    Balance changes made through the services keep totals and alerts current
+    on their own; run this after bulk loads or direct SQL edits of
+    inventory_balances.
+    """
+    changed = refresh_all()
+    db.session.commit()
+    click.echo(f'Stock totals refreshed; {changed:,} alerts opened or resolved')
@@ -0,0 +1,42 @@
+"""CLI archive-drafts command: move finalized drafts to the archive tables."""
+from datetime import datetime, timedelta, timezone
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from ..services.archive_service import archive_finalized, count_archivable
+
+
+@click.command('archive-drafts')
+@click.option('--older-than-days', type=int,
+              help='Retention window in days (default: ARCHIVE_RETENTION_DAYS)')
+@click.option('--batch-size', type=int,
+              help='Groups per committed batch (default: ARCHIVE_BATCH_SIZE)')
+@click.option('--dry-run', is_flag=True, help='Only count what would be archived')
+@with_appcontext
+def archive_drafts_command(older_than_days, batch_size, dry_run):
+    """Move finalized draft groups, drafts and approval actions to *_archive.
+
+    A group qualifies once none of its drafts is pending and it was created
+    before the retention window. Schedule daily; each batch commits on its own,
+    so the command can be interrupted and re-run.
+
+    Example:
+      flask archive-drafts --older-than-days 90
+    """
+    config = current_app.config
+    if older_than_days is None:
+        older_than_days = config.get('ARCHIVE_RETENTION_DAYS', 90)
+    if batch_size is None:
+        batch_size = config.get('ARCHIVE_BATCH_SIZE', 1000)
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+
+    if dry_run:
+        counts = count_archivable(cutoff)
+        click.echo(f'Would archive (created before {cutoff:%Y-%m-%d %H:%M} UTC):')
+    else:
+        counts = archive_finalized(cutoff, batch_size=batch_size)
+        click.echo(f'Archived (created before {cutoff:%Y-%m-%d %H:%M} UTC):')
+    for table, rows in counts.items():
+        click.echo(f'  {table}: {rows:,} rows')
@@ -0,0 +1,34 @@
+"""CLI rebuild-movements command: recompute daily per-article movement totals."""
+from datetime import datetime, timedelta, timezone
+
+import click
+from flask.cli import with_appcontext
+
+from ..services.movement_service import rebuild_range
+
+
+@click.command('rebuild-movements')
+@click.option('--from', 'first_day', type=click.DateTime(formats=['%Y-%m-%d']),
+              help='First day to rebuild (default: --days before --to)')
+@click.option('--to', 'last_day', type=click.DateTime(formats=['%Y-%m-%d']),
+              help='Last day to rebuild (default: today, UTC)')
+@click.option('--days', default=30, show_default=True,
+              help='Days ending at --to to rebuild when --from is not given')
+@with_appcontext
+def rebuild_movements_command(first_day, last_day, days):
+    """Recompute daily_article_movements from transactions.
+
+    Approvals, receipts and adjustments keep the table current on their own;
+    use this after bulk loads or to verify/repair a range. Days are replaced
+    in committed chunks of a month.
+
+    Example (full year):
+      flask rebuild-movements --from 2026-01-01 --to 2026-12-31
+    """
+    last = last_day.date() if last_day else datetime.now(timezone.utc).date()
+    first = first_day.date() if first_day else last - timedelta(days=days - 1)
+    if first > last:
+        raise click.ClickException('--from must not be after --to')
+
+    for chunk_first, chunk_last, rows in rebuild_range(first, last):
+        click.echo(f'  {chunk_first} .. {chunk_last}: {rows:,} rows')
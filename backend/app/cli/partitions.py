@@ -0,0 +1,130 @@
+"""CLI `flask partitions ...`: maintain monthly transactions partitions.
+
+Run `flask partitions create` from cron (e.g. daily) so next months'
+partitions exist before the first row arrives.
+"""
+from datetime import date, datetime, timedelta, timezone
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import func, select
+
+from .. import partitioning
+from ..api.reports import transaction_report_query
+from ..api.transactions import transaction_filters, transaction_list_query
+from ..extensions import db
+from ..models import Transaction
+
+
+partitions_cli = AppGroup('partitions', help='Monthly partitions of the transactions table.')
+
+
+def _connection():
+    conn = db.session.connection()
+    if not partitioning.is_partitioned(conn):
+        raise click.ClickException(
+            'transactions is not partitioned (PostgreSQL with migration d4e7a1b9c2f0 required)'
+        )
+    return conn
+
+
+def _old_months(conn, older_than: int, month: str | None) -> list[date]:
+    if month:
+        return [partitioning.parse_month(month)]
+    cutoff = partitioning.add_months(partitioning.month_start(date.today()), -older_than)
+    return partitioning.months_before(conn, cutoff)
+
+
+@partitions_cli.command('list')
+def list_command():
+    """Show attached partitions with estimated rows and size."""
+    for p in partitioning.list_partitions(_connection()):
+        click.echo(f"{p['name']:<28} {p['estimated_rows']:>12,} rows "
+                   f"{p['total_bytes'] / 2**20:>10.1f} MiB  {p['bounds']}")
+
+
+@partitions_cli.command('create')
+@click.option('--months-ahead', default=3, show_default=True,
+              help='Create partitions up to this many months after the current one')
+@click.option('--from', 'from_month', help='First month to create (YYYY-MM, default current month)')
+def create_command(months_ahead, from_month):
+    """Pre-create missing monthly partitions."""
+    conn = _connection()
+    current = partitioning.month_start(date.today())
+    first = partitioning.parse_month(from_month) if from_month else current
+    created = partitioning.ensure_partitions(conn, first, partitioning.add_months(current, months_ahead))
+    db.session.commit()
+    click.echo(f"Created {len(created)} partition(s){': ' + ', '.join(created) if created else ''}")
+
+
+@partitions_cli.command('detach')
+@click.option('--older-than', default=24, show_default=True,
+              help='Detach months that ended at least this many months ago')
+@click.option('--month', help='Detach only this month (YYYY-MM)')
+@click.option('--concurrently', is_flag=True, help='DETACH ... CONCURRENTLY (PostgreSQL 14+)')
+def detach_command(older_than, month, concurrently):
+    """Detach old partitions; they remain as plain tables outside all queries."""
+    months = _old_months(_connection(), older_than, month)
+    db.session.commit()
+    if concurrently:
+        # CONCURRENTLY cannot run inside a transaction block
+        with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            names = [partitioning.detach_partition(conn, m, concurrently=True) for m in months]
+    else:
+        conn = db.session.connection()
+        names = [partitioning.detach_partition(conn, m) for m in months]
+        db.session.commit()
+    click.echo(f"Detached {len(names)} partition(s){': ' + ', '.join(names) if names else ''}")
+
+
+@partitions_cli.command('archive')
+@click.option('--older-than', default=24, show_default=True,
+              help='Archive months that ended at least this many months ago')
+@click.option('--month', help='Archive only this month (YYYY-MM, may already be detached)')
+@click.option('--output-dir', help='Where .csv.gz files go (default instance/archive)')
+def archive_command(older_than, month, output_dir):
+    """Export old partitions to gzipped CSV and drop them."""
+    conn = _connection()
+    directory = output_dir or f'{current_app.instance_path}/archive'
+    for m in _old_months(conn, older_than, month):
+        path, rows = partitioning.archive_partition(conn, m, directory)
+        # Commit per month so a failure later keeps earlier archives consistent
+        db.session.commit()
+        conn = db.session.connection()
+        click.echo(f'{partitioning.partition_name(m)}: {rows:,} rows -> {path}')
+
+
+@partitions_cli.command('check')
+@click.option('--days', default=7, show_default=True, help='Date range used for the list query')
+def check_command(days):
+    """EXPLAIN date-bounded list and report queries and verify partition pruning.
+
+    Exits with status 1 if a query scans partitions outside its date range.
+    """
+    conn = _connection()
+    now = datetime.now(timezone.utc)
+    since = now - timedelta(days=days)
+    filters = transaction_filters({'from_': since, 'to': now})
+    first_of_month = partitioning.month_start(now)
+    checks = [
+        ('GET /api/transactions (count)', select(func.count()).select_from(Transaction).where(*filters), since, now),
+        ('GET /api/transactions (page)', transaction_list_query(filters, 100, 0), since, now),
+        ('GET /api/reports/transactions',
+         transaction_report_query({'from_date': first_of_month, 'to_date': now.date()}),
+         datetime.combine(first_of_month, datetime.min.time(), tzinfo=timezone.utc), now),
+    ]
+
+    total = len(partitioning.list_partitions(conn))
+    failed = False
+    for name, stmt, lower, upper in checks:
+        scanned = partitioning.scanned_partitions(conn, stmt)
+        # A day of slack: date bounds are cast with the session time zone
+        allowed = set(partitioning.expected_partitions(lower - timedelta(days=1), upper + timedelta(days=1)))
+        allowed.add(partitioning.DEFAULT_PARTITION)
+        ok = set(scanned) <= allowed
+        failed |= not ok
+        click.echo(f"{'ok  ' if ok else 'FAIL'} {name}: {len(scanned)}/{total} partitions "
+                   f"({', '.join(scanned) or 'none'})")
+    if failed:
+        raise SystemExit(1)
@@ -0,0 +1,56 @@
+"""CLI scale-gateway command: read hardware scales and submit stable weighings as drafts."""
+import asyncio
+import json
+import signal
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from ..scale_gateway import ScaleConfig, ScaleGateway, app_submitter
+
+
+async def _serve(gateway: ScaleGateway):
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # pragma: no cover - Windows
+            pass
+    return await gateway.run(stop)
+
+
+@click.command('scale-gateway')
+@click.option('--config', 'config_path', required=True, type=click.Path(exists=True, dir_okay=False),
+              help='JSON file with a "scales" list; other top-level keys are defaults for every scale')
+@click.option('--batch-size', default=20, show_default=True, help='Most lines per draft group')
+@click.option('--flush-seconds', default=2.0, show_default=True,
+              help='Longest wait for more lines before a group is submitted')
+@with_appcontext
+def scale_gateway_command(config_path, batch_size, flush_seconds):
+    """Read scales until interrupted and submit stable weighings as draft groups.
+
+    Example config:
+      {"location_id": 13, "user_id": 1,
+       "scales": [{"name": "mix-1", "source": "tcp://10.0.0.21:4001", "article_id": 42},
+                  {"name": "mix-2", "source": "serial:///dev/ttyUSB0?baudrate=9600"},
+                  {"name": "sim", "source": "sim://?plateaus=0:2,1.25:3&repeat=true"}]}
+    """
+    with open(config_path) as f:
+        config = json.load(f)
+    defaults = {key: value for key, value in config.items() if key != 'scales'}
+    try:
+        scales = [ScaleConfig.from_dict(scale, defaults) for scale in config.get('scales', [])]
+    except TypeError as e:
+        raise click.ClickException(f'Invalid scale config: {e}')
+    if not scales:
+        raise click.ClickException('No scales configured')
+
+    gateway = ScaleGateway(
+        scales, app_submitter(current_app._get_current_object()),
+        batch_size=batch_size, flush_seconds=flush_seconds, echo=click.echo
+    )
+    click.echo(f'Reading {len(scales)} scales (run {gateway.run_id}); Ctrl+C to stop')
+    stats = asyncio.run(_serve(gateway))
+    click.echo(', '.join(f'{name}: {count:,}' for name, count in sorted(stats.items())) or 'No readings')
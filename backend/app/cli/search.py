@@ -0,0 +1,20 @@
+"""CLI rebuild-search-text command: recompute articles.search_text."""
+import click
+from flask.cli import with_appcontext
+
+from ..extensions import db
+from ..services.search_service import rebuild_all
+
+
+@click.command('rebuild-search-text')
+@with_appcontext
+def rebuild_search_text_command():
+    """Recompute the search words of every article from its fields and aliases.
+
+    Article and alias changes made through the ORM keep search_text current
+    on their own; run this after bulk loads or direct SQL edits of articles
+    or article_aliases.
+    """
+    updated = rebuild_all()
+    db.session.commit()
+    click.echo(f'Search text rebuilt for {updated:,} articles')
@@ -4,7 +4,7 @@ from decimal import Decimal
 from flask.cli import with_appcontext
 
 from ..extensions import db
-from ..models import User, Location, Article, Batch, Stock, Surplus
+from ..models import User, Location, Article, Batch, InventoryBalance
 
 
 @click.command('seed')
@@ -113,53 +113,40 @@ def seed_command(demo):
             db.session.flush()
             click.echo('  Created batch: 292456953 (Akzo format)')
         
-        # Demo stock for batch 1
-        stock1 = Stock.query.filter_by(
+        # Demo stock and surplus for batch 1
+        balance1 = InventoryBalance.query.filter_by(
             location_id=location.id,
             article_id=art1.id,
             batch_id=batch1.id
         ).first()
-        if not stock1:
-            stock1 = Stock(
+        if not balance1:
+            balance1 = InventoryBalance(
                 location_id=location.id,
                 article_id=art1.id,
                 batch_id=batch1.id,
-                quantity_kg=Decimal('25.00')
+                stock_kg=Decimal('25.00'),
+                surplus_kg=Decimal('3.50'),
+                surplus_reason='Initial surplus from previous batch'
             )
-            db.session.add(stock1)
+            db.session.add(balance1)
             click.echo('  Created stock: 25.00kg for MNK-WHITE-5L batch 0044')
-        
-        # Demo surplus for batch 1
-        surplus1 = Surplus.query.filter_by(
-            location_id=location.id,
-            article_id=art1.id,
-            batch_id=batch1.id
-        ).first()
-        if not surplus1:
-            surplus1 = Surplus(
-                location_id=location.id,
-                article_id=art1.id,
-                batch_id=batch1.id,
-                quantity_kg=Decimal('3.50'),
-                reason='Initial surplus from previous batch'
-            )
-            db.session.add(surplus1)
             click.echo('  Created surplus: 3.50kg for MNK-WHITE-5L batch 0044')
         
         # Demo stock for batch 2
-        stock2 = Stock.query.filter_by(
+        balance2 = InventoryBalance.query.filter_by(
             location_id=location.id,
             article_id=art2.id,
             batch_id=batch2.id
         ).first()
-        if not stock2:
-            stock2 = Stock(
+        if not balance2:
+            balance2 = InventoryBalance(
                 location_id=location.id,
                 article_id=art2.id,
                 batch_id=batch2.id,
-                quantity_kg=Decimal('50.00')
+                stock_kg=Decimal('50.00'),
+                surplus_kg=Decimal('0')
             )
-            db.session.add(stock2)
+            db.session.add(balance2)
             click.echo('  Created stock: 50.00kg for AKZO-BLUE-10L batch 292456953')
     
     db.session.commit()
@@ -172,8 +159,3 @@ def seed_command(demo):
     click.echo('=' * 50)
     click.echo('')
     click.echo('Seed completed!')
-
-
-def register_cli(app):
-    """Register CLI commands with the Flask app."""
-    app.cli.add_command(seed_command)
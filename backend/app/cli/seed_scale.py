@@ -0,0 +1,462 @@
+"""CLI seed-scale command: high-volume synthetic data for performance work.
+
+Simulates day-by-day warehouse activity with the same row shapes the services
+write: receipts, weigh-in draft groups with surplus-first approval,
+inventory counts (surplus additions, resets, shortage drafts) and rejected or
+still-pending groups. Final inventory balances equal the sum of the
+generated transactions.
+
+Rows are written with bulk inserts - COPY on PostgreSQL, executemany
+elsewhere - and the output is fully determined by --seed.
+"""
+import csv
+import io
+import json
+import random
+import time
+from collections import Counter
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from decimal import Decimal
+
+import click
+from flask.cli import with_appcontext
+
+from ..extensions import db
+from ..models import (
+    User, Location, Article, Batch, InventoryBalance, Transaction,
+    DraftGroup, WeighInDraft, ApprovalAction
+)
+from ..partitioning import ensure_partitions, is_partitioned, month_start
+from ..services.alert_service import refresh_all
+from ..services.movement_service import rebuild_range
+from ..services.search_service import rebuild_all as rebuild_search_text
+
+
+LOCATION_ID = 13
+LOCATION_CODE = '13'
+CHUNK_SIZE = 20_000
+
+# Insert order respects foreign keys
+TABLE_ORDER = (
+    Article.__table__,
+    Batch.__table__,
+    DraftGroup.__table__,
+    WeighInDraft.__table__,
+    ApprovalAction.__table__,
+    Transaction.__table__,
+    InventoryBalance.__table__,
+)
+
+# Tables that get explicit ids (their sequences are fixed up on PostgreSQL)
+EXPLICIT_ID_TABLES = (Article.__table__, Batch.__table__, DraftGroup.__table__, WeighInDraft.__table__)
+
+
+def _kg(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
+
+
+def _copy_value(value):
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(',', ':'))
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class BulkWriter:
+    """Buffered bulk inserts: COPY on PostgreSQL, executemany elsewhere.
+
+    Buffers are flushed together in TABLE_ORDER so children never reach the
+    database before their parents.
+    """
+
+    def __init__(self, session, chunk_size: int = CHUNK_SIZE):
+        self.conn = session.connection()
+        self.use_copy = self.conn.dialect.name == 'postgresql'
+        self.chunk_size = chunk_size
+        self.buffers = {table.name: [] for table in TABLE_ORDER}
+        self.counts = Counter()
+        self._pending = 0
+
+    def add(self, table, row: dict) -> None:
+        self.buffers[table.name].append(row)
+        self._pending += 1
+        if self._pending >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        for table in TABLE_ORDER:
+            rows = self.buffers[table.name]
+            if not rows:
+                continue
+            if self.use_copy:
+                self._copy(table, rows)
+            else:
+                self.conn.execute(table.insert(), rows)
+            self.counts[table.name] += len(rows)
+            self.buffers[table.name] = []
+        self._pending = 0
+
+    def _copy(self, table, rows) -> None:
+        columns = list(rows[0].keys())
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for row in rows:
+            writer.writerow([_copy_value(row[c]) for c in columns])
+        buf.seek(0)
+
+        column_list = ', '.join(columns)
+        with self.conn.connection.cursor() as cur:
+            cur.copy_expert(f'COPY {table.name} ({column_list}) FROM STDIN WITH (FORMAT csv)', buf)
+
+    def fix_sequences(self) -> None:
+        """Move serial sequences past the explicit ids written by COPY."""
+        if not self.use_copy:
+            return
+        for table in EXPLICIT_ID_TABLES:
+            self.conn.exec_driver_sql(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {table.name}), 1))"
+            )
+
+
+def _next_id(model) -> int:
+    return (db.session.query(db.func.max(model.id)).scalar() or 0) + 1
+
+
+def _get_or_create_user(username: str, role: str) -> User:
+    user = User.query.filter_by(role=role, is_active=True).order_by(User.id).first()
+    if not user:
+        user = User(username=username, role=role, is_active=True)
+        db.session.add(user)
+        db.session.flush()
+    return user
+
+
+def generate(articles: int, batches_per_article: int, days: int, tx_per_day: int,
+             seed: int = 42, echo=None) -> dict:
+    """Generate a synthetic history ending today. Caller commits.
+
+    Args:
+        articles: Number of articles (every 10th is a consumable with one NA batch)
+        batches_per_article: Batches per paint article
+        days: Days of history
+        tx_per_day: Approximate transactions per day
+        seed: Random seed; same inputs give the same rows
+        echo: Optional progress callback taking a string
+
+    Returns:
+        dict with location_id, admin_user_id and row counts per table
+    """
+    rng = random.Random(seed)
+    echo = echo or (lambda message: None)
+
+    # `flask seed` may already have created location "13" under another id
+    location = Location.query.filter_by(code=LOCATION_CODE).first()
+    if not location:
+        location = Location(id=LOCATION_ID, code=LOCATION_CODE, name='Main Warehouse')
+        db.session.add(location)
+        db.session.flush()
+    location_id = location.id
+    admin = _get_or_create_user('seed-admin', 'ADMIN')
+    operator = _get_or_create_user('seed-operator', 'OPERATOR')
+
+    writer = BulkWriter(db.session)
+    today = date.today()
+    first_day = today - timedelta(days=days - 1)
+    history_start = datetime.combine(first_day, dt_time(6, 0), tzinfo=timezone.utc)
+    if is_partitioned(db.session.connection()):
+        # Historical months would otherwise all land in the default partition
+        ensure_partitions(db.session.connection(), first_day, month_start(today))
+
+    # --- Articles and batches ---
+    article_id = _next_id(Article)
+    batch_id = _next_id(Batch)
+    keys = []
+    for i in range(articles):
+        is_paint = i % 10 != 0
+        writer.add(Article.__table__, {
+            'id': article_id,
+            'article_no': f'ART-{article_id:06d}',
+            'description': f'{"Paint" if is_paint else "Consumable"} article {article_id}',
+            'article_group': rng.choice(['PRIMER', 'TOPCOAT', 'HARDENER', 'THINNER']) if is_paint else 'CONSUMABLE',
+            'base_uom': 'kg',
+            'uom': 'KG',
+            'manufacturer': rng.choice(['Mankiewicz', 'Akzo Nobel']) if is_paint else None,
+            'reorder_threshold': _kg(rng.randint(500, 5_000)),
+            'is_paint': is_paint,
+            'is_active': True,
+            'created_at': history_start,
+        })
+        for j in range(batches_per_article if is_paint else 1):
+            received = first_day + timedelta(days=rng.randint(0, max(days // 4, 0)))
+            writer.add(Batch.__table__, {
+                'id': batch_id,
+                'article_id': article_id,
+                'batch_code': str(1000 + j) if is_paint else 'NA',
+                'received_date': received,
+                'expiry_date': received + timedelta(days=rng.randint(90, 900)) if is_paint else date(2099, 12, 31),
+                'note': None if is_paint else 'System Batch (Consumable)',
+                'is_active': True,
+                'created_at': history_start,
+            })
+            keys.append((article_id, batch_id))
+            batch_id += 1
+        article_id += 1
+
+    # Running balances in hundredths of a kg
+    stock = {key: 0 for key in keys}
+    surplus = {}
+
+    group_id = _next_id(DraftGroup)
+    draft_id = _next_id(WeighInDraft)
+
+    def tx(occurred_at, tx_type, key, cents, source, **extra):
+        meta = extra.pop('meta', None) or {}
+        writer.add(Transaction.__table__, {
+            'tx_type': tx_type,
+            'occurred_at': occurred_at,
+            'location_id': location_id,
+            'article_id': key[0],
+            'batch_id': key[1],
+            'quantity_kg': _kg(cents),
+            'user_id': extra.pop('user_id', admin.id),
+            'source': source,
+            'client_event_id': extra.pop('client_event_id', None),
+            'order_number': extra.pop('order_number', None),
+            'draft_id': meta.get('draft_id'),
+            'reason': meta.get('reason'),
+            'meta': meta or None,
+        })
+
+    def draft_row(occurred_at, key, cents, status, draft_type, source, group=None, note=None,
+                  client_event_id=None):
+        nonlocal draft_id
+        row = {
+            'id': draft_id,
+            'location_id': location_id,
+            'article_id': key[0],
+            'batch_id': key[1],
+            'quantity_kg': _kg(cents),
+            'status': status,
+            'created_by_user_id': operator.id,
+            'source': source,
+            'client_event_id': client_event_id or f'seed-{seed}-{draft_id}',
+            'note': note,
+            'draft_type': draft_type,
+            'draft_group_id': group,
+            'created_at': occurred_at,
+        }
+        writer.add(WeighInDraft.__table__, row)
+        draft_id += 1
+        return row
+
+    def approval(occurred_at, draft, action, new_value):
+        writer.add(ApprovalAction.__table__, {
+            'draft_id': draft['id'],
+            'action': action,
+            'actor_user_id': admin.id,
+            'old_value': {'status': WeighInDraft.STATUS_DRAFT},
+            'new_value': new_value,
+            'note': None,
+            'created_at': occurred_at,
+        })
+
+    def receipt(occurred_at, key, cents):
+        stock[key] += cents
+        tx(occurred_at, Transaction.TX_STOCK_RECEIPT, key, cents, 'receiving',
+           order_number=f'PO-{rng.randint(10000, 99999)}',
+           meta={'note': None, 'received_date': occurred_at.date().isoformat(),
+                 'batch_created': False, 'is_consumable': False})
+        return 1
+
+    def weigh_in_group(occurred_at, day_index, day_groups):
+        nonlocal group_id
+        last_day = day_index == days - 1
+        roll = rng.random()
+        if last_day and roll < 0.3:
+            status = DraftGroup.STATUS_DRAFT
+        elif roll < 0.03:
+            status = DraftGroup.STATUS_REJECTED
+        else:
+            status = DraftGroup.STATUS_APPROVED
+
+        writer.add(DraftGroup.__table__, {
+            'id': group_id,
+            'name': f'OperatorDraft_{day_groups:03d}-{occurred_at.date().isoformat()}',
+            'status': status,
+            'source': 'ui_operator',
+            'location_id': location_id,
+            'created_by_user_id': operator.id,
+            'created_at': occurred_at,
+        })
+
+        emitted = 0
+        for _ in range(rng.choice((1, 1, 1, 2, 2, 3, 5))):
+            key = rng.choice(keys)
+            available = stock[key] + surplus.get(key, 0)
+            cents = min(rng.randint(50, 2_000), available)
+            if cents <= 0:
+                emitted += receipt(occurred_at, key, rng.randint(20_000, 200_000))
+                continue
+
+            draft = draft_row(occurred_at, key, cents, status,
+                              WeighInDraft.DRAFT_TYPE_WEIGH_IN, 'ui_operator', group=group_id)
+            if status == DraftGroup.STATUS_REJECTED:
+                approval(occurred_at, draft, 'REJECT', {'status': WeighInDraft.STATUS_REJECTED})
+                continue
+            if status != DraftGroup.STATUS_APPROVED:
+                continue
+
+            # Surplus-first consumption
+            use_surplus = min(surplus.get(key, 0), cents)
+            remaining = cents - use_surplus
+            surplus[key] = surplus.get(key, 0) - use_surplus
+            stock[key] -= remaining
+
+            meta = {'draft_id': draft['id']}
+            tx(occurred_at, Transaction.TX_WEIGH_IN, key, cents, 'approval',
+               client_event_id=draft['client_event_id'], meta=meta)
+            emitted += 1
+            if use_surplus:
+                tx(occurred_at, Transaction.TX_SURPLUS_CONSUMED, key, -use_surplus, 'approval',
+                   client_event_id=draft['client_event_id'], meta=meta)
+                emitted += 1
+            if remaining:
+                tx(occurred_at, Transaction.TX_STOCK_CONSUMED, key, -remaining, 'approval',
+                   client_event_id=draft['client_event_id'], meta=meta)
+                emitted += 1
+            approval(occurred_at, draft, 'APPROVE', {
+                'status': WeighInDraft.STATUS_APPROVED,
+                'consumed_surplus_kg': float(_kg(use_surplus)),
+                'consumed_stock_kg': float(_kg(remaining)),
+            })
+
+        group_id += 1
+        return emitted
+
+    def inventory_count(occurred_at):
+        key = rng.choice(keys)
+        event_id = f'inventory-count-seed-{seed}-{draft_id}-{key[1]}'
+        current_surplus = surplus.get(key, 0)
+        current_total = stock[key] + current_surplus
+
+        if rng.random() < 0.4:
+            delta = rng.randint(10, 500)
+            surplus[key] = current_surplus + delta
+            tx(occurred_at, Transaction.TX_INVENTORY_ADJUSTMENT, key, delta, 'inventory_count',
+               client_event_id=event_id,
+               meta={'reason': 'inventory_count_over', 'counted_total': float(_kg(current_total + delta)),
+                     'previous_total': float(_kg(current_total)), 'surplus_added': float(_kg(delta)),
+                     'note': None})
+            return 1
+
+        emitted = 0
+        if current_surplus > 0:
+            surplus[key] = 0
+            tx(occurred_at, Transaction.TX_INVENTORY_ADJUSTMENT, key, -current_surplus, 'inventory_count',
+               client_event_id=f'{event_id}-surplus-reset',
+               meta={'reason': 'inventory_count_surplus_reset',
+                     'surplus_before': float(_kg(current_surplus)), 'note': None})
+            emitted += 1
+
+        shortage = min(rng.randint(10, 300), stock[key])
+        if shortage <= 0:
+            return emitted
+        approved = rng.random() < 0.9
+        draft = draft_row(
+            occurred_at, key, shortage,
+            WeighInDraft.STATUS_APPROVED if approved else WeighInDraft.STATUS_DRAFT,
+            WeighInDraft.DRAFT_TYPE_INVENTORY_SHORTAGE, 'inventory_count',
+            note='Inventory count shortage', client_event_id=f'{event_id}-shortage'
+        )
+        if approved:
+            stock[key] -= shortage
+            tx(occurred_at, Transaction.TX_INVENTORY_ADJUSTMENT, key, -shortage, 'shortage_approval',
+               client_event_id=draft['client_event_id'],
+               meta={'draft_id': draft['id'], 'reason': 'inventory_shortage_approved'})
+            approval(occurred_at, draft, 'APPROVE', {
+                'status': WeighInDraft.STATUS_APPROVED,
+                'consumed_stock_kg': float(_kg(shortage)),
+                'consumed_surplus_kg': 0.0,
+            })
+            emitted += 1
+        return emitted
+
+    # --- Day-by-day activity ---
+    started = time.perf_counter()
+    for day_index in range(days):
+        day_start = history_start + timedelta(days=day_index)
+        # Working day 06:00-22:00, events in chronological order
+        offsets = iter(sorted(rng.randint(0, 16 * 3600) for _ in range(tx_per_day * 2)))
+
+        if day_index == 0:
+            for key in keys:
+                receipt(day_start, key, rng.randint(50_000, 500_000))
+
+        emitted, day_groups = 0, 0
+        while emitted < tx_per_day:
+            occurred_at = day_start + timedelta(seconds=next(offsets, 16 * 3600))
+            roll = rng.random()
+            if roll < 0.08:
+                emitted += receipt(occurred_at, rng.choice(keys), rng.randint(20_000, 200_000))
+            elif roll < 0.12:
+                emitted += inventory_count(occurred_at)
+            else:
+                day_groups += 1
+                emitted += weigh_in_group(occurred_at, day_index, day_groups) or 1
+
+        if (day_index + 1) % 10 == 0 or day_index == days - 1:
+            echo(f'  day {day_index + 1}/{days} ({time.perf_counter() - started:.0f}s)')
+
+    # --- Final balances ---
+    now = datetime.now(timezone.utc)
+    for key in sorted(stock.keys() | surplus.keys()):
+        writer.add(InventoryBalance.__table__, {
+            'location_id': location_id, 'article_id': key[0], 'batch_id': key[1],
+            'stock_kg': _kg(stock.get(key, 0)), 'surplus_kg': _kg(surplus.get(key, 0)),
+            'surplus_reason': None, 'stock_updated_at': now, 'surplus_updated_at': now,
+            'created_at': now,
+        })
+
+    writer.flush()
+    writer.fix_sequences()
+    # Bulk rows bypass the ORM hooks that maintain daily totals, stock totals, alerts and search text
+    movements = sum(rows for _, _, rows in rebuild_range(first_day, today, commit=False))
+    writer.counts['daily_article_movements'] += movements
+    writer.counts['alerts'] += refresh_all()
+    rebuild_search_text()
+    return {'location_id': location_id, 'admin_user_id': admin.id, 'counts': dict(writer.counts)}
+
+
+@click.command('seed-scale')
+@click.option('--articles', default=500, show_default=True, help='Number of articles')
+@click.option('--batches-per-article', default=5, show_default=True, help='Batches per paint article')
+@click.option('--days', default=90, show_default=True, help='Days of history ending today')
+@click.option('--tx-per-day', default=1000, show_default=True, help='Approximate transactions per day')
+@click.option('--seed', default=42, show_default=True, help='Random seed (same seed = same data)')
+@with_appcontext
+def seed_scale_command(articles, batches_per_article, days, tx_per_day, seed):
+    """Generate a large synthetic history for performance work.
+
+    Creates articles, batches, receipts, weigh-in draft groups with
+    surplus-first approvals, inventory counts and the final
+    inventory_balances rows. Uses COPY on PostgreSQL.
+
+    Example (about 9M transactions):
+      flask seed-scale --articles 5000 --batches-per-article 20 --days 365 --tx-per-day 25000
+    """
+    click.echo(f'Generating {days} days x ~{tx_per_day} tx/day '
+               f'for {articles} articles (seed {seed})...')
+    started = time.perf_counter()
+
+    result = generate(articles, batches_per_article, days, tx_per_day, seed=seed, echo=click.echo)
+    db.session.commit()
+
+    for table, count in sorted(result['counts'].items()):
+        click.echo(f'  {table}: {count:,} rows')
+    click.echo(f'Done in {time.perf_counter() - started:.1f}s')
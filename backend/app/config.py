@@ -19,6 +19,16 @@ class Config:
         'pool_pre_ping': True,
     }
     
+    # Read replica (optional): read-only report/listing endpoints use this bind
+    REPLICA_DATABASE_URL = os.getenv('REPLICA_DATABASE_URL', '')
+    SQLALCHEMY_BINDS = {'replica': REPLICA_DATABASE_URL} if REPLICA_DATABASE_URL else {}
+    REPLICA_MAX_LAG_SECONDS = float(os.getenv('REPLICA_MAX_LAG_SECONDS', 5))
+    REPLICA_CHECK_INTERVAL_SECONDS = float(os.getenv('REPLICA_CHECK_INTERVAL_SECONDS', 2))
+    
+    # Health checks: DB probe cache and pool usage at which /health/ready fails
+    HEALTH_CHECK_INTERVAL_SECONDS = float(os.getenv('HEALTH_CHECK_INTERVAL_SECONDS', 2))
+    HEALTH_POOL_SATURATION_RATIO = float(os.getenv('HEALTH_POOL_SATURATION_RATIO', 1.0))
+    
     # Server
     APP_HOST = os.getenv('APP_HOST', '127.0.0.1')
     APP_PORT = int(os.getenv('APP_PORT', 5001))
@@ -33,6 +43,9 @@ class Config:
     JWT_HEADER_NAME = 'Authorization'
     JWT_HEADER_TYPE = 'Bearer'
     
+    # Rate limiting (Flask-Limiter); disable only for load tests
+    RATELIMIT_ENABLED = os.getenv('RATELIMIT_ENABLED', 'true').lower() == 'true'
+    
     # Legacy API Token (deprecated, for backward compatibility only)
     API_TOKEN = os.getenv('API_TOKEN', '')
     ALLOW_NO_AUTH_IN_DEV = os.getenv('ALLOW_NO_AUTH_IN_DEV', 'false').lower() == 'true'
@@ -66,6 +79,48 @@ class Config:
         }
     }
     
+    # Response serialization: encode large list responses directly
+    # (orjson/msgpack) instead of dumping through Marshmallow schemas
+    FAST_SERIALIZATION = os.getenv('FAST_SERIALIZATION', 'false').lower() == 'true'
+    
+    # Change feed (SSE): 'memory' (single process) or 'postgres' (LISTEN/NOTIFY
+    # across workers); empty = postgres on PostgreSQL, memory otherwise
+    EVENTS_BACKEND = os.getenv('EVENTS_BACKEND', '')
+    EVENTS_PG_CHANNEL = os.getenv('EVENTS_PG_CHANNEL', 'warehouse_events')
+    EVENTS_BUFFER_SIZE = int(os.getenv('EVENTS_BUFFER_SIZE', 1000))
+    EVENTS_HEARTBEAT_SECONDS = float(os.getenv('EVENTS_HEARTBEAT_SECONDS', 15))
+    EVENTS_STREAM_MAX_SECONDS = float(os.getenv('EVENTS_STREAM_MAX_SECONDS', 300))
+    
+    # SQL query stats per request (Server-Timing header + structured log line)
+    QUERY_STATS_ENABLED = os.getenv('QUERY_STATS_ENABLED', 'true').lower() == 'true'
+    QUERY_N_PLUS_ONE_THRESHOLD = int(os.getenv('QUERY_N_PLUS_ONE_THRESHOLD', 5))
+    # Max queries per request (0 = no budget); per-endpoint overrides in QUERY_BUDGETS
+    QUERY_BUDGET_DEFAULT = int(os.getenv('QUERY_BUDGET_DEFAULT', 0))
+    QUERY_BUDGETS = {}
+    QUERY_BUDGET_ENFORCE = os.getenv('QUERY_BUDGET_ENFORCE', 'false').lower() == 'true'
+    
+    # Write transactions are retried on deadlock / serialization failure /
+    # lock timeout with jittered exponential backoff
+    DB_RETRY_MAX_ATTEMPTS = int(os.getenv('DB_RETRY_MAX_ATTEMPTS', 4))
+    DB_RETRY_BASE_DELAY_MS = float(os.getenv('DB_RETRY_BASE_DELAY_MS', 25))
+    DB_RETRY_MAX_DELAY_MS = float(os.getenv('DB_RETRY_MAX_DELAY_MS', 1000))
+    
+    # Inventory balance row locks (services/lock_manager.py): fail fast with NOWAIT,
+    # or cap the wait with a PostgreSQL lock_timeout (0 = wait indefinitely)
+    INVENTORY_LOCK_NOWAIT = os.getenv('INVENTORY_LOCK_NOWAIT', 'false').lower() == 'true'
+    INVENTORY_LOCK_TIMEOUT_MS = int(os.getenv('INVENTORY_LOCK_TIMEOUT_MS', 0))
+    
+    # `flask archive-drafts`: finalized groups older than this move to *_archive
+    ARCHIVE_RETENTION_DAYS = int(os.getenv('ARCHIVE_RETENTION_DAYS', 90))
+    ARCHIVE_BATCH_SIZE = int(os.getenv('ARCHIVE_BATCH_SIZE', 1000))
+    
+    # Per-request sampling profiler (ADMIN sends X-Profile: 1 or ?profile=1);
+    # PROFILE_DIR empty = <instance>/profiles
+    PROFILER_ENABLED = os.getenv('PROFILER_ENABLED', 'true').lower() == 'true'
+    PROFILER_INTERVAL_MS = float(os.getenv('PROFILER_INTERVAL_MS', 2))
+    PROFILE_DIR = os.getenv('PROFILE_DIR', '')
+    PROFILE_MAX_FILES = int(os.getenv('PROFILE_MAX_FILES', 200))
+    
     # Business rules
     QUANTITY_MIN = 0.01
     QUANTITY_MAX = 9999.99
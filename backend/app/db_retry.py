@@ -0,0 +1,109 @@
+"""Retry write transactions that lost a lock race.
+
+Approvals, receiving and inventory counts lock several inventory balance rows.
+Two requests locking overlapping rows in a different order can deadlock, and
+a SELECT ... FOR UPDATE NOWAIT / lock_timeout fails fast under contention.
+PostgreSQL aborts one side; that request is safe to replay from scratch.
+
+run_in_transaction() runs the service call plus commit, rolls back on a
+retryable error, sleeps with full-jitter exponential backoff and tries again,
+up to DB_RETRY_MAX_ATTEMPTS. When attempts run out the client gets a 409
+TRANSACTION_CONFLICT instead of a 500.
+"""
+import random
+import time
+from typing import Callable, Optional, TypeVar
+
+from flask import current_app
+from sqlalchemy.exc import DBAPIError
+
+from .error_handling import AppError
+from .extensions import db
+from .metrics import record_conflict, record_transaction_attempts
+
+
+T = TypeVar('T')
+
+# SQLSTATE -> reason label
+RETRYABLE_PGCODES = {
+    '40P01': 'deadlock',
+    '40001': 'serialization_failure',
+    '55P03': 'lock_timeout',
+}
+
+
+class TransactionConflictError(AppError):
+    """Raised when a transaction still conflicts after all retry attempts."""
+
+    http_status = 409
+
+    def __init__(self, operation: str, attempts: int, reason: str):
+        super().__init__(
+            code='TRANSACTION_CONFLICT',
+            message='The operation conflicted with concurrent changes, please retry',
+            details={'operation': operation, 'attempts': attempts, 'reason': reason}
+        )
+
+
+def retry_reason(error: Exception) -> Optional[str]:
+    """Return the reason label if error is a retryable lock conflict, else None."""
+    if not isinstance(error, DBAPIError):
+        return None
+    orig = error.orig
+    pgcode = getattr(orig, 'pgcode', None) or getattr(orig, 'sqlstate', None)
+    if pgcode in RETRYABLE_PGCODES:
+        return RETRYABLE_PGCODES[pgcode]
+    # SQLite writer contention (busy timeout expired)
+    if 'database is locked' in str(orig).lower():
+        return 'lock_timeout'
+    return None
+
+
+def backoff_delay(attempt: int, base_ms: float, max_ms: float) -> float:
+    """Full-jitter backoff in seconds for the given (1-based) failed attempt."""
+    ceiling = min(max_ms, base_ms * (2 ** (attempt - 1)))
+    return random.uniform(0, ceiling) / 1000
+
+
+def run_in_transaction(operation: str, fn: Callable[[], T]) -> T:
+    """Run fn() and commit, retrying on deadlock/serialization/lock timeout.
+
+    fn must do all of its reads inside the call: after a rollback the session
+    is expired and fn runs again from the start. AppErrors raised by fn are
+    not retried.
+
+    Usage:
+        result = run_in_transaction('approve_draft', lambda: approve_draft(
+            draft_id=draft_id, actor_user_id=actor_user_id, note=note
+        ))
+
+    Raises:
+        TransactionConflictError: still conflicting after DB_RETRY_MAX_ATTEMPTS
+    """
+    config = current_app.config
+    max_attempts = max(1, config.get('DB_RETRY_MAX_ATTEMPTS', 4))
+    base_ms = config.get('DB_RETRY_BASE_DELAY_MS', 25)
+    max_ms = config.get('DB_RETRY_MAX_DELAY_MS', 1000)
+
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            result = fn()
+            db.session.commit()
+        except DBAPIError as error:
+            db.session.rollback()
+            reason = retry_reason(error)
+            if reason is None:
+                raise
+            record_conflict(operation, reason)
+            if attempt >= max_attempts:
+                record_transaction_attempts(operation, attempt, 'conflict')
+                current_app.logger.warning(
+                    f'{operation}: giving up after {attempt} attempts ({reason})'
+                )
+                raise TransactionConflictError(operation, attempt, reason) from error
+            time.sleep(backoff_delay(attempt, base_ms, max_ms))
+        else:
+            record_transaction_attempts(operation, attempt, 'committed')
+            return result
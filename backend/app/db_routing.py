@@ -0,0 +1,136 @@
+"""Read-replica routing for heavy read-only endpoints.
+
+When SQLALCHEMY_BINDS contains a 'replica' entry (REPLICA_DATABASE_URL),
+views decorated with @replica_read send their SELECTs to the replica engine.
+Everything else stays on the primary:
+- undecorated views (all writes, approvals, receiving)
+- flushes and SELECT ... FOR UPDATE, even inside decorated views
+
+A lag guard probes the replica (at most every REPLICA_CHECK_INTERVAL_SECONDS)
+and falls back to the primary when the replica is unreachable or more than
+REPLICA_MAX_LAG_SECONDS behind.
+"""
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, g, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import text
+
+
+REPLICA_BIND_KEY = 'replica'
+
+ROUTE_PRIMARY = 'primary'
+ROUTE_REPLICA = 'replica'
+
+# PostgreSQL standby lag: 0 when all received WAL is replayed, otherwise the
+# age of the last replayed transaction. NULL-safe on a primary (returns 0).
+_PG_LAG_SQL = text(
+    "SELECT CASE "
+    "WHEN pg_last_wal_receive_lsn() IS NULL "
+    "  OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+# Per-engine probe results: engine -> {'checked_at', 'healthy', 'lag_seconds'}
+_replica_state = {}
+_state_lock = threading.Lock()
+
+
+def replica_read(f):
+    """Decorator: route the view's read queries to the replica (if configured).
+
+    Usage:
+        @jwt_required()
+        @require_roles('ADMIN')
+        @replica_read
+        def get(self):
+            ...
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        g.db_route_requested = True
+        try:
+            return f(*args, **kwargs)
+        finally:
+            g.db_route_requested = False
+    return decorated_function
+
+
+def _replica_requested() -> bool:
+    return has_request_context() and g.get('db_route_requested', False)
+
+
+def _probe_replica(engine) -> dict:
+    """Check replica reachability and replication lag."""
+    try:
+        with engine.connect() as conn:
+            if engine.dialect.name == 'postgresql':
+                lag = float(conn.execute(_PG_LAG_SQL).scalar() or 0)
+            else:
+                conn.execute(text('SELECT 1'))
+                lag = 0.0
+    except Exception as e:
+        current_app.logger.warning(f'Replica probe failed, using primary: {e}')
+        return {'healthy': False, 'lag_seconds': None}
+
+    max_lag = current_app.config.get('REPLICA_MAX_LAG_SECONDS', 5)
+    return {'healthy': lag <= max_lag, 'lag_seconds': lag}
+
+
+def get_replica_state(engine) -> dict:
+    """Return cached probe result for the replica engine, re-probing when stale."""
+    interval = current_app.config.get('REPLICA_CHECK_INTERVAL_SECONDS', 2)
+    now = time.monotonic()
+
+    with _state_lock:
+        state = _replica_state.get(engine)
+        if state is not None and now - state['checked_at'] < interval:
+            return state
+
+    state = _probe_replica(engine)
+    state['checked_at'] = now
+    with _state_lock:
+        _replica_state[engine] = state
+    return state
+
+
+def get_replica_engine(db):
+    """Return the replica engine if configured and within the lag budget, else None."""
+    engine = db.engines.get(REPLICA_BIND_KEY)
+    if engine is None:
+        return None
+    if not get_replica_state(engine)['healthy']:
+        return None
+    return engine
+
+
+class RoutingSession(Session):
+    """Session that sends read-only view queries to the replica bind."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and _replica_requested()
+            and getattr(clause, '_for_update_arg', None) is None
+        ):
+            replica = get_replica_engine(self._db)
+            if replica is not None:
+                g.db_route_used = ROUTE_REPLICA
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def register_db_routing(app):
+    """Expose the route taken by replica-eligible requests as X-DB-Route."""
+
+    @app.after_request
+    def add_db_route_header(response):
+        if g.get('db_route_used'):
+            response.headers['X-DB-Route'] = g.db_route_used
+        elif REPLICA_BIND_KEY in app.config.get('SQLALCHEMY_BINDS', {}):
+            response.headers['X-DB-Route'] = ROUTE_PRIMARY
+        return response
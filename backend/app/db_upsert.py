@@ -0,0 +1,37 @@
+"""INSERT ... ON CONFLICT DO UPDATE for the aggregate tables.
+
+daily_article_movements and article_stock_totals are written by session
+hooks with one multi-row upsert per transaction. Rows are sent in key
+order, so concurrent writers take the row locks in the same order and
+cannot deadlock on them.
+"""
+from typing import Iterable, List, Sequence
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+
+def upsert(connection, table, key_columns: Sequence[str], rows: List[dict],
+           add: Iterable[str] = (), replace: Iterable[str] = ()) -> None:
+    """Insert rows; on a key conflict add to or overwrite the stored columns.
+
+    Args:
+        table: Core Table
+        key_columns: Columns of the unique key the conflict is detected on
+        add: Columns added to the stored value (deltas)
+        replace: Columns overwritten with the new value
+    """
+    if not rows:
+        return
+    dialect = connection.dialect.name
+    if dialect == 'postgresql':
+        stmt = pg_insert(table)
+    elif dialect == 'sqlite':
+        stmt = sqlite_insert(table)
+    else:
+        raise NotImplementedError(f'{table.name} upsert is not supported on {dialect}')
+
+    set_ = {name: table.c[name] + stmt.excluded[name] for name in add}
+    set_.update({name: stmt.excluded[name] for name in replace})
+    stmt = stmt.on_conflict_do_update(index_elements=list(key_columns), set_=set_)
+    connection.execute(stmt, sorted(rows, key=lambda row: tuple(row[name] for name in key_columns)))
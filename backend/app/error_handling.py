@@ -29,8 +29,13 @@ ERROR_CODES = {
     'DUPLICATE_ALIAS': 409,
     'ALIAS_LIMIT_REACHED': 409,
     'ALIAS_NOT_FOUND': 404,
+    'DUPLICATE_BARCODE': 409,
     'FORBIDDEN': 403,
+    'TRANSACTION_CONFLICT': 409,
     'INTERNAL_ERROR': 500,
+    'METRICS_UNAVAILABLE': 501,
+    'FORECAST_UNAVAILABLE': 501,
+    'PROFILE_NOT_FOUND': 404,
 }
 
 
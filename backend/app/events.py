@@ -0,0 +1,306 @@
+"""Change feed: compact events published after commit.
+
+Services call publish() inside their unit of work; inventory row changes
+(InventoryBalance) are collected automatically at flush. Events only leave the
+process once the transaction commits and are dropped on rollback.
+
+Delivery backends (EVENTS_BACKEND, default: 'postgres' on PostgreSQL,
+'memory' otherwise):
+- 'memory': after commit, events go straight into this process's broker
+- 'postgres': events are sent with pg_notify inside the transaction, so
+  PostgreSQL delivers them on commit to every worker LISTENing on
+  EVENTS_PG_CHANNEL; each worker's listener thread feeds its own broker
+
+Code that needs every committed event in the committing process (e.g.
+metrics) registers a callback with subscribe().
+
+Each broker keeps a ring buffer of recent events so SSE clients can resume
+with Last-Event-ID. NOTIFY delivers in commit order, so every worker's buffer
+has the same order and an id seen on one worker is valid on another.
+"""
+import json
+import select
+import threading
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, text
+
+from .db_routing import RoutingSession
+from .extensions import db
+
+
+EVENT_INVENTORY_CHANGED = 'inventory.changed'
+EVENT_DRAFT_APPROVED = 'draft.approved'
+EVENT_DRAFT_REJECTED = 'draft.rejected'
+EVENT_GROUP_CREATED = 'group.created'
+EVENT_GROUP_APPROVED = 'group.approved'
+EVENT_GROUP_REJECTED = 'group.rejected'
+EVENT_ALERT_RAISED = 'alert.raised'
+EVENT_ALERT_RESOLVED = 'alert.resolved'
+EVENT_RESYNC = 'resync'
+
+BACKEND_MEMORY = 'memory'
+BACKEND_POSTGRES = 'postgres'
+
+# NOTIFY payloads must stay below 8000 bytes
+_PG_NOTIFY_MAX_BYTES = 7500
+
+# session.info keys for the current unit of work
+_PENDING = 'events_pending'
+_INVENTORY_KEYS = 'events_inventory_keys'
+_SENT = 'events_sent'
+
+# Process-wide callbacks receiving each commit's events
+_subscribers = []
+
+
+def make_event(event_type: str, data: dict) -> dict:
+    """Build an event envelope with a globally unique id."""
+    return {
+        'id': uuid.uuid4().hex,
+        'type': event_type,
+        'data': data,
+        'ts': datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def publish(event_type: str, data: dict) -> None:
+    """Queue an event on the current transaction; delivered after commit.
+
+    Args:
+        event_type: One of the EVENT_* constants
+        data: Small JSON-serializable payload (ids and statuses, not rows)
+    """
+    db.session().info.setdefault(_PENDING, []).append(make_event(event_type, data))
+
+
+def subscribe(callback) -> None:
+    """Call callback(events) in this process after every commit that had events."""
+    if callback not in _subscribers:
+        _subscribers.append(callback)
+
+
+def get_backend() -> str:
+    """Resolve the delivery backend for the current app."""
+    backend = current_app.config.get('EVENTS_BACKEND')
+    if backend:
+        return backend
+    return BACKEND_POSTGRES if db.engine.dialect.name == 'postgresql' else BACKEND_MEMORY
+
+
+class EventBroker:
+    """In-process ring buffer of recent events with blocking reads."""
+
+    def __init__(self, buffer_size: int = 1000):
+        self._buffer = deque(maxlen=buffer_size)  # (seq, event)
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._listener = None
+        self._listener_lock = threading.Lock()
+
+    @property
+    def last_seq(self) -> int:
+        with self._cond:
+            return self._seq
+
+    @property
+    def last_event_id(self):
+        with self._cond:
+            return self._buffer[-1][1]['id'] if self._buffer else None
+
+    def append(self, events) -> None:
+        """Add events to the buffer and wake up waiting streams."""
+        with self._cond:
+            for ev in events:
+                self._seq += 1
+                self._buffer.append((self._seq, ev))
+            self._cond.notify_all()
+
+    def resolve(self, event_id: str):
+        """Return the buffer position of event_id, or None if it is not buffered."""
+        with self._cond:
+            for seq, ev in reversed(self._buffer):
+                if ev['id'] == event_id:
+                    return seq
+        return None
+
+    def wait_after(self, seq: int, timeout: float):
+        """Wait up to timeout for events after position seq.
+
+        Returns:
+            (events, new_seq, lost) - lost is True if events after seq were
+            already evicted from the buffer (client must resync)
+        """
+        with self._cond:
+            if self._seq <= seq and timeout > 0:
+                self._cond.wait(timeout)
+            lost = bool(self._buffer) and self._buffer[0][0] > seq + 1
+            events = [ev for s, ev in self._buffer if s > seq]
+            return events, self._seq, lost
+
+    def ensure_listener(self, app) -> None:
+        """Start the PostgreSQL LISTEN thread for this worker (once)."""
+        with self._listener_lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._listener = PgListener(
+                engine=db.engine,
+                channel=app.config.get('EVENTS_PG_CHANNEL', 'warehouse_events'),
+                broker=self,
+                logger=app.logger
+            )
+            self._listener.start()
+
+
+class PgListener(threading.Thread):
+    """Background thread feeding NOTIFY payloads into a broker."""
+
+    def __init__(self, engine, channel, broker, logger):
+        super().__init__(name='events-pg-listener', daemon=True)
+        self.engine = engine
+        self.channel = channel
+        self.broker = broker
+        self.logger = logger
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                self._listen()
+            except Exception as e:
+                self.logger.warning(f'Event listener error, reconnecting: {e}')
+                self._stop_event.wait(1)
+
+    def _listen(self):
+        raw = self.engine.raw_connection()
+        # A LISTENing connection must never go back to the pool
+        raw.detach()
+        try:
+            conn = raw.driver_connection
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f'LISTEN "{self.channel}"')
+
+            while not self._stop_event.is_set():
+                if select.select([conn], [], [], 5) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    self.broker.append(json.loads(notify.payload))
+        finally:
+            raw.close()
+
+
+def get_broker(app=None) -> EventBroker:
+    """Return the app's event broker."""
+    app = app or current_app._get_current_object()
+    return app.extensions['events']
+
+
+def _notify_chunks(events):
+    """Split events into JSON arrays that fit in a NOTIFY payload."""
+    chunk, size = [], 2
+    for ev in events:
+        encoded = json.dumps(ev, separators=(',', ':'))
+        if chunk and size + len(encoded) + 1 > _PG_NOTIFY_MAX_BYTES:
+            yield '[' + ','.join(chunk) + ']'
+            chunk, size = [], 2
+        chunk.append(encoded)
+        size += len(encoded) + 1
+    if chunk:
+        yield '[' + ','.join(chunk) + ']'
+
+
+def _drain(session) -> None:
+    """Turn collected inventory keys into events; on Postgres, NOTIFY them now."""
+    keys = session.info.get(_INVENTORY_KEYS)
+    if keys:
+        pending = session.info.setdefault(_PENDING, [])
+        for (location_id, article_id, batch_id), emitted in keys.items():
+            if not emitted:
+                pending.append(make_event(EVENT_INVENTORY_CHANGED, {
+                    'location_id': location_id,
+                    'article_id': article_id,
+                    'batch_id': batch_id,
+                }))
+                keys[(location_id, article_id, batch_id)] = True
+
+    pending = session.info.get(_PENDING)
+    if not pending or not has_app_context() or get_backend() != BACKEND_POSTGRES:
+        return
+
+    # NOTIFY is transactional: delivered on commit, discarded on rollback
+    channel = current_app.config.get('EVENTS_PG_CHANNEL', 'warehouse_events')
+    conn = session.connection(bind_arguments={'bind': db.engine})
+    for payload in _notify_chunks(pending):
+        conn.execute(text('SELECT pg_notify(:channel, :payload)'),
+                     {'channel': channel, 'payload': payload})
+    session.info.setdefault(_SENT, []).extend(pending)
+    session.info[_PENDING] = []
+
+
+def _clear(session) -> None:
+    session.info.pop(_PENDING, None)
+    session.info.pop(_INVENTORY_KEYS, None)
+    session.info.pop(_SENT, None)
+
+
+def _after_flush(session, flush_context):
+    from .models import InventoryBalance, Stock, Surplus
+
+    keys = session.info.setdefault(_INVENTORY_KEYS, {})
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (InventoryBalance, Stock, Surplus)):
+            keys.setdefault((obj.location_id, obj.article_id, obj.batch_id), False)
+    _drain(session)
+
+
+def _before_commit(session):
+    _drain(session)
+
+
+def _after_commit(session):
+    pending = session.info.get(_PENDING) or []
+    committed = (session.info.get(_SENT) or []) + pending
+    _clear(session)
+    if not committed or not has_app_context():
+        return
+
+    if pending and get_backend() == BACKEND_MEMORY:
+        get_broker().append(pending)
+
+    for callback in _subscribers:
+        try:
+            callback(committed)
+        except Exception as e:
+            current_app.logger.warning(f'Event subscriber {callback.__name__} failed: {e}')
+
+
+def _after_transaction_end(session, transaction):
+    # Rollback or close of the outermost transaction: drop undelivered events
+    if transaction.parent is None:
+        _clear(session)
+
+
+_SESSION_LISTENERS = (
+    ('after_flush', _after_flush),
+    ('before_commit', _before_commit),
+    ('after_commit', _after_commit),
+    ('after_transaction_end', _after_transaction_end),
+)
+
+
+def register_events(app):
+    """Create the app's event broker and hook event delivery into the session."""
+    app.extensions['events'] = EventBroker(app.config.get('EVENTS_BUFFER_SIZE', 1000))
+
+    for name, fn in _SESSION_LISTENERS:
+        if not event.contains(RoutingSession, name, fn):
+            event.listen(RoutingSession, name, fn)
@@ -6,8 +6,10 @@ from flask_jwt_extended import JWTManager
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 
-# Database
-db = SQLAlchemy()
+from .db_routing import RoutingSession
+
+# Database (session routes read-only views to the replica bind, if configured)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # Migrations
 migrate = Migrate()
@@ -0,0 +1,183 @@
+"""Prometheus metrics: request latency, DB pool, row-lock waits, business counters.
+
+prometheus_client is optional; without it every helper here is a no-op and
+/metrics answers 501.
+
+Multiprocess (gunicorn and other forking servers): set PROMETHEUS_MULTIPROC_DIR
+to an empty, writable directory before the server starts. Each worker then
+writes its values to files there and /metrics aggregates them. Gauges use
+'livesum', so dead workers drop out once the server calls
+``prometheus_client.multiprocess.mark_process_dead(pid)`` (gunicorn child_exit).
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from flask import g, request
+from sqlalchemy import event
+
+from . import events
+
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Gauge, Histogram
+    from prometheus_client import multiprocess
+except ImportError:  # pragma: no cover - optional dependency
+    prometheus_client = None
+
+
+if prometheus_client is not None:
+    REQUEST_LATENCY = Histogram(
+        'http_request_duration_seconds',
+        'Request latency by blueprint and endpoint',
+        ['blueprint', 'endpoint', 'method'],
+        buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+    )
+    REQUEST_COUNT = Counter(
+        'http_requests_total',
+        'Requests by blueprint, endpoint and status code',
+        ['blueprint', 'endpoint', 'method', 'status']
+    )
+    DB_POOL_CHECKED_OUT = Gauge(
+        'db_pool_checked_out_connections',
+        'Connections currently checked out of the pool',
+        ['bind'],
+        multiprocess_mode='livesum'
+    )
+    DB_POOL_OVERFLOW = Gauge(
+        'db_pool_overflow_connections',
+        'Checked-out connections beyond pool_size',
+        ['bind'],
+        multiprocess_mode='livesum'
+    )
+    LOCK_WAIT = Histogram(
+        'db_row_lock_wait_seconds',
+        'Time spent acquiring row locks (SELECT ... FOR UPDATE)',
+        ['operation'],
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+    )
+    TX_CONFLICTS = Counter(
+        'db_transaction_conflicts_total',
+        'Write transactions rolled back by a deadlock, serialization failure or lock timeout',
+        ['operation', 'reason']
+    )
+    TX_ATTEMPTS = Histogram(
+        'db_transaction_attempts',
+        'Attempts per retried write transaction',
+        ['operation', 'outcome'],
+        buckets=(1, 2, 3, 4, 5, 8)
+    )
+    DRAFTS_CREATED = Counter('drafts_created_total', 'Weigh-in draft lines created')
+    GROUPS_APPROVED = Counter('draft_groups_approved_total', 'Draft groups approved')
+    KG_CONSUMED = Counter(
+        'inventory_consumed_kg_total',
+        'Kilograms consumed by draft approvals',
+        ['source']
+    )
+
+
+def metrics_available() -> bool:
+    return prometheus_client is not None
+
+
+@contextmanager
+def lock_wait(operation: str):
+    """Time the row-lock acquisition inside the block.
+
+    Usage:
+        with lock_wait('approve_draft'):
+            row = db.session.query(InventoryBalance).filter_by(...).with_for_update().first()
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if prometheus_client is not None:
+            LOCK_WAIT.labels(operation=operation).observe(time.perf_counter() - started)
+
+
+def record_conflict(operation: str, reason: str) -> None:
+    """Count one rolled-back attempt (see db_retry.run_in_transaction)."""
+    if prometheus_client is not None:
+        TX_CONFLICTS.labels(operation=operation, reason=reason).inc()
+
+
+def record_transaction_attempts(operation: str, attempts: int, outcome: str) -> None:
+    """Record how many attempts a transaction took ('committed' or 'conflict')."""
+    if prometheus_client is not None:
+        TX_ATTEMPTS.labels(operation=operation, outcome=outcome).observe(attempts)
+
+
+def render_latest():
+    """Return (body, content_type) for the Prometheus exposition format."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def _count_business_events(committed):
+    """events.subscribe() callback: business counters from committed events."""
+    for ev in committed:
+        if ev['type'] == events.EVENT_GROUP_CREATED:
+            DRAFTS_CREATED.inc(ev['data'].get('line_count', 0))
+        elif ev['type'] == events.EVENT_GROUP_APPROVED:
+            GROUPS_APPROVED.inc()
+        elif ev['type'] == events.EVENT_DRAFT_APPROVED:
+            KG_CONSUMED.labels(source='stock').inc(ev['data'].get('consumed_stock_kg', 0))
+            KG_CONSUMED.labels(source='surplus').inc(ev['data'].get('consumed_surplus_kg', 0))
+
+
+def _track_pool(bind: str, engine) -> None:
+    """Update pool gauges on every checkout/checkin."""
+    pool = engine.pool
+    if not hasattr(pool, 'checkedout'):
+        # SQLite/static pools have no size accounting
+        return
+
+    def update(checked_out):
+        DB_POOL_CHECKED_OUT.labels(bind=bind).set(checked_out)
+        DB_POOL_OVERFLOW.labels(bind=bind).set(max(checked_out - pool.size(), 0))
+
+    def on_checkout(dbapi_conn, record, proxy):
+        update(pool.checkedout())
+
+    def on_checkin(dbapi_conn, record):
+        # Fired before the connection is handed back to the pool
+        update(pool.checkedout() - 1)
+
+    event.listen(engine, 'checkout', on_checkout)
+    event.listen(engine, 'checkin', on_checkin)
+
+
+def register_metrics(app, db):
+    """Install request timing, pool gauges and business counters."""
+    if prometheus_client is None:
+        return
+
+    events.subscribe(_count_business_events)
+
+    with app.app_context():
+        for bind, engine in db.engines.items():
+            _track_pool(bind or 'default', engine)
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return response
+        # Unmatched URLs share one label to keep cardinality bounded
+        labels = {
+            'blueprint': request.blueprint or '',
+            'endpoint': request.endpoint or 'unmatched',
+            'method': request.method,
+        }
+        REQUEST_LATENCY.labels(**labels).observe(time.perf_counter() - started)
+        REQUEST_COUNT.labels(status=str(response.status_code), **labels).inc()
+        return response
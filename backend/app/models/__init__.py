@@ -4,12 +4,18 @@ from .location import Location
 from .article import Article
 from .article_alias import ArticleAlias
 from .batch import Batch
+from .inventory_balance import InventoryBalance
 from .stock import Stock
 from .surplus import Surplus
 from .weigh_in_draft import WeighInDraft
 from .draft_group import DraftGroup
 from .approval_action import ApprovalAction
 from .transaction import Transaction
+from .stock_snapshot import StockSnapshot
+from .daily_article_movement import DailyArticleMovement
+from .article_stock_total import ArticleStockTotal
+from .alert import Alert
+from .archive import DraftGroupArchive, WeighInDraftArchive, ApprovalActionArchive
 
 __all__ = [
     'User',
@@ -17,11 +23,19 @@ __all__ = [
     'Article',
     'ArticleAlias',
     'Batch',
+    'InventoryBalance',
     'Stock',
     'Surplus',
     'WeighInDraft',
     'DraftGroup',
     'ApprovalAction',
     'Transaction',
+    'StockSnapshot',
+    'DailyArticleMovement',
+    'ArticleStockTotal',
+    'Alert',
+    'DraftGroupArchive',
+    'WeighInDraftArchive',
+    'ApprovalActionArchive',
 ]
 
@@ -0,0 +1,61 @@
+"""Alert model."""
+from datetime import datetime, timezone
+
+from ..extensions import db
+
+
+class Alert(db.Model):
+    """Threshold crossing of an article at a location.
+
+    A LOW_STOCK alert opens when stock + surplus drops below the article's
+    reorder_threshold and is resolved (not deleted) once the total is back
+    at or above it. At most one alert per location/article/type is OPEN.
+    """
+
+    __tablename__ = 'alerts'
+
+    TYPE_LOW_STOCK = 'LOW_STOCK'
+
+    STATUS_OPEN = 'OPEN'
+    STATUS_RESOLVED = 'RESOLVED'
+
+    id = db.Column(db.Integer, primary_key=True)
+    alert_type = db.Column(db.Text, nullable=False, default=TYPE_LOW_STOCK)
+    status = db.Column(db.Text, nullable=False, default=STATUS_OPEN)
+    location_id = db.Column(
+        db.Integer,
+        db.ForeignKey('locations.id'),
+        nullable=False
+    )
+    article_id = db.Column(
+        db.Integer,
+        db.ForeignKey('articles.id'),
+        nullable=False
+    )
+    threshold_kg = db.Column(db.Numeric(14, 2), nullable=False)
+    # stock + surplus when the alert opened / was resolved
+    on_hand_kg = db.Column(db.Numeric(14, 2), nullable=False)
+    resolved_on_hand_kg = db.Column(db.Numeric(14, 2), nullable=True)
+    triggered_at = db.Column(
+        db.DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
+    resolved_at = db.Column(db.DateTime(timezone=True), nullable=True)
+
+    # Constraints
+    __table_args__ = (
+        db.Index(
+            'uq_alerts_open_key', 'location_id', 'article_id', 'alert_type',
+            unique=True,
+            postgresql_where=db.text("status = 'OPEN'"),
+            sqlite_where=db.text("status = 'OPEN'")
+        ),
+        db.Index('ix_alerts_status_triggered_at', 'status', 'triggered_at'),
+    )
+
+    # Relationships
+    article = db.relationship('Article')
+
+    def __repr__(self):
+        return f'<Alert {self.alert_type} {self.status} article {self.article_id}>'
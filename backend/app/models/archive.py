@@ -0,0 +1,89 @@
+"""Archive models for finalized drafts, draft groups and approval actions."""
+from ..extensions import db
+from .approval_action import ApprovalAction
+from .draft_group import DraftGroup
+from .weigh_in_draft import WeighInDraft
+
+
+def _archive_columns(source, retarget):
+    """Copies of source's columns; foreign keys in retarget point at archive tables.
+
+    Values are copied as-is, so there are no defaults and ids are not generated.
+    """
+    columns = []
+    for column in source.columns:
+        foreign_keys = [
+            db.ForeignKey(retarget.get(fk.target_fullname, fk.target_fullname))
+            for fk in column.foreign_keys
+        ]
+        columns.append(db.Column(
+            column.name, column.type, *foreign_keys,
+            primary_key=column.primary_key,
+            nullable=column.nullable,
+            autoincrement=False
+        ))
+    columns.append(db.Column('archived_at', db.DateTime(timezone=True), nullable=False))
+    return columns
+
+
+class DraftGroupArchive(db.Model):
+    """Finalized draft group moved out of draft_groups by `flask archive-drafts`."""
+
+    __table__ = db.Table(
+        'draft_groups_archive', db.metadata,
+        *_archive_columns(DraftGroup.__table__, {}),
+        db.Index('ix_draft_groups_archive_created_at', 'created_at'),
+    )
+
+    drafts = db.relationship('WeighInDraftArchive', back_populates='draft_group')
+
+    @property
+    def line_count(self):
+        return len(self.drafts)
+
+    @property
+    def total_quantity_kg(self):
+        return sum(float(d.quantity_kg) for d in self.drafts)
+
+    def __repr__(self):
+        return f'<DraftGroupArchive {self.id} ({self.status})>'
+
+
+class WeighInDraftArchive(db.Model):
+    """Finalized (APPROVED/REJECTED) draft moved out of weigh_in_drafts."""
+
+    __table__ = db.Table(
+        'weigh_in_drafts_archive', db.metadata,
+        *_archive_columns(WeighInDraft.__table__, {'draft_groups.id': 'draft_groups_archive.id'}),
+        # client_event_id stays unique across hot and archive (checked on create)
+        db.Index('ix_weigh_in_drafts_archive_client_event_id', 'client_event_id', unique=True),
+        db.Index('ix_weigh_in_drafts_archive_group_id', 'draft_group_id'),
+        db.Index('ix_weigh_in_drafts_archive_created_at', 'created_at'),
+    )
+
+    draft_group = db.relationship('DraftGroupArchive', back_populates='drafts')
+    approval_actions = db.relationship('ApprovalActionArchive', back_populates='draft')
+
+    def __repr__(self):
+        return f'<WeighInDraftArchive {self.id} ({self.status})>'
+
+
+class ApprovalActionArchive(db.Model):
+    """Approval action of an archived draft."""
+
+    __table__ = db.Table(
+        'approval_actions_archive', db.metadata,
+        *_archive_columns(ApprovalAction.__table__, {'weigh_in_drafts.id': 'weigh_in_drafts_archive.id'}),
+        db.Index('ix_approval_actions_archive_draft_id', 'draft_id'),
+    )
+
+    draft = db.relationship('WeighInDraftArchive', back_populates='approval_actions')
+
+    def __repr__(self):
+        return f'<ApprovalActionArchive {self.action} on Draft {self.draft_id}>'
+
+    def to_dict(self):
+        return {
+            **ApprovalAction.to_dict(self),
+            'archived_at': self.archived_at.isoformat() if self.archived_at else None
+        }
@@ -1,6 +1,8 @@
 """Article model."""
 from datetime import datetime, timezone
 
+from sqlalchemy import DDL, event
+
 from ..extensions import db
 
 
@@ -21,7 +23,7 @@ class Article(db.Model):
     uom = db.Column(db.String(10), nullable=False)  # KG or L - REQUIRED, no default
     manufacturer = db.Column(db.Text, nullable=True)
     manufacturer_art_number = db.Column(db.Text, nullable=True)  # Vendor code e.g., 34665.91B6.7.171
-    reorder_threshold = db.Column(db.Numeric(14, 2), nullable=True)  # Future low stock alarm
+    reorder_threshold = db.Column(db.Numeric(14, 2), nullable=True)  # LOW_STOCK alerts (services/alert_service.py)
     is_paint = db.Column(db.Boolean, default=True, nullable=False)
     is_active = db.Column(db.Boolean, default=True, nullable=False)
     created_at = db.Column(
@@ -30,11 +32,29 @@ class Article(db.Model):
         nullable=False
     )
     updated_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    # Normalized words of article_no, description, manufacturer(_art_number) and aliases,
+    # kept current by a flush hook (services/search_service.py)
+    search_text = db.Column(db.Text, nullable=True)
+    
+    __table_args__ = (
+        # Scan lookups (services/scan_service.py); NULLs do not collide
+        db.Index('ix_articles_barcode', 'barcode', unique=True),
+        # Article search (PostgreSQL only): word-prefix full text and trigram word similarity
+        db.Index(
+            'ix_articles_search_vector',
+            db.func.to_tsvector(db.literal_column("'simple'"), search_text),
+            postgresql_using='gin'
+        ).ddl_if(dialect='postgresql'),
+        db.Index(
+            'ix_articles_search_trgm', search_text,
+            postgresql_using='gin',
+            postgresql_ops={'search_text': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+    )
     
     # Relationships
     batches = db.relationship('Batch', back_populates='article')
-    stock_items = db.relationship('Stock', back_populates='article')
-    surplus_items = db.relationship('Surplus', back_populates='article')
+    balances = db.relationship('InventoryBalance', back_populates='article')
     drafts = db.relationship('WeighInDraft', back_populates='article')
     transactions = db.relationship('Transaction', back_populates='article')
     aliases = db.relationship('ArticleAlias', back_populates='article', cascade='all, delete-orphan')
@@ -61,3 +81,10 @@ class Article(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+
+
+# gin_trgm_ops for ix_articles_search_trgm when the schema is created without migrations
+event.listen(
+    Article.__table__, 'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
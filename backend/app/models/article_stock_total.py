@@ -0,0 +1,43 @@
+"""Article stock total model."""
+from datetime import datetime, timezone
+
+from ..extensions import db
+
+
+class ArticleStockTotal(db.Model):
+    """Stock and surplus of one article at one location, summed over batches.
+
+    Maintained by services/alert_service.py in the same database transaction
+    as every InventoryBalance change: only the location/article whose
+    balance rows were flushed is updated, and its low-stock state is
+    re-evaluated from the new total.
+    """
+
+    __tablename__ = 'article_stock_totals'
+
+    location_id = db.Column(
+        db.Integer,
+        db.ForeignKey('locations.id'),
+        primary_key=True
+    )
+    article_id = db.Column(
+        db.Integer,
+        db.ForeignKey('articles.id'),
+        primary_key=True
+    )
+    stock_kg = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    surplus_kg = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    # First expiry_date of an active batch with stock here (None: no dated stock)
+    earliest_expiry_date = db.Column(db.Date, nullable=True)
+    updated_at = db.Column(
+        db.DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
+
+    @property
+    def on_hand_kg(self):
+        return (self.stock_kg or 0) + (self.surplus_kg or 0)
+
+    def __repr__(self):
+        return f'<ArticleStockTotal {self.article_id}@{self.location_id}: {self.on_hand_kg}kg>'
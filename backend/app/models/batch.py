@@ -33,12 +33,19 @@ class Batch(db.Model):
     # Unique constraint: one batch_code per article
     __table_args__ = (
         db.UniqueConstraint('article_id', 'batch_code', name='uq_batch_article_code'),
+        # Scanned batch labels are looked up by code alone (services/scan_service.py)
+        db.Index('ix_batches_batch_code', 'batch_code'),
+        # FEFO / expiring-soon lookups; queries must filter on is_active to use it
+        db.Index(
+            'ix_batches_expiry_active', 'expiry_date',
+            postgresql_where=db.text('is_active AND expiry_date IS NOT NULL'),
+            sqlite_where=db.text('is_active = 1 AND expiry_date IS NOT NULL')
+        ),
     )
     
     # Relationships
     article = db.relationship('Article', back_populates='batches')
-    stock_items = db.relationship('Stock', back_populates='batch')
-    surplus_items = db.relationship('Surplus', back_populates='batch')
+    balances = db.relationship('InventoryBalance', back_populates='batch')
     drafts = db.relationship('WeighInDraft', back_populates='batch')
     transactions = db.relationship('Transaction', back_populates='batch')
     
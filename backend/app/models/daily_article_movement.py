@@ -0,0 +1,42 @@
+"""Daily article movement model."""
+from ..extensions import db
+
+
+class DailyArticleMovement(db.Model):
+    """Per-day totals of transactions by location/article/tx_type.
+
+    Maintained in the same database transaction as every Transaction insert
+    (services/movement_service.py) and rebuilt from transactions with
+    `flask rebuild-movements`. quantity_kg keeps the transaction sign
+    (consumption is negative); day is the UTC date of occurred_at.
+    """
+
+    __tablename__ = 'daily_article_movements'
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    location_id = db.Column(
+        db.Integer,
+        db.ForeignKey('locations.id'),
+        nullable=False
+    )
+    article_id = db.Column(
+        db.Integer,
+        db.ForeignKey('articles.id'),
+        nullable=False
+    )
+    tx_type = db.Column(db.Text, nullable=False)
+    quantity_kg = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    tx_count = db.Column(db.Integer, nullable=False, default=0)
+
+    # Constraints
+    __table_args__ = (
+        db.UniqueConstraint(
+            'day', 'location_id', 'article_id', 'tx_type',
+            name='uq_daily_article_movements_key'
+        ),
+        db.Index('ix_daily_article_movements_article_day', 'article_id', 'day'),
+    )
+
+    def __repr__(self):
+        return f'<DailyArticleMovement {self.day} {self.tx_type} {self.quantity_kg}kg>'
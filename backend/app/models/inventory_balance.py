@@ -0,0 +1,93 @@
+"""Inventory balance model."""
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+
+from ..extensions import db
+
+
+class InventoryBalance(db.Model):
+    """Stock and surplus balance per location/article/batch.
+
+    One row per key holds both quantities, so a mutation that moves stock
+    and surplus together locks and reads a single row, and summaries need a
+    single join. Replaces the former `stock` and `surplus` tables; Stock and
+    Surplus remain as compatibility mappings onto this table.
+    Check constraints: stock_kg >= 0, surplus_kg >= 0
+    """
+
+    __tablename__ = 'inventory_balances'
+
+    id = db.Column(db.Integer, primary_key=True)
+    location_id = db.Column(
+        db.Integer,
+        db.ForeignKey('locations.id'),
+        nullable=False
+    )
+    article_id = db.Column(
+        db.Integer,
+        db.ForeignKey('articles.id'),
+        nullable=False
+    )
+    batch_id = db.Column(
+        db.Integer,
+        db.ForeignKey('batches.id'),
+        nullable=False
+    )
+    stock_kg = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    surplus_kg = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    surplus_reason = db.Column(db.Text, nullable=True)
+    # Stamped whenever stock_kg / surplus_kg is assigned (see listeners below)
+    stock_updated_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    surplus_updated_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    created_at = db.Column(
+        db.DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
+
+    # Constraints
+    __table_args__ = (
+        db.UniqueConstraint(
+            'location_id', 'article_id', 'batch_id',
+            name='uq_inventory_balances_key'
+        ),
+        db.CheckConstraint('stock_kg >= 0', name='ck_inventory_balances_stock_positive'),
+        db.CheckConstraint('surplus_kg >= 0', name='ck_inventory_balances_surplus_positive'),
+    )
+
+    # Relationships
+    location = db.relationship('Location', back_populates='balances')
+    article = db.relationship('Article', back_populates='balances')
+    batch = db.relationship('Batch', back_populates='balances')
+
+    @property
+    def key(self):
+        return (self.location_id, self.article_id, self.batch_id)
+
+    def __repr__(self):
+        return f'<InventoryBalance {self.stock_kg}kg+{self.surplus_kg}kg at {self.location_id}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'location_id': self.location_id,
+            'article_id': self.article_id,
+            'batch_id': self.batch_id,
+            'stock_kg': float(self.stock_kg) if self.stock_kg else 0,
+            'surplus_kg': float(self.surplus_kg) if self.surplus_kg else 0,
+            'surplus_reason': self.surplus_reason,
+            'stock_updated_at': self.stock_updated_at.isoformat() if self.stock_updated_at else None,
+            'surplus_updated_at': self.surplus_updated_at.isoformat() if self.surplus_updated_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+
+@event.listens_for(InventoryBalance.stock_kg, 'set')
+def _stamp_stock(target, value, oldvalue, initiator):
+    target.stock_updated_at = datetime.now(timezone.utc)
+
+
+@event.listens_for(InventoryBalance.surplus_kg, 'set')
+def _stamp_surplus(target, value, oldvalue, initiator):
+    target.surplus_updated_at = datetime.now(timezone.utc)
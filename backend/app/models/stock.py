@@ -1,63 +1,31 @@
-"""Stock model."""
-from datetime import datetime, timezone
-
+"""Stock model (compatibility mapping)."""
 from ..extensions import db
+from .inventory_balance import InventoryBalance
 
 
 class Stock(db.Model):
-    """Stock inventory model.
-    
-    Tracks current stock quantity per location/article/batch.
-    Check constraint: quantity_kg >= 0
+    """Stock side of InventoryBalance.
+
+    Compatibility mapping for code written against the former `stock`
+    table: quantity_kg and last_updated map to InventoryBalance.stock_kg and
+    stock_updated_at. New code should use InventoryBalance, which also
+    carries the surplus quantity. Adding a Stock for a key that already has
+    a balance row violates uq_inventory_balances_key.
     """
-    
-    __tablename__ = 'stock'
-    
-    id = db.Column(db.Integer, primary_key=True)
-    location_id = db.Column(
-        db.Integer,
-        db.ForeignKey('locations.id'),
-        nullable=False
-    )
-    article_id = db.Column(
-        db.Integer,
-        db.ForeignKey('articles.id'),
-        nullable=False
-    )
-    batch_id = db.Column(
-        db.Integer,
-        db.ForeignKey('batches.id'),
-        nullable=False
-    )
-    quantity_kg = db.Column(
-        db.Numeric(14, 2),
-        nullable=False,
-        default=0
-    )
-    last_updated = db.Column(
-        db.DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
-        nullable=False
-    )
-    
-    # Constraints
-    __table_args__ = (
-        db.UniqueConstraint(
-            'location_id', 'article_id', 'batch_id',
-            name='uq_stock_location_article_batch'
-        ),
-        db.CheckConstraint('quantity_kg >= 0', name='ck_stock_quantity_positive'),
-    )
-    
-    # Relationships
-    location = db.relationship('Location', back_populates='stock_items')
-    article = db.relationship('Article', back_populates='stock_items')
-    batch = db.relationship('Batch', back_populates='stock_items')
-    
+
+    __table__ = InventoryBalance.__table__
+    __mapper_args__ = {
+        'include_properties': [
+            'id', 'location_id', 'article_id', 'batch_id', 'stock_kg', 'stock_updated_at'
+        ]
+    }
+
+    quantity_kg = db.synonym('stock_kg')
+    last_updated = db.synonym('stock_updated_at')
+
     def __repr__(self):
         return f'<Stock {self.quantity_kg}kg at {self.location_id}>'
-    
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -0,0 +1,52 @@
+"""Stock snapshot model."""
+from datetime import datetime, timezone
+
+from ..extensions import db
+
+
+class StockSnapshot(db.Model):
+    """Daily stock and surplus balance per location/article/batch.
+
+    Holds the balances at the end of snapshot_date (UTC midnight after it).
+    Written by `flask snapshot-stock`; keys with zero stock and surplus are
+    omitted.
+    """
+
+    __tablename__ = 'stock_snapshots'
+
+    id = db.Column(db.Integer, primary_key=True)
+    snapshot_date = db.Column(db.Date, nullable=False)
+    location_id = db.Column(
+        db.Integer,
+        db.ForeignKey('locations.id'),
+        nullable=False
+    )
+    article_id = db.Column(
+        db.Integer,
+        db.ForeignKey('articles.id'),
+        nullable=False
+    )
+    batch_id = db.Column(
+        db.Integer,
+        db.ForeignKey('batches.id'),
+        nullable=False
+    )
+    stock_kg = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    surplus_kg = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    created_at = db.Column(
+        db.DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
+
+    # Constraints
+    __table_args__ = (
+        db.UniqueConstraint(
+            'snapshot_date', 'location_id', 'article_id', 'batch_id',
+            name='uq_stock_snapshots_date_key'
+        ),
+        db.Index('ix_stock_snapshots_article_date', 'article_id', 'snapshot_date'),
+    )
+
+    def __repr__(self):
+        return f'<StockSnapshot {self.snapshot_date} {self.stock_kg}kg+{self.surplus_kg}kg>'
@@ -1,68 +1,32 @@
-"""Surplus model."""
-from datetime import datetime, timezone
-
+"""Surplus model (compatibility mapping)."""
 from ..extensions import db
+from .inventory_balance import InventoryBalance
 
 
 class Surplus(db.Model):
-    """Surplus inventory model.
-    
-    Tracks surplus quantity per location/article/batch.
-    Check constraint: quantity_kg >= 0
+    """Surplus side of InventoryBalance.
+
+    Compatibility mapping for code written against the former `surplus`
+    table: quantity_kg, reason and updated_at map to
+    InventoryBalance.surplus_kg, surplus_reason and surplus_updated_at.
+    New code should use InventoryBalance.
     """
-    
-    __tablename__ = 'surplus'
-    
-    id = db.Column(db.Integer, primary_key=True)
-    location_id = db.Column(
-        db.Integer,
-        db.ForeignKey('locations.id'),
-        nullable=False
-    )
-    article_id = db.Column(
-        db.Integer,
-        db.ForeignKey('articles.id'),
-        nullable=False
-    )
-    batch_id = db.Column(
-        db.Integer,
-        db.ForeignKey('batches.id'),
-        nullable=False
-    )
-    quantity_kg = db.Column(
-        db.Numeric(14, 2),
-        nullable=False,
-        default=0
-    )
-    reason = db.Column(db.Text, nullable=True)
-    created_at = db.Column(
-        db.DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
-        nullable=False
-    )
-    updated_at = db.Column(
-        db.DateTime(timezone=True),
-        nullable=True,
-        onupdate=lambda: datetime.now(timezone.utc)
-    )
-    
-    # Constraints
-    __table_args__ = (
-        db.UniqueConstraint(
-            'location_id', 'article_id', 'batch_id',
-            name='uq_surplus_location_article_batch'
-        ),
-        db.CheckConstraint('quantity_kg >= 0', name='ck_surplus_quantity_positive'),
-    )
-    
-    # Relationships
-    location = db.relationship('Location', back_populates='surplus_items')
-    article = db.relationship('Article', back_populates='surplus_items')
-    batch = db.relationship('Batch', back_populates='surplus_items')
-    
+
+    __table__ = InventoryBalance.__table__
+    __mapper_args__ = {
+        'include_properties': [
+            'id', 'location_id', 'article_id', 'batch_id', 'surplus_kg',
+            'surplus_reason', 'surplus_updated_at', 'created_at'
+        ]
+    }
+
+    quantity_kg = db.synonym('surplus_kg')
+    reason = db.synonym('surplus_reason')
+    updated_at = db.synonym('surplus_updated_at')
+
     def __repr__(self):
         return f'<Surplus {self.quantity_kg}kg at {self.location_id}>'
-    
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -9,6 +9,10 @@ class Transaction(db.Model):
     
     Records all inventory changes for audit trail.
     tx_type: WEIGH_IN, SURPLUS_CONSUMED, STOCK_CONSUMED, INVENTORY_ADJUSTMENT, STOCK_RECEIPT
+    
+    On PostgreSQL the table is range-partitioned by month on occurred_at
+    (migration d4e7a1b9c2f0, see app.partitioning) with primary key
+    (id, occurred_at); id alone stays unique via transactions_id_seq.
     """
     
     __tablename__ = 'transactions'
@@ -48,6 +52,11 @@ class Transaction(db.Model):
     # New fields for TASK-0010
     order_number = db.Column(db.String(50), nullable=True)
     
+    # Typed copies of meta['draft_id'] / meta['reason'] for indexed lookups.
+    # No foreign key: drafts may be archived while their transactions stay.
+    draft_id = db.Column(db.Integer, nullable=True)
+    reason = db.Column(db.Text, nullable=True)
+    
     # Indexes
     __table_args__ = (
         db.Index('ix_transactions_occurred_at', 'occurred_at'),
@@ -56,6 +65,8 @@ class Transaction(db.Model):
         # New indexes for TASK-0010
         db.Index('ix_transactions_type_created', 'tx_type', 'occurred_at'),
         db.Index('ix_transactions_order_number', 'order_number'),
+        db.Index('ix_transactions_draft_id', 'draft_id'),
+        db.Index('ix_transactions_reason_occurred', 'reason', 'occurred_at'),
     )
     
     # Relationships
@@ -92,5 +103,7 @@ class Transaction(db.Model):
             'source': self.source,
             'client_event_id': self.client_event_id,
             'order_number': self.order_number,
+            'draft_id': self.draft_id,
+            'reason': self.reason,
             'meta': self.meta
         }
@@ -0,0 +1,209 @@
+"""Monthly range partitions of the transactions table (PostgreSQL only).
+
+Migration d4e7a1b9c2f0 turns `transactions` into a table partitioned by
+RANGE (occurred_at), one partition per UTC month named transactions_yYYYYmMM,
+plus a transactions_default partition that catches rows no monthly partition
+covers. `flask partitions create` keeps partitions ahead of time, so the
+default partition stays empty and inserts never touch it. Old months can be
+detached (kept as plain tables) or archived to gzipped CSV and dropped.
+
+On other databases (SQLite in tests) `transactions` is a plain table and
+is_partitioned() returns False.
+"""
+import gzip
+import os
+import re
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+
+
+PARENT = 'transactions'
+DEFAULT_PARTITION = 'transactions_default'
+_NAME_RE = re.compile(r'^transactions_y(\d{4})m(\d{2})$')
+
+
+def month_start(value) -> date:
+    """First day of the month containing value (date or datetime)."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def parse_month(value: str) -> date:
+    """'YYYY-MM' -> first day of that month."""
+    return datetime.strptime(value, '%Y-%m').date()
+
+
+def partition_name(month: date) -> str:
+    return f'{PARENT}_y{month.year:04d}m{month.month:02d}'
+
+
+def partition_month(name: str) -> date | None:
+    """Month of a monthly partition name, None for anything else."""
+    match = _NAME_RE.match(name)
+    return date(int(match[1]), int(match[2]), 1) if match else None
+
+
+def partition_bounds(month: date) -> tuple[datetime, datetime]:
+    """[lower, upper) bounds of a month partition in UTC."""
+    lower = datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+    upper = datetime.combine(add_months(month, 1), datetime.min.time(), tzinfo=timezone.utc)
+    return lower, upper
+
+
+def _literal(value: datetime) -> str:
+    # Partition bounds are DDL and cannot be bound parameters
+    return f"'{value.isoformat(sep=' ')}'"
+
+
+def is_partitioned(conn) -> bool:
+    """Whether the migration has turned transactions into a partitioned table."""
+    if conn.dialect.name != 'postgresql':
+        return False
+    return conn.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:parent))"
+    ), {'parent': PARENT}).scalar()
+
+
+def _table_exists(conn, name: str) -> bool:
+    return conn.execute(text('SELECT to_regclass(:name) IS NOT NULL'), {'name': name}).scalar()
+
+
+def _column_list(conn) -> str:
+    return conn.execute(text(
+        "SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum) FROM pg_attribute "
+        "WHERE attrelid = to_regclass(:parent) AND attnum > 0 AND NOT attisdropped"
+    ), {'parent': PARENT}).scalar()
+
+
+def list_partitions(conn) -> list[dict]:
+    """Attached partitions, oldest first, with planner row estimates and size."""
+    rows = conn.execute(text(
+        "SELECT c.relname AS name, pg_get_expr(c.relpartbound, c.oid) AS bounds, "
+        "       greatest(c.reltuples, 0)::bigint AS estimated_rows, "
+        "       pg_total_relation_size(c.oid) AS total_bytes "
+        "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:parent) ORDER BY c.relname"
+    ), {'parent': PARENT}).mappings()
+    return [{**row, 'month': partition_month(row['name'])} for row in rows]
+
+
+def create_partition(conn, month: date) -> bool:
+    """Create and attach the partition for month. Returns False if it exists.
+
+    Rows that already landed in the default partition for that month are
+    moved into the new partition first, since ATTACH rejects overlaps.
+    """
+    name = partition_name(month)
+    if _table_exists(conn, name):
+        return False
+
+    lower, upper = partition_bounds(month)
+    conn.execute(text(f'CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+    if _table_exists(conn, DEFAULT_PARTITION):
+        columns = _column_list(conn)
+        in_month = 'occurred_at >= :lower AND occurred_at < :upper'
+        bounds = {'lower': lower, 'upper': upper}
+        conn.execute(text(
+            f'INSERT INTO {name} ({columns}) SELECT {columns} FROM {DEFAULT_PARTITION} WHERE {in_month}'
+        ), bounds)
+        conn.execute(text(f'DELETE FROM {DEFAULT_PARTITION} WHERE {in_month}'), bounds)
+    # Matching indexes, primary key and foreign keys are created on attach
+    conn.execute(text(
+        f'ALTER TABLE {PARENT} ATTACH PARTITION {name} '
+        f'FOR VALUES FROM ({_literal(lower)}) TO ({_literal(upper)})'
+    ))
+    return True
+
+
+def ensure_partitions(conn, first_month: date, last_month: date) -> list[str]:
+    """Create every missing monthly partition in [first_month, last_month]."""
+    created = []
+    month = month_start(first_month)
+    while month <= last_month:
+        if create_partition(conn, month):
+            created.append(partition_name(month))
+        month = add_months(month, 1)
+    return created
+
+
+def months_before(conn, cutoff: date) -> list[date]:
+    """Months of attached partitions that end on or before cutoff."""
+    return sorted(
+        p['month'] for p in list_partitions(conn)
+        if p['month'] is not None and add_months(p['month'], 1) <= cutoff
+    )
+
+
+def detach_partition(conn, month: date, concurrently: bool = False) -> str:
+    """Detach month's partition; it stays as a plain table outside all queries.
+
+    CONCURRENTLY (PostgreSQL 14+) avoids blocking writers but needs a
+    connection in autocommit mode.
+    """
+    name = partition_name(month)
+    mode = ' CONCURRENTLY' if concurrently else ''
+    conn.execute(text(f'ALTER TABLE {PARENT} DETACH PARTITION {name}{mode}'))
+    return name
+
+
+def archive_partition(conn, month: date, directory: str) -> tuple[str, int]:
+    """Write month's rows to <directory>/<partition>.csv.gz, then drop the table.
+
+    Detaches the partition first if it is still attached.
+
+    Returns:
+        (archive path, rows written)
+    """
+    name = partition_name(month)
+    attached = any(p['name'] == name for p in list_partitions(conn))
+    if attached:
+        detach_partition(conn, month)
+
+    rows = conn.execute(text(f'SELECT count(*) FROM {name}')).scalar()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'{name}.csv.gz')
+    cursor = conn.connection.cursor()
+    try:
+        with gzip.open(path, 'wt', newline='') as f:
+            cursor.copy_expert(f'COPY {name} TO STDOUT WITH (FORMAT csv, HEADER)', f)
+    finally:
+        cursor.close()
+    conn.execute(text(f'DROP TABLE {name}'))
+    return path, rows
+
+
+def relations_in_plan(plan) -> set[str]:
+    """All 'Relation Name' entries of an EXPLAIN (FORMAT JSON) plan."""
+    found = set()
+    if isinstance(plan, dict):
+        if 'Relation Name' in plan:
+            found.add(plan['Relation Name'])
+        for value in plan.values():
+            found |= relations_in_plan(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            found |= relations_in_plan(value)
+    return found
+
+
+def scanned_partitions(conn, stmt) -> list[str]:
+    """Partitions the planner keeps for stmt after plan-time and initial pruning."""
+    compiled = stmt.compile(dialect=conn.dialect)
+    plan = conn.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {compiled}', compiled.params).scalar()
+    partitions = {p['name'] for p in list_partitions(conn)}
+    return sorted(relations_in_plan(plan) & partitions)
+
+
+def expected_partitions(lower: datetime, upper: datetime) -> list[str]:
+    """Monthly partitions a query bounded by [lower, upper] may touch."""
+    names = []
+    month = month_start(lower)
+    while month <= month_start(upper):
+        names.append(partition_name(month))
+        month = add_months(month, 1)
+    return names
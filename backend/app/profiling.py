@@ -0,0 +1,188 @@
+"""Admin-triggered sampling profiler for single requests.
+
+An ADMIN adds ``X-Profile: 1`` (or ``?profile=1``) to any request. A
+background thread then samples the request thread's Python stack every
+PROFILER_INTERVAL_MS until the response is ready, and the samples are written
+to PROFILE_DIR in collapsed-stack format (one ``frame;frame;frame count`` line
+per unique stack) - the input format of flamegraph.pl, speedscope and
+inferno. The response carries ``X-Profile-Id`` and a ``Link`` header pointing
+at GET /api/admin/profiles/<id>.
+
+Requests without the flag pay only the header/query lookup: no thread, no
+JWT decoding, no sampling. Non-admin requests with the flag are served
+normally and not profiled.
+"""
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+
+from flask import current_app, g, request
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
+
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_ID_PATTERN = re.compile(r'^[0-9]{8}T[0-9]{6}-[0-9a-f]{8}$')
+
+
+class SamplingProfiler:
+    """Sample one thread's stack at a fixed interval from a helper thread."""
+
+    def __init__(self, thread_id: int, interval: float = 0.002):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[_collapse(frame)] += 1
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    name = getattr(code, 'co_qualname', code.co_name)
+    return f'{os.path.basename(code.co_filename)}:{name}'.replace(';', ':')
+
+
+def _collapse(frame) -> str:
+    """Root-first 'a;b;c' stack string for a frame."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+def format_collapsed(samples: Counter) -> str:
+    """Collapsed-stack text, heaviest stacks first."""
+    return ''.join(f'{stack} {count}\n' for stack, count in samples.most_common())
+
+
+def profile_dir(app=None) -> str:
+    app = app or current_app
+    return app.config.get('PROFILE_DIR') or os.path.join(app.instance_path, 'profiles')
+
+
+def profile_paths(profile_id: str, app=None):
+    """(collapsed_path, meta_path) for a profile id, or None if the id is malformed."""
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    base = os.path.join(profile_dir(app), profile_id)
+    return base + '.collapsed', base + '.json'
+
+
+def list_profiles(app=None) -> list:
+    """Metadata of stored profiles, newest first."""
+    directory = profile_dir(app)
+    if not os.path.isdir(directory):
+        return []
+    items = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        if name.endswith('.json'):
+            with open(os.path.join(directory, name)) as f:
+                items.append(json.load(f))
+    return items
+
+
+def _prune(directory: str, keep: int) -> None:
+    ids = sorted(name[:-5] for name in os.listdir(directory) if name.endswith('.json'))
+    for profile_id in ids[:-keep] if keep else []:
+        for suffix in ('.json', '.collapsed'):
+            try:
+                os.remove(os.path.join(directory, profile_id + suffix))
+            except FileNotFoundError:
+                pass
+
+
+def _profile_requested() -> bool:
+    return request.headers.get(PROFILE_HEADER) == '1' or request.args.get('profile') == '1'
+
+
+def _is_admin() -> bool:
+    try:
+        verify_jwt_in_request(optional=True)
+    except Exception:
+        return False
+    return get_jwt().get('role') == 'ADMIN'
+
+
+def _save(app, samples, started, meta) -> str:
+    now = datetime.now(timezone.utc)
+    profile_id = f'{now:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}'
+    directory = profile_dir(app)
+    os.makedirs(directory, exist_ok=True)
+
+    collapsed_path, meta_path = profile_paths(profile_id, app)
+    with open(collapsed_path, 'w') as f:
+        f.write(format_collapsed(samples))
+    with open(meta_path, 'w') as f:
+        json.dump({
+            'id': profile_id,
+            'created_at': now.isoformat(),
+            'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+            'samples': sum(samples.values()),
+            **meta,
+        }, f)
+
+    _prune(directory, app.config.get('PROFILE_MAX_FILES', 200))
+    return profile_id
+
+
+def register_profiling(app):
+    """Install the opt-in profiler hooks (skipped when PROFILER_ENABLED is false)."""
+    if not app.config.get('PROFILER_ENABLED', True):
+        return
+
+    @app.before_request
+    def start_profiler():
+        if not _profile_requested() or not _is_admin():
+            return
+        profiler = SamplingProfiler(
+            threading.get_ident(),
+            interval=app.config.get('PROFILER_INTERVAL_MS', 2) / 1000
+        )
+        g.profiler = (profiler, time.perf_counter(), get_jwt_identity())
+        profiler.start()
+
+    @app.after_request
+    def save_profile(response):
+        state = g.pop('profiler', None)
+        if state is None:
+            return response
+        profiler, started, user_id = state
+        samples = profiler.stop()
+        profile_id = _save(app, samples, started, {
+            'method': request.method,
+            'path': request.full_path.rstrip('?'),
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'interval_ms': profiler.interval * 1000,
+            'user_id': user_id,
+        })
+        response.headers['X-Profile-Id'] = profile_id
+        response.headers['Link'] = f'</api/admin/profiles/{profile_id}>; rel="profile"'
+        return response
+
+    @app.teardown_request
+    def stop_profiler(exc):
+        # Unhandled exception: after_request did not run
+        state = g.pop('profiler', None)
+        if state is not None:
+            state[0].stop()
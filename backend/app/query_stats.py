@@ -0,0 +1,177 @@
+"""Per-request SQL query counting, timing and N+1 detection.
+
+Engine-level before/after_cursor_execute hooks record every statement into
+the active collectors: one per request (while QUERY_STATS_ENABLED) plus any
+opened with count_queries(). Per request:
+- Server-Timing header: ``db;dur=<ms>;desc="<n> queries"`` and ``app;dur=<ms>``
+- one structured log line (JSON), at WARNING when a statement shape repeats
+  QUERY_N_PLUS_ONE_THRESHOLD+ times (likely N+1) or the budget is exceeded
+- query budget: QUERY_BUDGETS[endpoint] or QUERY_BUDGET_DEFAULT (0 = none);
+  with QUERY_BUDGET_ENFORCE (tests) exceeding it raises QueryBudgetExceeded
+"""
+import json
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+_collectors: ContextVar[tuple] = ContextVar('query_stats_collectors', default=())
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+# Bound parameter in any DBAPI paramstyle: ?, %s, %(name)s, :name, $1
+_PARAM = r'(?:\?|%s|%\(\w+\)s|:\w+|\$\d+)'
+_PARAM_LIST_RE = re.compile(rf'\(\s*{_PARAM}(?:\s*,\s*{_PARAM})*\s*\)')
+_PARAM_RE = re.compile(_PARAM)
+
+_MAX_LOGGED_STATEMENT = 300
+
+
+class QueryBudgetExceeded(AssertionError):
+    """An endpoint ran more SQL statements than its configured budget."""
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce a SQL statement to its shape (literals and IN-lists collapsed)."""
+    shape = _WHITESPACE_RE.sub(' ', statement).strip()
+    shape = _STRING_RE.sub('?', shape)
+    shape = _PARAM_LIST_RE.sub('(?)', shape)
+    shape = _PARAM_RE.sub('?', shape)
+    return _NUMBER_RE.sub('?', shape)
+
+
+class QueryStats:
+    """Query count, total DB time and statement shapes for one scope."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration_ms = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        self.count += 1
+        self.duration_ms += duration_ms
+        self.shapes[normalize_statement(statement)] += 1
+
+    def repeated(self, threshold: int):
+        """Statement shapes executed at least threshold times, most frequent first."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+@contextmanager
+def count_queries():
+    """Collect stats for all statements run inside the block.
+
+    Usage:
+        with count_queries() as stats:
+            client.get('/api/draft-groups', headers=headers)
+        assert stats.count <= 5
+    """
+    stats = QueryStats()
+    _push(stats)
+    try:
+        yield stats
+    finally:
+        _pop(stats)
+
+
+def _push(stats: QueryStats) -> None:
+    _collectors.set(_collectors.get() + (stats,))
+
+
+def _pop(stats: QueryStats) -> None:
+    _collectors.set(tuple(c for c in _collectors.get() if c is not stats))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _collectors.get():
+        conn.info.setdefault('query_stats_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    collectors = _collectors.get()
+    starts = conn.info.get('query_stats_start')
+    if not collectors or not starts:
+        return
+    duration_ms = (time.perf_counter() - starts.pop()) * 1000
+    for stats in collectors:
+        stats.record(statement, duration_ms)
+
+
+def _query_budget(app) -> int:
+    budgets = app.config.get('QUERY_BUDGETS') or {}
+    return budgets.get(request.endpoint, app.config.get('QUERY_BUDGET_DEFAULT', 0))
+
+
+def register_query_stats(app):
+    """Install engine hooks and per-request reporting."""
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @app.before_request
+    def start_query_stats():
+        if not app.config.get('QUERY_STATS_ENABLED', True):
+            return
+        g.query_stats = QueryStats()
+        g.query_stats_started = time.perf_counter()
+        _push(g.query_stats)
+
+    @app.after_request
+    def report_query_stats(response):
+        stats = g.pop('query_stats', None)
+        if stats is None:
+            return response
+        _pop(stats)
+
+        request_ms = (time.perf_counter() - g.pop('query_stats_started')) * 1000
+        response.headers.add(
+            'Server-Timing', f'db;dur={stats.duration_ms:.2f};desc="{stats.count} queries"'
+        )
+        response.headers.add('Server-Timing', f'app;dur={request_ms:.2f}')
+
+        threshold = app.config.get('QUERY_N_PLUS_ONE_THRESHOLD', 5)
+        repeated = stats.repeated(threshold)
+        budget = _query_budget(app)
+        over_budget = bool(budget) and stats.count > budget
+
+        record = {
+            'event': 'query_stats',
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'queries': stats.count,
+            'db_ms': round(stats.duration_ms, 2),
+            'request_ms': round(request_ms, 2),
+            'budget': budget or None,
+            'repeated': [
+                {'statement': shape[:_MAX_LOGGED_STATEMENT], 'count': n}
+                for shape, n in repeated
+            ],
+        }
+        if repeated or over_budget:
+            app.logger.warning(json.dumps(record))
+        else:
+            app.logger.info(json.dumps(record))
+
+        if over_budget and app.config.get('QUERY_BUDGET_ENFORCE', False):
+            raise QueryBudgetExceeded(
+                f'{request.endpoint} ran {stats.count} queries (budget {budget}); '
+                f'repeated: {record["repeated"]}'
+            )
+        return response
+
+    @app.teardown_request
+    def discard_query_stats(exc):
+        # after_request is skipped on unhandled errors
+        stats = g.pop('query_stats', None)
+        if stats is not None:
+            _pop(stats)
@@ -0,0 +1,16 @@
+"""Scale gateway: hardware scales as an input source for weigh-in drafts."""
+from .gateway import ScaleConfig, ScaleGateway, app_submitter
+from .readers import SerialScale, SimulatedScale, TcpScale, open_scale, parse_reading
+from .stability import StabilityDetector
+
+__all__ = [
+    'ScaleConfig',
+    'ScaleGateway',
+    'app_submitter',
+    'SerialScale',
+    'SimulatedScale',
+    'TcpScale',
+    'open_scale',
+    'parse_reading',
+    'StabilityDetector',
+]
@@ -0,0 +1,199 @@
+"""Scale gateway - stable weighings from many scales, submitted as draft groups.
+
+Each scale runs as its own asyncio task. Its readings go through a
+StabilityDetector, and only stable weighings become draft lines on a shared
+queue. A single submitter task drains that queue in batches: up to
+batch_size lines, or whatever arrived within flush_seconds of the first
+one. It creates one draft group per (location, user) through
+draft_group_service.create_group. Raw readings never reach the database.
+"""
+import asyncio
+import uuid
+from collections import Counter, defaultdict
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+from ..error_handling import AppError
+from .readers import open_scale
+from .stability import StabilityDetector
+
+
+# submit(location_id, user_id, lines) -> group id
+Submit = Callable[[int, int, List[Dict]], Awaitable[int]]
+
+
+class ScaleConfig:
+    """One scale: where to read it and what its weighings are booked as."""
+
+    def __init__(self, name: str, source: str, location_id: int, user_id: int,
+                 article_id: Optional[int] = None, batch_id='auto', window: int = 10,
+                 max_std_kg: float = 0.005, min_weight_kg: float = 0.05, zero_band_kg: float = 0.02):
+        self.name = name
+        self.source = source
+        self.location_id = location_id
+        self.user_id = user_id
+        self.article_id = article_id
+        self.batch_id = batch_id
+        self.window = window
+        self.max_std_kg = max_std_kg
+        self.min_weight_kg = min_weight_kg
+        self.zero_band_kg = zero_band_kg
+
+    @classmethod
+    def from_dict(cls, data: Dict, defaults: Optional[Dict] = None) -> 'ScaleConfig':
+        return cls(**{**(defaults or {}), **data})
+
+    def detector(self) -> StabilityDetector:
+        return StabilityDetector(self.window, self.max_std_kg, self.min_weight_kg, self.zero_band_kg)
+
+
+def app_submitter(app, source: str = 'scale') -> Submit:
+    """submit() that runs create_group in a worker thread with its own app context."""
+    from ..services import draft_group_service
+
+    def create(location_id, user_id, lines):
+        with app.app_context():
+            return draft_group_service.create_group(location_id, user_id, lines, source=source).id
+
+    async def submit(location_id, user_id, lines):
+        return await asyncio.to_thread(create, location_id, user_id, lines)
+
+    return submit
+
+
+class ScaleGateway:
+    """Reads all scales concurrently and submits their stable weighings in batches."""
+
+    def __init__(self, scales: Iterable[ScaleConfig], submit: Submit, batch_size: int = 20,
+                 flush_seconds: float = 2.0, retry_seconds: float = 5.0, max_attempts: int = 5,
+                 run_id: Optional[str] = None, echo: Optional[Callable[[str], None]] = None):
+        self.scales = {scale.name: scale for scale in scales}
+        self.submit = submit
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.retry_seconds = retry_seconds
+        self.max_attempts = max_attempts
+        # client_event_ids are scale-<name>-<run_id>-<seq>: unique per run, stable across retries
+        self.run_id = run_id or uuid.uuid4().hex[:8]
+        self.echo = echo or (lambda message: None)
+        self.stats = Counter()
+        self.group_ids: List[int] = []
+        self._seq = 0
+        self._queue: Optional[asyncio.Queue] = None
+
+    def assign(self, scale_name: str, article_id: Optional[int], batch_id='auto') -> None:
+        """Book a scale's next weighings on another article (None stops booking)."""
+        scale = self.scales[scale_name]
+        scale.article_id = article_id
+        scale.batch_id = batch_id
+
+    def _line(self, scale: ScaleConfig, weight_kg: float) -> Dict:
+        self._seq += 1
+        return {
+            'location_id': scale.location_id,
+            'user_id': scale.user_id,
+            'line': {
+                'article_id': scale.article_id,
+                'batch_id': scale.batch_id,
+                'quantity_kg': round(weight_kg, 2),
+                'client_event_id': f'scale-{scale.name}-{self.run_id}-{self._seq:06d}',
+                'note': f'Scale {scale.name}',
+            },
+        }
+
+    async def _read(self, scale: ScaleConfig) -> None:
+        detector = scale.detector()
+        async for value in open_scale(scale.source).readings():
+            self.stats['readings'] += 1
+            weight = detector.add(value)
+            if weight is None:
+                continue
+            self.stats['stable'] += 1
+            if scale.article_id is None:
+                self.stats['unassigned'] += 1
+                self.echo(f'{scale.name}: {weight:.3f} kg with no article assigned, dropped')
+                continue
+            await self._queue.put(self._line(scale, weight))
+
+    async def _next_batch(self) -> List[Dict]:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_seconds
+        while len(batch) < self.batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _submit_lines(self, location_id: int, user_id: int, lines: List[Dict]) -> None:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                group_id = await self.submit(location_id, user_id, lines)
+            except AppError as e:
+                if len(lines) > 1:
+                    # Groups are atomic: one bad line must not take the others down
+                    for line in lines:
+                        await self._submit_lines(location_id, user_id, [line])
+                elif e.code == 'DUPLICATE_EVENT_ID':
+                    self.stats['duplicates'] += 1
+                else:
+                    self.stats['rejected'] += 1
+                    self.echo(f"{lines[0]['client_event_id']}: rejected ({e.code}: {e.message})")
+                return
+            except Exception as e:
+                self.stats['retries'] += 1
+                self.echo(f'Submitting {len(lines)} lines failed (attempt {attempt}): {e}')
+                if attempt < self.max_attempts:
+                    await asyncio.sleep(self.retry_seconds)
+                continue
+            self.group_ids.append(group_id)
+            self.stats['groups'] += 1
+            self.stats['submitted'] += len(lines)
+            return
+        self.stats['failed'] += len(lines)
+
+    async def _submit_loop(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            by_key = defaultdict(list)
+            for item in batch:
+                by_key[(item['location_id'], item['user_id'])].append(item['line'])
+            for (location_id, user_id), lines in by_key.items():
+                await self._submit_lines(location_id, user_id, lines)
+            for _ in batch:
+                self._queue.task_done()
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> Counter:
+        """Read every scale until its stream ends or stop is set, then submit what is queued.
+
+        Returns:
+            Counters: readings, stable, groups, submitted, unassigned, rejected,
+            duplicates, retries, failed
+        """
+        self._queue = asyncio.Queue()
+        readers = [asyncio.create_task(self._read(scale)) for scale in self.scales.values()]
+        submitter = asyncio.create_task(self._submit_loop())
+        try:
+            readers_done = asyncio.gather(*readers)
+            if stop is None:
+                await readers_done
+            else:
+                stopped = asyncio.create_task(stop.wait())
+                await asyncio.wait([readers_done, stopped], return_when=asyncio.FIRST_COMPLETED)
+                stopped.cancel()
+                if readers_done.done():
+                    # Reader errors (bad source, missing driver) propagate
+                    await readers_done
+                else:
+                    readers_done.cancel()
+                    await asyncio.gather(readers_done, return_exceptions=True)
+            await self._queue.join()
+        finally:
+            for task in readers:
+                task.cancel()
+            submitter.cancel()
+            await asyncio.gather(submitter, return_exceptions=True)
+        return self.stats
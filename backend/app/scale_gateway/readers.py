@@ -0,0 +1,160 @@
+"""Scale readers: raw weight streams from TCP, serial or simulated scales.
+
+Every reader is an async iterator of readings in kg. Network and serial
+scales send one reading per line in the usual ASCII formats (for example
+`ST,GS,+0012.345 kg`, `S S     12.345 kg`, `12345 g`); lines without a
+weight (overload, errors, status lines) are skipped.
+
+Source URLs:
+    tcp://host:port                           scale or serial-to-Ethernet converter
+    serial:///dev/ttyUSB0?baudrate=9600       needs pyserial-asyncio
+    sim://?plateaus=0:2,1.25:3,0:2&rate=20&noise=0.002&seed=1
+"""
+import asyncio
+import random
+import re
+from typing import AsyncIterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+try:
+    import serial_asyncio
+except ImportError:  # pragma: no cover - exercised only with pyserial-asyncio
+    serial_asyncio = None
+
+
+_READING = re.compile(r'([-+]?)\s*(\d+(?:[.,]\d+)?)\s*(kg|g|lb)?\b', re.IGNORECASE)
+_UNIT_KG = {'kg': 1.0, 'g': 0.001, 'lb': 0.45359237}
+
+
+def parse_reading(line: str) -> Optional[float]:
+    """Weight in kg from one scale output line, None if the line carries no weight."""
+    match = _READING.search(line)
+    if not match:
+        return None
+    sign, number, unit = match.groups()
+    if unit is None and not re.search(r'[.,]', number):
+        # Bare integers are status/error codes ("E 3"), not weights
+        return None
+    value = float(number.replace(',', '.')) * _UNIT_KG[(unit or 'kg').lower()]
+    return -value if sign == '-' else value
+
+
+async def _stream_lines(reader: asyncio.StreamReader) -> AsyncIterator[float]:
+    while True:
+        raw = await reader.readline()
+        if not raw:
+            return
+        value = parse_reading(raw.decode('ascii', errors='replace'))
+        if value is not None:
+            yield value
+
+
+class TcpScale:
+    """Scale (or serial-to-Ethernet converter) that streams readings over TCP.
+
+    Reconnects with exponential backoff (up to max_backoff seconds) when the
+    connection drops.
+    """
+
+    def __init__(self, host: str, port: int, max_backoff: float = 30.0):
+        self.host = host
+        self.port = port
+        self.max_backoff = max_backoff
+
+    async def readings(self) -> AsyncIterator[float]:
+        backoff = 0.5
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+            except OSError:
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+            backoff = 0.5
+            try:
+                async for value in _stream_lines(reader):
+                    yield value
+            except OSError:
+                pass
+            finally:
+                writer.close()
+
+
+class SerialScale:
+    """Scale on a serial port (RS-232/USB). Requires pyserial-asyncio."""
+
+    def __init__(self, port: str, baudrate: int = 9600):
+        if serial_asyncio is None:
+            raise RuntimeError('Serial scales need pyserial-asyncio (pip install pyserial-asyncio)')
+        self.port = port
+        self.baudrate = baudrate
+
+    async def readings(self) -> AsyncIterator[float]:
+        reader, writer = await serial_asyncio.open_serial_connection(url=self.port, baudrate=self.baudrate)
+        try:
+            async for value in _stream_lines(reader):
+                yield value
+        finally:
+            writer.close()
+
+
+class SimulatedScale:
+    """Local stand-in for a scale: noisy plateaus at a fixed sample rate.
+
+    Each plateau is (weight_kg, seconds). Moving between plateaus takes a few
+    unstable samples, as when a container is put down or lifted. rate=0
+    yields without sleeping (tests).
+    """
+
+    def __init__(self, plateaus: List[Tuple[float, float]], rate: float = 20.0,
+                 noise_kg: float = 0.002, seed: Optional[int] = None, repeat: bool = False):
+        self.plateaus = plateaus
+        self.rate = rate
+        self.noise_kg = noise_kg
+        self.repeat = repeat
+        self.rng = random.Random(seed)
+
+    def samples(self):
+        """The reading sequence, without timing."""
+        samples_per_second = self.rate or 20.0
+        previous = 0.0
+        while True:
+            for weight, seconds in self.plateaus:
+                # Settling: overshoot and ringing towards the new weight
+                for step in range(1, 4):
+                    yield weight + (previous - weight) / (2 * step) + self.rng.uniform(-0.05, 0.05)
+                for _ in range(max(int(seconds * samples_per_second), 1)):
+                    yield weight + self.rng.gauss(0, self.noise_kg)
+                previous = weight
+            if not self.repeat:
+                return
+
+    async def readings(self) -> AsyncIterator[float]:
+        interval = 1 / self.rate if self.rate else 0
+        for value in self.samples():
+            yield round(value, 3)
+            # sleep(0) still lets the other scales and the submitter run
+            await asyncio.sleep(interval)
+
+
+def open_scale(source: str):
+    """Reader for a source URL (see module docstring)."""
+    parts = urlsplit(source)
+    query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+    if parts.scheme == 'tcp':
+        return TcpScale(parts.hostname, parts.port)
+    if parts.scheme == 'serial':
+        return SerialScale(parts.path, int(query.get('baudrate', 9600)))
+    if parts.scheme == 'sim':
+        plateaus = [
+            (float(weight), float(seconds))
+            for weight, seconds in (item.split(':') for item in query.get('plateaus', '0:2,1:3').split(','))
+        ]
+        return SimulatedScale(
+            plateaus,
+            rate=float(query.get('rate', 20)),
+            noise_kg=float(query.get('noise', 0.002)),
+            seed=int(query['seed']) if 'seed' in query else None,
+            repeat=query.get('repeat', 'false') == 'true'
+        )
+    raise ValueError(f'Unsupported scale source: {source}')
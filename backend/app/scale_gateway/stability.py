@@ -0,0 +1,70 @@
+"""Stable-weight detection over a raw scale stream."""
+from collections import deque
+from typing import Optional
+
+
+class StabilityDetector:
+    """Rolling-window variance filter that turns raw readings into weighings.
+
+    The last `window` readings are kept with their running sum and sum of
+    squares, so every reading costs O(1). The window is stable when it is
+    full and its standard deviation is at most max_std_kg.
+
+    A stable window near zero (within zero_band_kg) arms the detector. The
+    next stable window at or above min_weight_kg is reported once, as its
+    mean, and disarms it again. A load left on the scale is therefore not
+    reported twice; it has to come off first.
+    """
+
+    # Readings between exact re-sums of the window (bounds float drift)
+    RESUM_EVERY = 10_000
+
+    def __init__(self, window: int = 10, max_std_kg: float = 0.005,
+                 min_weight_kg: float = 0.05, zero_band_kg: float = 0.02):
+        if window < 2:
+            raise ValueError('window must be at least 2 readings')
+        self.max_variance = max_std_kg ** 2
+        self.min_weight_kg = min_weight_kg
+        self.zero_band_kg = zero_band_kg
+        self._values = deque(maxlen=window)
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._since_resum = 0
+        self.armed = True
+
+    def _push(self, value: float) -> None:
+        if len(self._values) == self._values.maxlen:
+            oldest = self._values[0]
+            self._sum -= oldest
+            self._sum_sq -= oldest * oldest
+        self._values.append(value)
+        self._sum += value
+        self._sum_sq += value * value
+        self._since_resum += 1
+        if self._since_resum >= self.RESUM_EVERY:
+            self._sum = sum(self._values)
+            self._sum_sq = sum(v * v for v in self._values)
+            self._since_resum = 0
+
+    def stable_mean(self) -> Optional[float]:
+        """Mean of the window if it is full and stable, else None."""
+        n = len(self._values)
+        if n < self._values.maxlen:
+            return None
+        mean = self._sum / n
+        variance = max(self._sum_sq / n - mean * mean, 0.0)
+        return mean if variance <= self.max_variance else None
+
+    def add(self, value: float) -> Optional[float]:
+        """Feed one reading (kg). Returns the weight of a new stable weighing, else None."""
+        self._push(value)
+        mean = self.stable_mean()
+        if mean is None:
+            return None
+        if abs(mean) <= self.zero_band_kg:
+            self.armed = True
+            return None
+        if self.armed and mean >= self.min_weight_kg:
+            self.armed = False
+            return mean
+        return None
@@ -0,0 +1,39 @@
+"""Alert Marshmallow schemas."""
+from marshmallow import Schema, fields, validate
+
+
+class AlertSchema(Schema):
+    """Alert response schema."""
+    id = fields.Integer(dump_only=True)
+    alert_type = fields.String()
+    status = fields.String()
+    location_id = fields.Integer()
+    article_id = fields.Integer()
+    article_no = fields.String(attribute='article.article_no')
+    threshold_kg = fields.Float()
+    on_hand_kg = fields.Float(metadata={'description': 'Stock + surplus when the alert opened'})
+    resolved_on_hand_kg = fields.Float(allow_none=True)
+    triggered_at = fields.DateTime()
+    resolved_at = fields.DateTime(allow_none=True)
+
+
+class AlertQuerySchema(Schema):
+    """Query parameters for listing alerts."""
+    status = fields.String(
+        load_default='OPEN',
+        validate=validate.OneOf(['OPEN', 'RESOLVED', 'ALL']),
+        metadata={'description': 'OPEN (default), RESOLVED or ALL'}
+    )
+    location_id = fields.Integer(metadata={'description': 'Filter by location'})
+    article_id = fields.Integer(metadata={'description': 'Filter by article'})
+    limit = fields.Integer(
+        load_default=100,
+        validate=validate.Range(min=1, max=1000),
+        metadata={'description': 'Newest alerts first'}
+    )
+
+
+class AlertListSchema(Schema):
+    """List of alerts response."""
+    items = fields.List(fields.Nested(AlertSchema))
+    total = fields.Integer()
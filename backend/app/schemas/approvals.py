@@ -12,6 +12,13 @@ class ApprovalActionSchema(Schema):
     new_value = fields.Dict(allow_none=True)
     note = fields.String(allow_none=True)
     created_at = fields.String(dump_only=True)  # Already serialized as ISO string from to_dict()
+    archived_at = fields.String(dump_only=True)  # Only set on archived actions
+
+
+class ApprovalActionListSchema(Schema):
+    """Approval actions of a draft."""
+    items = fields.List(fields.Nested(ApprovalActionSchema))
+    total = fields.Integer()
 
 
 class ApprovalRequestSchema(Schema):
@@ -28,6 +28,12 @@ class ArticleSchema(Schema):
         allow_none=True,
         metadata={'description': 'Last consumption date (STOCK_CONSUMED or SURPLUS_CONSUMED)'}
     )
+    # Precomputed in article_stock_totals; list responses only
+    earliest_expiry_date = fields.Date(
+        dump_only=True,
+        allow_none=True,
+        metadata={'description': 'First expiry of an active batch that still holds stock'}
+    )
 
 
 class ArticleCreateSchema(Schema):
@@ -61,3 +67,37 @@ class ArticleListSchema(Schema):
     items = fields.List(fields.Nested(ArticleSchema))
     total = fields.Integer()
 
+
+
+class ArticleSearchQuerySchema(Schema):
+    """Query parameters for article search."""
+    q = fields.String(
+        required=True,
+        validate=validate.Length(min=1, max=200),
+        metadata={'description': 'Words matched against article_no, description, manufacturer, '
+                                 'manufacturer_art_number and aliases (prefixes and typos allowed)'}
+    )
+    active = fields.String(
+        load_default='true',
+        validate=validate.OneOf(['true', 'false', 'all']),
+        metadata={'description': 'true (default): active only, false: archived only, all'}
+    )
+    page = fields.Integer(load_default=1, validate=validate.Range(min=1), metadata={'description': 'Page number'})
+    per_page = fields.Integer(
+        load_default=20,
+        validate=validate.Range(min=1, max=100),
+        metadata={'description': 'Items per page'}
+    )
+
+
+class ArticleSearchItemSchema(ArticleSchema):
+    """Article search hit."""
+    score = fields.Float(dump_only=True, metadata={'description': 'Relevance, best first'})
+
+
+class ArticleSearchSchema(Schema):
+    """Ranked, paginated article search response."""
+    items = fields.List(fields.Nested(ArticleSearchItemSchema))
+    total = fields.Integer(metadata={'description': 'Matches over all pages'})
+    page = fields.Integer()
+    per_page = fields.Integer()
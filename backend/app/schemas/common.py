@@ -25,6 +25,14 @@ class PaginationSchema(Schema):
     per_page = fields.Integer(load_default=50, metadata={'description': 'Items per page'})
 
 
+class ArchiveQuerySchema(Schema):
+    """Query parameter for reads that can include archived rows."""
+    include_archived = fields.Boolean(
+        load_default=False,
+        metadata={'description': 'Also return rows moved to the archive tables'}
+    )
+
+
 class NotImplementedSchema(Schema):
     """Not implemented response."""
     error = fields.Nested(ErrorDetailSchema, required=True)
@@ -1,5 +1,17 @@
-from marshmallow import Schema, fields, validate
+from marshmallow import Schema, ValidationError, fields, validate
 from .drafts import DraftSchema
+from ..services.batch_service import BATCH_AUTO
+
+
+class BatchIdField(fields.Integer):
+    """Batch id, or "auto" to let the server pick batches in FEFO order."""
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        if value == BATCH_AUTO:
+            return BATCH_AUTO
+        if isinstance(value, str) and not value.strip().isdigit():
+            raise ValidationError('Must be a batch id or "auto".')
+        return super()._deserialize(value, attr, data, **kwargs)
 
 
 class DraftGroupLineSchema(Schema):
@@ -7,7 +19,9 @@ class DraftGroupLineSchema(Schema):
     id = fields.Integer(dump_only=True)
     location_id = fields.Integer(required=False) # Can be inherited from group
     article_id = fields.Integer(required=True)
-    batch_id = fields.Integer(allow_none=True, load_default=None)
+    batch_id = BatchIdField(allow_none=True, load_default=None, metadata={
+        'description': 'Batch id, or "auto" for the earliest-expiring batches with stock at the location'
+    })
     quantity_kg = fields.Float(required=True, validate=validate.Range(min=0.01, max=9999.99))
     draft_type = fields.String(dump_default='WEIGH_IN', validate=validate.OneOf(['WEIGH_IN', 'INVENTORY_SHORTAGE']))
     note = fields.String(allow_none=True)
@@ -25,6 +39,7 @@ class DraftGroupSchema(Schema):
     created_at = fields.DateTime(dump_only=True)
     line_count = fields.Integer(dump_only=True)
     total_quantity_kg = fields.Float(dump_only=True)
+    archived_at = fields.DateTime(dump_only=True, metadata={'description': 'Only set on archived groups'})
     
     # Nested drafts (lines)
     drafts = fields.List(fields.Nested(DraftSchema), dump_only=True)
@@ -41,6 +56,7 @@ class DraftGroupSummarySchema(Schema):
     created_at = fields.DateTime(dump_only=True)
     line_count = fields.Integer(dump_only=True)
     total_quantity_kg = fields.Float(dump_only=True)
+    archived_at = fields.DateTime(dump_only=True, metadata={'description': 'Only set on archived groups'})
 
 
 class DraftGroupCreateSchema(Schema):
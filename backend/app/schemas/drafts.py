@@ -21,6 +21,7 @@ class DraftSchema(Schema):
     client_event_id = fields.String(required=True)
     note = fields.String(allow_none=True)
     created_at = fields.DateTime(dump_only=True)
+    archived_at = fields.DateTime(dump_only=True, metadata={'description': 'Only set on archived drafts'})
 
 
 class DraftCreateSchema(Schema):
@@ -95,6 +96,10 @@ class DraftQuerySchema(Schema):
     )
     location_id = fields.Integer(metadata={'description': 'Filter by location'})
     article_id = fields.Integer(metadata={'description': 'Filter by article'})
+    include_archived = fields.Boolean(
+        load_default=False,
+        metadata={'description': 'Also return finalized drafts moved to the archive'}
+    )
 
 
 class DraftListSchema(Schema):
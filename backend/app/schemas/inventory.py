@@ -170,3 +170,36 @@ class ReceiptHistoryResponseSchema(Schema):
     history = fields.List(fields.Nested(ReceiptHistoryItemSchema))
     total = fields.Integer()
 
+
+
+class ExpiringQuerySchema(Schema):
+    """Query parameters for batches expiring soon."""
+    days = fields.Integer(
+        load_default=30,
+        validate=validate.Range(min=0, max=3650),
+        metadata={'description': 'Batches expiring within this many days (already expired included)'}
+    )
+    location_id = fields.Integer(load_default=13, metadata={'description': 'Location ID (defaults to 13)'})
+    article_id = fields.Integer(metadata={'description': 'Filter by article ID'})
+
+
+class ExpiringItemSchema(Schema):
+    """Batch with stock that expires soon."""
+    batch_id = fields.Integer()
+    batch_code = fields.String()
+    expiry_date = fields.Date()
+    days_left = fields.Integer(metadata={'description': 'Negative once expired'})
+    article_id = fields.Integer()
+    article_no = fields.String()
+    description = fields.String(allow_none=True)
+    stock_qty = fields.Float()
+    surplus_qty = fields.Float()
+    total_qty = fields.Float()
+
+
+class ExpiringResponseSchema(Schema):
+    """Batches expiring soon, earliest first (FEFO order)."""
+    items = fields.List(fields.Nested(ExpiringItemSchema))
+    total = fields.Integer()
+    as_of = fields.Date()
+    until = fields.Date()
@@ -0,0 +1,22 @@
+"""Request profile Marshmallow schemas."""
+from marshmallow import Schema, fields
+
+
+class ProfileSchema(Schema):
+    """Metadata of one stored request profile."""
+    id = fields.String()
+    created_at = fields.String()
+    method = fields.String()
+    path = fields.String()
+    endpoint = fields.String(allow_none=True)
+    status = fields.Integer()
+    duration_ms = fields.Float()
+    samples = fields.Integer()
+    interval_ms = fields.Float()
+    user_id = fields.String(allow_none=True)
+
+
+class ProfileListSchema(Schema):
+    """Stored request profiles, newest first."""
+    items = fields.List(fields.Nested(ProfileSchema))
+    total = fields.Integer()
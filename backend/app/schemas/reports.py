@@ -1,5 +1,5 @@
 """Report Marshmallow schemas."""
-from marshmallow import Schema, fields
+from marshmallow import Schema, fields, validate
 
 
 class InventoryItemSchema(Schema):
@@ -19,6 +19,9 @@ class InventoryReportSchema(Schema):
     items = fields.List(fields.Nested(InventoryItemSchema))
     total = fields.Integer()
     generated_at = fields.DateTime()
+    as_of = fields.Date(metadata={'description': 'Only for as_of reports'})
+    source = fields.String(metadata={'description': 'Starting point of an as_of report: snapshot or current'})
+    snapshot_date = fields.Date(allow_none=True, metadata={'description': 'Snapshot used for an as_of report'})
 
 
 class TransactionItemSchema(Schema):
@@ -48,3 +51,75 @@ class ReportQuerySchema(Schema):
     article_id = fields.Integer(metadata={'description': 'Filter by article'})
     from_date = fields.Date(metadata={'description': 'Start date'})
     to_date = fields.Date(metadata={'description': 'End date'})
+
+
+class InventoryReportQuerySchema(ReportQuerySchema):
+    """Query parameters for the inventory report."""
+    as_of = fields.Date(metadata={'description': 'Balances at the end of this day (UTC) instead of now'})
+
+
+class MovementReportQuerySchema(ReportQuerySchema):
+    """Query parameters for the movement report."""
+    by_day = fields.Boolean(load_default=False, metadata={'description': 'One row per day instead of period totals'})
+
+
+class MovementItemSchema(Schema):
+    """Summed transactions of one article and tx_type."""
+    day = fields.Date(metadata={'description': 'Only with by_day'})
+    location_id = fields.Integer()
+    article_id = fields.Integer()
+    article_no = fields.String()
+    tx_type = fields.String()
+    quantity_kg = fields.Float()
+    tx_count = fields.Integer()
+
+
+class MovementReportSchema(Schema):
+    """Movement report response."""
+    items = fields.List(fields.Nested(MovementItemSchema))
+    total = fields.Integer()
+    generated_at = fields.DateTime()
+    from_date = fields.Date()
+    to_date = fields.Date()
+
+
+class ConsumptionForecastQuerySchema(Schema):
+    """Query parameters for the consumption forecast."""
+    location_id = fields.Integer(metadata={'description': 'Filter by location'})
+    to_date = fields.Date(metadata={'description': 'Last day of the window (default: today, UTC)'})
+    window_days = fields.Integer(load_default=90, validate=validate.Range(min=7, max=365),
+                                 metadata={'description': 'Days of history'})
+    rolling_days = fields.Integer(load_default=7, validate=validate.Range(min=1, max=90),
+                                  metadata={'description': 'Rolling average span'})
+    alpha = fields.Float(load_default=0.3, validate=validate.Range(min=0, max=1, min_inclusive=False),
+                         metadata={'description': 'Exponential smoothing factor'})
+    lead_time_days = fields.Integer(load_default=14, validate=validate.Range(min=1, max=365),
+                                    metadata={'description': 'Replenishment lead time'})
+    safety_factor = fields.Float(load_default=1.65, validate=validate.Range(min=0, max=5),
+                                 metadata={'description': 'Standard deviations of safety stock (1.65 ~ 95%)'})
+
+
+class ConsumptionForecastItemSchema(Schema):
+    """Consumption statistics and reorder suggestion for one article."""
+    article_id = fields.Integer()
+    article_no = fields.String()
+    reorder_threshold = fields.Float(allow_none=True, metadata={'description': 'Currently configured threshold'})
+    on_hand_kg = fields.Float(metadata={'description': 'Current stock + surplus'})
+    avg_daily_kg = fields.Float()
+    rolling_avg_kg = fields.Float(metadata={'description': 'Mean of the last rolling_days'})
+    peak_rolling_avg_kg = fields.Float()
+    forecast_daily_kg = fields.Float(metadata={'description': 'Exponentially smoothed daily consumption'})
+    safety_stock_kg = fields.Float()
+    reorder_point_kg = fields.Float(metadata={'description': 'Suggested reorder_threshold'})
+    days_of_cover = fields.Float(allow_none=True, metadata={'description': 'None without consumption'})
+    below_reorder_point = fields.Boolean()
+
+
+class ConsumptionForecastSchema(Schema):
+    """Consumption forecast response."""
+    items = fields.List(fields.Nested(ConsumptionForecastItemSchema))
+    total = fields.Integer()
+    generated_at = fields.DateTime()
+    from_date = fields.Date()
+    to_date = fields.Date()
+    compute_ms = fields.Float()
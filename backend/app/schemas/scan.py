@@ -0,0 +1,58 @@
+"""Scan resolution Marshmallow schemas."""
+from marshmallow import Schema, fields, validate
+
+from .batches import BatchSchema
+
+
+# Codes per request; a scan session is flushed long before this
+MAX_SCAN_CODES = 500
+
+
+class ScanArticleSchema(Schema):
+    """What a scanner client needs to show and book a scanned article."""
+    id = fields.Integer()
+    article_no = fields.String()
+    description = fields.String(allow_none=True)
+    barcode = fields.String(allow_none=True)
+    uom = fields.String()
+    manufacturer = fields.String(allow_none=True)
+    is_paint = fields.Boolean()
+    is_active = fields.Boolean()
+
+
+class ScanResolveSchema(Schema):
+    """Schema for resolving scanned codes."""
+    codes = fields.List(
+        fields.String(validate=validate.Length(max=200)),
+        required=True,
+        validate=validate.Length(min=1, max=MAX_SCAN_CODES),
+        metadata={'description': 'Scanned codes in scan order: barcode, article_no, alias or batch code'}
+    )
+
+
+class ScanCandidateSchema(Schema):
+    """Article and batch an ambiguous batch code may refer to."""
+    article = fields.Nested(ScanArticleSchema)
+    batch = fields.Nested(BatchSchema)
+
+
+class ScanResultSchema(Schema):
+    """Resolution of one scanned code."""
+    code = fields.String()
+    match = fields.String(
+        allow_none=True,
+        metadata={'description': 'barcode, article_no, alias or batch; null if unresolved'}
+    )
+    article = fields.Nested(ScanArticleSchema, allow_none=True)
+    batch = fields.Nested(BatchSchema, allow_none=True)
+    candidates = fields.List(
+        fields.Nested(ScanCandidateSchema),
+        metadata={'description': 'Batch code found for several articles and not disambiguated by the previous scan'}
+    )
+
+
+class ScanResolveResponseSchema(Schema):
+    """Scan resolution response."""
+    items = fields.List(fields.Nested(ScanResultSchema))
+    total = fields.Integer()
+    resolved = fields.Integer()
@@ -14,6 +14,8 @@ class TransactionSchema(Schema):
     user_id = fields.Integer(allow_none=True)
     source = fields.String()
     client_event_id = fields.String(allow_none=True)
+    draft_id = fields.Integer(allow_none=True)
+    reason = fields.String(allow_none=True)
     meta = fields.Dict(allow_none=True)
     # Denormalized fields for convenience
     article_no = fields.String(allow_none=True)
@@ -30,6 +32,8 @@ class TransactionQuerySchema(Schema):
         validate=validate.OneOf(['WEIGH_IN', 'SURPLUS_CONSUMED', 'STOCK_CONSUMED', 'INVENTORY_ADJUSTMENT']),
         metadata={'description': 'Filter by transaction type'}
     )
+    draft_id = fields.Integer(metadata={'description': 'Filter by the draft that produced the transaction'})
+    reason = fields.String(metadata={'description': 'Filter by reason (e.g. inventory_shortage_approved)'})
     from_ = fields.DateTime(
         data_key='from',
         metadata={'description': 'Filter transactions from this datetime (ISO format)'}
@@ -0,0 +1,96 @@
+"""Fast response serialization for large list endpoints.
+
+List endpoints build plain dict rows straight from Core queries. By default
+those rows still go through the Marshmallow response schema. When
+FAST_SERIALIZATION is enabled (or the client asks for msgpack), the rows are
+encoded directly:
+- JSON via orjson when installed, stdlib json otherwise
+- msgpack when the client sends ``Accept: application/msgpack``
+
+Both encoders handle Decimal (as float) and date/datetime (ISO 8601), and use
+the same field names and sorted key order as the Marshmallow/jsonify path.
+"""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from flask import current_app, request
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+MSGPACK_MIMETYPES = (MSGPACK_MIMETYPE, 'application/x-msgpack')
+
+
+def _default(value):
+    """Convert types the encoders do not handle natively."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not serializable')
+
+
+def dumps_json(payload) -> bytes:
+    """Encode payload as compact JSON with sorted keys (matches jsonify)."""
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(
+        payload, default=_default, separators=(',', ':'), sort_keys=True
+    ).encode('utf-8')
+
+
+def dumps_msgpack(payload) -> bytes:
+    """Encode payload as msgpack (dates as ISO strings, Decimal as float)."""
+    if msgpack is None:
+        raise RuntimeError('msgpack is not installed')
+    return msgpack.packb(payload, default=_default, use_bin_type=True, datetime=False)
+
+
+def wants_msgpack() -> bool:
+    """True if the client prefers msgpack over JSON and msgpack is available."""
+    if msgpack is None:
+        return False
+    best = request.accept_mimetypes.best_match(
+        [JSON_MIMETYPE, *MSGPACK_MIMETYPES],
+        default=JSON_MIMETYPE
+    )
+    return best in MSGPACK_MIMETYPES
+
+
+def use_fast_path() -> bool:
+    """True if the current request should bypass Marshmallow dumping."""
+    return current_app.config.get('FAST_SERIALIZATION', False) or wants_msgpack()
+
+
+def fast_response(payload, status_code: int = 200):
+    """Build a response from already-shaped payload without schema dumping.
+
+    Args:
+        payload: Dict/list using the same field names as the response schema
+        status_code: HTTP status code
+
+    Returns:
+        Flask response (msgpack or JSON depending on Accept header)
+    """
+    if wants_msgpack():
+        body = dumps_msgpack(payload)
+        mimetype = MSGPACK_MIMETYPE
+    else:
+        # Trailing newline mirrors Flask's jsonify output
+        body = dumps_json(payload) + b'\n'
+        mimetype = JSON_MIMETYPE
+
+    response = current_app.response_class(body, status=status_code, mimetype=mimetype)
+    response.vary.add('Accept')
+    return response
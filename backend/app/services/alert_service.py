@@ -0,0 +1,337 @@
+"""Alert service - incremental low-stock alerts.
+
+article_stock_totals keeps stock + surplus per location/article. An
+after_flush hook turns the InventoryBalance changes of each flush into
+per-key deltas (old -> new attribute values) and collects them for the
+transaction. In before_commit they are added to the stored totals with one
+upsert, in key order, so concurrent commits lock the total rows in the
+same order; then only the touched totals (plus those of articles whose
+reorder_threshold changed) are compared with the article's
+reorder_threshold:
+
+- total < threshold and no OPEN alert: a LOW_STOCK alert is opened
+- total >= threshold (or threshold cleared) with an OPEN alert: it is resolved
+
+The same hooks keep earliest_expiry_date of a total (first expiry of an
+active batch holding stock) current; it is recomputed only when a batch's
+balance starts or stops holding stock or a batch's expiry changes.
+
+Everything runs on the session's connection, so totals and alerts commit or
+roll back with the balance change; alert.raised / alert.resolved events are
+published on the same transaction. Nothing re-scans all articles per
+request; `flask refresh-stock-totals` does a full pass after bulk loads.
+"""
+from collections import defaultdict
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, bindparam, event, func, inspect, insert, or_, select, tuple_, update
+
+from .. import events
+from ..db_routing import RoutingSession
+from ..db_upsert import upsert
+from ..extensions import db
+from ..models import Alert, Article, ArticleStockTotal, Batch, InventoryBalance, Stock, Surplus
+
+
+# (location_id, article_id)
+TotalKey = Tuple[int, int]
+
+# Balance attribute -> position in a [stock, surplus] delta
+_QUANTITIES = (('stock_kg', 0), ('surplus_kg', 1))
+
+# session.info key: changes flushed in the current transaction, see _after_flush
+_PENDING = 'stock_totals_pending'
+
+
+def _upsert_totals(connection, rows: List[dict], add: bool) -> None:
+    """Write totals; add=True adds the row values to existing totals (deltas)."""
+    quantities = ('stock_kg', 'surplus_kg')
+    upsert(connection, ArticleStockTotal.__table__, ('location_id', 'article_id'), rows,
+           add=quantities if add else (), replace=('updated_at',) if add else (*quantities, 'updated_at'))
+
+
+def resum(connection, keys: Optional[Iterable[TotalKey]] = None) -> None:
+    """Recompute totals from inventory_balances for keys (None = every key)."""
+    balances = InventoryBalance.__table__.c
+    sums = select(
+        balances.location_id, balances.article_id,
+        func.sum(balances.stock_kg), func.sum(balances.surplus_kg)
+    ).group_by(balances.location_id, balances.article_id)
+    if keys is None:
+        keys = _all_keys(connection)
+    else:
+        keys = set(keys)
+        if not keys:
+            return
+        sums = sums.where(tuple_(balances.location_id, balances.article_id).in_(sorted(keys)))
+
+    # Keys without balance rows any more total zero
+    values = {key: (0, 0) for key in keys}
+    for location_id, article_id, stock_kg, surplus_kg in connection.execute(sums):
+        values[(location_id, article_id)] = (stock_kg or 0, surplus_kg or 0)
+    if values:
+        now = datetime.now(timezone.utc)
+        _upsert_totals(connection, [
+            {'location_id': loc, 'article_id': art, 'stock_kg': _kg(stock_kg),
+             'surplus_kg': _kg(surplus_kg), 'updated_at': now}
+            for (loc, art), (stock_kg, surplus_kg) in values.items()
+        ], add=False)
+
+
+def evaluate(connection, keys: Optional[Iterable[TotalKey]] = None,
+             article_ids: Iterable[int] = ()) -> List[Tuple[str, dict]]:
+    """Open/resolve LOW_STOCK alerts of the given totals from their stored values.
+
+    Args:
+        keys: Location/article totals to check; None = all
+        article_ids: Also check every location of these articles
+
+    Returns:
+        (event type, data) for every alert opened or resolved
+    """
+    totals = ArticleStockTotal.__table__.c
+    articles = Article.__table__.c
+    alerts = Alert.__table__.c
+    stmt = select(
+        totals.location_id, totals.article_id, totals.stock_kg + totals.surplus_kg,
+        articles.reorder_threshold, alerts.id
+    ).select_from(ArticleStockTotal.__table__).join(
+        Article.__table__, articles.id == totals.article_id
+    ).outerjoin(Alert.__table__, and_(
+        alerts.location_id == totals.location_id,
+        alerts.article_id == totals.article_id,
+        alerts.alert_type == Alert.TYPE_LOW_STOCK,
+        alerts.status == Alert.STATUS_OPEN
+    ))
+    if keys is not None:
+        keys, article_ids = sorted(set(keys)), set(article_ids)
+        if not keys and not article_ids:
+            return []
+        conditions = []
+        if keys:
+            conditions.append(tuple_(totals.location_id, totals.article_id).in_(keys))
+        if article_ids:
+            conditions.append(totals.article_id.in_(article_ids))
+        stmt = stmt.where(or_(*conditions))
+
+    now = datetime.now(timezone.utc)
+    opened, resolved, changes = [], [], []
+    for loc, art, on_hand, threshold, alert_id in connection.execute(stmt.order_by(totals.location_id, totals.article_id)):
+        on_hand = _kg(on_hand)
+        low = threshold is not None and on_hand < threshold
+        if low and alert_id is None:
+            opened.append({
+                'alert_type': Alert.TYPE_LOW_STOCK, 'status': Alert.STATUS_OPEN,
+                'location_id': loc, 'article_id': art, 'threshold_kg': threshold,
+                'on_hand_kg': on_hand, 'triggered_at': now,
+            })
+            changes.append((events.EVENT_ALERT_RAISED, {
+                'location_id': loc, 'article_id': art,
+                'on_hand_kg': float(on_hand), 'threshold_kg': float(threshold),
+            }))
+        elif not low and alert_id is not None:
+            resolved.append({'b_id': alert_id, 'b_on_hand': on_hand})
+            changes.append((events.EVENT_ALERT_RESOLVED, {
+                'alert_id': alert_id, 'location_id': loc, 'article_id': art,
+                'on_hand_kg': float(on_hand),
+            }))
+
+    if opened:
+        connection.execute(insert(Alert.__table__), opened)
+    if resolved:
+        connection.execute(
+            update(Alert.__table__).where(alerts.id == bindparam('b_id')).values(
+                status=Alert.STATUS_RESOLVED, resolved_at=now,
+                resolved_on_hand_kg=bindparam('b_on_hand')
+            ),
+            resolved
+        )
+    return changes
+
+
+def _kg(value) -> Decimal:
+    return Decimal(str(value or 0))
+
+
+def _balance_change(session, obj):
+    """(index, old, new) per quantity attribute of a flushed balance.
+
+    old is None when the previous value was never loaded; both are None for
+    an unchanged attribute that is not loaded.
+    """
+    state = inspect(obj)
+    changes = []
+    for attr, index in _QUANTITIES:
+        if attr not in state.attrs:
+            continue  # Stock/Surplus map only one side
+        if obj in session.new:
+            changes.append((index, Decimal('0'), _kg(getattr(obj, attr))))
+            continue
+        history = state.attrs[attr].history
+        if obj in session.deleted:
+            old = history.deleted or history.unchanged
+            changes.append((index, _kg(old[0]) if old else None, Decimal('0')))
+        elif history.added:
+            changes.append((index, _kg(history.deleted[0]) if history.deleted else None,
+                            _kg(history.added[0])))
+        else:
+            value = history.unchanged[0] if history.unchanged else None
+            changes.append((index, _kg(value) if value is not None else None,
+                            _kg(value) if value is not None else None))
+    return changes
+
+
+def _collect(session):
+    """What this flush changed, as (deltas, resum_keys, threshold_articles, expiry_keys, expiry_articles).
+
+    Deltas come from attribute history (old value -> new value). A changed
+    quantity whose old value was never loaded cannot be diffed, so its key
+    is re-summed from inventory_balances instead. Earliest expiry only moves
+    when a batch's balance starts or stops holding stock, or when a batch's
+    expiry_date/is_active changes.
+    """
+    deltas = defaultdict(lambda: [Decimal('0'), Decimal('0')])
+    resum_keys, threshold_articles = set(), set()
+    expiry_keys, expiry_articles = set(), set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (InventoryBalance, Stock, Surplus)):
+            key = (obj.location_id, obj.article_id)
+            changes = _balance_change(session, obj)
+            if any(old is None and new is not None for _, old, new in changes):
+                resum_keys.add(key)
+                expiry_keys.add(key)
+                continue
+            for index, old, new in changes:
+                if old is not None:
+                    deltas[key][index] += new - old
+            # Unknown side (not loaded, or not mapped by Stock/Surplus): recheck expiry
+            if len(changes) < len(_QUANTITIES) or any(old is None for _, old, _ in changes) or (
+                (sum(old for _, old, _ in changes) > 0) != (sum(new for _, _, new in changes) > 0)
+            ):
+                expiry_keys.add(key)
+        elif isinstance(obj, Article) and obj not in session.new:
+            if inspect(obj).attrs.reorder_threshold.history.has_changes():
+                threshold_articles.add(obj.id)
+        elif isinstance(obj, Batch) and obj not in session.new:
+            attrs = inspect(obj).attrs
+            if attrs.expiry_date.history.has_changes() or attrs.is_active.history.has_changes():
+                expiry_articles.add(obj.article_id)
+    deltas = {key: value for key, value in deltas.items() if key not in resum_keys and any(value)}
+    return deltas, resum_keys, threshold_articles, expiry_keys, expiry_articles
+
+
+def refresh_earliest_expiry(connection, keys: Optional[Iterable[TotalKey]] = None,
+                            article_ids: Iterable[int] = ()) -> None:
+    """Set earliest_expiry_date of totals: first expiry of an active batch holding stock.
+
+    Args:
+        keys: Location/article totals to update; None = all
+        article_ids: Also update every location of these articles
+    """
+    totals = ArticleStockTotal.__table__.c
+    balances = InventoryBalance.__table__.c
+    batches = Batch.__table__.c
+    earliest = select(func.min(batches.expiry_date)).select_from(InventoryBalance.__table__).join(
+        Batch.__table__, batches.id == balances.batch_id
+    ).where(
+        balances.location_id == totals.location_id,
+        balances.article_id == totals.article_id,
+        batches.is_active.is_(True),
+        balances.stock_kg + balances.surplus_kg > 0
+    ).scalar_subquery()
+    stmt = update(ArticleStockTotal.__table__).values(earliest_expiry_date=earliest)
+    if keys is not None:
+        keys, article_ids = sorted(set(keys)), set(article_ids)
+        if not keys and not article_ids:
+            return
+        conditions = []
+        if keys:
+            conditions.append(tuple_(totals.location_id, totals.article_id).in_(keys))
+        if article_ids:
+            conditions.append(totals.article_id.in_(article_ids))
+        stmt = stmt.where(or_(*conditions))
+    connection.execute(stmt)
+
+
+def _after_flush(session, flush_context):
+    deltas, resum_keys, threshold_articles, expiry_keys, expiry_articles = _collect(session)
+    if not (deltas or resum_keys or threshold_articles or expiry_keys or expiry_articles):
+        return
+    # Same shape as _collect's result, summed over the transaction's flushes
+    pending_deltas, *pending_sets = session.info.setdefault(_PENDING, (
+        defaultdict(lambda: [Decimal('0'), Decimal('0')]), set(), set(), set(), set()
+    ))
+    for key, (stock_kg, surplus_kg) in deltas.items():
+        pending_deltas[key][0] += stock_kg
+        pending_deltas[key][1] += surplus_kg
+    for collected, changed in zip(pending_sets, (resum_keys, threshold_articles, expiry_keys, expiry_articles)):
+        collected.update(changed)
+
+
+def _before_commit(session):
+    # Flush first: commit's own final flush runs after this hook
+    session.flush()
+    pending = session.info.pop(_PENDING, None)
+    if pending is None:
+        return
+    deltas, resum_keys, threshold_articles, expiry_keys, expiry_articles = pending
+    # A re-summed key reads the final balances: its deltas are already in them
+    deltas = {key: value for key, value in deltas.items() if key not in resum_keys and any(value)}
+    connection = session.connection(bind_arguments={'bind': db.engine})
+    now = datetime.now(timezone.utc)
+    if deltas:
+        _upsert_totals(connection, [
+            {'location_id': loc, 'article_id': art, 'stock_kg': stock_kg,
+             'surplus_kg': surplus_kg, 'updated_at': now}
+            for (loc, art), (stock_kg, surplus_kg) in deltas.items()
+        ], add=True)
+    if resum_keys:
+        resum(connection, resum_keys)
+    if expiry_keys or expiry_articles:
+        refresh_earliest_expiry(connection, expiry_keys, expiry_articles)
+    if deltas or resum_keys or threshold_articles:
+        for event_type, data in evaluate(connection, {*deltas, *resum_keys}, threshold_articles):
+            events.publish(event_type, data)
+
+
+def _after_transaction_end(session, transaction):
+    # Rollback of the outermost transaction: drop the unwritten changes
+    if transaction.parent is None:
+        session.info.pop(_PENDING, None)
+
+
+def register_alerts(app):
+    """Keep article_stock_totals and low-stock alerts in step with balance flushes."""
+    if not event.contains(RoutingSession, 'after_flush', _after_flush):
+        event.listen(RoutingSession, 'after_flush', _after_flush)
+    # Ahead of the events hook, so the alert events go out with this commit
+    if not event.contains(RoutingSession, 'before_commit', _before_commit):
+        event.listen(RoutingSession, 'before_commit', _before_commit, insert=True)
+    if not event.contains(RoutingSession, 'after_transaction_end', _after_transaction_end):
+        event.listen(RoutingSession, 'after_transaction_end', _after_transaction_end)
+
+
+def _all_keys(connection) -> Set[TotalKey]:
+    balances = InventoryBalance.__table__.c
+    totals = ArticleStockTotal.__table__.c
+    return {tuple(row) for row in connection.execute(
+        select(totals.location_id, totals.article_id)
+        .union(select(balances.location_id, balances.article_id))
+    )}
+
+
+def refresh_all() -> int:
+    """Re-sum every location/article, its earliest expiry and all thresholds. Caller commits.
+
+    Returns:
+        Alerts opened or resolved
+    """
+    connection = db.session.connection(bind_arguments={'bind': db.engine})
+    resum(connection)
+    refresh_earliest_expiry(connection)
+    changes = evaluate(connection)
+    for event_type, data in changes:
+        events.publish(event_type, data)
+    return len(changes)
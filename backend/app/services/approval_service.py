@@ -4,24 +4,33 @@ from decimal import Decimal
 from typing import Optional
 
 from ..extensions import db
-from ..models import WeighInDraft, Stock, Surplus, Transaction, ApprovalAction, User
+from ..models import WeighInDraft, Transaction, ApprovalAction, User
 from ..error_handling import AppError, InsufficientStockError
+from ..metrics import lock_wait
+from ..events import publish, EVENT_DRAFT_APPROVED, EVENT_DRAFT_REJECTED
+from .lock_manager import LockedInventory, lock_inventory
 
 
-def approve_draft(draft_id: int, actor_user_id: int, note: Optional[str] = None) -> dict:
+def approve_draft(draft_id: int, actor_user_id: int, note: Optional[str] = None,
+                  locks: Optional[LockedInventory] = None) -> dict:
     """Approve a draft.
     
     Delegates to specific handler based on draft_type:
     - WEIGH_IN: surplus-first consumption (existing logic)
     - INVENTORY_SHORTAGE: stock-only consumption (new logic)
     
+    locks: balance rows the caller already locked with lock_inventory()
+    (approve_group locks every line's key at once); None = lock the
+    draft's key here.
+    
     WARNING: THIS FUNCTION DOES NOT COMMIT. Caller is responsible for 
     calling db.session.commit() to finalize the transaction.
     """
     # 1. Lock draft FOR UPDATE and validate
-    draft = db.session.query(WeighInDraft).filter_by(
-        id=draft_id
-    ).with_for_update().first()
+    with lock_wait('approve_draft'):
+        draft = db.session.query(WeighInDraft).filter_by(
+            id=draft_id
+        ).with_for_update().first()
     
     if not draft:
         raise AppError('DRAFT_NOT_FOUND', f'Draft {draft_id} not found')
@@ -40,54 +49,26 @@ def approve_draft(draft_id: int, actor_user_id: int, note: Optional[str] = None)
         
     # Delegate based on type
     if draft.draft_type == WeighInDraft.DRAFT_TYPE_INVENTORY_SHORTAGE:
-        return _approve_shortage_draft(draft, actor_user_id, note)
+        return _approve_shortage_draft(draft, actor_user_id, note, locks)
     else:
         # Default to WEIGH_IN logic
-        return _approve_weigh_in_draft(draft, actor_user_id, note)
+        return _approve_weigh_in_draft(draft, actor_user_id, note, locks)
 
 
-def _approve_weigh_in_draft(draft, actor_user_id, note=None):
+def _approve_weigh_in_draft(draft, actor_user_id, note=None, locks=None):
     """Surplus-first consumption logic for WEIGH_IN drafts."""
     now = datetime.now(timezone.utc)
     
-    # 3. Lock or create surplus row FOR UPDATE
-    surplus = db.session.query(Surplus).filter_by(
-        location_id=draft.location_id,
-        article_id=draft.article_id,
-        batch_id=draft.batch_id
-    ).with_for_update().first()
-    
-    if not surplus:
-        surplus = Surplus(
-            location_id=draft.location_id,
-            article_id=draft.article_id,
-            batch_id=draft.batch_id,
-            quantity_kg=Decimal('0')
-        )
-        db.session.add(surplus)
-        db.session.flush()  # Get ID, maintain lock
-    
-    # 4. Lock or create stock row FOR UPDATE
-    stock = db.session.query(Stock).filter_by(
-        location_id=draft.location_id,
-        article_id=draft.article_id,
-        batch_id=draft.batch_id
-    ).with_for_update().first()
-    
-    if not stock:
-        stock = Stock(
-            location_id=draft.location_id,
-            article_id=draft.article_id,
-            batch_id=draft.batch_id,
-            quantity_kg=Decimal('0')
-        )
-        db.session.add(stock)
-        db.session.flush()
+    # 3-4. Lock (or create) the balance row holding stock and surplus
+    key = (draft.location_id, draft.article_id, draft.batch_id)
+    if locks is None:
+        locks = lock_inventory([key], 'approve_draft')
+    balance = locks.row(key, create=True)
     
     # 5. Calculate surplus-first consumption
     draft_qty = Decimal(str(draft.quantity_kg))
-    surplus_qty = Decimal(str(surplus.quantity_kg))
-    stock_qty = Decimal(str(stock.quantity_kg))
+    surplus_qty = Decimal(str(balance.surplus_kg))
+    stock_qty = Decimal(str(balance.stock_kg))
     
     # How much can we take from surplus?
     use_surplus = min(surplus_qty, draft_qty)
@@ -102,10 +83,8 @@ def _approve_weigh_in_draft(draft, actor_user_id, note=None):
         )
     
     # 7. Apply inventory updates
-    surplus.quantity_kg = surplus_qty - use_surplus
-    surplus.updated_at = now
-    
-    stock.quantity_kg = stock_qty - remaining
+    balance.surplus_kg = surplus_qty - use_surplus
+    balance.stock_kg = stock_qty - remaining
     
     # 8. Create transaction records
     transactions_created = []
@@ -121,6 +100,7 @@ def _approve_weigh_in_draft(draft, actor_user_id, note=None):
         user_id=actor_user_id,
         source=draft.source,
         client_event_id=draft.client_event_id,
+        draft_id=draft.id,
         meta={'draft_id': draft.id}
     )
     db.session.add(tx_weigh_in)
@@ -138,6 +118,7 @@ def _approve_weigh_in_draft(draft, actor_user_id, note=None):
             user_id=actor_user_id,
             source='approval',
             client_event_id=draft.client_event_id,
+            draft_id=draft.id,
             meta={'draft_id': draft.id}
         )
         db.session.add(tx_surplus)
@@ -155,6 +136,7 @@ def _approve_weigh_in_draft(draft, actor_user_id, note=None):
             user_id=actor_user_id,
             source='approval',
             client_event_id=draft.client_event_id,
+            draft_id=draft.id,
             meta={'draft_id': draft.id}
         )
         db.session.add(tx_stock)
@@ -179,6 +161,13 @@ def _approve_weigh_in_draft(draft, actor_user_id, note=None):
     )
     db.session.add(approval_action)
     
+    publish(EVENT_DRAFT_APPROVED, {
+        'draft_id': draft.id,
+        'draft_group_id': draft.draft_group_id,
+        'status': WeighInDraft.STATUS_APPROVED,
+        'consumed_surplus_kg': float(use_surplus),
+        'consumed_stock_kg': float(remaining)
+    })
     db.session.flush()
     
     return {
@@ -186,14 +175,14 @@ def _approve_weigh_in_draft(draft, actor_user_id, note=None):
         'new_status': WeighInDraft.STATUS_APPROVED,
         'consumed_surplus_kg': float(use_surplus),
         'consumed_stock_kg': float(remaining),
-        'remaining_surplus_kg': float(surplus.quantity_kg),
-        'remaining_stock_kg': float(stock.quantity_kg),
+        'remaining_surplus_kg': float(balance.surplus_kg),
+        'remaining_stock_kg': float(balance.stock_kg),
         'transactions': [tx.to_dict() for tx in transactions_created],
         'approval_action': approval_action.to_dict()
     }
 
 
-def _approve_shortage_draft(draft, actor_user_id, note=None):
+def _approve_shortage_draft(draft, actor_user_id, note=None, locks=None):
     """Stock-only consumption logic for INVENTORY_SHORTAGE drafts.
     
     Never touches surplus.
@@ -201,16 +190,15 @@ def _approve_shortage_draft(draft, actor_user_id, note=None):
     """
     now = datetime.now(timezone.utc)
     
-    # Lock stock row
-    stock = db.session.query(Stock).filter_by(
-        location_id=draft.location_id,
-        article_id=draft.article_id,
-        batch_id=draft.batch_id
-    ).with_for_update().first()
+    # Lock balance row
+    key = (draft.location_id, draft.article_id, draft.batch_id)
+    if locks is None:
+        locks = lock_inventory([key], 'approve_draft')
+    balance = locks.row(key)
     
     stock_qty = Decimal('0')
-    if stock:
-        stock_qty = Decimal(str(stock.quantity_kg))
+    if balance:
+        stock_qty = Decimal(str(balance.stock_kg))
     
     draft_qty = Decimal(str(draft.quantity_kg))
     
@@ -223,7 +211,7 @@ def _approve_shortage_draft(draft, actor_user_id, note=None):
         )
     
     # Reduce stock
-    stock.quantity_kg = stock_qty - draft_qty
+    balance.stock_kg = stock_qty - draft_qty
     
     # Create INVENTORY_ADJUSTMENT transaction (negative)
     tx = Transaction(
@@ -236,6 +224,8 @@ def _approve_shortage_draft(draft, actor_user_id, note=None):
         user_id=actor_user_id,
         source='shortage_approval',
         client_event_id=draft.client_event_id,
+        draft_id=draft.id,
+        reason='inventory_shortage_approved',
         meta={
             'draft_id': draft.id,
             'reason': 'inventory_shortage_approved'
@@ -262,6 +252,13 @@ def _approve_shortage_draft(draft, actor_user_id, note=None):
     )
     db.session.add(approval_action)
     
+    publish(EVENT_DRAFT_APPROVED, {
+        'draft_id': draft.id,
+        'draft_group_id': draft.draft_group_id,
+        'status': WeighInDraft.STATUS_APPROVED,
+        'consumed_surplus_kg': 0.0,
+        'consumed_stock_kg': float(draft_qty)
+    })
     db.session.flush()
     
     return {
@@ -269,7 +266,7 @@ def _approve_shortage_draft(draft, actor_user_id, note=None):
         'new_status': WeighInDraft.STATUS_APPROVED,
         'consumed_surplus_kg': 0.0,
         'consumed_stock_kg': float(draft_qty),
-        'remaining_stock_kg': float(stock.quantity_kg),
+        'remaining_stock_kg': float(balance.stock_kg),
         'transactions': [tx.to_dict()],
         'approval_action': approval_action.to_dict()
     }
@@ -317,6 +314,11 @@ def reject_draft(draft_id: int, actor_user_id: int, note: Optional[str] = None)
         note=note
     )
     db.session.add(approval_action)
+    publish(EVENT_DRAFT_REJECTED, {
+        'draft_id': draft_id,
+        'draft_group_id': draft.draft_group_id,
+        'status': WeighInDraft.STATUS_REJECTED
+    })
     db.session.flush()
     
     return {
@@ -0,0 +1,149 @@
+"""Archive service - move finalized drafts out of the hot tables.
+
+A draft group is finalized once none of its drafts is still in DRAFT
+status (single drafts are approved one by one, so the group header itself
+may still say DRAFT). Finalized groups older than the retention window are
+moved, with their drafts and approval actions, into the *_archive tables
+in batches of whole groups; each batch commits on its own so no
+transaction holds many locks for long. Legacy drafts without a group are
+moved on their own.
+
+Archived rows keep their ids, so transactions.draft_id and the archive
+foreign keys (drafts -> groups, actions -> drafts) stay valid. Reads see
+them only with include_archived.
+"""
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, exists, func, insert, literal, or_, select
+
+from ..extensions import db
+from ..models import (
+    ApprovalAction, ApprovalActionArchive, DraftGroup, DraftGroupArchive,
+    WeighInDraft, WeighInDraftArchive
+)
+
+
+FINAL_STATUSES = (WeighInDraft.STATUS_APPROVED, WeighInDraft.STATUS_REJECTED)
+
+# (hot model, archive model), parents first
+ARCHIVE_TABLES = (
+    (DraftGroup, DraftGroupArchive),
+    (WeighInDraft, WeighInDraftArchive),
+    (ApprovalAction, ApprovalActionArchive),
+)
+
+
+def client_event_id_exists(client_event_id: str) -> bool:
+    """True if a hot or archived draft already uses client_event_id."""
+    return db.session.execute(select(
+        exists().where(WeighInDraft.client_event_id == client_event_id)
+        | exists().where(WeighInDraftArchive.client_event_id == client_event_id)
+    )).scalar()
+
+
+def _archivable_groups(cutoff: datetime):
+    lines = select(WeighInDraft.id).where(WeighInDraft.draft_group_id == DraftGroup.id)
+    pending = lines.where(WeighInDraft.status == WeighInDraft.STATUS_DRAFT)
+    return select(DraftGroup.id).where(
+        DraftGroup.created_at < cutoff,
+        ~pending.exists(),
+        # An empty group is finalized only by its own status
+        or_(DraftGroup.status.in_(FINAL_STATUSES), lines.exists())
+    )
+
+
+def _archivable_orphan_drafts(cutoff: datetime):
+    return select(WeighInDraft.id).where(
+        WeighInDraft.draft_group_id.is_(None),
+        WeighInDraft.status.in_(FINAL_STATUSES),
+        WeighInDraft.created_at < cutoff
+    )
+
+
+def archivable_group_ids(cutoff: datetime, limit: int) -> List[int]:
+    """Ids of finalized groups created before cutoff, oldest first."""
+    stmt = _archivable_groups(cutoff).order_by(DraftGroup.id).limit(limit)
+    return list(db.session.execute(stmt.with_for_update(skip_locked=True)).scalars())
+
+
+def archivable_orphan_draft_ids(cutoff: datetime, limit: int) -> List[int]:
+    """Ids of finalized drafts without a group created before cutoff."""
+    stmt = _archivable_orphan_drafts(cutoff).order_by(WeighInDraft.id).limit(limit)
+    return list(db.session.execute(stmt.with_for_update(skip_locked=True)).scalars())
+
+
+def count_archivable(cutoff: datetime) -> Dict[str, int]:
+    """Groups and drafts archive_finalized(cutoff) would move."""
+    groups = _archivable_groups(cutoff).subquery()
+    drafts = select(func.count()).select_from(WeighInDraft).where(or_(
+        WeighInDraft.draft_group_id.in_(select(groups.c.id)),
+        WeighInDraft.id.in_(_archivable_orphan_drafts(cutoff))
+    ))
+    return {
+        DraftGroup.__tablename__: db.session.execute(select(func.count()).select_from(groups)).scalar(),
+        WeighInDraft.__tablename__: db.session.execute(drafts).scalar(),
+    }
+
+
+def _move(hot, archive, where, archived_at) -> int:
+    """INSERT ... SELECT matching rows into archive; returns the row count."""
+    columns = [column.name for column in hot.__table__.columns]
+    result = db.session.execute(
+        insert(archive.__table__).from_select(
+            columns + ['archived_at'],
+            select(*hot.__table__.columns, literal(archived_at, archive.__table__.c.archived_at.type))
+            .where(where)
+        )
+    )
+    return result.rowcount
+
+
+def archive_batch(group_ids: List[int], draft_ids: List[int],
+                  archived_at: Optional[datetime] = None) -> Dict[str, int]:
+    """Move groups (with their drafts and actions) and ungrouped drafts to the archive.
+
+    Runs in the caller's transaction; does not commit.
+    """
+    archived_at = archived_at or datetime.now(timezone.utc)
+    draft_filter = or_(WeighInDraft.draft_group_id.in_(group_ids), WeighInDraft.id.in_(draft_ids))
+    filters = {
+        DraftGroup: DraftGroup.id.in_(group_ids),
+        WeighInDraft: draft_filter,
+        ApprovalAction: ApprovalAction.draft_id.in_(select(WeighInDraft.id).where(draft_filter)),
+    }
+
+    moved = {}
+    for hot, archive in ARCHIVE_TABLES:
+        moved[hot.__tablename__] = _move(hot, archive, filters[hot], archived_at)
+    # Children first, so foreign keys between hot tables hold throughout
+    for hot, _ in reversed(ARCHIVE_TABLES):
+        db.session.execute(
+            delete(hot).where(filters[hot]).execution_options(synchronize_session=False)
+        )
+    return moved
+
+
+def archive_finalized(cutoff: datetime, batch_size: int = 1000) -> Counter:
+    """Archive everything finalized before cutoff, committing every batch.
+
+    Args:
+        cutoff: Groups/drafts created before this are eligible
+        batch_size: Max groups (and max ungrouped drafts) per batch
+
+    Returns:
+        Counter of rows moved per hot table
+    """
+    totals = Counter()
+    while True:
+        group_ids = archivable_group_ids(cutoff, batch_size)
+        draft_ids = archivable_orphan_draft_ids(cutoff, batch_size)
+        if not group_ids and not draft_ids:
+            db.session.rollback()
+            break
+        totals.update(archive_batch(group_ids, draft_ids))
+        db.session.commit()
+    # Rows moved by bulk statements may still sit in the identity map
+    db.session.expire_all()
+    return totals
@@ -1,8 +1,15 @@
 """Batch service - shared batch logic."""
-from datetime import date
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import List, Tuple
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from ..extensions import db
-from ..models import Batch
+from ..models import Batch, InventoryBalance
+
+# batch_id value asking create_group to pick batches in FEFO order
+BATCH_AUTO = 'auto'
 
 def get_or_create_system_batch(article_id: int) -> Batch:
     """Get or create the system 'NA' batch for a given article.
@@ -37,3 +44,31 @@ def get_or_create_system_batch(article_id: int) -> Batch:
         db.session.flush() # Get ID
         
     return batch
+
+
+def fefo_batches(location_id: int, article_id: int) -> List[Tuple[int, Decimal, Decimal]]:
+    """Unexpired active batches of an article with stock + surplus at a location, FEFO order.
+
+    One query: batches of the article (uq_batch_article_code), each joined to
+    its balance row by the full uq_inventory_balances_key. Undated batches
+    come last.
+
+    Returns:
+        [(batch_id, stock_kg, surplus_kg)], earliest expiry first
+    """
+    today = datetime.now(timezone.utc).date()
+    available = InventoryBalance.stock_kg + InventoryBalance.surplus_kg
+    rows = db.session.execute(
+        select(Batch.id, InventoryBalance.stock_kg, InventoryBalance.surplus_kg).join(
+            InventoryBalance,
+            (InventoryBalance.location_id == location_id)
+            & (InventoryBalance.article_id == Batch.article_id)
+            & (InventoryBalance.batch_id == Batch.id)
+        ).where(
+            Batch.article_id == article_id,
+            Batch.is_active,
+            (Batch.expiry_date >= today) | Batch.expiry_date.is_(None),
+            available > 0
+        ).order_by(Batch.expiry_date.asc().nulls_last(), Batch.id)
+    ).all()
+    return [(batch_id, Decimal(str(stock)), Decimal(str(surplus))) for batch_id, stock, surplus in rows]
@@ -1,12 +1,17 @@
 """Draft Group service - atomic group operations."""
+from collections import defaultdict
 from datetime import datetime, timezone
 from decimal import Decimal, ROUND_HALF_UP
 from typing import List, Optional, Dict
 
 from ..extensions import db
-from ..models import DraftGroup, WeighInDraft, Stock, Surplus, User, Article, Batch
+from ..models import DraftGroup, WeighInDraft, User, Article, Batch
 from ..error_handling import AppError, InsufficientStockError
+from ..metrics import lock_wait
+from ..events import publish, EVENT_GROUP_CREATED, EVENT_GROUP_APPROVED, EVENT_GROUP_REJECTED
 from .approval_service import approve_draft, reject_draft
+from .archive_service import client_event_id_exists
+from .lock_manager import lock_inventory
 from . import batch_service
 
 
@@ -40,6 +45,54 @@ def _generate_group_name(source: str) -> str:
     return f"{source_prefix}_{counter:03d}-{today_str}"
 
 
+def _quantize(quantity_kg) -> Decimal:
+    return Decimal(str(quantity_kg)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+
+def _take(candidate: list, quantity: Decimal) -> Decimal:
+    """Take up to quantity from a [batch_id, stock, surplus] candidate, surplus first
+    (the order approval consumes them in). Returns the amount taken."""
+    from_surplus = min(max(candidate[2], Decimal('0')), quantity)
+    from_stock = min(max(candidate[1], Decimal('0')), quantity - from_surplus)
+    candidate[2] -= from_surplus
+    candidate[1] -= from_stock
+    return from_surplus + from_stock
+
+
+def _fefo_candidates(location_id: int, article_id: int, reserved: Dict) -> List[list]:
+    """[batch_id, stock, surplus] in FEFO order, less what explicit lines reserved."""
+    candidates = [list(row) for row in batch_service.fefo_batches(location_id, article_id)]
+    for candidate in candidates:
+        _take(candidate, reserved.get((article_id, candidate[0]), Decimal('0')))
+    return candidates
+
+
+def _allocate_fefo(candidates: List[list], quantity: Decimal) -> List[tuple]:
+    """Split quantity over candidates, earliest expiry first.
+
+    Candidates are updated in place, so later lines of the same article only
+    see what is left.
+
+    Returns:
+        [(batch_id, quantity_kg)]
+    """
+    stock = sum((max(c[1], Decimal('0')) for c in candidates), Decimal('0'))
+    surplus = sum((max(c[2], Decimal('0')) for c in candidates), Decimal('0'))
+    if stock + surplus < quantity:
+        raise InsufficientStockError(float(quantity), float(stock), float(surplus))
+
+    parts = []
+    remaining = quantity
+    for candidate in candidates:
+        if remaining <= 0:
+            break
+        taken = _take(candidate, remaining)
+        if taken > 0:
+            parts.append((candidate[0], taken))
+            remaining -= taken
+    return parts
+
+
 def create_group(
     location_id: int,
     user_id: int,
@@ -47,7 +100,12 @@ def create_group(
     name: Optional[str] = None,
     source: str = 'ui_admin'
 ) -> DraftGroup:
-    """Create a group with multiple lines atomically."""
+    """Create a group with multiple lines atomically.
+
+    A line with batch_id "auto" is drawn from the article's earliest-expiring
+    batches with stock + surplus at the location, split over several drafts
+    when one batch is not enough.
+    """
     
     # Auto-name if no name provided
     if not name:
@@ -63,6 +121,15 @@ def create_group(
     db.session.add(group)
     db.session.flush() # Get group ID
     
+    # Quantities already claimed by explicit-batch lines of this group
+    reserved = defaultdict(Decimal)
+    for line_data in lines:
+        batch_id = line_data.get('batch_id')
+        if isinstance(batch_id, int) and line_data.get('draft_type', WeighInDraft.DRAFT_TYPE_WEIGH_IN) == WeighInDraft.DRAFT_TYPE_WEIGH_IN:
+            reserved[(line_data['article_id'], batch_id)] += _quantize(line_data['quantity_kg'])
+    fefo = {}  # article_id -> FEFO candidates, one query per article
+
+    draft_count = 0
     for line_data in lines:
         # Resolve Article to check is_paint
         article = db.session.get(Article, line_data['article_id'])
@@ -71,7 +138,13 @@ def create_group(
         
         # Handle Batch ID Logic
         batch_id = line_data.get('batch_id')
-        
+        draft_type = line_data.get('draft_type', WeighInDraft.DRAFT_TYPE_WEIGH_IN)
+        qty = _quantize(line_data['quantity_kg'])
+
+        if batch_id == batch_service.BATCH_AUTO and not article.is_paint:
+            # Consumables only ever use the system batch
+            batch_id = None
+
         if batch_id is None:
             if article.is_paint:
                  raise AppError('BATCH_REQUIRED', f"Batch ID is required for paint article {article.article_no}")
@@ -79,38 +152,55 @@ def create_group(
             # Consumable: Find or Create 'NA' system batch (using shared service)
             batch = batch_service.get_or_create_system_batch(article.id)
             batch_id = batch.id
-        
-        # Check for duplicate client_event_id (idempotency)
-        existing = WeighInDraft.query.filter_by(
-            client_event_id=line_data['client_event_id']
-        ).first()
-        if existing:
-            raise AppError(
-                'DUPLICATE_EVENT_ID',
-                f"A draft with client_event_id '{line_data['client_event_id']}' already exists",
-                {'client_event_id': line_data['client_event_id']}
+
+        if batch_id == batch_service.BATCH_AUTO:
+            if draft_type != WeighInDraft.DRAFT_TYPE_WEIGH_IN:
+                raise AppError(
+                    'VALIDATION_ERROR',
+                    f'batch_id "auto" is only supported for {WeighInDraft.DRAFT_TYPE_WEIGH_IN} lines',
+                    {'client_event_id': line_data['client_event_id']}
+                )
+            if article.id not in fefo:
+                fefo[article.id] = _fefo_candidates(location_id, article.id, reserved)
+            parts = _allocate_fefo(fefo[article.id], qty)
+        else:
+            parts = [(batch_id, qty)]
+
+        for index, (part_batch_id, part_qty) in enumerate(parts):
+            # Split lines: first part keeps the client's id, the rest get #2, #3, ...
+            client_event_id = line_data['client_event_id']
+            if index:
+                client_event_id = f'{client_event_id}#{index + 1}'
+
+            # Check for duplicate client_event_id (idempotency), archived drafts included
+            if client_event_id_exists(client_event_id):
+                raise AppError(
+                    'DUPLICATE_EVENT_ID',
+                    f"A draft with client_event_id '{client_event_id}' already exists",
+                    {'client_event_id': client_event_id}
+                )
+
+            draft = WeighInDraft(
+                draft_group_id=group.id,
+                location_id=location_id,
+                article_id=line_data['article_id'],
+                batch_id=part_batch_id,
+                quantity_kg=part_qty,
+                draft_type=draft_type,
+                client_event_id=client_event_id,
+                note=line_data.get('note'),
+                created_by_user_id=user_id,
+                source=source
             )
-            
-        # Round quantity
-        qty = Decimal(str(line_data['quantity_kg'])).quantize(
-            Decimal('0.01'),
-            rounding=ROUND_HALF_UP
-        )
-        
-        draft = WeighInDraft(
-            draft_group_id=group.id,
-            location_id=location_id,
-            article_id=line_data['article_id'],
-            batch_id=batch_id,
-            quantity_kg=qty,
-            draft_type=line_data.get('draft_type', WeighInDraft.DRAFT_TYPE_WEIGH_IN),
-            client_event_id=line_data['client_event_id'],
-            note=line_data.get('note'),
-            created_by_user_id=user_id,
-            source=source
-        )
-        db.session.add(draft)
+            db.session.add(draft)
+            draft_count += 1
     
+    publish(EVENT_GROUP_CREATED, {
+        'group_id': group.id,
+        'location_id': location_id,
+        'status': group.status,
+        'line_count': draft_count
+    })
     db.session.commit()
     return group
 
@@ -139,9 +229,10 @@ def approve_group(group_id: int, actor_user_id: int, note: Optional[str] = None)
     """Atomic group approval with pre-checks and row-level locking."""
     
     # 1. Lock group and validate
-    group = db.session.query(DraftGroup).filter_by(
-        id=group_id
-    ).with_for_update().first()
+    with lock_wait('approve_group'):
+        group = db.session.query(DraftGroup).filter_by(
+            id=group_id
+        ).with_for_update().first()
     
     if not group:
         raise AppError('GROUP_NOT_FOUND', f'Draft Group {group_id} not found')
@@ -154,19 +245,15 @@ def approve_group(group_id: int, actor_user_id: int, note: Optional[str] = None)
         )
     
     # 2. Get and lock all lines
-    drafts = db.session.query(WeighInDraft).filter_by(
-        draft_group_id=group_id
-    ).with_for_update().all()
+    with lock_wait('approve_group'):
+        drafts = db.session.query(WeighInDraft).filter_by(
+            draft_group_id=group_id
+        ).with_for_update().all()
     
     if not drafts:
         raise AppError('GROUP_EMPTY', f'Group {group_id} has no lines')
     
     # 3. Pre-check: Sum requirements and lock inventory
-    # Consistent locking order by (article_id, batch_id) to prevent deadlocks
-    inventory_keys = sorted(list(set(
-        (d.article_id, d.batch_id) for d in drafts
-    )))
-    
     # Requirements mapping: (article_id, batch_id) -> {'weigh_in': Decimal, 'shortage': Decimal}
     needs = {}
     for d in drafts:
@@ -175,33 +262,16 @@ def approve_group(group_id: int, actor_user_id: int, note: Optional[str] = None)
             needs[key] = {'WEIGH_IN': Decimal('0'), 'INVENTORY_SHORTAGE': Decimal('0')}
         needs[key][d.draft_type] += Decimal(str(d.quantity_kg))
         
-    # Lock Stock and Surplus rows
-    locked_stock = {}
-    locked_surplus = {}
-    
-    for art_id, bat_id in inventory_keys:
-        # Lock Stock
-        stock = db.session.query(Stock).filter_by(
-            location_id=group.location_id,
-            article_id=art_id,
-            batch_id=bat_id
-        ).with_for_update().first()
-        
-        locked_stock[(art_id, bat_id)] = Decimal(str(stock.quantity_kg)) if stock else Decimal('0')
-        
-        # Lock Surplus
-        surplus = db.session.query(Surplus).filter_by(
-            location_id=group.location_id,
-            article_id=art_id,
-            batch_id=bat_id
-        ).with_for_update().first()
-        
-        locked_surplus[(art_id, bat_id)] = Decimal(str(surplus.quantity_kg)) if surplus else Decimal('0')
+    # Lock all balance rows up front, in canonical order
+    locks = lock_inventory(
+        [(group.location_id, art_id, bat_id) for art_id, bat_id in needs],
+        'approve_group'
+    )
         
     # 4. Availability Validation (Pre-check)
     for (art_id, bat_id), requirements in needs.items():
-        stock_available = locked_stock[(art_id, bat_id)]
-        surplus_available = locked_surplus[(art_id, bat_id)]
+        stock_available = locks.stock_qty((group.location_id, art_id, bat_id))
+        surplus_available = locks.surplus_qty((group.location_id, art_id, bat_id))
         
         # WEIGH_IN uses Surplus-First
         weigh_in_needed = requirements['WEIGH_IN']
@@ -230,13 +300,14 @@ def approve_group(group_id: int, actor_user_id: int, note: Optional[str] = None)
                 message=f"Insufficient inventory for weigh-in line (Article {art_id}, Batch {bat_id})"
             )
 
-    # 5. Execution: Success guaranteed by pre-check
+    # 5. Execution: Success guaranteed by pre-check; the balance rows are already locked
     results = []
     for d in drafts:
-        res = approve_draft(d.id, actor_user_id, note)
+        res = approve_draft(d.id, actor_user_id, note, locks)
         results.append(res)
         
     group.status = DraftGroup.STATUS_APPROVED
+    publish(EVENT_GROUP_APPROVED, {'group_id': group.id, 'status': group.status})
     db.session.commit()
     
     return {
@@ -275,6 +346,7 @@ def reject_group(group_id: int, actor_user_id: int, note: Optional[str] = None)
         results.append(res)
         
     group.status = DraftGroup.STATUS_REJECTED
+    publish(EVENT_GROUP_REJECTED, {'group_id': group.id, 'status': group.status})
     db.session.commit()
     
     return {
@@ -0,0 +1,163 @@
+"""Forecast service - consumption rates and suggested reorder points.
+
+Daily consumption per article is read in one query from the
+daily_article_movements aggregate (approved WEIGH_IN quantities) and laid
+out as an articles x days NumPy matrix; every statistic below is a
+vectorized operation over that matrix, so the cost grows with the matrix
+size rather than with per-article Python loops.
+
+    avg_daily_kg        mean over the window
+    rolling_avg_kg      mean of the last rolling_days
+    peak_rolling_avg_kg highest rolling_days mean in the window
+    forecast_daily_kg   exponentially smoothed daily consumption (alpha)
+    safety_stock_kg     safety_factor * std(daily) * sqrt(lead_time_days)
+    reorder_point_kg    forecast_daily_kg * lead_time_days + safety_stock_kg
+    days_of_cover       (stock + surplus) / forecast_daily_kg
+
+numpy is optional; without it is_available() is False and the endpoint
+answers 501.
+"""
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select
+
+from ..extensions import db
+from ..models import Article, DailyArticleMovement, InventoryBalance, Transaction
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+
+# Approved weigh-ins carry the full consumed quantity (positive)
+CONSUMPTION_TX_TYPE = Transaction.TX_WEIGH_IN
+
+
+def is_available() -> bool:
+    return np is not None
+
+
+def _round(values, digits=2):
+    """List of rounded floats, None where the value is not finite."""
+    rounded = np.round(values, digits)
+    return [float(v) if np.isfinite(v) else None for v in rounded]
+
+
+def consumption_matrix(first_day: date, last_day: date, location_id: Optional[int] = None):
+    """Daily consumption as (article_ids, matrix[article, day]) in one query."""
+    m = DailyArticleMovement
+    stmt = select(m.article_id, m.day, func.sum(m.quantity_kg)).where(
+        m.tx_type == CONSUMPTION_TX_TYPE, m.day >= first_day, m.day <= last_day
+    )
+    if location_id:
+        stmt = stmt.where(m.location_id == location_id)
+    rows = db.session.execute(stmt.group_by(m.article_id, m.day)).all()
+
+    days = (last_day - first_day).days + 1
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.zeros((0, days))
+
+    article_col, day_col, qty_col = zip(*rows)
+    article_ids, article_index = np.unique(np.array(article_col, dtype=np.int64), return_inverse=True)
+    day_index = np.array([(d - first_day).days for d in day_col], dtype=np.int64)
+    matrix = np.zeros((len(article_ids), days))
+    matrix[article_index, day_index] = np.array(qty_col, dtype=np.float64)
+    return article_ids, matrix
+
+
+def smoothed(matrix, alpha: float):
+    """Last value of simple exponential smoothing along each row.
+
+    s_0 = x_0, s_t = alpha * x_t + (1 - alpha) * s_(t-1), unrolled into one
+    weighted sum (a matrix-vector product) instead of a loop over days.
+    """
+    days = matrix.shape[1]
+    weights = alpha * (1 - alpha) ** np.arange(days - 1, -1, -1, dtype=np.float64)
+    weights[0] = (1 - alpha) ** (days - 1)
+    return matrix @ weights
+
+
+def rolling_means(matrix, window: int):
+    """Means of every window-day span along each row (via cumulative sums)."""
+    window = min(window, matrix.shape[1])
+    cumulative = np.cumsum(np.pad(matrix, ((0, 0), (1, 0))), axis=1)
+    return (cumulative[:, window:] - cumulative[:, :-window]) / window
+
+
+def forecast(last_day: date, window_days: int = 90, rolling_days: int = 7, alpha: float = 0.3,
+             lead_time_days: int = 14, safety_factor: float = 1.65,
+             location_id: Optional[int] = None) -> Dict:
+    """Consumption statistics and reorder suggestions for every active article.
+
+    Articles without consumption in the window are included with zero rates.
+
+    Returns:
+        dict with items (one per article, by article_no) and compute_ms
+    """
+    started = time.perf_counter()
+    first_day = last_day - timedelta(days=window_days - 1)
+    consumed_ids, consumed = consumption_matrix(first_day, last_day, location_id)
+
+    # Active articles with their current stock + surplus, one query
+    on_hand = select(
+        InventoryBalance.article_id,
+        func.sum(InventoryBalance.stock_kg + InventoryBalance.surplus_kg).label('on_hand_kg')
+    ).group_by(InventoryBalance.article_id)
+    if location_id:
+        on_hand = on_hand.where(InventoryBalance.location_id == location_id)
+    on_hand = on_hand.subquery()
+    articles = db.session.execute(
+        select(Article.id, Article.article_no, Article.reorder_threshold, on_hand.c.on_hand_kg)
+        .outerjoin(on_hand, on_hand.c.article_id == Article.id)
+        .where(Article.is_active.is_(True))
+        .order_by(Article.article_no)
+    ).all()
+    if not articles:
+        return {'items': [], 'compute_ms': round((time.perf_counter() - started) * 1000, 1)}
+
+    article_ids = np.array([a.id for a in articles], dtype=np.int64)
+    stock = np.array([float(a.on_hand_kg or 0) for a in articles])
+
+    # Align consumption rows with the article list (zeros where nothing was consumed)
+    matrix = np.zeros((len(article_ids), window_days))
+    if len(consumed_ids):
+        position = np.searchsorted(consumed_ids, article_ids)
+        position = np.minimum(position, len(consumed_ids) - 1)
+        found = consumed_ids[position] == article_ids
+        matrix[found] = consumed[position[found]]
+
+    avg_daily = matrix.mean(axis=1)
+    rolling = rolling_means(matrix, rolling_days)
+    rolling_avg = rolling[:, -1]
+    peak_rolling = rolling.max(axis=1)
+    forecast_daily = smoothed(matrix, alpha)
+    safety_stock = safety_factor * matrix.std(axis=1) * np.sqrt(lead_time_days)
+    reorder_point = forecast_daily * lead_time_days + safety_stock
+    with np.errstate(divide='ignore', invalid='ignore'):
+        days_of_cover = np.where(forecast_daily > 0, stock / forecast_daily, np.inf)
+
+    columns = {
+        'on_hand_kg': _round(stock),
+        'avg_daily_kg': _round(avg_daily, 3),
+        'rolling_avg_kg': _round(rolling_avg, 3),
+        'peak_rolling_avg_kg': _round(peak_rolling, 3),
+        'forecast_daily_kg': _round(forecast_daily, 3),
+        'safety_stock_kg': _round(safety_stock),
+        'reorder_point_kg': _round(reorder_point),
+        'days_of_cover': _round(days_of_cover, 1),
+    }
+    items: List[dict] = []
+    for i, article in enumerate(articles):
+        item = {
+            'article_id': article.id,
+            'article_no': article.article_no,
+            'reorder_threshold': float(article.reorder_threshold) if article.reorder_threshold is not None else None,
+        }
+        for name, values in columns.items():
+            item[name] = values[i]
+        item['below_reorder_point'] = item['on_hand_kg'] < item['reorder_point_kg']
+        items.append(item)
+    return {'items': items, 'compute_ms': round((time.perf_counter() - started) * 1000, 1)}
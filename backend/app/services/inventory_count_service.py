@@ -5,8 +5,9 @@ from typing import Optional
 import uuid
 
 from ..extensions import db
-from ..models import Stock, Surplus, Transaction, WeighInDraft, Location, Article, Batch, User
+from ..models import Transaction, WeighInDraft, Location, Article, Batch, User
 from ..error_handling import AppError
+from .lock_manager import lock_inventory
 
 
 def perform_inventory_count(
@@ -63,43 +64,13 @@ def perform_inventory_count(
     if not batch:
         raise AppError('BATCH_NOT_FOUND', f'Batch {batch_id} not found')
     
-    # Lock and get/create stock row
-    stock = db.session.query(Stock).filter_by(
-        location_id=location_id,
-        article_id=article_id,
-        batch_id=batch_id
-    ).with_for_update().first()
-    
-    if not stock:
-        stock = Stock(
-            location_id=location_id,
-            article_id=article_id,
-            batch_id=batch_id,
-            quantity_kg=Decimal('0')
-        )
-        db.session.add(stock)
-        db.session.flush()
-    
-    # Lock and get/create surplus row
-    surplus = db.session.query(Surplus).filter_by(
-        location_id=location_id,
-        article_id=article_id,
-        batch_id=batch_id
-    ).with_for_update().first()
-    
-    if not surplus:
-        surplus = Surplus(
-            location_id=location_id,
-            article_id=article_id,
-            batch_id=batch_id,
-            quantity_kg=Decimal('0')
-        )
-        db.session.add(surplus)
-        db.session.flush()
+    # Lock and get/create the balance row
+    key = (location_id, article_id, batch_id)
+    balance = lock_inventory([key], 'inventory_count').row(key, create=True)
     
     # Calculate current state
-    current_stock = Decimal(str(stock.quantity_kg))
-    current_surplus = Decimal(str(surplus.quantity_kg))
+    current_stock = Decimal(str(balance.stock_kg))
+    current_surplus = Decimal(str(balance.surplus_kg))
     current_total = current_stock + current_surplus
     
     transactions_created = []
@@ -124,8 +95,7 @@ def perform_inventory_count(
         delta = counted_qty - current_total
         
         # Add to surplus
-        surplus.quantity_kg = current_surplus + delta
-        surplus.updated_at = now
+        balance.surplus_kg = current_surplus + delta
         
         # Create transaction
         tx = Transaction(
@@ -138,6 +108,7 @@ def perform_inventory_count(
             user_id=actor_user_id,
             source='inventory_count',
             client_event_id=client_event_id,
+            reason='inventory_count_over',
             meta={
                 'reason': 'inventory_count_over',
                 'counted_total': float(counted_qty),
@@ -170,6 +141,7 @@ def perform_inventory_count(
                 user_id=actor_user_id,
                 source='inventory_count',
                 client_event_id=f'{client_event_id}-surplus-reset',
+                reason='inventory_count_surplus_reset',
                 meta={
                     'reason': 'inventory_count_surplus_reset',
                     'surplus_before': float(current_surplus),
@@ -179,8 +151,7 @@ def perform_inventory_count(
             db.session.add(tx_surplus_reset)
             transactions_created.append(tx_surplus_reset)
             
-            surplus.quantity_kg = Decimal('0')
-            surplus.updated_at = now
+            balance.surplus_kg = Decimal('0')
             
             result['surplus_reset'] = float(current_surplus)
         
@@ -4,8 +4,9 @@ from decimal import Decimal
 from typing import Optional
 
 from ..extensions import db
-from ..models import Stock, Surplus, Transaction, Location, Article, Batch, User
+from ..models import Transaction, Location, Article, Batch, User
 from ..error_handling import AppError
+from .lock_manager import lock_inventory
 
 
 def adjust_inventory(
@@ -93,40 +94,11 @@ def adjust_inventory(
         raise AppError('BATCH_NOT_FOUND', f'Batch {batch_id} not found')
     
     # Get or create target row with lock
-    if target == 'stock':
-        row = db.session.query(Stock).filter_by(
-            location_id=location_id,
-            article_id=article_id,
-            batch_id=batch_id
-        ).with_for_update().first()
-        
-        if not row:
-            row = Stock(
-                location_id=location_id,
-                article_id=article_id,
-                batch_id=batch_id,
-                quantity_kg=Decimal('0')
-            )
-            db.session.add(row)
-            db.session.flush()
-    else:  # surplus
-        row = db.session.query(Surplus).filter_by(
-            location_id=location_id,
-            article_id=article_id,
-            batch_id=batch_id
-        ).with_for_update().first()
-        
-        if not row:
-            row = Surplus(
-                location_id=location_id,
-                article_id=article_id,
-                batch_id=batch_id,
-                quantity_kg=Decimal('0')
-            )
-            db.session.add(row)
-            db.session.flush()
-    
-    previous_value = Decimal(str(row.quantity_kg))
+    key = (location_id, article_id, batch_id)
+    row = lock_inventory([key], 'adjust_inventory').row(key, create=True)
+    column = 'stock_kg' if target == 'stock' else 'surplus_kg'
+    
+    previous_value = Decimal(str(getattr(row, column)))
     
     # Calculate new value
     if mode == 'set':
@@ -148,10 +120,7 @@ def adjust_inventory(
         )
     
     # Apply the adjustment
-    row.quantity_kg = new_value
-    if target == 'surplus':
-        row.updated_at = now
-    # stock.last_updated auto-updates via onupdate
+    setattr(row, column, new_value)
     
     # Calculate delta for transaction (new - old)
     delta_for_tx = new_value - previous_value
@@ -0,0 +1,178 @@
+"""Movement service - daily per-article transaction totals.
+
+daily_article_movements holds, per (day, location, article, tx_type), the
+summed quantity and the number of transactions. Every Transaction added
+through the ORM session is aggregated by an after_flush hook and written
+with one upsert in before_commit, so the totals commit or roll back
+together with the approval, receipt, count or adjustment that wrote them,
+and the rows are locked once per transaction, in key order. Bulk inserts
+that bypass the ORM (seed-scale) and history from before this table
+existed are covered by `flask rebuild-movements`.
+
+Period reports read the aggregate (a few rows per article per day)
+instead of scanning transactions.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, event, func, insert, select
+
+from ..db_routing import RoutingSession
+from ..db_upsert import upsert
+from ..extensions import db
+from ..models import DailyArticleMovement, Transaction
+from .snapshot_service import day_end
+
+
+# (day, location_id, article_id, tx_type)
+MovementKey = Tuple[date, int, int, str]
+
+# session.info key: movement totals flushed in the current transaction
+_PENDING = 'movement_totals'
+
+# Days rebuilt per committed chunk
+REBUILD_CHUNK_DAYS = 31
+
+
+def day_of(occurred_at: datetime) -> date:
+    """UTC date of a timestamp (naive timestamps are taken as UTC)."""
+    if occurred_at.tzinfo is not None:
+        occurred_at = occurred_at.astimezone(timezone.utc)
+    return occurred_at.date()
+
+
+def aggregate(transactions: Iterable[Transaction]) -> Dict[MovementKey, list]:
+    """{key: [quantity_kg, tx_count]} for the given transactions."""
+    totals = defaultdict(lambda: [Decimal('0'), 0])
+    for tx in transactions:
+        key = (day_of(tx.occurred_at), tx.location_id, tx.article_id, tx.tx_type)
+        totals[key][0] += Decimal(str(tx.quantity_kg))
+        totals[key][1] += 1
+    return totals
+
+
+def upsert_movements(connection, totals: Dict[MovementKey, list]) -> None:
+    """Add totals to daily_article_movements (INSERT ... ON CONFLICT DO UPDATE)."""
+    upsert(
+        connection, DailyArticleMovement.__table__, ('day', 'location_id', 'article_id', 'tx_type'),
+        [
+            {'day': day, 'location_id': loc, 'article_id': art, 'tx_type': tx_type,
+             'quantity_kg': quantity, 'tx_count': count}
+            for (day, loc, art, tx_type), (quantity, count) in totals.items()
+        ],
+        add=('quantity_kg', 'tx_count')
+    )
+
+
+def _after_flush(session, flush_context):
+    # session.new still lists the objects this flush inserted
+    transactions = [obj for obj in session.new if isinstance(obj, Transaction)]
+    if not transactions:
+        return
+    pending = session.info.setdefault(_PENDING, defaultdict(lambda: [Decimal('0'), 0]))
+    for key, (quantity, count) in aggregate(transactions).items():
+        pending[key][0] += quantity
+        pending[key][1] += count
+
+
+def _before_commit(session):
+    # Flush first: commit's own final flush runs after this hook
+    session.flush()
+    totals = session.info.pop(_PENDING, None)
+    if totals:
+        upsert_movements(session.connection(bind_arguments={'bind': db.engine}), totals)
+
+
+def _after_transaction_end(session, transaction):
+    # Rollback of the outermost transaction: drop unwritten totals
+    if transaction.parent is None:
+        session.info.pop(_PENDING, None)
+
+
+_SESSION_LISTENERS = (
+    ('after_flush', _after_flush),
+    ('before_commit', _before_commit),
+    ('after_transaction_end', _after_transaction_end),
+)
+
+
+def register_movements(app):
+    """Keep daily_article_movements in step with ORM Transaction inserts."""
+    for name, fn in _SESSION_LISTENERS:
+        if not event.contains(RoutingSession, name, fn):
+            event.listen(RoutingSession, name, fn)
+
+
+def _utc_day(column):
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return func.date(func.timezone('UTC', column))
+    return func.date(column)
+
+
+def rebuild(first_day: date, last_day: date) -> int:
+    """Recompute days first_day..last_day from transactions. Caller commits.
+
+    Returns:
+        Rows written
+    """
+    since = day_end(first_day - timedelta(days=1))
+    until = day_end(last_day)
+    db.session.execute(delete(DailyArticleMovement).where(
+        DailyArticleMovement.day >= first_day, DailyArticleMovement.day <= last_day
+    ))
+
+    day = _utc_day(Transaction.occurred_at)
+    source = select(
+        day, Transaction.location_id, Transaction.article_id, Transaction.tx_type,
+        func.sum(Transaction.quantity_kg), func.count()
+    ).where(
+        # occurred_at range: index scan, prunes monthly partitions
+        Transaction.occurred_at >= since, Transaction.occurred_at < until
+    ).group_by(day, Transaction.location_id, Transaction.article_id, Transaction.tx_type)
+    result = db.session.execute(insert(DailyArticleMovement).from_select(
+        ['day', 'location_id', 'article_id', 'tx_type', 'quantity_kg', 'tx_count'], source
+    ))
+    return result.rowcount
+
+
+def rebuild_range(first_day: date, last_day: date, commit: bool = True) -> List[Tuple[date, date, int]]:
+    """rebuild() in chunks of REBUILD_CHUNK_DAYS, committing after each one.
+
+    Returns:
+        [(chunk first day, chunk last day, rows written)]
+    """
+    chunks = []
+    start = first_day
+    while start <= last_day:
+        end = min(start + timedelta(days=REBUILD_CHUNK_DAYS - 1), last_day)
+        chunks.append((start, end, rebuild(start, end)))
+        if commit:
+            db.session.commit()
+        start = end + timedelta(days=1)
+    return chunks
+
+
+def period_totals(from_date: date, to_date: date, location_id: Optional[int] = None,
+                  article_id: Optional[int] = None, by_day: bool = False):
+    """Summed quantity and count per article and tx_type for days in [from_date, to_date].
+
+    Returns:
+        Row mappings (day, location_id, article_id, tx_type, quantity_kg, tx_count),
+        day only with by_day
+    """
+    m = DailyArticleMovement
+    keys = [m.location_id, m.article_id, m.tx_type]
+    if by_day:
+        keys.insert(0, m.day)
+    stmt = select(
+        *keys,
+        func.sum(m.quantity_kg).label('quantity_kg'),
+        func.sum(m.tx_count).label('tx_count')
+    ).where(m.day >= from_date, m.day <= to_date)
+    if location_id:
+        stmt = stmt.where(m.location_id == location_id)
+    if article_id:
+        stmt = stmt.where(m.article_id == article_id)
+    return db.session.execute(stmt.group_by(*keys).order_by(*keys)).mappings()
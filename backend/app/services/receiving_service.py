@@ -5,8 +5,10 @@ from decimal import Decimal, ROUND_HALF_UP
 from typing import Optional
 
 from ..extensions import db
-from ..models import Stock, Transaction, Location, Article, Batch, User
+from ..models import Transaction, Location, Article, Batch, User
 from ..error_handling import AppError
+from ..metrics import lock_wait
+from .lock_manager import lock_inventory
 
 
 # Batch code regex: 4-5 digits (Mankiewicz) or 9-12 digits (Akzo)
@@ -131,10 +133,11 @@ def receive_stock(
     batch_created = False
     
     # Try to find existing batch
-    batch = db.session.query(Batch).filter_by(
-        article_id=article_id,
-        batch_code=batch_code
-    ).with_for_update().first()
+    with lock_wait('receive_stock'):
+        batch = db.session.query(Batch).filter_by(
+            article_id=article_id,
+            batch_code=batch_code
+        ).with_for_update().first()
     
     if batch:
         # Batch exists - check expiry
@@ -174,25 +177,12 @@ def receive_stock(
         batch_created = True
     
     # ===== STOCK HANDLING (get or create with lock) =====
-    stock = db.session.query(Stock).filter_by(
-        location_id=location_id,
-        article_id=article_id,
-        batch_id=batch.id
-    ).with_for_update().first()
-    
-    if not stock:
-        stock = Stock(
-            location_id=location_id,
-            article_id=article_id,
-            batch_id=batch.id,
-            quantity_kg=Decimal('0')
-        )
-        db.session.add(stock)
-        db.session.flush()
+    key = (location_id, article_id, batch.id)
+    balance = lock_inventory([key], 'receive_stock').row(key, create=True)
     
-    previous_stock = Decimal(str(stock.quantity_kg))
+    previous_stock = Decimal(str(balance.stock_kg))
     new_stock = previous_stock + quantity_kg
-    stock.quantity_kg = new_stock
+    balance.stock_kg = new_stock
     
     # ===== CREATE TRANSACTION =====
     tx = Transaction(
@@ -0,0 +1,106 @@
+"""Scan resolution - scanned codes to articles and batches in a few IN queries.
+
+A scan-gun session submits every code it collected at once. Whatever the
+number of codes, resolution costs at most three queries, each answered by a
+unique or plain index:
+
+1. articles by barcode (ix_articles_barcode) or article_no
+2. aliases (stored uppercased, unique) joined to their article
+3. batches by batch_code (ix_batches_batch_code) joined to their article
+"""
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import or_, select
+
+from ..extensions import db
+from ..models import Article, ArticleAlias, Batch
+
+
+MATCH_BARCODE = 'barcode'
+MATCH_ARTICLE_NO = 'article_no'
+MATCH_ALIAS = 'alias'
+MATCH_BATCH = 'batch'
+
+
+def _result(code: str, match: Optional[str] = None, article: Optional[Article] = None,
+            batch: Optional[Batch] = None, candidates: Optional[List[Dict]] = None) -> Dict:
+    return {
+        'code': code,
+        'match': match,
+        'article': article,
+        'batch': batch,
+        'candidates': candidates or [],
+    }
+
+
+def resolve_codes(codes: Sequence[str]) -> List[Dict]:
+    """Resolve scanned codes, in scan order (one result per code, repeats included).
+
+    Each code is an article barcode, article_no (as scanned or uppercased),
+    alias (case-insensitive) or batch code, tried in that order. Batch codes
+    are only unique per article, so a batch code that follows a scan of the
+    same article resolves to that article's batch, even over an article match.
+    A batch code of several articles with no such context is returned
+    unresolved, with the candidates.
+
+    Returns:
+        Dicts with code, match (barcode|article_no|alias|batch|None), article,
+        batch and candidates ({article, batch} for ambiguous batch codes)
+    """
+    scanned = [code.strip() for code in codes]
+    distinct = sorted({code for code in scanned if code})
+    if not distinct:
+        return [_result(code) for code in scanned]
+    uppercased = sorted({code.upper() for code in distinct})
+
+    by_barcode, by_article_no = {}, {}
+    for article in db.session.scalars(select(Article).where(or_(
+        Article.barcode.in_(distinct),
+        Article.article_no.in_(sorted(set(distinct) | set(uppercased)))
+    ))):
+        if article.barcode is not None:
+            by_barcode[article.barcode] = article
+        by_article_no[article.article_no] = article
+
+    by_alias = {
+        alias: article
+        for alias, article in db.session.execute(
+            select(ArticleAlias.alias, Article)
+            .join(Article, Article.id == ArticleAlias.article_id)
+            .where(ArticleAlias.alias.in_(uppercased))
+        )
+    }
+
+    batches_by_code = {}
+    for batch, article in db.session.execute(
+        select(Batch, Article)
+        .join(Article, Article.id == Batch.article_id)
+        .where(Batch.batch_code.in_(distinct))
+        .order_by(Batch.id)
+    ):
+        batches_by_code.setdefault(batch.batch_code, []).append((batch, article))
+
+    results = []
+    # Article of the previous resolved scan: the usual sequence is article label, then batch label
+    context = None
+    for code in scanned:
+        batches = batches_by_code.get(code, [])
+        own = [(batch, article) for batch, article in batches if context is not None and article.id == context.id]
+        if own:
+            result = _result(code, MATCH_BATCH, own[0][1], own[0][0])
+        elif code in by_barcode:
+            result = _result(code, MATCH_BARCODE, by_barcode[code])
+        elif code in by_article_no or code.upper() in by_article_no:
+            result = _result(code, MATCH_ARTICLE_NO, by_article_no.get(code) or by_article_no[code.upper()])
+        elif code.upper() in by_alias:
+            result = _result(code, MATCH_ALIAS, by_alias[code.upper()])
+        elif len(batches) == 1:
+            result = _result(code, MATCH_BATCH, batches[0][1], batches[0][0])
+        elif batches:
+            result = _result(code, candidates=[{'article': article, 'batch': batch} for batch, article in batches])
+        else:
+            result = _result(code)
+        if result['article'] is not None:
+            context = result['article']
+        results.append(result)
+    return results
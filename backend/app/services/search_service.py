@@ -0,0 +1,343 @@
+"""Search service - ranked article search.
+
+articles.search_text holds the normalized words (casefolded, split on
+non-word characters) of article_no, description, manufacturer,
+manufacturer_art_number and the article's aliases. An after_flush hook
+rewrites it for the articles and aliases changed in the flush, so it
+commits or rolls back with them; `flask rebuild-search-text` covers bulk
+loads and direct SQL edits.
+
+A query matches an article when every query word is a prefix of one of
+its words, or (for typos) is close to one by trigram similarity.
+
+PostgreSQL: per query word, a prefix tsquery ('w:*') against the GIN index
+ix_articles_search_vector or the pg_trgm word similarity operator against
+ix_articles_search_trgm; the conditions of all words are ANDed.
+
+Other databases: an in-process inverted index (word -> article ids, sorted
+vocabulary for prefixes, trigram -> words for typos) built from one query.
+Commits that changed search_text drop it; it is also rebuilt after
+INDEX_TTL_SECONDS so writes from other processes show up.
+"""
+import heapq
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, case, event, func, inspect, literal_column, or_, select, update
+
+from ..db_routing import RoutingSession
+from ..extensions import db
+from ..models import Article, ArticleAlias
+
+
+# Article columns that feed search_text (aliases are added on top)
+SEARCH_FIELDS = ('article_no', 'description', 'manufacturer', 'manufacturer_art_number')
+
+# pg_trgm's default word_similarity_threshold, used by the fallback index too
+FUZZY_THRESHOLD = 0.6
+
+# Seconds before the in-process index is rebuilt regardless of local writes
+INDEX_TTL_SECONDS = 60
+
+# Articles per UPDATE batch in rebuild_all()
+REBUILD_CHUNK = 5000
+
+# Score weights: exact article_no, then per query word exact > prefix > fuzzy
+_EXACT_ARTICLE_NO = 10.0
+_WORD_EXACT = 1.0
+_WORD_PREFIX = 0.8
+_WORD_FUZZY = 0.6
+
+_WORD = re.compile(r'\w+')
+
+
+def words(text: Optional[str]) -> List[str]:
+    """Casefolded words of a text, in order."""
+    return _WORD.findall(text.casefold()) if text else []
+
+
+def search_document(values: Iterable[Optional[str]]) -> str:
+    """search_text for the given field values: their distinct words, space separated."""
+    return ' '.join(dict.fromkeys(word for value in values for word in words(value)))
+
+
+def update_documents(connection, article_ids: Optional[Iterable[int]] = None) -> int:
+    """Recompute search_text of the given articles (None = all).
+
+    Returns:
+        Articles updated
+    """
+    articles = Article.__table__.c
+    aliases = ArticleAlias.__table__.c
+    stmt = select(articles.id, *[articles[name] for name in SEARCH_FIELDS])
+    alias_stmt = select(aliases.article_id, aliases.alias)
+    if article_ids is not None:
+        article_ids = sorted(set(article_ids))
+        if not article_ids:
+            return 0
+        stmt = stmt.where(articles.id.in_(article_ids))
+        alias_stmt = alias_stmt.where(aliases.article_id.in_(article_ids))
+
+    alias_map = defaultdict(list)
+    for article_id, alias in connection.execute(alias_stmt.order_by(aliases.id)):
+        alias_map[article_id].append(alias)
+    rows = [
+        {'b_id': row[0], 'search_text': search_document([*row[1:], *alias_map[row[0]]])}
+        for row in connection.execute(stmt.order_by(articles.id))
+    ]
+    write = update(Article.__table__).where(articles.id == bindparam('b_id')).values(
+        search_text=bindparam('search_text')
+    )
+    for start in range(0, len(rows), REBUILD_CHUNK):
+        connection.execute(write, rows[start:start + REBUILD_CHUNK])
+    return len(rows)
+
+
+def rebuild_all() -> int:
+    """search_text for every article. Caller commits.
+
+    Returns:
+        Articles updated
+    """
+    return update_documents(db.session.connection(bind_arguments={'bind': db.engine}))
+
+
+def _after_flush(session, flush_context):
+    article_ids = set()
+    for obj in (*session.new, *session.dirty):
+        if isinstance(obj, Article):
+            attrs = inspect(obj).attrs
+            if obj in session.new or any(attrs[name].history.has_changes() for name in SEARCH_FIELDS):
+                article_ids.add(obj.id)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, ArticleAlias):
+            article_ids.add(obj.article_id)
+        elif isinstance(obj, Article) and obj in session.deleted:
+            session.info['search_changed'] = True
+    if article_ids:
+        update_documents(session.connection(bind_arguments={'bind': db.engine}), article_ids)
+        session.info['search_changed'] = True
+
+
+def _after_commit(session):
+    if session.info.pop('search_changed', False):
+        invalidate()
+
+
+def _after_transaction_end(session, transaction):
+    # Rollback of the outermost transaction: the index is still current
+    if transaction.parent is None:
+        session.info.pop('search_changed', None)
+
+
+_SESSION_LISTENERS = (
+    ('after_flush', _after_flush),
+    ('after_commit', _after_commit),
+    ('after_transaction_end', _after_transaction_end),
+)
+
+
+def register_search(app):
+    """Keep articles.search_text in step with article and alias flushes."""
+    for name, fn in _SESSION_LISTENERS:
+        if not event.contains(RoutingSession, name, fn):
+            event.listen(RoutingSession, name, fn)
+
+
+def _trigrams(word: str) -> set:
+    """pg_trgm-style trigrams of one word (two leading blanks, one trailing)."""
+    padded = f'  {word} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """In-process inverted index over search_text, for databases without tsvector/pg_trgm."""
+
+    def __init__(self, rows: Iterable[Tuple[int, str, Optional[str], bool]]):
+        """Build from (id, article_no, search_text, is_active) rows."""
+        self.postings: Dict[str, set] = defaultdict(set)
+        self.inactive = set()
+        # Normalized article_no -> ids, for the exact-match boost
+        self.by_article_no: Dict[str, List[int]] = defaultdict(list)
+        article_nos = {}
+        for article_id, article_no, search_text, is_active in rows:
+            article_nos[article_id] = article_no
+            if not is_active:
+                self.inactive.add(article_id)
+            self.by_article_no[' '.join(words(article_no))].append(article_id)
+            for word in (search_text or '').split():
+                self.postings[word].add(article_id)
+        # Position in article_no order: tie-break between equal scores
+        self.rank = {a: i for i, a in enumerate(sorted(article_nos, key=article_nos.__getitem__))}
+        self.vocabulary = sorted(self.postings)
+        self.word_trigrams: Dict[str, set] = defaultdict(set)
+        for word in self.vocabulary:
+            for trigram in _trigrams(word):
+                self.word_trigrams[trigram].add(word)
+        self.built_at = time.monotonic()
+
+    def _word_matches(self, query_word: str) -> List[Tuple[str, float]]:
+        """Vocabulary words matching query_word with their score: prefixes and typos."""
+        matches = {}
+        i = bisect_left(self.vocabulary, query_word)
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(query_word):
+            word = self.vocabulary[i]
+            matches[word] = _WORD_EXACT if word == query_word else _WORD_PREFIX
+            i += 1
+
+        # Trigram similarity (typos), for the words that are not prefix matches
+        query_trigrams = _trigrams(query_word)
+        shared = defaultdict(int)
+        for trigram in query_trigrams:
+            for word in self.word_trigrams.get(trigram, ()):
+                shared[word] += 1
+        for word, count in shared.items():
+            if word in matches:
+                continue
+            # Share of the query's trigrams found in the word, like pg_trgm word_similarity
+            similarity = count / len(query_trigrams)
+            if similarity >= FUZZY_THRESHOLD:
+                matches[word] = _WORD_FUZZY * similarity
+        return list(matches.items())
+
+    def search(self, query: str, active: str = 'true', offset: int = 0,
+               limit: int = 20) -> Tuple[List[Tuple[int, float]], int]:
+        """Articles matching every query word, best first.
+
+        Words are intersected starting with the most selective one, and only
+        offset + limit hits are ordered; the per-article work stays in set and
+        dict builtins.
+
+        Returns:
+            ([(article_id, score)] for the page, total matches)
+        """
+        query_words = list(dict.fromkeys(words(query)))
+        matched = [self._word_matches(word) for word in query_words]
+        if not matched or not all(matched):
+            return [], 0
+        matched.sort(key=lambda matches: sum(len(self.postings[word]) for word, _ in matches))
+
+        totals = None
+        for matches in matched:
+            # Ascending score: a better match of the same article overwrites a weaker one
+            best = {}
+            for word, score in sorted(matches, key=lambda match: match[1]):
+                ids = self.postings[word] if totals is None else self.postings[word].intersection(totals)
+                best.update(dict.fromkeys(ids, score))
+            totals = best if totals is None else {a: totals[a] + score for a, score in best.items()}
+            if not totals:
+                return [], 0
+
+        if active == 'true':
+            for article_id in self.inactive.intersection(totals):
+                del totals[article_id]
+        elif active == 'false':
+            totals = {a: totals[a] for a in self.inactive.intersection(totals)}
+        for article_id in self.by_article_no.get(' '.join(query_words), ()):
+            if article_id in totals:
+                totals[article_id] += _EXACT_ARTICLE_NO
+
+        # Few distinct scores: order score buckets, then article_no within a bucket
+        needed = offset + limit
+        scores = set(totals.values())
+        if len(scores) == 1:
+            buckets = {scores.pop(): totals}
+        else:
+            buckets = defaultdict(list)
+            for article_id, score in totals.items():
+                buckets[score].append(article_id)
+        ranked = []
+        for score in sorted(buckets, reverse=True):
+            ranked.extend(heapq.nsmallest(needed - len(ranked), buckets[score], key=self.rank.__getitem__))
+            if len(ranked) >= needed:
+                break
+        return [(article_id, round(totals[article_id], 4)) for article_id in ranked[offset:]], len(totals)
+
+
+_index: Optional[SearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def invalidate() -> None:
+    """Drop the in-process index; the next fallback search rebuilds it."""
+    global _index
+    _index = None
+
+
+def _memory_index() -> SearchIndex:
+    global _index
+    with _index_lock:
+        if _index is None or time.monotonic() - _index.built_at > INDEX_TTL_SECONDS:
+            _index = SearchIndex(db.session.execute(
+                select(Article.id, Article.article_no, Article.search_text, Article.is_active)
+            ).all())
+        return _index
+
+
+def _tsquery(query_words: List[str]) -> str:
+    # Words are \w+ only, so no tsquery syntax can leak in
+    return ' & '.join(f'{word}:*' for word in query_words)
+
+
+def _postgres_search(query: str, active: str, columns, limit: int, offset: int):
+    query_words = list(dict.fromkeys(words(query)))
+    if not query_words:
+        return [], 0
+    vector = func.to_tsvector(literal_column("'simple'"), Article.search_text)
+    # Every word must match, as a prefix (GIN tsvector) or a typo (GIN trigram),
+    # the same rule as SearchIndex.search
+    matches = [
+        or_(
+            vector.op('@@')(func.to_tsquery(literal_column("'simple'"), _tsquery([word]))),
+            Article.search_text.op('%>')(word)
+        )
+        for word in query_words
+    ]
+    score = (
+        func.ts_rank(vector, func.to_tsquery(literal_column("'simple'"), _tsquery(query_words)))
+        + sum(func.word_similarity(word, Article.search_text) for word in query_words)
+        + case((func.lower(Article.article_no) == query.strip().lower(), _EXACT_ARTICLE_NO), else_=0)
+    ).label('score')
+    stmt = select(*columns, score, func.count().over().label('match_count')).where(*matches)
+    if active == 'true':
+        stmt = stmt.where(Article.is_active.is_(True))
+    elif active == 'false':
+        stmt = stmt.where(Article.is_active.is_(False))
+    rows = db.session.execute(
+        stmt.order_by(score.desc(), Article.article_no).limit(limit).offset(offset)
+    ).mappings().all()
+    total = rows[0]['match_count'] if rows else 0
+    return [{k: v for k, v in row.items() if k != 'match_count'} for row in rows], total
+
+
+def search(query: str, columns: Iterable[str], active: str = 'true',
+           page: int = 1, per_page: int = 20) -> Tuple[List[dict], int]:
+    """Ranked articles matching query.
+
+    Args:
+        columns: Article columns to return with each match
+        active: 'true', 'false' or 'all'
+
+    Returns:
+        (page of row dicts with the columns plus score, total matches)
+    """
+    table_columns = [Article.__table__.c[name] for name in columns]
+    offset = (page - 1) * per_page
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return _postgres_search(query, active, table_columns, per_page, offset)
+
+    page_ids, total = _memory_index().search(query, active, offset, per_page)
+    if not page_ids:
+        return [], total
+    rows = {row['id']: dict(row) for row in db.session.execute(
+        select(*table_columns).where(Article.id.in_([article_id for article_id, _ in page_ids]))
+    ).mappings()}
+    items = []
+    for article_id, score in page_ids:
+        if article_id in rows:
+            items.append({**rows[article_id], 'score': score})
+    return items, total
@@ -0,0 +1,206 @@
+"""Snapshot service - daily stock balances and point-in-time inventory.
+
+A snapshot holds the stock and surplus balances at the end of a UTC day.
+Balances at any other time are derived from the snapshot (or the live
+inventory_balances) closest to it, plus or minus the transactions in
+between, so a month-end report reads a few days of transactions instead
+of the whole log.
+
+How transactions move the balances:
+    stock:   STOCK_RECEIPT, STOCK_CONSUMED, INVENTORY_ADJUSTMENT from
+             shortage approvals and stock adjustments
+    surplus: SURPLUS_CONSUMED, INVENTORY_ADJUSTMENT from inventory counts
+             and surplus adjustments
+WEIGH_IN rows record the weighed quantity only; the consumption rows
+written next to them carry the balance change.
+"""
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, func, insert, select
+
+from ..extensions import db
+from ..models import InventoryBalance, Transaction, StockSnapshot
+
+
+ZERO = Decimal('0')
+
+Key = Tuple[int, int, int]
+
+_adjustment_target = Transaction.meta['target'].as_string()
+_is_adjustment = Transaction.tx_type == Transaction.TX_INVENTORY_ADJUSTMENT
+
+STOCK_DELTA = case(
+    (Transaction.tx_type.in_([Transaction.TX_STOCK_RECEIPT, Transaction.TX_STOCK_CONSUMED]),
+     Transaction.quantity_kg),
+    (and_(_is_adjustment, Transaction.source == 'shortage_approval'), Transaction.quantity_kg),
+    (and_(_is_adjustment, Transaction.source == 'adjustment', _adjustment_target == 'stock'),
+     Transaction.quantity_kg),
+    else_=0,
+)
+
+SURPLUS_DELTA = case(
+    (Transaction.tx_type == Transaction.TX_SURPLUS_CONSUMED, Transaction.quantity_kg),
+    (and_(_is_adjustment, Transaction.source == 'inventory_count'), Transaction.quantity_kg),
+    (and_(_is_adjustment, Transaction.source == 'adjustment', _adjustment_target == 'surplus'),
+     Transaction.quantity_kg),
+    else_=0,
+)
+
+
+def day_end(day: date) -> datetime:
+    """UTC instant a day's snapshot describes (midnight after day)."""
+    return datetime.combine(day + timedelta(days=1), time.min, tzinfo=timezone.utc)
+
+
+def _balances() -> Dict[Key, list]:
+    return defaultdict(lambda: [ZERO, ZERO])
+
+
+def _key_filters(model, location_id, article_id):
+    filters = []
+    if location_id:
+        filters.append(model.location_id == location_id)
+    if article_id:
+        filters.append(model.article_id == article_id)
+    return filters
+
+
+def current_balances(location_id: Optional[int] = None, article_id: Optional[int] = None) -> Dict[Key, list]:
+    """Live balances: {(location, article, batch): [stock, surplus]}."""
+    balances = _balances()
+    rows = db.session.execute(
+        select(InventoryBalance.location_id, InventoryBalance.article_id, InventoryBalance.batch_id,
+               InventoryBalance.stock_kg, InventoryBalance.surplus_kg)
+        .where(*_key_filters(InventoryBalance, location_id, article_id))
+    )
+    for loc, art, batch, stock_kg, surplus_kg in rows:
+        balances[(loc, art, batch)] = [Decimal(stock_kg), Decimal(surplus_kg)]
+    return balances
+
+
+def snapshot_balances(snapshot_date: date, location_id: Optional[int] = None,
+                      article_id: Optional[int] = None) -> Dict[Key, list]:
+    """Balances stored for snapshot_date."""
+    balances = _balances()
+    rows = db.session.execute(
+        select(StockSnapshot.location_id, StockSnapshot.article_id, StockSnapshot.batch_id,
+               StockSnapshot.stock_kg, StockSnapshot.surplus_kg)
+        .where(StockSnapshot.snapshot_date == snapshot_date,
+               *_key_filters(StockSnapshot, location_id, article_id))
+    )
+    for loc, art, batch, stock_kg, surplus_kg in rows:
+        balances[(loc, art, batch)] = [Decimal(stock_kg), Decimal(surplus_kg)]
+    return balances
+
+
+def movements(since: datetime, until: Optional[datetime] = None, location_id: Optional[int] = None,
+              article_id: Optional[int] = None) -> Dict[Key, list]:
+    """Net stock/surplus change per key for transactions in [since, until).
+
+    The occurred_at range uses ix_transactions_occurred_at and prunes
+    monthly partitions on PostgreSQL.
+    """
+    filters = [Transaction.occurred_at >= since, *_key_filters(Transaction, location_id, article_id)]
+    if until is not None:
+        filters.append(Transaction.occurred_at < until)
+    rows = db.session.execute(
+        select(Transaction.location_id, Transaction.article_id, Transaction.batch_id,
+               func.sum(STOCK_DELTA), func.sum(SURPLUS_DELTA))
+        .where(*filters)
+        .group_by(Transaction.location_id, Transaction.article_id, Transaction.batch_id)
+    )
+    totals = _balances()
+    for loc, art, batch, stock_delta, surplus_delta in rows:
+        totals[(loc, art, batch)] = [Decimal(stock_delta or 0), Decimal(surplus_delta or 0)]
+    return totals
+
+
+def _apply(balances: Dict[Key, list], deltas: Dict[Key, list], sign: int) -> Dict[Key, list]:
+    for key, (stock_delta, surplus_delta) in deltas.items():
+        balances[key][0] += sign * stock_delta
+        balances[key][1] += sign * surplus_delta
+    return balances
+
+
+def take_snapshots(days: list) -> Dict[date, int]:
+    """Write snapshots for the given past days, replacing existing ones. Caller commits.
+
+    Starts from the live balances and walks back one day at a time,
+    subtracting each day's transactions, so backfilling N days reads every
+    transaction since the oldest day once.
+
+    Returns:
+        {snapshot_date: rows written}
+    """
+    today = datetime.now(timezone.utc).date()
+    days = sorted(set(days), reverse=True)
+    if days and days[0] >= today:
+        raise ValueError('Snapshots can only be taken for days that have ended (before today, UTC)')
+
+    balances = current_balances()
+    cursor = None  # instant the balances currently describe; None = now
+    written = {}
+    for day in days:
+        boundary = day_end(day)
+        _apply(balances, movements(boundary, cursor), -1)
+        cursor = boundary
+
+        db.session.execute(delete(StockSnapshot).where(StockSnapshot.snapshot_date == day))
+        rows = [
+            {'snapshot_date': day, 'location_id': key[0], 'article_id': key[1], 'batch_id': key[2],
+             'stock_kg': stock_kg, 'surplus_kg': surplus_kg}
+            for key, (stock_kg, surplus_kg) in sorted(balances.items())
+            if stock_kg or surplus_kg
+        ]
+        if rows:
+            db.session.execute(insert(StockSnapshot), rows)
+        written[day] = len(rows)
+    return written
+
+
+def balances_as_of(as_of: date, location_id: Optional[int] = None,
+                   article_id: Optional[int] = None) -> Tuple[Dict[Key, list], dict]:
+    """Balances at the end of as_of from the nearest snapshot plus the delta.
+
+    The starting point is the closest snapshot before or after as_of, or the
+    live balances when they are closer (or no snapshot exists).
+
+    Returns:
+        (balances, basis) where basis describes the starting point
+    """
+    target = day_end(as_of)
+    now = datetime.now(timezone.utc)
+    if target >= now:
+        return current_balances(location_id, article_id), {'source': 'current', 'snapshot_date': None}
+
+    before = db.session.execute(
+        select(func.max(StockSnapshot.snapshot_date)).where(StockSnapshot.snapshot_date <= as_of)
+    ).scalar()
+    after = db.session.execute(
+        select(func.min(StockSnapshot.snapshot_date)).where(StockSnapshot.snapshot_date > as_of)
+    ).scalar()
+
+    # (distance, starting instant, snapshot date or None for live balances)
+    candidates = [(now - target, now, None)]
+    if before is not None:
+        candidates.append((target - day_end(before), day_end(before), before))
+    if after is not None:
+        candidates.append((day_end(after) - target, day_end(after), after))
+    _, start, snapshot_date = min(candidates, key=lambda c: c[0])
+
+    if snapshot_date is None:
+        balances = current_balances(location_id, article_id)
+    else:
+        balances = snapshot_balances(snapshot_date, location_id, article_id)
+
+    if start < target:
+        _apply(balances, movements(start, target, location_id, article_id), 1)
+    elif start > target:
+        _apply(balances, movements(target, None if snapshot_date is None else start,
+                                   location_id, article_id), -1)
+
+    basis = {'source': 'current' if snapshot_date is None else 'snapshot', 'snapshot_date': snapshot_date}
+    return balances, basis
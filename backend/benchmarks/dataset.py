@@ -0,0 +1,39 @@
+"""Scaled benchmark dataset, built with the seed-scale generator."""
+from app.cli.seed_scale import LOCATION_CODE, generate
+from app.extensions import db
+from app.models import User, Location, InventoryBalance
+
+
+# generate() parameters; transactions ~= days * tx_per_day
+SCALES = {
+    'small': {'articles': 200, 'batches_per_article': 5, 'days': 60, 'tx_per_day': 800},
+    'medium': {'articles': 2_000, 'batches_per_article': 10, 'days': 180, 'tx_per_day': 2_800},
+    'full': {'articles': 5_000, 'batches_per_article': 20, 'days': 365, 'tx_per_day': 13_700},
+}
+
+__all__ = ['SCALES', 'is_populated', 'load_context', 'populate']
+
+
+def is_populated() -> bool:
+    return db.session.query(InventoryBalance.id).first() is not None
+
+
+def load_context() -> dict:
+    """Location, admin user and inventory keys of an already populated dataset."""
+    location = Location.query.filter_by(code=LOCATION_CODE).one()
+    admin = User.query.filter_by(role='ADMIN', is_active=True).order_by(User.id).first()
+    keys = db.session.query(InventoryBalance.article_id, InventoryBalance.batch_id).filter(
+        InventoryBalance.location_id == location.id
+    ).order_by(InventoryBalance.batch_id).all()
+    return {'location_id': location.id, 'admin_user_id': admin.id, 'keys': [tuple(k) for k in keys]}
+
+
+def populate(scale: str = 'small', seed: int = 42) -> dict:
+    """Create the benchmark dataset for the given scale preset.
+
+    Returns:
+        load_context() of the new dataset
+    """
+    generate(seed=seed, **SCALES[scale])
+    db.session.commit()
+    return load_context()
@@ -0,0 +1,261 @@
+"""Benchmark runner for hot endpoints and services.
+
+Usage (from backend/):
+    BENCH_DATABASE_URL=postgresql+psycopg2://localhost/warehouse_bench \\
+        python -m benchmarks.run --scale small --output bench_results.json
+
+    # compare against the committed baseline (exit 1 on regression)
+    python -m benchmarks.run --scale small --check benchmarks/baseline.json
+
+    # refresh the baseline after an intentional change
+    python -m benchmarks.run --scale small --write-baseline benchmarks/baseline.json
+
+The database is created and populated on first use and reused afterwards
+(use --reset to rebuild it). Every scenario reports p50/p99/mean latency in
+milliseconds and the number of SQL statements per call.
+"""
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.extensions import db
+from app.query_stats import count_queries
+from app.services import draft_group_service
+from app.services.receiving_service import receive_stock
+
+from . import dataset
+
+
+DEFAULT_DATABASE_URL = 'sqlite:///bench.db'
+
+ENDPOINTS = {
+    'inventory_summary': '/api/inventory/summary',
+    'reports_inventory': '/api/reports/inventory',
+    'transactions': '/api/transactions',
+    'draft_groups': '/api/draft-groups',
+    'consumption_forecast': '/api/reports/consumption-forecast',
+    'article_search': '/api/articles/search?q=paint+mankiewicz',
+}
+
+APPROVE_GROUP_SIZES = (10, 100, 1000)
+
+
+class BenchConfig:
+    """App config for benchmarks: no rate limits, no query budget."""
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = os.getenv('BENCH_DATABASE_URL', DEFAULT_DATABASE_URL)
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    ENV = 'testing'
+    JWT_SECRET_KEY = 'benchmark-jwt-secret-key-not-for-production'
+    JWT_TOKEN_LOCATION = ['headers']
+    API_TITLE = 'Warehouse API Benchmarks'
+    API_VERSION = '0.1.0'
+    OPENAPI_VERSION = '3.0.3'
+    RATELIMIT_ENABLED = False
+    QUERY_BUDGET_ENFORCE = False
+
+    @classmethod
+    def get_cors_origins(cls):
+        return []
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(timings_ms, query_counts):
+    return {
+        'iterations': len(timings_ms),
+        'p50_ms': round(percentile(timings_ms, 50), 2),
+        'p99_ms': round(percentile(timings_ms, 99), 2),
+        'mean_ms': round(statistics.fmean(timings_ms), 2),
+        'queries': max(query_counts),
+    }
+
+
+def measure(fn, iterations, setup=None):
+    """Call fn() iterations times; setup() runs untimed before each call."""
+    timings, queries = [], []
+    for _ in range(iterations):
+        arg = setup() if setup else None
+        with count_queries() as stats:
+            started = time.perf_counter()
+            fn(arg)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(stats.count)
+    return summarize(timings, queries)
+
+
+def bench_endpoints(app, ctx, iterations):
+    client = app.test_client()
+    token = create_access_token(
+        identity=str(ctx['admin_user_id']), additional_claims={'role': 'ADMIN'}
+    )
+    headers = {'Authorization': f'Bearer {token}'}
+    results = {}
+
+    for name, url in ENDPOINTS.items():
+        def call(_, url=url):
+            response = client.get(url, headers=headers)
+            assert response.status_code == 200, (url, response.status_code)
+        # Warm-up (connection, caches)
+        call(None)
+        results[name] = measure(call, iterations)
+    return results
+
+
+def bench_approve_group(ctx, iterations):
+    keys = ctx['keys']
+    results = {}
+    counter = {'n': 0}
+
+    for size in APPROVE_GROUP_SIZES:
+        def setup(size=size):
+            counter['n'] += 1
+            lines = [{
+                'article_id': keys[i % len(keys)][0],
+                'batch_id': keys[i % len(keys)][1],
+                'quantity_kg': 0.5,
+                'client_event_id': f'bench-approve-{time.time_ns()}-{counter["n"]}-{i}',
+            } for i in range(size)]
+            group = draft_group_service.create_group(
+                location_id=ctx['location_id'],
+                user_id=ctx['admin_user_id'],
+                lines=lines
+            )
+            return group.id
+
+        def call(group_id):
+            draft_group_service.approve_group(group_id, ctx['admin_user_id'])
+
+        # Large groups are slow; fewer iterations keep the run in minutes
+        runs = max(3, iterations // (size // 10))
+        results[f'approve_group_{size}'] = measure(call, runs, setup=setup)
+    return results
+
+
+def bench_receive_stock(ctx, iterations):
+    keys = ctx['keys']
+    counter = {'n': 0}
+
+    def call(_):
+        counter['n'] += 1
+        article_id = keys[counter['n'] % len(keys)][0]
+        receive_stock(
+            article_id=article_id,
+            batch_code=f'{50000 + counter["n"] % 40000:05d}',
+            quantity_kg=Decimal('25.00'),
+            expiry_date=date.today() + timedelta(days=365),
+            actor_user_id=ctx['admin_user_id'],
+            order_number='PO-BENCH'
+        )
+        db.session.commit()
+
+    return {'receive_stock': measure(call, iterations)}
+
+
+def run(scale, iterations, reset=False, seed=42):
+    app = create_app(BenchConfig)
+    with app.app_context():
+        if reset:
+            db.drop_all()
+        db.create_all()
+
+        if dataset.is_populated():
+            ctx = dataset.load_context()
+        else:
+            print(f'Populating {scale} dataset: {dataset.SCALES[scale]}', file=sys.stderr)
+            started = time.perf_counter()
+            ctx = dataset.populate(scale, seed=seed)
+            print(f'  done in {time.perf_counter() - started:.1f}s', file=sys.stderr)
+
+        results = {}
+        results.update(bench_endpoints(app, ctx, iterations))
+        results.update(bench_approve_group(ctx, iterations))
+        results.update(bench_receive_stock(ctx, iterations))
+
+        return {
+            'scale': scale,
+            'database': db.engine.dialect.name,
+            'results': results,
+        }
+
+
+def compare(report, baseline):
+    """Return a list of regression messages (empty = OK).
+
+    Latency is only compared when both runs used the same database backend;
+    query counts are compared always.
+    """
+    thresholds = baseline.get('thresholds', {})
+    latency_pct = thresholds.get('latency_pct', 25)
+    extra_queries = thresholds.get('extra_queries', 0)
+    same_backend = report['database'] == baseline.get('database')
+
+    problems = []
+    for name, base in baseline['results'].items():
+        current = report['results'].get(name)
+        if current is None:
+            problems.append(f'{name}: missing from this run')
+            continue
+        if current['queries'] > base['queries'] + extra_queries:
+            problems.append(f"{name}: {current['queries']} queries (baseline {base['queries']})")
+        if same_backend:
+            for key in ('p50_ms', 'p99_ms'):
+                limit = base[key] * (1 + latency_pct / 100)
+                if current[key] > limit:
+                    problems.append(
+                        f'{name}: {key} {current[key]} > {limit:.2f} '
+                        f'(baseline {base[key]} + {latency_pct}%)'
+                    )
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run warehouse benchmarks')
+    parser.add_argument('--scale', choices=sorted(dataset.SCALES), default='small')
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--reset', action='store_true', help='Drop and repopulate the database')
+    parser.add_argument('--output', help='Write results JSON here')
+    parser.add_argument('--check', metavar='BASELINE', help='Fail on regression against baseline')
+    parser.add_argument('--write-baseline', metavar='BASELINE', help='Save results as new baseline')
+    args = parser.parse_args(argv)
+
+    report = run(args.scale, args.iterations, reset=args.reset, seed=args.seed)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    print(text)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+
+    if args.write_baseline:
+        report['thresholds'] = {'latency_pct': 25, 'extra_queries': 0}
+        with open(args.write_baseline, 'w') as f:
+            f.write(json.dumps(report, indent=2, sort_keys=True) + '\n')
+
+    if args.check:
+        with open(args.check) as f:
+            baseline = json.load(f)
+        problems = compare(report, baseline)
+        for problem in problems:
+            print(f'REGRESSION {problem}', file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
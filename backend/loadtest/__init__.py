@@ -0,0 +1 @@
+"""Closed-loop load tests against a running server (asyncio + httpx)."""
@@ -0,0 +1,240 @@
+"""Load-test runner: ramp operator stations and find the knee of the curve.
+
+Start the server without rate limits first (one worker per core is typical):
+    RATELIMIT_ENABLED=false gunicorn -w 4 -b 127.0.0.1:5001 'app:create_app()'
+
+Then, from backend/:
+    python -m loadtest.run --base-url http://127.0.0.1:5001 \\
+        --operators 5,10,20,40 --approvers 2 --dashboards 3 --duration 60 \\
+        --output load_results.json
+
+Every stage runs for --duration seconds with the given number of operator
+stations (approvers and dashboards stay constant) and reports throughput,
+p50/p95/p99 latency, error and 409 rates per request type, plus the row-lock
+wait and transaction-conflict deltas scraped from /metrics. The knee is the
+first stage where adding stations no longer raises throughput by
+--knee-gain percent.
+"""
+import argparse
+import asyncio
+import json
+import math
+import re
+import statistics
+import sys
+import time
+from collections import Counter, defaultdict
+
+import httpx
+
+from . import scenarios
+
+
+LOCK_METRICS = (
+    'db_row_lock_wait_seconds_sum',
+    'db_row_lock_wait_seconds_count',
+    'db_transaction_conflicts_total',
+)
+_SAMPLE_RE = re.compile(r'^(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)(?P<labels>\{[^}]*\})?\s+(?P<value>\S+)')
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Stats:
+    """Latency and status code samples per request name."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    def record(self, name: str, status: int, seconds: float) -> None:
+        self.latencies[name].append(seconds * 1000)
+        self.statuses[name][status] += 1
+
+    def _summarize(self, latencies, statuses, elapsed):
+        count = len(latencies)
+        errors = sum(n for status, n in statuses.items() if status == 0 or status >= 500)
+        return {
+            'requests': count,
+            'throughput_rps': round(count / elapsed, 2) if elapsed else 0.0,
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'mean_ms': round(statistics.fmean(latencies), 2),
+            'error_rate': round(errors / count, 4),
+            'conflict_rate': round(statuses.get(409, 0) / count, 4),
+            'statuses': {str(status): n for status, n in sorted(statuses.items())},
+        }
+
+    def summary(self, elapsed: float) -> dict:
+        """Per-request-type results plus a 'total' row."""
+        result = {
+            name: self._summarize(values, self.statuses[name], elapsed)
+            for name, values in sorted(self.latencies.items())
+        }
+        if self.latencies:
+            all_latencies = [v for values in self.latencies.values() for v in values]
+            all_statuses = Counter()
+            for statuses in self.statuses.values():
+                all_statuses.update(statuses)
+            result['total'] = self._summarize(all_latencies, all_statuses, elapsed)
+        return result
+
+
+def parse_metrics(text: str) -> dict:
+    """Lock-wait and conflict samples from Prometheus text: {'name{labels}': value}."""
+    samples = {}
+    for line in text.splitlines():
+        match = _SAMPLE_RE.match(line)
+        if match and match['name'] in LOCK_METRICS:
+            samples[match['name'] + (match['labels'] or '')] = float(match['value'])
+    return samples
+
+
+def lock_report(before: dict, after: dict) -> dict:
+    """Per-operation lock waits and per-reason conflicts during a stage."""
+    delta = {key: value - before.get(key, 0.0) for key, value in after.items()}
+    report = {'lock_wait': {}, 'conflicts': {}}
+    for key, value in delta.items():
+        labels = dict(re.findall(r'(\w+)="([^"]*)"', key))
+        if key.startswith('db_row_lock_wait_seconds_count') and value:
+            operation = labels.get('operation', '')
+            total = delta.get(key.replace('_count', '_sum', 1), 0.0)
+            report['lock_wait'][operation] = {
+                'acquisitions': int(value),
+                'mean_ms': round(total / value * 1000, 3),
+            }
+        elif key.startswith('db_transaction_conflicts_total') and value:
+            report['conflicts'][f"{labels.get('operation')}:{labels.get('reason')}"] = int(value)
+    return report
+
+
+def find_knee(stages: list, min_gain_pct: float) -> dict:
+    """First stage whose throughput gain over the previous one is below min_gain_pct."""
+    for previous, current in zip(stages, stages[1:]):
+        before = previous['results'].get('total', {}).get('throughput_rps', 0)
+        after = current['results'].get('total', {}).get('throughput_rps', 0)
+        if before and (after - before) / before * 100 < min_gain_pct:
+            return {'operators': current['operators'], 'last_scaling_stage': previous['operators']}
+    return {}
+
+
+async def _login(client, username, password):
+    response = await client.post('/api/auth/login', json={'username': username, 'password': password})
+    response.raise_for_status()
+    return response.json()['access_token']
+
+
+async def _tokens(client, args):
+    return {
+        'admin': await _login(client, args.admin_user, args.admin_password),
+        'operator': await _login(client, args.operator_user, args.operator_password),
+    }
+
+
+async def _scrape(client):
+    try:
+        response = await client.get('/metrics')
+    except httpx.HTTPError:
+        return {}
+    return parse_metrics(response.text) if response.status_code == 200 else {}
+
+
+async def run_stage(client, tokens, keys, args, operators, seed):
+    stats = Stats()
+    deadline = time.monotonic() + args.duration
+    think = {'operator': args.operator_think, 'approver': args.approver_think,
+             'dashboard': args.dashboard_think}
+    ctx = scenarios.Context(client, stats, tokens, keys, deadline, think,
+                            location_id=args.location_id, seed=seed)
+
+    before = await _scrape(client)
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(scenarios.operator_station(ctx, n) for n in range(operators)),
+        *(scenarios.approver(ctx, n) for n in range(args.approvers)),
+        *(scenarios.dashboard(ctx, n) for n in range(args.dashboards)),
+    )
+    elapsed = time.perf_counter() - started
+    after = await _scrape(client)
+
+    return {
+        'operators': operators,
+        'approvers': args.approvers,
+        'dashboards': args.dashboards,
+        'duration_s': round(elapsed, 2),
+        'results': stats.summary(elapsed),
+        'locks': lock_report(before, after),
+        'unapproved_backlog': ctx.pending.qsize(),
+    }
+
+
+async def run(args):
+    limits = httpx.Limits(max_connections=args.max_connections)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        tokens = await _tokens(client, args)
+        response = await client.get('/api/inventory/summary', params={'location_id': args.location_id},
+                                    headers={'Authorization': f"Bearer {tokens['admin']}"})
+        response.raise_for_status()
+        keys = [item for item in response.json()['items'] if item['total_qty'] > 0 and item['expiry_date']]
+        if not keys:
+            raise SystemExit('No stock to weigh against - seed the server first (flask seed-scale)')
+
+        stages = []
+        for index, operators in enumerate(args.operators):
+            print(f'stage {index + 1}/{len(args.operators)}: {operators} operator stations '
+                  f'for {args.duration}s', file=sys.stderr)
+            if index:
+                # Access tokens expire after 15 minutes; log in again per stage
+                tokens = await _tokens(client, args)
+            stage = await run_stage(client, tokens, keys, args, operators, seed=args.seed + index)
+            total = stage['results'].get('total', {})
+            print(f"  {total.get('throughput_rps', 0)} req/s  p50 {total.get('p50_ms')} ms  "
+                  f"p99 {total.get('p99_ms')} ms  errors {total.get('error_rate')}  "
+                  f"409 {total.get('conflict_rate')}", file=sys.stderr)
+            stages.append(stage)
+
+    return {'base_url': args.base_url, 'stages': stages, 'knee': find_knee(stages, args.knee_gain)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Closed-loop warehouse load test')
+    parser.add_argument('--base-url', default='http://127.0.0.1:5001')
+    parser.add_argument('--operators', default='5,10,20',
+                        type=lambda s: [int(n) for n in s.split(',')],
+                        help='Operator stations per stage, comma-separated')
+    parser.add_argument('--location-id', type=int, default=13)
+    parser.add_argument('--approvers', type=int, default=2)
+    parser.add_argument('--dashboards', type=int, default=3)
+    parser.add_argument('--duration', type=float, default=60, help='Seconds per stage')
+    parser.add_argument('--operator-think', type=float, default=1.0, help='Mean think time (s)')
+    parser.add_argument('--approver-think', type=float, default=0.2)
+    parser.add_argument('--dashboard-think', type=float, default=5.0)
+    parser.add_argument('--knee-gain', type=float, default=10.0,
+                        help='Throughput gain (%%) below which a stage counts as the knee')
+    parser.add_argument('--admin-user', default='stefan')
+    parser.add_argument('--admin-password', default='ChangeMe123!')
+    parser.add_argument('--operator-user', default='operator')
+    parser.add_argument('--operator-password', default='Operator123!')
+    parser.add_argument('--max-connections', type=int, default=200)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Write results JSON here')
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
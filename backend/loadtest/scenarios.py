@@ -0,0 +1,121 @@
+"""Virtual users: operator stations, approvers and dashboards.
+
+Each scenario is a closed loop - send a request, wait for the answer, think,
+repeat - until the stage deadline. Operators feed the groups and drafts they
+create into a shared queue that approvers drain, like the real approval flow.
+"""
+import asyncio
+import random
+import time
+import uuid
+
+
+class Context:
+    """State shared by all virtual users of one stage."""
+
+    def __init__(self, client, stats, tokens, keys, deadline, think, location_id=13, seed=None):
+        self.client = client
+        self.stats = stats
+        self.tokens = tokens
+        self.keys = keys
+        self.location_id = location_id
+        self.deadline = deadline
+        self.think = think
+        self.rng = random.Random(seed)
+        self.pending = asyncio.Queue()
+
+    def running(self) -> bool:
+        return time.monotonic() < self.deadline
+
+    async def pause(self, kind: str) -> None:
+        """Exponential think time with the configured mean, cut off at the deadline."""
+        mean = self.think[kind]
+        if mean > 0:
+            delay = self.rng.expovariate(1 / mean)
+            await asyncio.sleep(min(delay, max(self.deadline - time.monotonic(), 0)))
+
+    async def call(self, name, role, method, url, **kwargs):
+        """Send one request and record its latency and status under name."""
+        headers = {'Authorization': f"Bearer {self.tokens[role]}"}
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=headers, **kwargs)
+            status = response.status_code
+        except Exception:
+            # Connection errors and timeouts count as errors (status 0)
+            response, status = None, 0
+        self.stats.record(name, status, time.perf_counter() - started)
+        return response
+
+
+def _line(ctx, station):
+    key = ctx.rng.choice(ctx.keys)
+    return {
+        'article_id': key['article_id'],
+        'batch_id': key['batch_id'],
+        'quantity_kg': round(ctx.rng.uniform(0.1, 2.5), 2),
+        'client_event_id': f'load-{station}-{uuid.uuid4().hex}',
+    }
+
+
+async def operator_station(ctx, station: int) -> None:
+    """Weigh-in station: mostly multi-line draft groups, some single drafts."""
+    while ctx.running():
+        if ctx.rng.random() < 0.7:
+            response = await ctx.call('create_group', 'operator', 'POST', '/api/draft-groups', json={
+                'location_id': ctx.location_id,
+                'lines': [_line(ctx, station) for _ in range(ctx.rng.randint(1, 5))],
+            })
+            if response is not None and response.status_code == 201:
+                ctx.pending.put_nowait(('group', response.json()['id']))
+        else:
+            response = await ctx.call('create_draft', 'operator', 'POST', '/api/drafts', json={
+                'location_id': ctx.location_id, **_line(ctx, station)
+            })
+            if response is not None and response.status_code == 201:
+                ctx.pending.put_nowait(('draft', response.json()['id']))
+        await ctx.pause('operator')
+
+
+async def approver(ctx, number: int) -> None:
+    """Admin approving (sometimes rejecting) queued work and receiving POs."""
+    while ctx.running():
+        if ctx.rng.random() < 0.1:
+            key = ctx.rng.choice(ctx.keys)
+            await ctx.call('receive_stock', 'admin', 'POST', '/api/inventory/receive', json={
+                'location_id': ctx.location_id,
+                'article_id': key['article_id'],
+                'batch_code': key['batch_code'],
+                'expiry_date': key['expiry_date'],
+                'quantity_kg': '250.00',
+                'order_number': f'PO-LOAD-{number}',
+            })
+        else:
+            try:
+                kind, item_id = await asyncio.wait_for(ctx.pending.get(), timeout=1)
+            except asyncio.TimeoutError:
+                continue
+            action = 'reject' if ctx.rng.random() < 0.05 else 'approve'
+            if kind == 'group':
+                await ctx.call(f'{action}_group', 'admin', 'POST',
+                               f'/api/draft-groups/{item_id}/{action}', json={})
+            else:
+                await ctx.call(f'{action}_draft', 'admin', 'POST',
+                               f'/api/drafts/{item_id}/{action}', json={})
+        await ctx.pause('approver')
+
+
+DASHBOARD_URLS = (
+    ('inventory_summary', '/api/inventory/summary'),
+    ('reports_inventory', '/api/reports/inventory'),
+    ('reports_transactions', '/api/reports/transactions'),
+    ('draft_groups', '/api/draft-groups'),
+)
+
+
+async def dashboard(ctx, number: int) -> None:
+    """Wall display polling summary, reports and the group list."""
+    while ctx.running():
+        name, url = ctx.rng.choice(DASHBOARD_URLS)
+        await ctx.call(name, 'admin', 'GET', url)
+        await ctx.pause('dashboard')
@@ -0,0 +1,126 @@
+"""merge stock and surplus into inventory_balances
+
+Revision ID: a7d3e9f1c4b2
+Revises: f2c9d6e3a8b1
+Create Date: 2026-10-18 14:22:41.118093
+
+Stock and surplus share the key (location_id, article_id, batch_id); one
+row now holds both quantities. Rows of the old tables are merged per key
+(a key present in only one table gets 0 for the other quantity). The old
+tables are replaced by views with the same names and columns for
+ad-hoc SQL and reporting tools.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3e9f1c4b2'
+down_revision = 'f2c9d6e3a8b1'
+branch_labels = None
+depends_on = None
+
+KEY = ('location_id', 'article_id', 'batch_id')
+
+
+def _key_join(alias):
+    return ' AND '.join(f'{alias}.{column} = k.{column}' for column in KEY)
+
+
+def upgrade():
+    op.create_table('inventory_balances',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('location_id', sa.Integer(), nullable=False),
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.Column('batch_id', sa.Integer(), nullable=False),
+    sa.Column('stock_kg', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('surplus_kg', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('surplus_reason', sa.Text(), nullable=True),
+    sa.Column('stock_updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('surplus_updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.CheckConstraint('stock_kg >= 0', name='ck_inventory_balances_stock_positive'),
+    sa.CheckConstraint('surplus_kg >= 0', name='ck_inventory_balances_surplus_positive'),
+    sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ),
+    sa.ForeignKeyConstraint(['batch_id'], ['batches.id'], ),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('location_id', 'article_id', 'batch_id', name='uq_inventory_balances_key')
+    )
+
+    # Union of keys rather than FULL OUTER JOIN (not available on older SQLite)
+    columns = ', '.join(KEY)
+    op.execute(
+        f'INSERT INTO inventory_balances ({columns}, stock_kg, surplus_kg, surplus_reason, '
+        'stock_updated_at, surplus_updated_at, created_at) '
+        f'SELECT {", ".join("k." + c for c in KEY)}, '
+        'COALESCE(st.quantity_kg, 0), COALESCE(su.quantity_kg, 0), su.reason, '
+        'st.last_updated, su.updated_at, '
+        'COALESCE(su.created_at, st.last_updated, CURRENT_TIMESTAMP) '
+        f'FROM (SELECT {columns} FROM stock UNION SELECT {columns} FROM surplus) k '
+        f'LEFT JOIN stock st ON {_key_join("st")} '
+        f'LEFT JOIN surplus su ON {_key_join("su")} '
+        f'ORDER BY {", ".join("k." + c for c in KEY)}'
+    )
+
+    op.drop_table('surplus')
+    op.drop_table('stock')
+
+    op.execute(
+        f'CREATE VIEW stock AS SELECT id, {columns}, stock_kg AS quantity_kg, '
+        'COALESCE(stock_updated_at, created_at) AS last_updated FROM inventory_balances'
+    )
+    op.execute(
+        f'CREATE VIEW surplus AS SELECT id, {columns}, surplus_kg AS quantity_kg, '
+        'surplus_reason AS reason, created_at, surplus_updated_at AS updated_at '
+        'FROM inventory_balances'
+    )
+
+
+def downgrade():
+    op.execute('DROP VIEW surplus')
+    op.execute('DROP VIEW stock')
+
+    op.create_table('stock',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('location_id', sa.Integer(), nullable=False),
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.Column('batch_id', sa.Integer(), nullable=False),
+    sa.Column('quantity_kg', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('last_updated', sa.DateTime(timezone=True), nullable=False),
+    sa.CheckConstraint('quantity_kg >= 0', name='ck_stock_quantity_positive'),
+    sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ),
+    sa.ForeignKeyConstraint(['batch_id'], ['batches.id'], ),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('location_id', 'article_id', 'batch_id', name='uq_stock_location_article_batch')
+    )
+    op.create_table('surplus',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('location_id', sa.Integer(), nullable=False),
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.Column('batch_id', sa.Integer(), nullable=False),
+    sa.Column('quantity_kg', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('reason', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.CheckConstraint('quantity_kg >= 0', name='ck_surplus_quantity_positive'),
+    sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ),
+    sa.ForeignKeyConstraint(['batch_id'], ['batches.id'], ),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('location_id', 'article_id', 'batch_id', name='uq_surplus_location_article_batch')
+    )
+
+    columns = ', '.join(KEY)
+    op.execute(
+        f'INSERT INTO stock ({columns}, quantity_kg, last_updated) '
+        f'SELECT {columns}, stock_kg, COALESCE(stock_updated_at, created_at) FROM inventory_balances'
+    )
+    op.execute(
+        f'INSERT INTO surplus ({columns}, quantity_kg, reason, created_at, updated_at) '
+        f'SELECT {columns}, surplus_kg, surplus_reason, created_at, surplus_updated_at '
+        'FROM inventory_balances'
+    )
+
+    op.drop_table('inventory_balances')
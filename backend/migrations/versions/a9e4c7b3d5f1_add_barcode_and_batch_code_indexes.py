@@ -0,0 +1,46 @@
+"""add unique articles.barcode index and batches.batch_code index
+
+Revision ID: a9e4c7b3d5f1
+Revises: f3d8a4c6e2b7
+Create Date: 2026-10-18 20:04:17.329845
+
+Scan resolution looks articles up by barcode and batches by code alone.
+Barcodes are trimmed and blank ones set to NULL first; remaining duplicates
+stop the migration, since picking which article keeps a barcode is a
+business decision.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9e4c7b3d5f1'
+down_revision = 'f3d8a4c6e2b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("UPDATE articles SET barcode = NULLIF(TRIM(barcode), '') WHERE barcode IS NOT NULL")
+
+    duplicates = op.get_bind().execute(sa.text(
+        'SELECT barcode, COUNT(*) FROM articles WHERE barcode IS NOT NULL '
+        'GROUP BY barcode HAVING COUNT(*) > 1 ORDER BY barcode'
+    )).fetchall()
+    if duplicates:
+        listed = ', '.join(f'{barcode} ({count} articles)' for barcode, count in duplicates[:20])
+        raise RuntimeError(f'Duplicate article barcodes, clear or fix them before upgrading: {listed}')
+
+    with op.batch_alter_table('articles', schema=None) as batch_op:
+        batch_op.create_index('ix_articles_barcode', ['barcode'], unique=True)
+
+    with op.batch_alter_table('batches', schema=None) as batch_op:
+        batch_op.create_index('ix_batches_batch_code', ['batch_code'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('batches', schema=None) as batch_op:
+        batch_op.drop_index('ix_batches_batch_code')
+
+    with op.batch_alter_table('articles', schema=None) as batch_op:
+        batch_op.drop_index('ix_articles_barcode')
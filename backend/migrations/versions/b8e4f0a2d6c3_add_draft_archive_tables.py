@@ -0,0 +1,98 @@
+"""add draft_groups/weigh_in_drafts/approval_actions archive tables
+
+Revision ID: b8e4f0a2d6c3
+Revises: a7d3e9f1c4b2
+Create Date: 2026-10-18 15:31:12.640257
+
+Cold storage for finalized groups, drafts and approval actions, filled by
+`flask archive-drafts`. Columns mirror the hot tables plus archived_at; ids
+are copied, and foreign keys between the three point at the archive tables.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e4f0a2d6c3'
+down_revision = 'a7d3e9f1c4b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('draft_groups_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('name', sa.Text(), nullable=True),
+    sa.Column('status', sa.Text(), nullable=False),
+    sa.Column('source', sa.Text(), nullable=False),
+    sa.Column('location_id', sa.Integer(), nullable=False),
+    sa.Column('created_by_user_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['created_by_user_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('draft_groups_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_draft_groups_archive_created_at', ['created_at'], unique=False)
+
+    op.create_table('weigh_in_drafts_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('location_id', sa.Integer(), nullable=False),
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.Column('batch_id', sa.Integer(), nullable=False),
+    sa.Column('quantity_kg', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('status', sa.Text(), nullable=False),
+    sa.Column('created_by_user_id', sa.Integer(), nullable=True),
+    sa.Column('source', sa.Text(), nullable=False),
+    sa.Column('client_event_id', sa.Text(), nullable=False),
+    sa.Column('note', sa.Text(), nullable=True),
+    sa.Column('draft_type', sa.String(length=20), nullable=False),
+    sa.Column('draft_group_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ),
+    sa.ForeignKeyConstraint(['batch_id'], ['batches.id'], ),
+    sa.ForeignKeyConstraint(['created_by_user_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['draft_group_id'], ['draft_groups_archive.id'], ),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('weigh_in_drafts_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_weigh_in_drafts_archive_client_event_id', ['client_event_id'], unique=True)
+        batch_op.create_index('ix_weigh_in_drafts_archive_created_at', ['created_at'], unique=False)
+        batch_op.create_index('ix_weigh_in_drafts_archive_group_id', ['draft_group_id'], unique=False)
+
+    op.create_table('approval_actions_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('draft_id', sa.Integer(), nullable=False),
+    sa.Column('action', sa.Text(), nullable=False),
+    sa.Column('actor_user_id', sa.Integer(), nullable=False),
+    sa.Column('old_value', sa.JSON(), nullable=True),
+    sa.Column('new_value', sa.JSON(), nullable=True),
+    sa.Column('note', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['actor_user_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['draft_id'], ['weigh_in_drafts_archive.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('approval_actions_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_approval_actions_archive_draft_id', ['draft_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('approval_actions_archive', schema=None) as batch_op:
+        batch_op.drop_index('ix_approval_actions_archive_draft_id')
+
+    op.drop_table('approval_actions_archive')
+    with op.batch_alter_table('weigh_in_drafts_archive', schema=None) as batch_op:
+        batch_op.drop_index('ix_weigh_in_drafts_archive_group_id')
+        batch_op.drop_index('ix_weigh_in_drafts_archive_created_at')
+        batch_op.drop_index('ix_weigh_in_drafts_archive_client_event_id')
+
+    op.drop_table('weigh_in_drafts_archive')
+    with op.batch_alter_table('draft_groups_archive', schema=None) as batch_op:
+        batch_op.drop_index('ix_draft_groups_archive_created_at')
+
+    op.drop_table('draft_groups_archive')
@@ -0,0 +1,55 @@
+"""add daily_article_movements
+
+Revision ID: c9f5a1b3e7d4
+Revises: b8e4f0a2d6c3
+Create Date: 2026-10-18 16:52:40.118304
+
+Per-day transaction totals by location/article/tx_type, kept current by the
+application on every transaction insert. Backfilled here from the existing
+transactions (UTC days).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9f5a1b3e7d4'
+down_revision = 'b8e4f0a2d6c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('daily_article_movements',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('location_id', sa.Integer(), nullable=False),
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.Column('tx_type', sa.Text(), nullable=False),
+    sa.Column('quantity_kg', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('tx_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('day', 'location_id', 'article_id', 'tx_type', name='uq_daily_article_movements_key')
+    )
+    with op.batch_alter_table('daily_article_movements', schema=None) as batch_op:
+        batch_op.create_index('ix_daily_article_movements_article_day', ['article_id', 'day'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        day = "(occurred_at AT TIME ZONE 'UTC')::date"
+    else:
+        day = 'date(occurred_at)'
+    op.execute(
+        'INSERT INTO daily_article_movements '
+        '(day, location_id, article_id, tx_type, quantity_kg, tx_count) '
+        f'SELECT {day}, location_id, article_id, tx_type, SUM(quantity_kg), COUNT(*) '
+        f'FROM transactions GROUP BY {day}, location_id, article_id, tx_type'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('daily_article_movements', schema=None) as batch_op:
+        batch_op.drop_index('ix_daily_article_movements_article_day')
+
+    op.drop_table('daily_article_movements')
@@ -0,0 +1,75 @@
+"""add article_stock_totals and alerts
+
+Revision ID: d1a6b2c8f4e9
+Revises: c9f5a1b3e7d4
+Create Date: 2026-10-18 17:44:21.903517
+
+Per location/article stock + surplus totals, maintained by the application
+on every balance change, and LOW_STOCK alerts against
+articles.reorder_threshold. Both are backfilled from the current balances.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd1a6b2c8f4e9'
+down_revision = 'c9f5a1b3e7d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('article_stock_totals',
+    sa.Column('location_id', sa.Integer(), nullable=False),
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.Column('stock_kg', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('surplus_kg', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ),
+    sa.PrimaryKeyConstraint('location_id', 'article_id')
+    )
+    op.create_table('alerts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('alert_type', sa.Text(), nullable=False),
+    sa.Column('status', sa.Text(), nullable=False),
+    sa.Column('location_id', sa.Integer(), nullable=False),
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.Column('threshold_kg', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('on_hand_kg', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('resolved_on_hand_kg', sa.Numeric(precision=14, scale=2), nullable=True),
+    sa.Column('triggered_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('resolved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('alerts', schema=None) as batch_op:
+        batch_op.create_index('ix_alerts_status_triggered_at', ['status', 'triggered_at'], unique=False)
+        batch_op.create_index('uq_alerts_open_key', ['location_id', 'article_id', 'alert_type'], unique=True,
+                              postgresql_where=sa.text("status = 'OPEN'"),
+                              sqlite_where=sa.text("status = 'OPEN'"))
+
+    op.execute(
+        'INSERT INTO article_stock_totals (location_id, article_id, stock_kg, surplus_kg, updated_at) '
+        'SELECT location_id, article_id, SUM(stock_kg), SUM(surplus_kg), CURRENT_TIMESTAMP '
+        'FROM inventory_balances GROUP BY location_id, article_id'
+    )
+    op.execute(
+        'INSERT INTO alerts (alert_type, status, location_id, article_id, threshold_kg, on_hand_kg, triggered_at) '
+        "SELECT 'LOW_STOCK', 'OPEN', t.location_id, t.article_id, a.reorder_threshold, "
+        't.stock_kg + t.surplus_kg, CURRENT_TIMESTAMP '
+        'FROM article_stock_totals t JOIN articles a ON a.id = t.article_id '
+        'WHERE a.reorder_threshold IS NOT NULL AND t.stock_kg + t.surplus_kg < a.reorder_threshold'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('alerts', schema=None) as batch_op:
+        batch_op.drop_index('uq_alerts_open_key', postgresql_where=sa.text("status = 'OPEN'"),
+                            sqlite_where=sa.text("status = 'OPEN'"))
+        batch_op.drop_index('ix_alerts_status_triggered_at')
+
+    op.drop_table('alerts')
+    op.drop_table('article_stock_totals')
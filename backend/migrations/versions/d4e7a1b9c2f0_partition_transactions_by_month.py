@@ -0,0 +1,147 @@
+"""partition transactions by month
+
+Revision ID: d4e7a1b9c2f0
+Revises: c8f64cf6440c
+Create Date: 2026-10-18 09:12:40.118203
+
+Turns `transactions` into a RANGE (occurred_at) partitioned table with one
+partition per UTC month (transactions_yYYYYmMM) plus a default partition.
+The primary key becomes (id, occurred_at) because PostgreSQL requires the
+partition key in every unique constraint; ids still come from
+transactions_id_seq. Existing rows are copied, so run this in a maintenance
+window on large databases. PostgreSQL only - a no-op elsewhere.
+"""
+from datetime import date, datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4e7a1b9c2f0'
+down_revision = 'c8f64cf6440c'
+branch_labels = None
+depends_on = None
+
+# Partitions created up front after the current month; `flask partitions create` keeps them ahead
+MONTHS_AHEAD = 3
+
+COLUMNS = (
+    'id, tx_type, occurred_at, location_id, article_id, batch_id, quantity_kg, '
+    'user_id, source, client_event_id, meta, order_number'
+)
+
+INDEXES = (
+    ('ix_transactions_occurred_at', ['occurred_at']),
+    ('ix_transactions_article_occurred', ['article_id', 'occurred_at']),
+    ('ix_transactions_batch_occurred', ['batch_id', 'occurred_at']),
+    ('ix_transactions_type_created', ['tx_type', 'occurred_at']),
+    ('ix_transactions_order_number', ['order_number']),
+    ('ix_transactions_client_event_id', ['client_event_id']),
+)
+
+
+def _columns(id_column):
+    return [
+        id_column,
+        sa.Column('tx_type', sa.Text(), nullable=False),
+        sa.Column('occurred_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('location_id', sa.Integer(), nullable=False),
+        sa.Column('article_id', sa.Integer(), nullable=False),
+        sa.Column('batch_id', sa.Integer(), nullable=False),
+        sa.Column('quantity_kg', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('source', sa.Text(), nullable=False),
+        sa.Column('client_event_id', sa.Text(), nullable=True),
+        sa.Column('meta', sa.JSON(), nullable=True),
+        sa.Column('order_number', sa.String(length=50), nullable=True),
+        sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ),
+        sa.ForeignKeyConstraint(['batch_id'], ['batches.id'], ),
+        sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    ]
+
+
+def _id_column():
+    return sa.Column('id', sa.Integer(), nullable=False, autoincrement=False,
+                     server_default=sa.text("nextval('transactions_id_seq'::regclass)"))
+
+
+def _add_month(month, count=1):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _bound(month):
+    return f"'{datetime(month.year, month.month, 1, tzinfo=timezone.utc).isoformat(sep=' ')}'"
+
+
+def _create_indexes():
+    for name, columns in INDEXES:
+        op.create_index(name, 'transactions', columns, unique=False)
+
+
+def _drop_indexes():
+    for name, _ in INDEXES:
+        op.drop_index(name, table_name='transactions')
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.rename_table('transactions', 'transactions_unpartitioned')
+    op.execute('ALTER TABLE transactions_unpartitioned '
+               'RENAME CONSTRAINT transactions_pkey TO transactions_unpartitioned_pkey')
+
+    op.create_table(
+        'transactions',
+        *_columns(_id_column()),
+        sa.PrimaryKeyConstraint('id', 'occurred_at', name='transactions_pkey'),
+        postgresql_partition_by='RANGE (occurred_at)',
+    )
+    op.execute('ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id')
+
+    # Same naming as app.partitioning: transactions_yYYYYmMM, UTC month bounds
+    oldest = bind.execute(sa.text('SELECT min(occurred_at) FROM transactions_unpartitioned')).scalar()
+    today = datetime.now(timezone.utc).date()
+    month = date((oldest or today).year, (oldest or today).month, 1)
+    last = _add_month(date(today.year, today.month, 1), MONTHS_AHEAD)
+    while month <= last:
+        op.execute(
+            f'CREATE TABLE transactions_y{month.year:04d}m{month.month:02d} PARTITION OF transactions '
+            f'FOR VALUES FROM ({_bound(month)}) TO ({_bound(_add_month(month))})'
+        )
+        month = _add_month(month)
+    op.execute('CREATE TABLE transactions_default PARTITION OF transactions DEFAULT')
+
+    op.execute(f'INSERT INTO transactions ({COLUMNS}) SELECT {COLUMNS} FROM transactions_unpartitioned')
+    op.drop_table('transactions_unpartitioned')
+
+    # Built after the copy; each index on the parent cascades to every partition
+    _create_indexes()
+    op.execute('ANALYZE transactions')
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    # Detached or archived partitions are not copied back
+    _drop_indexes()
+    op.rename_table('transactions', 'transactions_partitioned')
+    op.execute('ALTER TABLE transactions_partitioned '
+               'RENAME CONSTRAINT transactions_pkey TO transactions_partitioned_pkey')
+
+    op.create_table(
+        'transactions',
+        *_columns(_id_column()),
+        sa.PrimaryKeyConstraint('id', name='transactions_pkey'),
+    )
+    op.execute('ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id')
+    op.execute(f'INSERT INTO transactions ({COLUMNS}) SELECT {COLUMNS} FROM transactions_partitioned')
+    op.execute('DROP TABLE transactions_partitioned')
+
+    _create_indexes()
@@ -0,0 +1,43 @@
+"""add stock_snapshots
+
+Revision ID: e5b8c2d4f1a7
+Revises: d4e7a1b9c2f0
+Create Date: 2026-10-18 11:40:05.532871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b8c2d4f1a7'
+down_revision = 'd4e7a1b9c2f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('stock_snapshots',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('snapshot_date', sa.Date(), nullable=False),
+    sa.Column('location_id', sa.Integer(), nullable=False),
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.Column('batch_id', sa.Integer(), nullable=False),
+    sa.Column('stock_kg', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('surplus_kg', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ),
+    sa.ForeignKeyConstraint(['batch_id'], ['batches.id'], ),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('snapshot_date', 'location_id', 'article_id', 'batch_id', name='uq_stock_snapshots_date_key')
+    )
+    with op.batch_alter_table('stock_snapshots', schema=None) as batch_op:
+        batch_op.create_index('ix_stock_snapshots_article_date', ['article_id', 'snapshot_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('stock_snapshots', schema=None) as batch_op:
+        batch_op.drop_index('ix_stock_snapshots_article_date')
+
+    op.drop_table('stock_snapshots')
@@ -0,0 +1,47 @@
+"""add batches expiry index and article_stock_totals.earliest_expiry_date
+
+Revision ID: e7c3d9a5b1f2
+Revises: d1a6b2c8f4e9
+Create Date: 2026-10-18 18:36:02.447190
+
+Partial index on batches.expiry_date for active, dated batches (expiring
+soon / FEFO), and the per location/article earliest expiry of batches that
+still hold stock, backfilled from the current balances.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7c3d9a5b1f2'
+down_revision = 'd1a6b2c8f4e9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('batches', schema=None) as batch_op:
+        batch_op.create_index('ix_batches_expiry_active', ['expiry_date'], unique=False,
+                              postgresql_where=sa.text('is_active AND expiry_date IS NOT NULL'),
+                              sqlite_where=sa.text('is_active = 1 AND expiry_date IS NOT NULL'))
+
+    with op.batch_alter_table('article_stock_totals', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('earliest_expiry_date', sa.Date(), nullable=True))
+
+    is_active = 'b.is_active' if op.get_bind().dialect.name == 'postgresql' else 'b.is_active = 1'
+    op.execute(
+        'UPDATE article_stock_totals SET earliest_expiry_date = ('
+        'SELECT MIN(b.expiry_date) FROM inventory_balances ib JOIN batches b ON b.id = ib.batch_id '
+        'WHERE ib.location_id = article_stock_totals.location_id '
+        'AND ib.article_id = article_stock_totals.article_id '
+        f'AND {is_active} AND ib.stock_kg + ib.surplus_kg > 0)'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('article_stock_totals', schema=None) as batch_op:
+        batch_op.drop_column('earliest_expiry_date')
+
+    with op.batch_alter_table('batches', schema=None) as batch_op:
+        batch_op.drop_index('ix_batches_expiry_active', postgresql_where=sa.text('is_active AND expiry_date IS NOT NULL'),
+                            sqlite_where=sa.text('is_active = 1 AND expiry_date IS NOT NULL'))
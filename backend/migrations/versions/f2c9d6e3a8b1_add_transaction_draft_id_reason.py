@@ -0,0 +1,62 @@
+"""add transactions.draft_id and transactions.reason
+
+Revision ID: f2c9d6e3a8b1
+Revises: e5b8c2d4f1a7
+Create Date: 2026-10-18 13:05:27.904416
+
+Promotes meta['draft_id'] and meta['reason'] to typed, indexed columns.
+Existing rows are backfilled in id ranges of BATCH_SIZE; on PostgreSQL each
+batch commits on its own, so no single long transaction holds row locks on
+the whole table. The indexes are built after the backfill.
+"""
+from contextlib import nullcontext
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c9d6e3a8b1'
+down_revision = 'e5b8c2d4f1a7'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 50_000
+
+
+def upgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('draft_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('reason', sa.Text(), nullable=True))
+
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        draft_id = "(meta->>'draft_id')::integer"
+        reason = "meta->>'reason'"
+        # Commit each batch (needs transactional DDL, i.e. PostgreSQL)
+        batches = op.get_context().autocommit_block()
+    else:
+        draft_id = "CAST(json_extract(meta, '$.draft_id') AS INTEGER)"
+        reason = "json_extract(meta, '$.reason')"
+        batches = nullcontext()
+
+    low, high = bind.execute(sa.text('SELECT min(id), max(id) FROM transactions')).one()
+    if low is not None:
+        with batches:
+            for start in range(low, high + 1, BATCH_SIZE):
+                op.execute(sa.text(
+                    f'UPDATE transactions SET draft_id = {draft_id}, reason = {reason} '
+                    'WHERE id >= :start AND id < :end AND meta IS NOT NULL'
+                ).bindparams(start=start, end=start + BATCH_SIZE))
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.create_index('ix_transactions_draft_id', ['draft_id'], unique=False)
+        batch_op.create_index('ix_transactions_reason_occurred', ['reason', 'occurred_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_transactions_reason_occurred')
+        batch_op.drop_index('ix_transactions_draft_id')
+        batch_op.drop_column('reason')
+        batch_op.drop_column('draft_id')
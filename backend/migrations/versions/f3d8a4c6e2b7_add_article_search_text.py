@@ -0,0 +1,64 @@
+"""add articles.search_text and search indexes
+
+Revision ID: f3d8a4c6e2b7
+Revises: e7c3d9a5b1f2
+Create Date: 2026-10-18 19:12:40.581306
+
+Normalized words of article_no, description, manufacturer,
+manufacturer_art_number and aliases per article, backfilled here and kept
+current by the application. On PostgreSQL: GIN full-text index (word
+prefixes) and pg_trgm GIN index (typos) over it.
+"""
+import re
+from collections import defaultdict
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3d8a4c6e2b7'
+down_revision = 'e7c3d9a5b1f2'
+branch_labels = None
+depends_on = None
+
+
+def _search_document(values):
+    # Same normalization as services/search_service.search_document
+    return ' '.join(dict.fromkeys(
+        word for value in values if value for word in re.findall(r'\w+', value.casefold())
+    ))
+
+
+def upgrade():
+    with op.batch_alter_table('articles', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('search_text', sa.Text(), nullable=True))
+
+    bind = op.get_bind()
+    aliases = defaultdict(list)
+    for article_id, alias in bind.execute(sa.text('SELECT article_id, alias FROM article_aliases ORDER BY id')):
+        aliases[article_id].append(alias)
+    rows = [
+        {'b_id': row[0], 'search_text': _search_document([*row[1:], *aliases[row[0]]])}
+        for row in bind.execute(sa.text(
+            'SELECT id, article_no, description, manufacturer, manufacturer_art_number FROM articles'
+        ))
+    ]
+    if rows:
+        bind.execute(sa.text('UPDATE articles SET search_text = :search_text WHERE id = :b_id'), rows)
+
+    if bind.dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.create_index('ix_articles_search_vector', 'articles',
+                        [sa.text("to_tsvector('simple', search_text)")], postgresql_using='gin')
+        op.create_index('ix_articles_search_trgm', 'articles', ['search_text'], postgresql_using='gin',
+                        postgresql_ops={'search_text': 'gin_trgm_ops'})
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_articles_search_trgm', table_name='articles')
+        op.drop_index('ix_articles_search_vector', table_name='articles')
+
+    with op.batch_alter_table('articles', schema=None) as batch_op:
+        batch_op.drop_column('search_text')
@@ -2,10 +2,11 @@
 import os
 from datetime import timedelta
 import pytest
+from flask_jwt_extended import create_access_token
 
 from app import create_app
 from app.extensions import db
-from app.models import User, Location, Article, Batch, Stock, Surplus, WeighInDraft
+from app.models import User, Location, Article, Batch, InventoryBalance, WeighInDraft
 
 
 class TestConfig:
@@ -31,6 +32,10 @@ class TestConfig:
     API_VERSION = '0.1.0'
     OPENAPI_VERSION = '3.0.3'
     
+    # Fail tests when an endpoint exceeds its query budget
+    QUERY_BUDGET_ENFORCE = True
+    QUERY_BUDGET_DEFAULT = 25
+    
     # CORS
     CORS_ORIGINS = 'http://localhost:3000'
     CORS_ALLOW_ALL = False
@@ -84,6 +89,13 @@ def user(app):
     return user_id
 
 
+@pytest.fixture
+def admin_headers(user):
+    """Authorization header with an ADMIN access token for the test user."""
+    token = create_access_token(identity=str(user), additional_claims={'role': 'ADMIN'})
+    return {'Authorization': f'Bearer {token}'}
+
+
 @pytest.fixture
 def article(app):
     """Create test article."""
@@ -107,21 +119,46 @@ def batch(app, article):
     return batch_id
 
 
+def _set_balance(location, article, batch, **quantities):
+    """Upsert the single InventoryBalance row for a key; returns its id."""
+    row = InventoryBalance.query.filter_by(
+        location_id=location, article_id=article, batch_id=batch
+    ).first()
+    if row is None:
+        row = InventoryBalance(location_id=location, article_id=article, batch_id=batch)
+        db.session.add(row)
+    for column, value in quantities.items():
+        setattr(row, column, value)
+    db.session.commit()
+    return row.id
+
+
+@pytest.fixture
+def make_batch(app, location, article):
+    """Factory: batch of the test article expiring in expires_in days (None = no expiry),
+    with a balance at the test location; returns the batch id."""
+    from datetime import datetime, timezone
+    from decimal import Decimal
+    today = datetime.now(timezone.utc).date()
+
+    def make(code, expires_in, stock_kg='5.00', surplus_kg='0.00', is_active=True):
+        b = Batch(article_id=article, batch_code=code, is_active=is_active,
+                  expiry_date=today + timedelta(days=expires_in) if expires_in is not None else None)
+        db.session.add(b)
+        db.session.flush()
+        db.session.add(InventoryBalance(location_id=location, article_id=article, batch_id=b.id,
+                                        stock_kg=Decimal(stock_kg), surplus_kg=Decimal(surplus_kg)))
+        db.session.commit()
+        return b.id
+    return make
+
+
 @pytest.fixture
 def stock(app, location, article, batch):
     """Create test stock with 10kg."""
     from decimal import Decimal
     with app.app_context():
-        s = Stock(
-            location_id=location,
-            article_id=article,
-            batch_id=batch,
-            quantity_kg=Decimal('10.00')
-        )
-        db.session.add(s)
-        db.session.commit()
-        stock_id = s.id
-    return stock_id
+        return _set_balance(location, article, batch, stock_kg=Decimal('10.00'))
 
 
 @pytest.fixture
@@ -129,16 +166,7 @@ def surplus(app, location, article, batch):
     """Create test surplus with 5kg."""
     from decimal import Decimal
     with app.app_context():
-        s = Surplus(
-            location_id=location,
-            article_id=article,
-            batch_id=batch,
-            quantity_kg=Decimal('5.00')
-        )
-        db.session.add(s)
-        db.session.commit()
-        surplus_id = s.id
-    return surplus_id
+        return _set_balance(location, article, batch, surplus_kg=Decimal('5.00'))
 
 
 @pytest.fixture
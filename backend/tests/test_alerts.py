@@ -0,0 +1,140 @@
+"""Tests for per-article stock totals and low-stock alerts."""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from app import events
+from app.events import get_broker
+from app.extensions import db
+from app.models import Alert, Article, ArticleStockTotal, InventoryBalance
+from app.query_stats import count_queries
+from app.services.alert_service import refresh_all
+from app.services.approval_service import approve_draft
+from app.services.receiving_service import receive_stock
+
+
+@pytest.fixture
+def threshold(app, article):
+    """reorder_threshold of 12kg on the test article."""
+    db.session.get(Article, article).reorder_threshold = Decimal('12.00')
+    db.session.commit()
+
+
+def _total(location, article):
+    total = db.session.get(ArticleStockTotal, (location, article))
+    return total.on_hand_kg if total else None
+
+
+def _receive(article, user, quantity, event_id):
+    receive_stock(
+        article_id=article, batch_code='5678', quantity_kg=Decimal(quantity),
+        expiry_date=date.today() + timedelta(days=365), actor_user_id=user,
+        order_number='PO-1', client_event_id=event_id
+    )
+    db.session.commit()
+
+
+def test_totals_follow_balance_changes(app, location, article, user, stock, surplus, pending_draft):
+    assert _total(location, article) == Decimal('15.00')
+
+    approve_draft(pending_draft, user)
+    db.session.commit()
+    assert _total(location, article) == Decimal('10.00')
+
+    _receive(article, user, '7.50', 'al-1')
+    assert _total(location, article) == Decimal('17.50')
+    balances = InventoryBalance.query.filter_by(article_id=article).all()
+    assert _total(location, article) == sum(b.stock_kg + b.surplus_kg for b in balances)
+
+
+def test_crossing_opens_and_resolves_one_alert(app, location, article, user, stock, surplus,
+                                               threshold, pending_draft):
+    app.config['EVENTS_BACKEND'] = events.BACKEND_MEMORY
+    start = get_broker(app).last_seq
+    assert Alert.query.count() == 0
+
+    approve_draft(pending_draft, user)  # 15 -> 10kg, below 12
+    db.session.commit()
+    alert = Alert.query.one()
+    assert (alert.status, alert.threshold_kg, alert.on_hand_kg) == ('OPEN', Decimal('12.00'), Decimal('10.00'))
+
+    _receive(article, user, '1.00', 'al-2')  # still below: no second alert
+    assert Alert.query.count() == 1
+
+    _receive(article, user, '5.00', 'al-3')  # 16kg
+    db.session.refresh(alert)
+    assert (alert.status, alert.resolved_on_hand_kg) == ('RESOLVED', Decimal('16.00'))
+    assert alert.resolved_at is not None
+
+    new_events, _, _ = get_broker(app).wait_after(start, 0)
+    assert [ev['type'] for ev in new_events if ev['type'].startswith('alert.')] == \
+        ['alert.raised', 'alert.resolved']
+
+
+def test_rolled_back_change_leaves_totals_and_alerts(app, location, article, user, stock, surplus,
+                                                     threshold, pending_draft):
+    approve_draft(pending_draft, user)
+    db.session.flush()
+    # Written once per transaction, at commit
+    assert Alert.query.count() == 0
+    db.session.rollback()
+
+    assert Alert.query.count() == 0
+    assert _total(location, article) == Decimal('15.00')
+
+
+def test_one_upsert_per_transaction(app, location, article, user, stock, surplus, threshold, pending_draft):
+    with count_queries() as stats:
+        receive_stock(
+            article_id=article, batch_code='5678', quantity_kg=Decimal('1.00'),
+            expiry_date=date.today() + timedelta(days=365), actor_user_id=user,
+            order_number='PO-1', client_event_id='al-4'
+        )
+        db.session.flush()
+        approve_draft(pending_draft, user)  # 16 -> 11kg, below 12
+        db.session.flush()
+        db.session.commit()
+
+    # Both flushes are added to the total together at commit, and checked once
+    assert sum(n for shape, n in stats.shapes.items() if 'INTO article_stock_totals' in shape) == 1
+    assert sum(n for shape, n in stats.shapes.items() if 'JOIN alerts' in shape) == 1
+    assert _total(location, article) == Decimal('11.00')
+    assert Alert.query.one().on_hand_kg == Decimal('11.00')
+
+
+def test_threshold_change_reevaluates_article(app, location, article, stock, surplus):
+    db.session.get(Article, article).reorder_threshold = Decimal('20.00')
+    db.session.commit()
+    assert Alert.query.filter_by(status='OPEN').count() == 1
+
+    db.session.get(Article, article).reorder_threshold = None
+    db.session.commit()
+    assert Alert.query.filter_by(status='OPEN').count() == 0
+
+
+def test_refresh_repairs_totals(app, location, article, stock, surplus, threshold):
+    db.session.get(ArticleStockTotal, (location, article)).stock_kg = Decimal('999.00')
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=['refresh-stock-totals'])
+    assert result.exit_code == 0, result.output
+    assert _total(location, article) == Decimal('15.00')
+    assert Alert.query.filter_by(status='OPEN').count() == 0
+    assert refresh_all() == 0
+
+
+def test_list_alerts(client, admin_headers, location, article, user, stock, surplus, threshold, pending_draft):
+    approve_draft(pending_draft, user)
+    db.session.commit()
+
+    response = client.get('/api/alerts', headers=admin_headers)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['total'] == 1
+    item = body['items'][0]
+    assert (item['article_no'], item['status'], item['on_hand_kg'], item['threshold_kg']) == \
+        ('TEST-001', 'OPEN', 10.0, 12.0)
+
+    assert client.get('/api/alerts?status=RESOLVED', headers=admin_headers).get_json()['total'] == 0
+    assert client.get('/api/alerts').status_code == 401
@@ -0,0 +1,130 @@
+"""Tests for archiving finalized drafts, groups and approval actions."""
+from datetime import datetime, timedelta, timezone
+
+from app.extensions import db
+from app.models import (
+    ApprovalAction, ApprovalActionArchive, DraftGroup, DraftGroupArchive,
+    Transaction, WeighInDraft, WeighInDraftArchive
+)
+from app.services import draft_group_service
+from app.services.archive_service import archive_finalized, count_archivable
+
+
+def _group(location, article, batch, user, event_ids, days_old=200):
+    group = draft_group_service.create_group(
+        location_id=location,
+        user_id=user,
+        lines=[
+            {'article_id': article, 'batch_id': batch, 'quantity_kg': 1, 'client_event_id': event_id}
+            for event_id in event_ids
+        ]
+    )
+    created_at = datetime.now(timezone.utc) - timedelta(days=days_old)
+    group.created_at = created_at
+    for draft in group.drafts:
+        draft.created_at = created_at
+    db.session.commit()
+    return group.id, [d.id for d in group.drafts]
+
+
+def _run(app, *args):
+    result = app.test_cli_runner().invoke(args=['archive-drafts', *args])
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+def test_archives_finalized_groups_with_children(app, location, article, batch, user, stock):
+    approved_id, approved_drafts = _group(location, article, batch, user, ['ar-1', 'ar-2'])
+    draft_group_service.approve_group(approved_id, user)
+    rejected_id, _ = _group(location, article, batch, user, ['ar-3'])
+    draft_group_service.reject_group(rejected_id, user)
+    pending_id, _ = _group(location, article, batch, user, ['ar-4'])
+    recent_id, _ = _group(location, article, batch, user, ['ar-5'], days_old=1)
+    draft_group_service.approve_group(recent_id, user)
+
+    output = _run(app, '--older-than-days', '90', '--batch-size', '1')
+    assert 'weigh_in_drafts: 3 rows' in output
+
+    assert {g.id for g in DraftGroup.query} == {pending_id, recent_id}
+    assert {g.id for g in DraftGroupArchive.query} == {approved_id, rejected_id}
+    assert WeighInDraftArchive.query.count() == 3
+    assert ApprovalActionArchive.query.count() == 3
+    assert ApprovalAction.query.count() == 1
+    archived = db.session.get(WeighInDraftArchive, approved_drafts[0])
+    assert archived.draft_group.id == approved_id
+    assert archived.archived_at is not None
+    # Transactions keep pointing at the archived draft ids
+    assert Transaction.query.filter_by(draft_id=approved_drafts[0]).count() > 0
+
+    # Nothing left to move
+    assert sum(archive_finalized(datetime.now(timezone.utc) - timedelta(days=90)).values()) == 0
+
+
+def test_group_with_pending_line_stays_hot(app, location, article, batch, user, stock):
+    group_id, draft_ids = _group(location, article, batch, user, ['pl-1', 'pl-2'])
+    from app.services.approval_service import approve_draft
+    approve_draft(draft_ids[0], user)
+    db.session.commit()
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=90)
+    assert count_archivable(cutoff) == {'draft_groups': 0, 'weigh_in_drafts': 0}
+    approve_draft(draft_ids[1], user)
+    db.session.commit()
+    # Header still says DRAFT, but no line is pending any more
+    assert db.session.get(DraftGroup, group_id).status == DraftGroup.STATUS_DRAFT
+    assert count_archivable(cutoff) == {'draft_groups': 1, 'weigh_in_drafts': 2}
+
+
+def test_dry_run_moves_nothing(app, location, article, batch, user):
+    group_id, _ = _group(location, article, batch, user, ['dr-1'])
+    draft_group_service.reject_group(group_id, user)
+
+    output = _run(app, '--older-than-days', '90', '--dry-run')
+    assert 'draft_groups: 1 rows' in output
+    assert DraftGroupArchive.query.count() == 0
+    assert db.session.get(DraftGroup, group_id) is not None
+
+
+def test_reads_include_archived(app, client, admin_headers, location, article, batch, user):
+    group_id, (draft_id,) = _group(location, article, batch, user, ['rd-1'])
+    draft_group_service.reject_group(group_id, user)
+    archive_finalized(datetime.now(timezone.utc) - timedelta(days=90))
+
+    assert client.get(f'/api/drafts/{draft_id}', headers=admin_headers).status_code == 404
+    response = client.get(f'/api/drafts/{draft_id}?include_archived=true', headers=admin_headers)
+    assert response.status_code == 200
+    assert response.get_json()['archived_at'] is not None
+
+    assert client.get('/api/drafts', headers=admin_headers).get_json()['total'] == 0
+    listed = client.get('/api/drafts?include_archived=true&status=REJECTED', headers=admin_headers).get_json()
+    assert [d['id'] for d in listed['items']] == [draft_id]
+
+    groups = client.get('/api/draft-groups?include_archived=true', headers=admin_headers).get_json()
+    assert [(g['id'], g['line_count']) for g in groups['items']] == [(group_id, 1)]
+    detail = client.get(f'/api/draft-groups/{group_id}?include_archived=true', headers=admin_headers)
+    assert detail.get_json()['drafts'][0]['id'] == draft_id
+
+    actions = client.get(f'/api/drafts/{draft_id}/actions', headers=admin_headers).get_json()
+    assert actions['total'] == 0
+    actions = client.get(f'/api/drafts/{draft_id}/actions?include_archived=true', headers=admin_headers).get_json()
+    assert [a['action'] for a in actions['items']] == ['REJECT']
+
+
+def test_archived_client_event_id_is_still_a_duplicate(app, client, admin_headers, location, article, batch, user):
+    group_id, _ = _group(location, article, batch, user, ['dup-1'])
+    draft_group_service.reject_group(group_id, user)
+    archive_finalized(datetime.now(timezone.utc) - timedelta(days=90))
+    assert WeighInDraft.query.count() == 0
+
+    response = client.post('/api/drafts', headers=admin_headers, json={
+        'location_id': location, 'article_id': article, 'batch_id': batch,
+        'quantity_kg': 1.0, 'client_event_id': 'dup-1'
+    })
+    assert response.status_code == 409
+
+    response = client.post('/api/draft-groups', headers=admin_headers, json={
+        'location_id': location,
+        'lines': [{'article_id': article, 'batch_id': batch, 'quantity_kg': 1.0, 'client_event_id': 'dup-1'}]
+    })
+    assert response.status_code == 409
+    assert response.get_json()['error']['code'] == 'DUPLICATE_EVENT_ID'
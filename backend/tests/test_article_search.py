@@ -0,0 +1,96 @@
+"""Tests for ranked article search and articles.search_text maintenance."""
+import pytest
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models import Article
+from app.services import article_alias_service, search_service
+
+
+@pytest.fixture
+def catalog(app):
+    articles = [
+        Article(article_no='PR-100', description='Grey primer 2K', uom='KG',
+                manufacturer='Mankiewicz', manufacturer_art_number='34665.91B6.7.171'),
+        Article(article_no='TC-200', description='Topcoat white gloss', uom='KG', manufacturer='Akzo Nobel'),
+        Article(article_no='PRIMER', description='Legacy primer', uom='KG', is_active=False),
+        Article(article_no='GL-300', description='Nitrile gloves', uom='KG', is_paint=False),
+    ]
+    db.session.add_all(articles)
+    db.session.commit()
+    return {a.article_no: a.id for a in articles}
+
+
+def _search(client, headers, **params):
+    response = client.get('/api/articles/search', headers=headers, query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_search_text_follows_article_and_alias_writes(app, catalog):
+    article = db.session.get(Article, catalog['TC-200'])
+    assert article.search_text == 'tc 200 topcoat white gloss akzo nobel'
+
+    article_alias_service.create_alias(article.id, 'weiss-lack')
+    article.description = 'Topcoat matt'
+    db.session.commit()
+    db.session.refresh(article)
+    assert article.search_text == 'tc 200 topcoat matt akzo nobel weiss lack'
+
+    assert search_service.rebuild_all() == len(catalog)
+
+
+def test_search_matches_prefixes_typos_and_aliases(client, admin_headers, catalog):
+    body = _search(client, admin_headers, q='prim grey')
+    assert [item['article_no'] for item in body['items']] == ['PR-100']
+    assert body['total'] == 1 and body['items'][0]['score'] > 0
+
+    # Vendor number parts and manufacturer
+    assert _search(client, admin_headers, q='91B6')['items'][0]['article_no'] == 'PR-100'
+    assert _search(client, admin_headers, q='mankiewicz')['total'] == 1
+    # Typo
+    assert [i['article_no'] for i in _search(client, admin_headers, q='topcoet')['items']] == ['TC-200']
+
+    article_alias_service.create_alias(catalog['GL-300'], 'HANDSCHUH')
+    db.session.commit()
+    assert [i['article_no'] for i in _search(client, admin_headers, q='handsch')['items']] == ['GL-300']
+
+    # Archived articles only on request; exact article_no ranks first
+    assert _search(client, admin_headers, q='primer')['total'] == 1
+    body = _search(client, admin_headers, q='primer', active='all')
+    assert [i['article_no'] for i in body['items']] == ['PRIMER', 'PR-100']
+
+
+def test_search_paginates(client, admin_headers, catalog):
+    db.session.add_all([Article(article_no=f'TH-{i:03d}', description='Thinner', uom='L') for i in range(25)])
+    db.session.commit()
+
+    first = _search(client, admin_headers, q='thinner', per_page=10)
+    last = _search(client, admin_headers, q='thinner', per_page=10, page=3)
+    assert first['total'] == last['total'] == 25
+    assert [i['article_no'] for i in first['items']] == [f'TH-{i:03d}' for i in range(10)]
+    assert len(last['items']) == 5
+    assert _search(client, admin_headers, q='zzzz')['items'] == []
+
+    response = client.get('/api/articles/search?q=', headers=admin_headers)
+    assert response.status_code in (400, 422)
+
+
+def test_postgres_search_agrees_with_fallback_index(app, catalog):
+    if db.engine.dialect.name != 'postgresql':
+        pytest.skip('needs PostgreSQL with pg_trgm')
+    article_alias_service.create_alias(catalog['GL-300'], 'HANDSCHUH')
+    db.session.commit()
+    columns = [Article.__table__.c.article_no]
+    index = search_service.SearchIndex(db.session.execute(
+        select(Article.id, Article.article_no, Article.search_text, Article.is_active)
+    ).all())
+    article_nos = {article_id: article_no for article_no, article_id in catalog.items()}
+
+    # A good match of one word must not carry a query whose other word matches nothing
+    for query in ('prim grey', 'topcoet', 'handsch', 'primer', 'gloss white', 'topcoat xyz', 'mankiewicz 91b6'):
+        rows, total = search_service._postgres_search(query, 'all', columns, 20, 0)
+        ids, fallback_total = index.search(query, 'all')
+        assert sorted(row['article_no'] for row in rows) == sorted(article_nos[a] for a, _ in ids), query
+        assert total == fallback_total, query
+    assert search_service._postgres_search('topcoat xyz', 'all', columns, 20, 0) == ([], 0)
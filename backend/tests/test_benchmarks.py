@@ -0,0 +1,37 @@
+"""Tests for the benchmark runner's statistics and regression check."""
+from benchmarks.run import compare, percentile
+
+
+def _report(database='postgresql', p50=10.0, p99=20.0, queries=3):
+    return {
+        'database': database,
+        'results': {'transactions': {'p50_ms': p50, 'p99_ms': p99, 'queries': queries}},
+    }
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([7.0], 99) == 7.0
+
+
+def test_compare_within_thresholds():
+    baseline = {**_report(), 'thresholds': {'latency_pct': 25, 'extra_queries': 0}}
+    assert compare(_report(p50=12.0, p99=24.0), baseline) == []
+
+
+def test_compare_flags_latency_and_query_regressions():
+    baseline = {**_report(), 'thresholds': {'latency_pct': 25, 'extra_queries': 0}}
+
+    problems = compare(_report(p50=13.0, queries=4), baseline)
+
+    assert len(problems) == 2
+    assert any('p50_ms' in p for p in problems)
+    assert any('4 queries' in p for p in problems)
+
+
+def test_compare_skips_latency_across_backends():
+    """A SQLite run is only checked for query counts against a Postgres baseline."""
+    baseline = {**_report(), 'thresholds': {'latency_pct': 25}}
+    assert compare(_report(database='sqlite', p50=100.0, p99=200.0), baseline) == []
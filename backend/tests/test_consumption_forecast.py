@@ -0,0 +1,79 @@
+"""Tests for the NumPy consumption forecast."""
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from app.extensions import db
+from app.models import Article, DailyArticleMovement
+from app.services import forecast_service
+
+
+def _consume(location, article, day, quantity):
+    db.session.add(DailyArticleMovement(
+        day=day, location_id=location, article_id=article, tx_type='WEIGH_IN',
+        quantity_kg=Decimal(quantity), tx_count=1
+    ))
+
+
+def test_smoothing_and_rolling_match_reference_loop():
+    rng = np.random.default_rng(1)
+    matrix = rng.uniform(0, 10, size=(4, 30))
+
+    expected = matrix[:, 0].copy()
+    for t in range(1, 30):
+        expected = 0.3 * matrix[:, t] + 0.7 * expected
+    assert np.allclose(forecast_service.smoothed(matrix, 0.3), expected)
+
+    rolling = forecast_service.rolling_means(matrix, 7)
+    assert rolling.shape == (4, 24)
+    assert np.allclose(rolling[:, -1], matrix[:, -7:].mean(axis=1))
+    assert np.allclose(rolling[:, 0], matrix[:, :7].mean(axis=1))
+
+
+def test_forecast_rates_cover_and_reorder_point(app, location, article, stock, surplus):
+    idle = Article(article_no='IDLE-001', uom='KG')
+    db.session.add(idle)
+    last_day = date(2026, 3, 31)
+    for n in range(28):
+        _consume(location, article, last_day - timedelta(days=n), '3.00')
+    db.session.commit()
+
+    result = forecast_service.forecast(last_day, window_days=28, lead_time_days=10, safety_factor=2)
+    items = {item['article_no']: item for item in result['items']}
+
+    busy = items['TEST-001']
+    assert busy['on_hand_kg'] == 15.0
+    assert busy['avg_daily_kg'] == busy['rolling_avg_kg'] == busy['forecast_daily_kg'] == 3.0
+    assert busy['safety_stock_kg'] == 0.0
+    assert busy['reorder_point_kg'] == 30.0
+    assert busy['days_of_cover'] == 5.0
+    assert busy['below_reorder_point'] is True
+
+    assert items['IDLE-001']['forecast_daily_kg'] == 0.0
+    assert items['IDLE-001']['days_of_cover'] is None
+
+
+def test_consumption_forecast_endpoint(client, admin_headers, location, article):
+    today = datetime.now(timezone.utc).date()
+    _consume(location, article, today, '14.00')
+    db.session.commit()
+
+    response = client.get('/api/reports/consumption-forecast?window_days=7&alpha=1', headers=admin_headers)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['total'] == 1
+    assert body['from_date'] == (today - timedelta(days=6)).isoformat()
+    assert body['items'][0]['forecast_daily_kg'] == 14.0
+    assert body['items'][0]['avg_daily_kg'] == 2.0
+
+    assert client.get('/api/reports/consumption-forecast?window_days=3', headers=admin_headers).status_code == 422
+
+
+def test_consumption_forecast_without_numpy(client, admin_headers, monkeypatch):
+    monkeypatch.setattr(forecast_service, 'np', None)
+    response = client.get('/api/reports/consumption-forecast', headers=admin_headers)
+    assert response.status_code == 501
+    assert response.get_json()['error']['code'] == 'FORECAST_UNAVAILABLE'
@@ -0,0 +1,118 @@
+"""Tests for the daily_article_movements aggregate."""
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models import DailyArticleMovement, Transaction
+from app.query_stats import count_queries
+from app.services.approval_service import approve_draft
+from app.services.movement_service import aggregate, rebuild_range
+from app.services.receiving_service import receive_stock
+
+
+def _movements():
+    return {
+        (m.day, m.location_id, m.article_id, m.tx_type): [m.quantity_kg, m.tx_count]
+        for m in DailyArticleMovement.query
+    }
+
+
+def _receive(article, user, quantity, event_id):
+    receive_stock(
+        article_id=article, batch_code='5678', quantity_kg=Decimal(quantity),
+        expiry_date=date.today() + timedelta(days=365), actor_user_id=user,
+        order_number='PO-1', client_event_id=event_id
+    )
+    db.session.commit()
+
+
+def test_receipts_and_approvals_upsert_in_same_transaction(app, location, article, user, stock, surplus, pending_draft):
+    _receive(article, user, '20.00', 'mv-1')
+    _receive(article, user, '2.50', 'mv-2')
+    approve_draft(pending_draft, user)
+    db.session.commit()
+
+    today = datetime.now(timezone.utc).date()
+    movements = _movements()
+    assert movements[(today, location, article, 'STOCK_RECEIPT')] == [Decimal('22.50'), 2]
+    assert movements == aggregate(Transaction.query.all())
+
+
+def test_one_upsert_per_transaction(app, location, article, user, stock, surplus, pending_draft):
+    with count_queries() as stats:
+        receive_stock(
+            article_id=article, batch_code='5678', quantity_kg=Decimal('20.00'),
+            expiry_date=date.today() + timedelta(days=365), actor_user_id=user,
+            order_number='PO-1', client_event_id='mv-4'
+        )
+        db.session.flush()
+        approve_draft(pending_draft, user)
+        db.session.flush()
+        db.session.commit()
+
+    # Both flushes are written together at commit, rows in key order
+    assert sum(n for shape, n in stats.shapes.items() if 'INTO daily_article_movements' in shape) == 1
+    assert _movements() == aggregate(Transaction.query.all())
+
+
+def test_rolled_back_approval_leaves_no_movement(app, stock, surplus, pending_draft, user):
+    approve_draft(pending_draft, user)
+    db.session.flush()
+    # Written once per transaction, at commit
+    assert DailyArticleMovement.query.count() == 0
+    db.session.rollback()
+    assert DailyArticleMovement.query.count() == 0
+
+    approve_draft(pending_draft, user)
+    db.session.commit()
+    assert DailyArticleMovement.query.count() > 0
+
+
+def test_rebuild_matches_incremental_and_picks_up_bulk_rows(app, location, article, batch, user, stock, surplus, pending_draft):
+    _receive(article, user, '20.00', 'mv-3')
+    approve_draft(pending_draft, user)
+    db.session.commit()
+    incremental = _movements()
+
+    # Core insert bypasses the ORM hook
+    occurred_at = datetime.now(timezone.utc) - timedelta(days=3)
+    db.session.execute(insert(Transaction), [{
+        'tx_type': 'STOCK_CONSUMED', 'occurred_at': occurred_at, 'location_id': location,
+        'article_id': article, 'batch_id': batch, 'quantity_kg': Decimal('-1.25'),
+        'user_id': user, 'source': 'manual'
+    }])
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=['rebuild-movements', '--days', '7'])
+    assert result.exit_code == 0, result.output
+
+    rebuilt = _movements()
+    assert rebuilt[(occurred_at.date(), location, article, 'STOCK_CONSUMED')] == [Decimal('-1.25'), 1]
+    del rebuilt[(occurred_at.date(), location, article, 'STOCK_CONSUMED')]
+    assert rebuilt == incremental
+
+    # Idempotent
+    rebuild_range(date.today() - timedelta(days=6), date.today())
+    assert len(_movements()) == len(rebuilt) + 1
+
+
+def test_movement_report(app, client, admin_headers, location, article, user):
+    _receive(article, user, '20.00', 'mv-4')
+    _receive(article, user, '5.00', 'mv-5')
+
+    response = client.get(f'/api/reports/movements?article_id={article}', headers=admin_headers)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['total'] == 1
+    item = body['items'][0]
+    assert (item['article_no'], item['tx_type'], item['quantity_kg'], item['tx_count']) == \
+        ('TEST-001', 'STOCK_RECEIPT', 25.0, 2)
+    assert 'day' not in item
+
+    by_day = client.get('/api/reports/movements?by_day=true', headers=admin_headers).get_json()
+    assert by_day['items'][0]['day'] == datetime.now(timezone.utc).date().isoformat()
+
+    past = client.get('/api/reports/movements?from_date=2020-01-01&to_date=2020-01-31', headers=admin_headers)
+    assert past.get_json()['total'] == 0
@@ -0,0 +1,127 @@
+"""Tests for retrying write transactions on lock conflicts."""
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from app import db_retry
+from app.db_retry import TransactionConflictError, retry_reason, run_in_transaction
+from app.extensions import db
+from app.models import WeighInDraft
+
+
+class FakePgError(Exception):
+    def __init__(self, pgcode):
+        super().__init__(f'pgcode {pgcode}')
+        self.pgcode = pgcode
+
+
+def lock_error(pgcode='40P01'):
+    return OperationalError('SELECT ... FOR UPDATE', {}, FakePgError(pgcode))
+
+
+@pytest.fixture
+def no_backoff(app):
+    app.config['DB_RETRY_BASE_DELAY_MS'] = 0
+    app.config['DB_RETRY_MAX_ATTEMPTS'] = 3
+
+
+def test_retry_reason_classifies_sqlstate():
+    assert retry_reason(lock_error('40P01')) == 'deadlock'
+    assert retry_reason(lock_error('40001')) == 'serialization_failure'
+    assert retry_reason(lock_error('55P03')) == 'lock_timeout'
+    assert retry_reason(lock_error('23505')) is None
+    assert retry_reason(ValueError('nope')) is None
+
+
+def test_backoff_is_capped():
+    for attempt in range(1, 10):
+        assert 0 <= db_retry.backoff_delay(attempt, 25, 100) <= 0.1
+
+
+def test_retries_until_commit(app, no_backoff):
+    calls = []
+
+    def work():
+        calls.append(1)
+        if len(calls) < 3:
+            raise lock_error()
+        return 'done'
+
+    assert run_in_transaction('test_op', work) == 'done'
+    assert len(calls) == 3
+
+
+def test_gives_up_with_conflict_error(app, no_backoff):
+    calls = []
+
+    def work():
+        calls.append(1)
+        raise lock_error('40001')
+
+    with pytest.raises(TransactionConflictError) as exc_info:
+        run_in_transaction('test_op', work)
+
+    assert len(calls) == 3
+    assert exc_info.value.details == {
+        'operation': 'test_op', 'attempts': 3, 'reason': 'serialization_failure'
+    }
+
+
+def test_other_database_errors_are_not_retried(app, no_backoff):
+    calls = []
+
+    def work():
+        calls.append(1)
+        raise IntegrityError('INSERT', {}, FakePgError('23505'))
+
+    with pytest.raises(IntegrityError):
+        run_in_transaction('test_op', work)
+    assert len(calls) == 1
+
+
+def test_approve_endpoint_survives_deadlock(app, client, no_backoff, monkeypatch,
+                                            location, article, batch, user, stock, surplus):
+    with app.app_context():
+        draft = WeighInDraft(
+            location_id=location, article_id=article, batch_id=batch,
+            quantity_kg=3, created_by_user_id=user, client_event_id='evt-retry'
+        )
+        db.session.add(draft)
+        db.session.commit()
+        draft_id = draft.id
+
+    from app.api import approvals
+    real_approve = approvals.approve_draft
+    calls = []
+
+    def flaky_approve(**kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            real_approve(**kwargs)
+            raise lock_error()
+        return real_approve(**kwargs)
+
+    monkeypatch.setattr(approvals, 'approve_draft', flaky_approve)
+    token = create_access_token(identity=str(user), additional_claims={'role': 'ADMIN'})
+    response = client.post(f'/api/drafts/{draft_id}/approve', json={},
+                           headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == 200
+    assert len(calls) == 2
+    # The first attempt was rolled back: surplus (5 kg) covers the 3 kg once
+    assert response.get_json()['consumed_surplus_kg'] == 3
+
+
+def test_approve_endpoint_returns_409_after_max_attempts(app, client, no_backoff, monkeypatch, user):
+    from app.api import approvals
+
+    def always_deadlocks(**kwargs):
+        raise lock_error()
+
+    monkeypatch.setattr(approvals, 'approve_draft', always_deadlocks)
+    token = create_access_token(identity=str(user), additional_claims={'role': 'ADMIN'})
+    response = client.post('/api/drafts/1/approve', json={},
+                           headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == 409
+    assert response.get_json()['error']['code'] == 'TRANSACTION_CONFLICT'
@@ -0,0 +1,91 @@
+"""Tests for read-replica routing with two local databases."""
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.extensions import db
+from app.models import Article
+from tests.conftest import TestConfig
+
+
+@pytest.fixture
+def routed_app(tmp_path):
+    """App with separate primary and replica SQLite databases."""
+    class RoutedConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'primary.db'}"
+        SQLALCHEMY_BINDS = {'replica': f"sqlite:///{tmp_path / 'replica.db'}"}
+        REPLICA_MAX_LAG_SECONDS = 5
+        REPLICA_CHECK_INTERVAL_SECONDS = 0
+
+    application = create_app(RoutedConfig)
+    with application.app_context():
+        db.create_all()
+        db.metadata.create_all(db.engines['replica'])
+
+        # Same schema, different contents, so we can tell who answered
+        db.session.add(Article(article_no='PRIMARY-ONLY', uom='KG'))
+        db.session.commit()
+        with db.engines['replica'].begin() as conn:
+            conn.execute(Article.__table__.insert().values(
+                article_no='REPLICA-ONLY', uom='KG', base_uom='kg',
+                is_paint=True, is_active=True, created_at=db.func.now()
+            ))
+
+        yield application
+        db.session.remove()
+        db.drop_all()
+        # init_app registered a metadata for the bind on the shared db object
+        db.metadatas.pop('replica', None)
+
+
+@pytest.fixture
+def headers(routed_app):
+    token = create_access_token(identity='1', additional_claims={'role': 'ADMIN'})
+    return {'Authorization': f'Bearer {token}'}
+
+
+def _article_nos(response):
+    return [item['article_no'] for item in response.get_json()['items']]
+
+
+def test_read_only_endpoint_uses_replica(routed_app, headers):
+    """Decorated listing endpoint reads from the replica."""
+    response = routed_app.test_client().get('/api/articles', headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers['X-DB-Route'] == 'replica'
+    assert _article_nos(response) == ['REPLICA-ONLY']
+
+
+def test_lagging_replica_falls_back_to_primary(routed_app, headers):
+    """Replica over the lag budget is skipped in favor of the primary."""
+    routed_app.config['REPLICA_MAX_LAG_SECONDS'] = -1
+
+    response = routed_app.test_client().get('/api/articles', headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers['X-DB-Route'] == 'primary'
+    assert _article_nos(response) == ['PRIMARY-ONLY']
+
+
+def test_undecorated_endpoint_uses_primary(routed_app, headers):
+    """Endpoints without @replica_read stay on the primary."""
+    response = routed_app.test_client().get('/api/articles/PRIMARY-ONLY', headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers['X-DB-Route'] == 'primary'
+
+
+def test_writes_go_to_primary(routed_app, headers):
+    """Creating an article writes to the primary only."""
+    response = routed_app.test_client().post(
+        '/api/articles',
+        json={'article_no': 'NEW-001', 'uom': 'KG'},
+        headers=headers
+    )
+    assert response.status_code == 201
+
+    with db.engines['replica'].connect() as conn:
+        replica_nos = [r.article_no for r in conn.execute(Article.__table__.select())]
+    assert 'NEW-001' not in replica_nos
+    assert db.session.query(Article).filter_by(article_no='NEW-001').count() == 1
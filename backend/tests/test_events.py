@@ -0,0 +1,149 @@
+"""Tests for the change feed (after-commit events and SSE stream)."""
+import json
+
+import pytest
+
+from app import events
+from app.events import EventBroker, get_broker, make_event, _notify_chunks
+from app.services import draft_group_service
+
+
+@pytest.fixture
+def memory_events(app):
+    """Force in-process delivery regardless of the test database."""
+    app.config['EVENTS_BACKEND'] = events.BACKEND_MEMORY
+    app.config['EVENTS_STREAM_MAX_SECONDS'] = 0
+    return get_broker(app)
+
+
+def _types_after(broker, seq):
+    new_events, _, _ = broker.wait_after(seq, 0)
+    return [ev['type'] for ev in new_events], new_events
+
+
+def _parse_sse(body: str):
+    """Return (id, type, data) for each message with a data line."""
+    messages = []
+    for block in body.split('\n\n'):
+        fields = dict(
+            line.split(': ', 1) for line in block.split('\n')
+            if ': ' in line and not line.startswith(':')
+        )
+        if 'data' in fields:
+            messages.append((fields.get('id'), fields['event'], json.loads(fields['data'])))
+    return messages
+
+
+def test_approve_publishes_after_commit(app, client, memory_events, admin_headers,
+                                        stock, surplus, pending_draft, location, article, batch):
+    """Approving a draft emits draft.approved and inventory.changed once committed."""
+    start = memory_events.last_seq
+
+    response = client.post(f'/api/drafts/{pending_draft}/approve', json={}, headers=admin_headers)
+    assert response.status_code == 200
+
+    types, new_events = _types_after(memory_events, start)
+    assert 'draft.approved' in types
+    inventory = [ev['data'] for ev in new_events if ev['type'] == 'inventory.changed']
+    assert inventory == [{'location_id': location, 'article_id': article, 'batch_id': batch}]
+
+
+def test_failed_approval_publishes_nothing(app, client, memory_events, admin_headers,
+                                           location, article, batch, user):
+    """Rolled-back work does not leak events."""
+    with app.app_context():
+        group = draft_group_service.create_group(
+            location_id=location,
+            user_id=user,
+            lines=[{'article_id': article, 'batch_id': batch,
+                    'quantity_kg': 50, 'client_event_id': 'evt-big'}]
+        )
+        group_id = group.id
+    start = memory_events.last_seq
+
+    response = client.post(f'/api/draft-groups/{group_id}/approve', json={}, headers=admin_headers)
+    assert response.status_code == 409
+
+    types, _ = _types_after(memory_events, start)
+    assert types == []
+
+
+def test_group_lifecycle_events(app, memory_events, location, article, batch, user):
+    """Creating and rejecting a group emits group.created and group.rejected."""
+    start = memory_events.last_seq
+    with app.app_context():
+        group = draft_group_service.create_group(
+            location_id=location,
+            user_id=user,
+            lines=[{'article_id': article, 'batch_id': batch,
+                    'quantity_kg': 1, 'client_event_id': 'evt-1'}]
+        )
+        draft_group_service.reject_group(group.id, user)
+
+    types, new_events = _types_after(memory_events, start)
+    assert types == ['group.created', 'draft.rejected', 'group.rejected']
+    assert new_events[0]['data']['line_count'] == 1
+
+
+def test_stream_resumes_from_last_event_id(app, client, memory_events, admin_headers,
+                                           location, article, batch, user):
+    """Last-Event-ID replays only events after that id."""
+    with app.app_context():
+        for i in range(3):
+            draft_group_service.create_group(
+                location_id=location,
+                user_id=user,
+                lines=[{'article_id': article, 'batch_id': batch,
+                        'quantity_kg': 1, 'client_event_id': f'evt-{i}'}]
+            )
+    _, all_events = _types_after(memory_events, 0)
+    first_id = all_events[0]['id']
+
+    response = client.get(
+        '/api/events/stream',
+        headers={**admin_headers, 'Last-Event-ID': first_id}
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    messages = _parse_sse(response.get_data(as_text=True))
+    assert [m[0] for m in messages] == [ev['id'] for ev in all_events[1:]]
+    assert [m[1] for m in messages] == ['group.created', 'group.created']
+
+
+def test_stream_unknown_id_requests_resync(client, memory_events, admin_headers):
+    """An id that is no longer buffered yields a resync event."""
+    response = client.get(
+        '/api/events/stream',
+        headers={**admin_headers, 'Last-Event-ID': 'gone'}
+    )
+
+    messages = _parse_sse(response.get_data(as_text=True))
+    assert [m[1] for m in messages] == ['resync']
+
+
+def test_stream_requires_auth(client, memory_events):
+    assert client.get('/api/events/stream').status_code == 401
+
+
+def test_broker_reports_evicted_events():
+    """A reader that fell behind the ring buffer is told to resync."""
+    broker = EventBroker(buffer_size=2)
+    broker.append([make_event('group.created', {'group_id': i}) for i in range(5)])
+
+    new_events, seq, lost = broker.wait_after(1, 0)
+    assert lost is True
+    assert [ev['data']['group_id'] for ev in new_events] == [3, 4]
+    assert seq == 5
+
+
+def test_notify_chunks_fit_payload_limit():
+    """Large commits are split into NOTIFY-sized JSON arrays."""
+    batch = [make_event('inventory.changed', {'article_id': i, 'pad': 'x' * 200})
+             for i in range(100)]
+
+    chunks = list(_notify_chunks(batch))
+
+    assert len(chunks) > 1
+    assert all(len(c) <= 7500 for c in chunks)
+    assert [ev['id'] for c in chunks for ev in json.loads(c)] == [ev['id'] for ev in batch]
@@ -0,0 +1,57 @@
+"""Tests for expiring-soon batches and the precomputed earliest expiry."""
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from app.extensions import db
+from app.models import ArticleStockTotal, Batch, InventoryBalance
+from app.query_stats import count_queries
+
+
+TODAY = datetime.now(timezone.utc).date()
+
+
+def _earliest(location, article):
+    return db.session.get(ArticleStockTotal, (location, article)).earliest_expiry_date
+
+
+def test_expiring_lists_stocked_active_batches_in_fefo_order(client, admin_headers, location, article, make_batch):
+    soon = make_batch('1001', 10)
+    expired = make_batch('1002', -3)
+    make_batch('1003', 100)                      # too late
+    make_batch('1004', 5, stock_kg='0.00')       # no stock
+    make_batch('1005', 5, is_active=False)       # archived
+    make_batch('1006', None)                     # no expiry
+
+    with count_queries() as stats:
+        response = client.get('/api/inventory/expiring?days=30', headers=admin_headers)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [(i['batch_id'], i['days_left']) for i in body['items']] == [(expired, -3), (soon, 10)]
+    assert body['items'][1]['total_qty'] == 5.0
+    assert body['until'] == (TODAY + timedelta(days=30)).isoformat()
+    assert sum(n for shape, n in stats.shapes.items() if 'FROM batches' in shape) == 1
+
+    assert client.get('/api/inventory/expiring?days=0', headers=admin_headers).get_json()['total'] == 1
+
+
+def test_earliest_expiry_follows_stock_and_batches(client, admin_headers, location, article, make_batch):
+    first = make_batch('2001', 20)
+    make_batch('2002', 40)
+    assert _earliest(location, article) == TODAY + timedelta(days=20)
+
+    # Emptying the first batch moves the earliest expiry to the next one
+    balance = InventoryBalance.query.filter_by(batch_id=first).one()
+    balance.stock_kg = Decimal('0')
+    db.session.commit()
+    assert _earliest(location, article) == TODAY + timedelta(days=40)
+
+    balance.stock_kg = Decimal('2.00')
+    db.session.commit()
+    assert _earliest(location, article) == TODAY + timedelta(days=20)
+
+    db.session.get(Batch, first).expiry_date = TODAY + timedelta(days=60)
+    db.session.commit()
+    assert _earliest(location, article) == TODAY + timedelta(days=40)
+
+    items = client.get('/api/articles', headers=admin_headers).get_json()['items']
+    assert items[0]['earliest_expiry_date'] == (TODAY + timedelta(days=40)).isoformat()
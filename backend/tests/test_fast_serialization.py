@@ -0,0 +1,85 @@
+"""Tests for the fast serialization path on large list endpoints."""
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.extensions import db
+from app.models import Transaction
+from app.serialization import dumps_json
+
+
+LIST_ENDPOINTS = [
+    '/api/transactions',
+    '/api/articles',
+    '/api/inventory/summary',
+    '/api/reports/inventory',
+    '/api/reports/transactions',
+]
+
+
+@pytest.fixture
+def transactions(app, location, article, batch, user, stock, surplus):
+    """A few transactions with Decimal quantities and aware timestamps."""
+    with app.app_context():
+        for i, qty in enumerate(['5.25', '-1.10', '-0.01']):
+            db.session.add(Transaction(
+                tx_type=Transaction.TX_STOCK_CONSUMED,
+                occurred_at=datetime(2026, 2, 1, 8, i, 30, 123456, tzinfo=timezone.utc),
+                location_id=location,
+                article_id=article,
+                batch_id=batch,
+                quantity_kg=Decimal(qty),
+                user_id=user,
+                source='approval',
+                meta={'draft_id': i}
+            ))
+        db.session.commit()
+
+
+def test_dumps_json_handles_decimal_and_datetime():
+    """Decimal encodes as float and datetimes as ISO 8601, keys sorted."""
+    payload = {
+        'b': Decimal('2.50'),
+        'a': datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    }
+    assert json.loads(dumps_json(payload)) == {
+        'a': '2026-01-02T03:04:05+00:00',
+        'b': 2.5,
+    }
+    assert dumps_json(payload).startswith(b'{"a"')
+
+
+@pytest.mark.parametrize('url', LIST_ENDPOINTS)
+def test_fast_path_matches_schema_output(app, client, admin_headers, transactions, url):
+    """Fast path returns the same fields and values as Marshmallow dumping."""
+    app.config['FAST_SERIALIZATION'] = False
+    slow = client.get(url, headers=admin_headers)
+    app.config['FAST_SERIALIZATION'] = True
+    fast = client.get(url, headers=admin_headers)
+
+    assert slow.status_code == 200
+    assert fast.status_code == 200
+    assert fast.mimetype == 'application/json'
+
+    slow_data, fast_data = slow.get_json(), fast.get_json()
+    slow_data.pop('generated_at', None)
+    fast_data.pop('generated_at', None)
+    assert fast_data == slow_data
+    assert slow_data['total'] > 0
+
+
+def test_msgpack_negotiation(client, admin_headers, transactions):
+    """Accept: application/msgpack returns msgpack with the same field names."""
+    msgpack = pytest.importorskip('msgpack')
+
+    json_data = client.get('/api/transactions', headers=admin_headers).get_json()
+    response = client.get(
+        '/api/transactions',
+        headers={**admin_headers, 'Accept': 'application/msgpack'}
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/msgpack'
+    assert msgpack.unpackb(response.data) == json_data
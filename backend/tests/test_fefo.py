@@ -0,0 +1,93 @@
+"""Tests for FEFO batch selection (batch_id "auto") in draft groups."""
+from decimal import Decimal
+
+from app.extensions import db
+from app.models import Article, Batch, DraftGroup, InventoryBalance
+from app.query_stats import count_queries
+from app.services import draft_group_service
+
+
+def _post(client, headers, location, lines):
+    return client.post('/api/draft-groups', headers=headers, json={'location_id': location, 'lines': lines})
+
+
+def test_auto_picks_earliest_expiry_and_splits(client, admin_headers, location, article, user, make_batch):
+    undated = make_batch('2001', None, stock_kg='50.00')
+    later = make_batch('2002', 60, stock_kg='4.00')
+    first = make_batch('2003', 5, stock_kg='2.00', surplus_kg='1.00')
+    make_batch('2004', -1, stock_kg='9.00')                    # expired
+    make_batch('2005', 1, stock_kg='9.00', is_active=False)    # inactive
+    make_batch('2006', 2, stock_kg='0.00')                     # empty
+
+    with count_queries() as stats:
+        response = _post(client, admin_headers, location, [
+            {'article_id': article, 'batch_id': 'auto', 'quantity_kg': 8.5, 'client_event_id': 'fefo-1'},
+        ])
+    assert response.status_code == 201, response.get_json()
+    drafts = response.get_json()['drafts']
+    assert [(d['batch_id'], d['quantity_kg'], d['client_event_id']) for d in drafts] == [
+        (first, 3.0, 'fefo-1'), (later, 4.0, 'fefo-1#2'), (undated, 1.5, 'fefo-1#3'),
+    ]
+    # One candidate query for the article
+    assert sum(n for shape, n in stats.shapes.items() if 'inventory_balances' in shape.lower()) == 1
+
+    # The split drafts approve like any others
+    draft_group_service.approve_group(response.get_json()['id'], user)
+    remaining = {b.batch_id: b.stock_kg + b.surplus_kg for b in InventoryBalance.query}
+    assert (remaining[first], remaining[later], remaining[undated]) == (0, 0, Decimal('48.50'))
+
+
+def test_auto_lines_share_availability_with_explicit_lines(client, admin_headers, location, article, make_batch):
+    first = make_batch('2101', 5, stock_kg='3.00')
+    second = make_batch('2102', 10, stock_kg='5.00')
+
+    response = _post(client, admin_headers, location, [
+        {'article_id': article, 'batch_id': 'auto', 'quantity_kg': 2, 'client_event_id': 'mix-1'},
+        {'article_id': article, 'batch_id': first, 'quantity_kg': 1, 'client_event_id': 'mix-2'},
+        {'article_id': article, 'batch_id': 'auto', 'quantity_kg': 2, 'client_event_id': 'mix-3'},
+    ])
+    assert response.status_code == 201, response.get_json()
+    drafts = sorted(response.get_json()['drafts'], key=lambda d: d['client_event_id'])
+    assert [(d['client_event_id'], d['batch_id'], d['quantity_kg']) for d in drafts] == [
+        ('mix-1', first, 2.0), ('mix-2', first, 1.0), ('mix-3', second, 2.0),
+    ]
+
+
+def test_auto_insufficient_stock_creates_nothing(client, admin_headers, location, article, make_batch):
+    make_batch('2201', 5, stock_kg='1.00', surplus_kg='0.50')
+    make_batch('2202', -2, stock_kg='9.00')
+
+    response = _post(client, admin_headers, location, [
+        {'article_id': article, 'batch_id': 'auto', 'quantity_kg': 2, 'client_event_id': 'short-1'},
+    ])
+    assert response.status_code == 409
+    error = response.get_json()['error']
+    assert error['code'] == 'INSUFFICIENT_STOCK'
+    assert error['details']['available_stock_kg'] == 1.0
+    assert error['details']['available_surplus_kg'] == 0.5
+    db.session.rollback()
+    assert DraftGroup.query.count() == 0
+
+
+def test_auto_rules(client, admin_headers, location, article, batch):
+    consumable = Article(article_no='CONS-001', description='Gloves', uom='KG', is_paint=False)
+    db.session.add(consumable)
+    db.session.commit()
+
+    response = _post(client, admin_headers, location, [
+        {'article_id': consumable.id, 'batch_id': 'auto', 'quantity_kg': 1, 'client_event_id': 'rule-1'},
+    ])
+    assert response.status_code == 201
+    assert db.session.get(Batch, response.get_json()['drafts'][0]['batch_id']).batch_code == 'NA'
+
+    response = _post(client, admin_headers, location, [
+        {'article_id': article, 'batch_id': 'auto', 'quantity_kg': 1, 'client_event_id': 'rule-2',
+         'draft_type': 'INVENTORY_SHORTAGE'},
+    ])
+    assert response.status_code == 400
+    assert response.get_json()['error']['code'] == 'VALIDATION_ERROR'
+
+    response = _post(client, admin_headers, location, [
+        {'article_id': article, 'batch_id': 'latest', 'quantity_kg': 1, 'client_event_id': 'rule-3'},
+    ])
+    assert response.status_code in (400, 422)
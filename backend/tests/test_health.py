@@ -0,0 +1,99 @@
+"""Tests for liveness/readiness health checks."""
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from app.api import health
+
+
+def test_live_does_not_touch_database(client, monkeypatch):
+    def fail(engine):
+        raise AssertionError('liveness must not probe the database')
+    monkeypatch.setattr(health, '_probe_database', fail)
+
+    response = client.get('/health/live')
+
+    assert response.status_code == 200
+    assert response.get_json() == {'status': 'ok'}
+
+
+def test_ready_reports_database_and_pool(client):
+    response = client.get('/health/ready')
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['status'] == 'ready'
+    assert body['checks']['database']['status'] == 'ok'
+    assert body['checks']['pool']['saturated'] is False
+    assert 'class' in body['checks']['pool']
+
+
+def test_ready_returns_503_when_database_down(app, client, monkeypatch):
+    monkeypatch.setattr(health, '_probe_database', lambda engine: {
+        'healthy': False, 'latency_ms': None, 'error': 'connection refused'
+    })
+
+    response = client.get('/health/ready')
+
+    assert response.status_code == 503
+    body = response.get_json()
+    assert body['status'] == 'unavailable'
+    assert body['checks']['database']['error'] == 'connection refused'
+    # Legacy endpoint stays 200 but no longer claims everything is fine
+    legacy = client.get('/health').get_json()
+    assert legacy['status'] == 'degraded'
+
+
+def test_ready_returns_503_when_pool_saturated(client, monkeypatch):
+    probes = []
+    monkeypatch.setattr(health, '_probe_database', lambda engine: probes.append(engine))
+    monkeypatch.setattr(health, 'pool_stats', lambda engine: {
+        'class': 'QueuePool', 'size': 5, 'max_overflow': 10, 'checked_out': 15,
+        'checked_in': 0, 'overflow': 10, 'capacity': 15, 'usage': 1.0,
+    })
+
+    response = client.get('/health/ready')
+
+    assert response.status_code == 503
+    assert response.get_json()['checks']['pool']['saturated'] is True
+    assert response.get_json()['checks']['database'] == {'status': 'unknown'}
+    assert probes == []
+
+
+def test_database_probe_is_cached(app, client, monkeypatch):
+    calls = []
+    real_probe = health._probe_database
+
+    def counting_probe(engine):
+        calls.append(engine)
+        return real_probe(engine)
+    monkeypatch.setattr(health, '_probe_database', counting_probe)
+
+    for _ in range(3):
+        assert client.get('/health/ready').status_code == 200
+    client.get('/health')
+    assert len(calls) == 1
+
+    app.config['HEALTH_CHECK_INTERVAL_SECONDS'] = 0
+    client.get('/health/ready')
+    assert len(calls) == 2
+
+
+def test_pool_stats_for_queue_pool():
+    engine = create_engine('sqlite://', poolclass=QueuePool, pool_size=2, max_overflow=1)
+    connections = [engine.connect() for _ in range(2)]
+    try:
+        stats = health.pool_stats(engine)
+    finally:
+        for conn in connections:
+            conn.close()
+        engine.dispose()
+
+    assert stats['class'] == 'QueuePool'
+    assert stats['capacity'] == 3
+    assert stats['checked_out'] == 2
+    assert stats['usage'] == round(2 / 3, 3)
+
+
+def test_health_is_not_rate_limited(client):
+    for _ in range(60):
+        assert client.get('/health/live').status_code == 200
@@ -0,0 +1,59 @@
+"""Tests for the unified stock/surplus inventory_balances row."""
+from decimal import Decimal
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models import InventoryBalance, Stock, Surplus
+from app.query_stats import count_queries
+from app.services.approval_service import approve_draft
+
+
+def get_headers(user_id):
+    token = create_access_token(identity=str(user_id), additional_claims={'role': 'ADMIN'})
+    return {'Authorization': f'Bearer {token}'}
+
+
+def test_stock_and_surplus_share_one_row(app, stock, surplus):
+    assert stock == surplus
+    assert db.session.query(InventoryBalance).count() == 1
+
+    balance = db.session.get(InventoryBalance, stock)
+    assert (balance.stock_kg, balance.surplus_kg) == (Decimal('10.00'), Decimal('5.00'))
+
+    # Compatibility mappings read the matching column of the same row
+    assert db.session.get(Stock, stock).quantity_kg == Decimal('10.00')
+    assert db.session.get(Surplus, surplus).quantity_kg == Decimal('5.00')
+    assert Stock.query.filter(Stock.quantity_kg > 9).count() == 1
+
+
+@pytest.mark.parametrize('column', ['stock_kg', 'surplus_kg'])
+def test_each_quantity_is_checked(app, stock, column):
+    balance = db.session.get(InventoryBalance, stock)
+    setattr(balance, column, Decimal('-1'))
+    with pytest.raises(IntegrityError):
+        db.session.flush()
+    db.session.rollback()
+
+
+def test_approval_updates_one_row(app, user, stock, surplus, draft):
+    with count_queries() as stats:
+        result = approve_draft(draft, user)
+        db.session.commit()
+
+    balance = db.session.get(InventoryBalance, stock)
+    assert (balance.stock_kg, balance.surplus_kg) == (Decimal('10.00'), Decimal('2.00'))
+    assert balance.surplus_updated_at is not None
+    assert result['remaining_surplus_kg'] == 2.0
+
+    balance_statements = sum(n for shape, n in stats.shapes.items() if 'inventory_balances' in shape)
+    assert balance_statements == 2  # one locking SELECT, one UPDATE
+
+
+def test_summary_joins_one_balance_row(client, user, location, batch, stock, surplus):
+    response = client.get(f'/api/inventory/summary?location_id={location}', headers=get_headers(user))
+    assert response.status_code == 200
+    item = response.get_json()['items'][0]
+    assert (item['stock_qty'], item['surplus_qty'], item['total_qty']) == (10.0, 5.0, 15.0)
@@ -0,0 +1,62 @@
+"""Tests for the load-test harness's statistics and metric parsing."""
+import pytest
+
+pytest.importorskip('httpx')
+
+from loadtest.run import Stats, find_knee, lock_report, parse_metrics  # noqa: E402
+
+
+METRICS_BEFORE = """
+# HELP db_row_lock_wait_seconds Time spent acquiring row locks
+db_row_lock_wait_seconds_count{operation="approve_group"} 10.0
+db_row_lock_wait_seconds_sum{operation="approve_group"} 0.5
+db_transaction_conflicts_total{operation="approve_group",reason="deadlock"} 1.0
+http_requests_total{blueprint="health"} 3.0
+"""
+
+METRICS_AFTER = """
+db_row_lock_wait_seconds_count{operation="approve_group"} 30.0
+db_row_lock_wait_seconds_sum{operation="approve_group"} 1.5
+db_row_lock_wait_seconds_count{operation="receive_stock"} 4.0
+db_row_lock_wait_seconds_sum{operation="receive_stock"} 0.002
+db_transaction_conflicts_total{operation="approve_group",reason="deadlock"} 3.0
+"""
+
+
+def test_stats_summary_rates_and_total():
+    stats = Stats()
+    for ms in (10, 20, 30, 40):
+        stats.record('approve_group', 200, ms / 1000)
+    stats.record('approve_group', 409, 0.05)
+    stats.record('create_group', 500, 0.1)
+    stats.record('create_group', 0, 1.0)
+
+    summary = stats.summary(elapsed=2.0)
+
+    approve = summary['approve_group']
+    assert approve['requests'] == 5
+    assert approve['throughput_rps'] == 2.5
+    assert approve['p50_ms'] == 30
+    assert approve['conflict_rate'] == 0.2
+    assert approve['error_rate'] == 0
+    assert summary['create_group']['error_rate'] == 1.0
+    assert summary['total']['requests'] == 7
+    assert summary['total']['statuses'] == {'0': 1, '200': 4, '409': 1, '500': 1}
+
+
+def test_lock_report_uses_metric_deltas():
+    report = lock_report(parse_metrics(METRICS_BEFORE), parse_metrics(METRICS_AFTER))
+
+    assert report['lock_wait']['approve_group'] == {'acquisitions': 20, 'mean_ms': 50.0}
+    assert report['lock_wait']['receive_stock'] == {'acquisitions': 4, 'mean_ms': 0.5}
+    assert report['conflicts'] == {'approve_group:deadlock': 2}
+
+
+def _stage(operators, rps):
+    return {'operators': operators, 'results': {'total': {'throughput_rps': rps}}}
+
+
+def test_find_knee():
+    stages = [_stage(5, 50), _stage(10, 95), _stage(20, 100), _stage(40, 80)]
+    assert find_knee(stages, 10) == {'operators': 20, 'last_scaling_stage': 10}
+    assert find_knee(stages[:2], 10) == {}
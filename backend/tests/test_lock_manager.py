@@ -0,0 +1,98 @@
+"""Tests for canonical inventory balance row locking."""
+from decimal import Decimal
+
+from sqlalchemy import tuple_
+from sqlalchemy.dialects import postgresql
+
+from app.extensions import db
+from app.models import Batch, InventoryBalance
+from app.query_stats import count_queries
+from app.services.lock_manager import lock_inventory
+
+
+def _add_batches(article_id, codes):
+    batches = [Batch(article_id=article_id, batch_code=code) for code in codes]
+    db.session.add_all(batches)
+    db.session.flush()
+    return [b.id for b in batches]
+
+
+def test_locks_all_keys_with_one_statement(app, location, article, batch, stock, surplus):
+    batch_ids = _add_batches(article, ['2001', '2002'])
+    for batch_id in batch_ids:
+        db.session.add(InventoryBalance(location_id=location, article_id=article, batch_id=batch_id,
+                                        stock_kg=Decimal('3')))
+    db.session.commit()
+
+    keys = [(location, article, b) for b in reversed(batch_ids + [batch])]
+    with count_queries() as stats:
+        locks = lock_inventory(keys + keys[:1], 'test')
+
+    assert stats.count == 1
+    assert list(locks.rows) == sorted(set(keys))
+    assert locks.stock_qty((location, article, batch)) == Decimal('10')
+    assert locks.surplus_qty((location, article, batch)) == Decimal('5')
+    assert locks.surplus_qty((location, article, batch_ids[0])) == Decimal('0')
+
+
+def test_row_creation(app, location, article, batch):
+    key = (location, article, batch)
+
+    with count_queries() as stats:
+        locks = lock_inventory([key], 'test')
+    assert stats.count == 1
+    assert locks.row(key) is None
+
+    created = locks.row(key, create=True)
+    assert created.id is not None
+    assert (created.stock_kg, created.surplus_kg) == (Decimal('0'), Decimal('0'))
+    assert locks.row(key) is created
+    assert db.session.query(InventoryBalance).count() == 1
+
+
+def test_empty_key_set_runs_no_queries(app):
+    with count_queries() as stats:
+        locks = lock_inventory([], 'test')
+    assert stats.count == 0
+    assert locks.rows == {}
+
+
+def test_lock_statement_is_ordered_and_supports_nowait(app):
+    query = db.session.query(InventoryBalance).filter(
+        tuple_(
+            InventoryBalance.location_id, InventoryBalance.article_id, InventoryBalance.batch_id
+        ).in_([(13, 1, 1)])
+    ).order_by(
+        InventoryBalance.location_id, InventoryBalance.article_id, InventoryBalance.batch_id
+    ).with_for_update(nowait=True)
+
+    sql = str(query.statement.compile(dialect=postgresql.dialect()))
+
+    assert ('ORDER BY inventory_balances.location_id, inventory_balances.article_id, '
+            'inventory_balances.batch_id') in sql
+    assert sql.endswith('FOR UPDATE NOWAIT')
+
+
+def test_approve_group_locks_inventory_once(app, location, article, batch, user, stock, surplus):
+    """Group approval pre-locks all keys in one statement instead of one per key."""
+    from app.services import draft_group_service
+
+    other_batch = _add_batches(article, ['2003'])[0]
+    db.session.add(InventoryBalance(location_id=location, article_id=article, batch_id=other_batch,
+                                    stock_kg=Decimal('4')))
+    db.session.commit()
+    group = draft_group_service.create_group(
+        location_id=location,
+        user_id=user,
+        lines=[
+            {'article_id': article, 'batch_id': batch, 'quantity_kg': 1, 'client_event_id': 'lk-1'},
+            {'article_id': article, 'batch_id': other_batch, 'quantity_kg': 1, 'client_event_id': 'lk-2'},
+        ]
+    )
+
+    with count_queries() as stats:
+        draft_group_service.approve_group(group.id, user)
+
+    # One statement for the whole group; the lines reuse the locked rows
+    balance_locks = sum(n for shape, n in stats.shapes.items() if 'FROM inventory_balances WHERE' in shape)
+    assert balance_locks == 1
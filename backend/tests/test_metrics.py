@@ -0,0 +1,80 @@
+"""Tests for the Prometheus /metrics endpoint and collectors."""
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+prometheus_client = pytest.importorskip('prometheus_client')
+
+from app import metrics  # noqa: E402
+from app.services import draft_group_service  # noqa: E402
+
+
+def sample(name, **labels):
+    return prometheus_client.REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_metrics_endpoint_exposes_request_latency(client):
+    client.get('/health')
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    body = response.get_data(as_text=True)
+    assert 'http_request_duration_seconds_bucket{blueprint="health"' in body
+    assert 'http_requests_total{blueprint="health",endpoint="health.HealthCheck",method="GET",status="200"}' in body
+
+
+def test_unmatched_urls_share_one_label(client):
+    before = sample('http_requests_total', blueprint='', endpoint='unmatched',
+                    method='GET', status='404')
+    client.get('/no/such/path/1')
+    client.get('/no/such/path/2')
+
+    assert sample('http_requests_total', blueprint='', endpoint='unmatched',
+                  method='GET', status='404') == before + 2
+
+
+def test_business_counters_and_lock_wait(app, client, admin_headers,
+                                         location, article, batch, user, stock, surplus):
+    """Group creation/approval updates drafts, groups and kg counters."""
+    drafts_before = sample('drafts_created_total')
+    groups_before = sample('draft_groups_approved_total')
+    stock_kg_before = sample('inventory_consumed_kg_total', source='stock')
+    surplus_kg_before = sample('inventory_consumed_kg_total', source='surplus')
+    locks_before = sample('db_row_lock_wait_seconds_count', operation='approve_group')
+
+    with app.app_context():
+        group = draft_group_service.create_group(
+            location_id=location,
+            user_id=user,
+            lines=[{'article_id': article, 'batch_id': batch,
+                    'quantity_kg': 7, 'client_event_id': 'evt-a'}]
+        )
+        group_id = group.id
+
+    response = client.post(f'/api/draft-groups/{group_id}/approve', json={}, headers=admin_headers)
+    assert response.status_code == 200
+
+    assert sample('drafts_created_total') == drafts_before + 1
+    assert sample('draft_groups_approved_total') == groups_before + 1
+    # 5 kg surplus is used first, the remaining 2 kg come from stock
+    assert sample('inventory_consumed_kg_total', source='surplus') == surplus_kg_before + 5
+    assert sample('inventory_consumed_kg_total', source='stock') == stock_kg_before + 2
+    assert sample('db_row_lock_wait_seconds_count', operation='approve_group') > locks_before
+
+
+def test_pool_gauges_track_checkouts(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool,
+                           pool_size=1, max_overflow=2)
+    metrics._track_pool('test', engine)
+
+    first = engine.connect()
+    second = engine.connect()
+    second.execute(text('SELECT 1'))
+    assert sample('db_pool_checked_out_connections', bind='test') == 2
+    assert sample('db_pool_overflow_connections', bind='test') == 1
+
+    second.close()
+    first.close()
+    assert sample('db_pool_checked_out_connections', bind='test') == 0
+    engine.dispose()
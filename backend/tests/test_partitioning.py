@@ -0,0 +1,66 @@
+"""Tests for monthly transactions partition helpers."""
+from datetime import date, datetime, timezone
+
+from app import partitioning
+from app.api.transactions import transaction_filters
+from app.extensions import db
+
+
+def test_month_arithmetic_and_names():
+    assert partitioning.add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+    assert partitioning.add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert partitioning.month_start(datetime(2026, 10, 18, 23, 59)) == date(2026, 10, 1)
+    assert partitioning.parse_month('2026-02') == date(2026, 2, 1)
+
+    name = partitioning.partition_name(date(2026, 2, 1))
+    assert name == 'transactions_y2026m02'
+    assert partitioning.partition_month(name) == date(2026, 2, 1)
+    assert partitioning.partition_month(partitioning.DEFAULT_PARTITION) is None
+
+
+def test_partition_bounds_are_utc_months():
+    lower, upper = partitioning.partition_bounds(date(2026, 12, 1))
+    assert lower == datetime(2026, 12, 1, tzinfo=timezone.utc)
+    assert upper == datetime(2027, 1, 1, tzinfo=timezone.utc)
+
+
+def test_expected_partitions_span_range():
+    lower = datetime(2026, 9, 28, tzinfo=timezone.utc)
+    upper = datetime(2026, 11, 2, tzinfo=timezone.utc)
+    assert partitioning.expected_partitions(lower, upper) == [
+        'transactions_y2026m09', 'transactions_y2026m10', 'transactions_y2026m11'
+    ]
+
+
+def test_relations_in_plan():
+    plan = [{'Plan': {
+        'Node Type': 'Append',
+        'Subplans Removed': 20,
+        'Plans': [
+            {'Node Type': 'Index Scan', 'Relation Name': 'transactions_y2026m10'},
+            {'Node Type': 'Hash Join', 'Plans': [
+                {'Node Type': 'Seq Scan', 'Relation Name': 'transactions_y2026m09'},
+                {'Node Type': 'Seq Scan', 'Relation Name': 'articles'},
+            ]},
+        ],
+    }}]
+    assert partitioning.relations_in_plan(plan) == {
+        'transactions_y2026m10', 'transactions_y2026m09', 'articles'
+    }
+
+
+def test_list_filters_bound_occurred_at():
+    since = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    filters = transaction_filters({'from_': since, 'to': since, 'article_id': 1})
+    columns = [f.left.name for f in filters]
+    assert columns == ['article_id', 'occurred_at', 'occurred_at']
+
+
+def test_not_partitioned_outside_postgres(app):
+    if db.engine.dialect.name == 'postgresql':
+        return
+    assert partitioning.is_partitioned(db.session.connection()) is False
+
+    result = app.test_cli_runner().invoke(args=['partitions', 'create'])
+    assert result.exit_code != 0
+    assert 'not partitioned' in result.output
@@ -0,0 +1,84 @@
+"""Tests for the admin-triggered request profiler."""
+import threading
+import time
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app.profiling import SamplingProfiler, format_collapsed
+
+
+@pytest.fixture
+def profile_app(app, tmp_path):
+    app.config['PROFILE_DIR'] = str(tmp_path)
+    app.config['PROFILER_INTERVAL_MS'] = 1
+    return app
+
+
+def _headers(user, role):
+    token = create_access_token(identity=str(user), additional_claims={'role': role})
+    return {'Authorization': f'Bearer {token}'}
+
+
+def _busy_wait(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_sampling_profiler_collects_collapsed_stacks():
+    profiler = SamplingProfiler(threading.get_ident(), interval=0.001)
+    profiler.start()
+    _busy_wait(0.1)
+    samples = profiler.stop()
+
+    text = format_collapsed(samples)
+    assert 'test_profiling.py:_busy_wait' in text
+    stack, count = text.splitlines()[0].rsplit(' ', 1)
+    assert int(count) > 0
+    assert stack.split(';')[-1].startswith('test_profiling.py:')
+
+
+def test_admin_request_is_profiled(profile_app, client, user, tmp_path):
+    headers = {**_headers(user, 'ADMIN'), 'X-Profile': '1'}
+    response = client.get('/api/transactions', headers=headers)
+
+    assert response.status_code == 200
+    profile_id = response.headers['X-Profile-Id']
+    assert response.headers['Link'] == f'</api/admin/profiles/{profile_id}>; rel="profile"'
+    assert (tmp_path / f'{profile_id}.collapsed').exists()
+
+    listing = client.get('/api/admin/profiles', headers=_headers(user, 'ADMIN')).get_json()
+    assert listing['total'] == 1
+    assert listing['items'][0]['id'] == profile_id
+    assert listing['items'][0]['path'] == '/api/transactions'
+    assert listing['items'][0]['status'] == 200
+
+    download = client.get(f'/api/admin/profiles/{profile_id}', headers=_headers(user, 'ADMIN'))
+    assert download.status_code == 200
+    assert download.mimetype == 'text/plain'
+
+
+def test_query_flag_also_profiles(profile_app, client, user):
+    response = client.get('/api/transactions?profile=1', headers=_headers(user, 'ADMIN'))
+    assert 'X-Profile-Id' in response.headers
+
+
+def test_unflagged_and_non_admin_requests_are_not_profiled(profile_app, client, user, tmp_path):
+    plain = client.get('/api/transactions', headers=_headers(user, 'ADMIN'))
+    operator = client.get('/api/draft-groups', headers={**_headers(user, 'OPERATOR'), 'X-Profile': '1'})
+    anonymous = client.get('/health', headers={'X-Profile': '1'})
+
+    assert plain.status_code == 200 and operator.status_code == 200
+    for response in (plain, operator, anonymous):
+        assert 'X-Profile-Id' not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_profile_download_requires_admin_and_valid_id(profile_app, client, user):
+    assert client.get('/api/admin/profiles', headers=_headers(user, 'OPERATOR')).status_code == 403
+
+    response = client.get('/api/admin/profiles/..%2F..%2Fetc', headers=_headers(user, 'ADMIN'))
+    assert response.status_code == 404
+    missing = client.get('/api/admin/profiles/20260101T000000-deadbeef', headers=_headers(user, 'ADMIN'))
+    assert missing.get_json()['error']['code'] == 'PROFILE_NOT_FOUND'
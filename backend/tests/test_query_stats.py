@@ -0,0 +1,80 @@
+"""Tests for per-request query counting, N+1 detection and budgets."""
+import pytest
+
+from app.query_stats import (
+    QueryBudgetExceeded, QueryStats, count_queries, normalize_statement
+)
+from app.services import draft_group_service
+
+
+@pytest.fixture
+def groups(app, location, article, batch, user):
+    """Ten groups with two lines each."""
+    with app.app_context():
+        for i in range(10):
+            draft_group_service.create_group(
+                location_id=location,
+                user_id=user,
+                lines=[
+                    {'article_id': article, 'batch_id': batch,
+                     'quantity_kg': 1, 'client_event_id': f'evt-{i}-a'},
+                    {'article_id': article, 'batch_id': batch,
+                     'quantity_kg': 2, 'client_event_id': f'evt-{i}-b'},
+                ]
+            )
+
+
+def test_normalize_statement_collapses_literals_and_in_lists():
+    a = normalize_statement("SELECT * FROM t WHERE id IN (?, ?, ?) AND name = 'x'")
+    b = normalize_statement("SELECT *\n  FROM t WHERE id IN (%(id_1_1)s) AND name = 'yy'")
+    assert a == b == 'SELECT * FROM t WHERE id IN (?) AND name = ?'
+
+
+def test_repeated_shapes_are_reported():
+    stats = QueryStats()
+    for i in range(6):
+        stats.record(f'SELECT * FROM drafts WHERE group_id = {i}', 0.1)
+    stats.record('SELECT * FROM draft_groups', 0.1)
+
+    assert stats.count == 7
+    assert stats.repeated(5) == [('SELECT * FROM drafts WHERE group_id = ?', 6)]
+
+
+def test_server_timing_header(client, admin_headers, groups):
+    response = client.get('/api/draft-groups', headers=admin_headers)
+
+    assert response.status_code == 200
+    timings = response.headers.getlist('Server-Timing')
+    assert timings[0].startswith('db;dur=')
+    assert 'queries"' in timings[0]
+    assert timings[1].startswith('app;dur=')
+
+
+def test_group_listing_has_no_n_plus_one(client, admin_headers, groups):
+    """Listing groups loads drafts in one query, independent of group count."""
+    with count_queries() as stats:
+        response = client.get('/api/draft-groups', headers=admin_headers)
+
+    assert response.status_code == 200
+    assert len(response.get_json()['items']) == 10
+    assert stats.repeated(3) == []
+    assert stats.count <= 4
+
+
+def test_budget_exceeded_fails_request(app, client, admin_headers, groups):
+    """An endpoint over its budget raises when enforcement is on."""
+    app.config['QUERY_BUDGETS'] = {'draft_groups.DraftGroupList': 1}
+
+    with pytest.raises(QueryBudgetExceeded, match='draft_groups.DraftGroupList'):
+        client.get('/api/draft-groups', headers=admin_headers)
+
+
+def test_budget_not_enforced_only_logs(app, client, admin_headers, groups, caplog):
+    app.config['QUERY_BUDGETS'] = {'draft_groups.DraftGroupList': 1}
+    app.config['QUERY_BUDGET_ENFORCE'] = False
+
+    response = client.get('/api/draft-groups', headers=admin_headers)
+
+    assert response.status_code == 200
+    assert any('"event": "query_stats"' in r.message and r.levelname == 'WARNING'
+               for r in caplog.records)
@@ -0,0 +1,150 @@
+"""Tests for the scale gateway: parsing, stable-weight detection and batched submission."""
+import asyncio
+
+import pytest
+
+from app.error_handling import AppError
+from app.extensions import db
+from app.models import DraftGroup
+from app.scale_gateway import (
+    ScaleConfig, ScaleGateway, SimulatedScale, StabilityDetector, TcpScale, app_submitter, parse_reading
+)
+
+
+@pytest.mark.parametrize('line, expected', [
+    ('ST,GS,+0012.345 kg\r\n', 12.345),
+    ('S S     1.250 kg', 1.25),
+    ('US,GS,-0000.020kg', -0.02),
+    ('12345 g', 12.345),
+    ('  0,750 kg', 0.75),
+    ('OL', None),
+    ('E 3', None),
+])
+def test_parse_reading(line, expected):
+    assert parse_reading(line) == expected
+
+
+def test_detector_reports_each_load_once():
+    detector = StabilityDetector(window=10, max_std_kg=0.005)
+    samples = list(SimulatedScale([(0, 1), (1.25, 2), (0, 1), (1.25, 1), (0.01, 1)], rate=0, seed=3).samples())
+    weights = [w for w in map(detector.add, samples) if w is not None]
+    # The same weight twice: the scale was emptied in between
+    assert [round(w, 2) for w in weights] == [1.25, 1.25]
+
+    # Settling noise never counts, and a load left on the scale is reported once
+    detector = StabilityDetector(window=5, max_std_kg=0.005)
+    assert [detector.add(v) for v in (0.5, 1.7, 0.9, 1.3, 1.1)] == [None] * 5
+    assert sum(detector.add(2.0) is not None for _ in range(100)) == 1
+
+
+def _run(gateway, stop=None):
+    return asyncio.run(gateway.run(stop))
+
+
+def test_gateway_batches_stable_weighings_into_groups(app, location, article, batch, user, stock):
+    calls = []
+    submit = app_submitter(app)
+
+    async def counting_submit(location_id, user_id, lines):
+        calls.append(len(lines))
+        return await submit(location_id, user_id, lines)
+
+    defaults = {'location_id': location, 'user_id': user, 'article_id': article, 'batch_id': batch}
+    gateway = ScaleGateway([
+        ScaleConfig('mix-1', 'sim://?plateaus=0:1,1.25:1,0:1,2.5:1,0:1&rate=0&seed=1', **defaults),
+        ScaleConfig('mix-2', 'sim://?plateaus=0:1,0.8:2,0:1&rate=0&seed=2', **defaults),
+        ScaleConfig('idle', 'sim://?plateaus=0:1,3:1&rate=0&seed=3', location, user),
+    ], counting_submit, batch_size=20, flush_seconds=0.2, run_id='t1')
+
+    stats = _run(gateway)
+    assert stats['stable'] == 4 and stats['unassigned'] == 1
+    assert stats['readings'] == 250
+    # Hundreds of readings, one create_group call
+    assert calls == [3] and stats['groups'] == 1 and stats['submitted'] == 3
+
+    db.session.expire_all()
+    group = db.session.get(DraftGroup, gateway.group_ids[0])
+    assert group.source == 'scale'
+    drafts = sorted(group.drafts, key=lambda d: d.quantity_kg)
+    assert [float(d.quantity_kg) for d in drafts] == [0.8, 1.25, 2.5]
+    assert {d.batch_id for d in drafts} == {batch}
+    assert all(d.client_event_id.startswith('scale-mix-') and '-t1-' in d.client_event_id for d in drafts)
+    assert len({d.client_event_id for d in drafts}) == 3
+
+
+def test_gateway_isolates_rejected_lines():
+    calls, submitted = [], []
+
+    async def submit(location_id, user_id, lines):
+        calls.append(len(lines))
+        if any(line['article_id'] == 2 for line in lines):
+            raise AppError('INSUFFICIENT_STOCK', 'Insufficient inventory')
+        submitted.extend(line['quantity_kg'] for line in lines)
+        return len(calls)
+
+    gateway = ScaleGateway([
+        ScaleConfig('ok', 'sim://?plateaus=0:1,1:1,0:1,2:1&rate=0&seed=1', 13, 1, article_id=1),
+        ScaleConfig('short', 'sim://?plateaus=0:1,5:1&rate=0&seed=2', 13, 1, article_id=2),
+    ], submit, batch_size=10, flush_seconds=0.2, run_id='t2')
+
+    stats = _run(gateway)
+    # The group of three fails as a whole, then each line is retried alone
+    assert calls == [3, 1, 1, 1]
+    assert stats['rejected'] == 1 and stats['submitted'] == 2 and stats['groups'] == 2
+    assert sorted(submitted) == [1.0, 2.0]
+
+
+def test_tcp_scale_stream():
+    async def scenario():
+        async def serve(reader, writer):
+            for line in (b'ST,GS,+0001.250 kg\r\n', b'OL\r\n', b'ST,GS,+0001.252 kg\r\n'):
+                writer.write(line)
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(serve, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        readings = []
+        async with server:
+            async for value in TcpScale('127.0.0.1', port).readings():
+                readings.append(value)
+                if len(readings) == 2:
+                    break
+        return readings
+
+    assert asyncio.run(scenario()) == [1.25, 1.252]
+
+
+def test_gateway_stops_on_event_and_flushes():
+    async def scenario():
+        submitted = []
+
+        async def submit(location_id, user_id, lines):
+            submitted.extend(lines)
+            return 1
+
+        gateway = ScaleGateway([
+            ScaleConfig('live', 'sim://?plateaus=0:0.2,1.5:0.2&rate=200&repeat=true', 13, 1, article_id=1),
+        ], submit, flush_seconds=0.05)
+        stop = asyncio.Event()
+        asyncio.get_running_loop().call_later(1.0, stop.set)
+        stats = await gateway.run(stop)
+        return stats, submitted
+
+    stats, submitted = asyncio.run(scenario())
+    assert stats['submitted'] == len(submitted) >= 1
+    assert all(line['quantity_kg'] == 1.5 for line in submitted)
+
+
+def test_cli_runs_configured_scales(app, tmp_path, location, article, batch, user, stock):
+    config = tmp_path / 'scales.json'
+    config.write_text(
+        '{"location_id": %d, "user_id": %d, "article_id": %d, "scales": ['
+        '{"name": "a", "source": "sim://?plateaus=0:1,1.5:1&rate=0&seed=1"},'
+        '{"name": "b", "source": "sim://?plateaus=0:1,0.5:1&rate=0&seed=2"}]}' % (location, user, article)
+    )
+    result = app.test_cli_runner().invoke(args=['scale-gateway', '--config', str(config), '--flush-seconds', '0.1'])
+    assert result.exit_code == 0, result.output
+    assert 'submitted: 2' in result.output
+    db.session.expire_all()
+    assert DraftGroup.query.count() == 1
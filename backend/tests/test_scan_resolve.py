@@ -0,0 +1,108 @@
+"""Tests for batched scan resolution and unique article barcodes."""
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import event, insert
+
+from app.db_routing import RoutingSession
+from app.extensions import db
+from app.models import Article, Batch
+from app.query_stats import count_queries
+from app.services import article_alias_service
+
+
+@pytest.fixture
+def labels(app, article, batch):
+    """TEST-001 (barcode 4006381333931, batch 1234) and PR-100 (alias GRUND, batches 1234 and 98765)."""
+    db.session.get(Article, article).barcode = '4006381333931'
+    primer = Article(article_no='PR-100', description='Grey primer', uom='KG')
+    db.session.add(primer)
+    db.session.flush()
+    db.session.add_all([
+        Batch(article_id=primer.id, batch_code='1234'),
+        Batch(article_id=primer.id, batch_code='98765'),
+    ])
+    db.session.commit()
+    article_alias_service.create_alias(primer.id, 'grund')
+    db.session.commit()
+    return {'TEST-001': article, 'PR-100': primer.id}
+
+
+def _resolve(client, headers, codes):
+    response = client.post('/api/scan/resolve', headers=headers, json={'codes': codes})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_resolves_every_kind_of_code_in_scan_order(client, admin_headers, labels):
+    body = _resolve(client, admin_headers, [
+        '4006381333931', ' pr-100 ', 'Grund', '98765', 'NOPE', '4006381333931'
+    ])
+    assert body['total'] == 6 and body['resolved'] == 5
+    items = body['items']
+    assert [item['match'] for item in items] == ['barcode', 'article_no', 'alias', 'batch', None, 'barcode']
+    assert [item['article']['article_no'] if item['article'] else None for item in items] == [
+        'TEST-001', 'PR-100', 'PR-100', 'PR-100', None, 'TEST-001'
+    ]
+    assert items[3]['batch']['batch_code'] == '98765'
+    assert items[1]['code'] == 'pr-100'
+
+
+def test_batch_code_follows_previous_article(client, admin_headers, labels):
+    # 1234 exists for both articles: the preceding article scan decides
+    items = _resolve(client, admin_headers, ['PR-100', '1234', '4006381333931', '1234'])['items']
+    assert [(item['match'], item['article']['id']) for item in items[1::2]] == [
+        ('batch', labels['PR-100']), ('batch', labels['TEST-001'])
+    ]
+
+    # Without context it stays unresolved, with both candidates
+    item = _resolve(client, admin_headers, ['1234'])['items'][0]
+    assert item['match'] is None and item['article'] is None
+    assert sorted(c['article']['article_no'] for c in item['candidates']) == ['PR-100', 'TEST-001']
+
+
+def test_query_count_does_not_grow_with_scans(client, admin_headers, labels):
+    with count_queries() as few:
+        _resolve(client, admin_headers, ['4006381333931', '98765'])
+    codes = ['4006381333931', 'PR-100', 'GRUND', '98765', '1234'] * 20 + [f'MISS-{i}' for i in range(100)]
+    with count_queries() as many:
+        body = _resolve(client, admin_headers, codes)
+    assert body['total'] == 200
+    assert many.count == few.count
+
+
+def test_article_barcodes_are_unique(client, admin_headers, labels):
+    payload = {'article_no': 'TC-200', 'uom': 'KG', 'barcode': ' 4006381333931 '}
+    response = client.post('/api/articles', headers=admin_headers, json=payload)
+    assert response.status_code == 409
+    assert response.get_json()['error']['details'] == {'barcode': '4006381333931'}
+
+    # Blank barcodes are stored as NULL and never collide
+    for article_no in ('TC-200', 'TC-201'):
+        response = client.post('/api/articles', headers=admin_headers,
+                               json={'article_no': article_no, 'uom': 'KG', 'barcode': ' '})
+        assert response.status_code == 201, response.get_json()
+        assert response.get_json()['barcode'] is None
+
+
+def test_concurrent_duplicate_barcode_is_a_conflict(client, admin_headers, labels):
+    raced = []
+
+    def competitor(session, flush_context, instances):
+        # Another request inserts the barcode between the check and the commit
+        if not raced:
+            raced.append(True)
+            session.connection(bind_arguments={'bind': db.engine}).execute(insert(Article), {
+                'article_no': 'TC-300', 'uom': 'KG', 'base_uom': 'kg', 'barcode': '5901234123457',
+                'is_paint': True, 'is_active': True, 'created_at': datetime.now(timezone.utc),
+            })
+
+    event.listen(RoutingSession, 'before_flush', competitor)
+    try:
+        response = client.post('/api/articles', headers=admin_headers,
+                               json={'article_no': 'TC-301', 'uom': 'KG', 'barcode': '5901234123457'})
+    finally:
+        event.remove(RoutingSession, 'before_flush', competitor)
+    assert raced and response.status_code == 409
+    assert response.get_json()['error']['code'] == 'DUPLICATE_BARCODE'
+    assert Article.query.filter_by(article_no='TC-301').count() == 0
@@ -0,0 +1,103 @@
+"""Tests for daily stock snapshots and point-in-time inventory reports."""
+from datetime import datetime, time, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.extensions import db
+from app.models import Transaction, StockSnapshot
+from app.services.snapshot_service import take_snapshots
+
+
+@pytest.fixture
+def history(app, location, article, batch, user, stock, surplus):
+    """Two days of movements ending in the current balances (stock 10, surplus 5)."""
+    today = datetime.now(timezone.utc).date()
+    yesterday = today - timedelta(days=1)
+    before = today - timedelta(days=2)
+
+    def tx(day, tx_type, quantity, source, meta=None):
+        db.session.add(Transaction(
+            tx_type=tx_type, occurred_at=datetime.combine(day, time(12, 0), tzinfo=timezone.utc),
+            location_id=location, article_id=article, batch_id=batch,
+            quantity_kg=Decimal(quantity), user_id=user, source=source, meta=meta
+        ))
+
+    tx(yesterday, Transaction.TX_STOCK_RECEIPT, '4', 'receiving')
+    tx(yesterday, Transaction.TX_WEIGH_IN, '1', 'ui')
+    tx(yesterday, Transaction.TX_SURPLUS_CONSUMED, '-1', 'approval')
+    tx(today, Transaction.TX_STOCK_CONSUMED, '-2', 'approval')
+    tx(today, Transaction.TX_INVENTORY_ADJUSTMENT, '3', 'adjustment', {'target': 'surplus'})
+    tx(today, Transaction.TX_INVENTORY_ADJUSTMENT, '-3', 'inventory_count')
+    db.session.commit()
+    # End of `before`: stock 8, surplus 6; end of `yesterday`: stock 12, surplus 5
+    return {'before': before, 'yesterday': yesterday, 'today': today}
+
+
+def _report(client, headers, as_of):
+    response = client.get(f'/api/reports/inventory?as_of={as_of.isoformat()}', headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_snapshot_command_backfills_days(app, history):
+    result = app.test_cli_runner().invoke(args=[
+        'snapshot-stock', '--date', history['yesterday'].isoformat(), '--days', '2'
+    ])
+    assert result.exit_code == 0, result.output
+
+    rows = {
+        s.snapshot_date: (s.stock_kg, s.surplus_kg)
+        for s in db.session.query(StockSnapshot)
+    }
+    assert rows == {
+        history['before']: (Decimal('8.00'), Decimal('6.00')),
+        history['yesterday']: (Decimal('12.00'), Decimal('5.00')),
+    }
+
+    # Re-running a day replaces it instead of duplicating
+    assert app.test_cli_runner().invoke(args=['snapshot-stock', '--date', history['yesterday'].isoformat()]).exit_code == 0
+    assert db.session.query(StockSnapshot).count() == 2
+
+
+def test_snapshot_rejects_unfinished_day(app, history):
+    with pytest.raises(ValueError):
+        take_snapshots([history['today']])
+
+
+def test_as_of_without_snapshots_uses_current_balances(client, admin_headers, history):
+    body = _report(client, admin_headers, history['before'])
+
+    assert body['source'] == 'current'
+    assert body['snapshot_date'] is None
+    assert [(i['stock_kg'], i['surplus_kg']) for i in body['items']] == [(8.0, 6.0)]
+    assert body['items'][0]['article_no'] == 'TEST-001'
+
+
+def test_as_of_uses_nearest_snapshot(app, client, admin_headers, history):
+    before = history['before']
+    take_snapshots([before])
+    db.session.commit()
+
+    body = _report(client, admin_headers, before)
+    assert (body['source'], body['snapshot_date']) == ('snapshot', before.isoformat())
+    assert [(i['stock_kg'], i['surplus_kg']) for i in body['items']] == [(8.0, 6.0)]
+
+    # Forward from the snapshot by yesterday's movements
+    body = _report(client, admin_headers, history['yesterday'])
+    assert [(i['stock_kg'], i['surplus_kg']) for i in body['items']] == [(12.0, 5.0)]
+
+    # Backward from a later snapshot
+    db.session.query(StockSnapshot).delete()
+    take_snapshots([history['yesterday']])
+    db.session.commit()
+    body = _report(client, admin_headers, before)
+    assert body['snapshot_date'] == history['yesterday'].isoformat()
+    assert [(i['stock_kg'], i['surplus_kg']) for i in body['items']] == [(8.0, 6.0)]
+
+
+def test_as_of_today_is_current_inventory(client, admin_headers, history):
+    body = _report(client, admin_headers, history['today'])
+
+    assert body['source'] == 'current'
+    assert [(i['stock_kg'], i['surplus_kg']) for i in body['items']] == [(10.0, 5.0)]
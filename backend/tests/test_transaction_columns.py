@@ -0,0 +1,51 @@
+"""Tests for the typed draft_id/reason transaction columns."""
+from flask_jwt_extended import create_access_token
+
+from app.extensions import db
+from app.models import Transaction
+from app.services.approval_service import approve_draft
+
+
+def get_headers(user_id):
+    token = create_access_token(identity=str(user_id), additional_claims={'role': 'ADMIN'})
+    return {'Authorization': f'Bearer {token}'}
+
+
+def test_approval_sets_draft_id(app, client, user, surplus, stock, draft):
+    approve_draft(draft, user)
+    db.session.commit()
+
+    rows = Transaction.query.filter_by(draft_id=draft).all()
+    assert {t.tx_type for t in rows} == {Transaction.TX_WEIGH_IN, Transaction.TX_SURPLUS_CONSUMED}
+    assert all(t.meta['draft_id'] == draft for t in rows)
+
+    response = client.get(f'/api/drafts/{draft}/transactions', headers=get_headers(user))
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['total'] == 2
+    assert {item['draft_id'] for item in body['items']} == {draft}
+
+    listed = client.get(f'/api/transactions?draft_id={draft}', headers=get_headers(user)).get_json()
+    assert listed['total'] == 2
+
+
+def test_inventory_count_sets_reason(client, user, location, article, batch, stock, surplus):
+    headers = get_headers(user)
+    client.post('/api/inventory/count', headers=headers, json={
+        'location_id': location, 'article_id': article, 'batch_id': batch, 'counted_total_qty': 17.0
+    })
+
+    response = client.get('/api/transactions?reason=inventory_count_over', headers=headers)
+    body = response.get_json()
+    assert body['total'] == 1
+    assert body['items'][0]['reason'] == 'inventory_count_over'
+    assert body['items'][0]['draft_id'] is None
+
+
+def test_draft_transactions_uses_index(app):
+    if db.engine.dialect.name != 'sqlite':
+        return
+    plan = db.session.execute(db.text(
+        'EXPLAIN QUERY PLAN SELECT id FROM transactions WHERE draft_id = 1'
+    )).all()
+    assert 'ix_transactions_draft_id' in ' '.join(str(row[-1]) for row in plan)